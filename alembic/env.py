@@ -43,30 +43,31 @@ def get_url():
     Get database URL from settings.
 
     This allows us to use the same configuration system
-    as the rest of the application.
+    as the rest of the application. DATABASE_URL overrides it
+    (e.g. `DATABASE_URL=sqlite:///test.db alembic upgrade head`).
     """
+    url = os.getenv('DATABASE_URL')
+    if url:
+        return url
+
     try:
         settings = get_settings()
 
-        # Build DatabaseConfig from settings
-        db_config = DatabaseConfig(
-            host=settings.DB_HOST,
-            port=settings.DB_PORT,
-            database=settings.DB_NAME,
-            user=settings.DB_USER,
-            password=settings.DB_PASSWORD
-        )
+        # Build DatabaseConfig from settings (DB_TYPE selects SQLite / PostgreSQL)
+        db_config = DatabaseConfig.from_env(settings)
 
         # For migrations, use synchronous URL
         return db_config.get_sync_url()
 
     except Exception as e:
         print(f"Error getting database URL: {e}")
-        # Fallback to environment variable if settings fail
-        return os.getenv(
-            'DATABASE_URL',
-            'sqlite:///data/database/whale_tracker.db'
-        )
+        # Fallback to the default SQLite database
+        return 'sqlite:///data/database/whale_tracker.db'
+
+
+def is_sqlite(url: str) -> bool:
+    """SQLite needs batch mode (copy-and-move) for ALTER TABLE."""
+    return url.startswith('sqlite')
 
 
 def run_migrations_offline() -> None:
@@ -89,6 +90,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        render_as_batch=is_sqlite(url),
     )
 
     with context.begin_transaction():
@@ -107,6 +109,7 @@ def do_run_migrations(connection: Connection) -> None:
         target_metadata=target_metadata,
         compare_type=True,
         compare_server_default=True,
+        render_as_batch=connection.dialect.name == 'sqlite',
     )
 
     with context.begin_transaction():
@@ -123,9 +126,11 @@ async def run_async_migrations() -> None:
     # Get URL and build async configuration
     url = get_url()
 
-    # Replace postgresql:// with postgresql+asyncpg:// for async
+    # Use the async drivers (asyncpg / aiosqlite)
     if url.startswith('postgresql://'):
-        url = url.replace('postgresql://', 'postgresql+asyncpg://')
+        url = url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    elif url.startswith('sqlite://'):
+        url = url.replace('sqlite://', 'sqlite+aiosqlite://', 1)
 
     # Create async engine
     configuration = {
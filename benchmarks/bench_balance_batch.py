@@ -0,0 +1,138 @@
+"""
+Benchmark: per-address eth_getBalance vs batched JSON-RPC
+==========================================================
+
+Starts a local mock JSON-RPC server (with simulated network latency per HTTP
+request) and compares:
+1. Sequential Web3Manager.get_eth_balance() - one round trip per whale
+2. Web3Manager.get_balances_batch() - JSON-RPC batches of batch_size calls
+
+Usage:
+    python benchmarks/bench_balance_batch.py [--whales 500] [--latency-ms 5] [--batch-size 100]
+
+Author: Whale Tracker Project
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+from aiohttp import web
+from web3 import Web3
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.web3_manager import Web3Manager
+
+
+class MockRPCServer:
+    """Local JSON-RPC server running in its own thread and event loop."""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.http_requests = 0
+        self.url = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._runner = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _answer(call):
+        method = call.get('method')
+        if method == 'eth_getBalance':
+            # Deterministic balance derived from the address
+            result = hex(int(call['params'][0], 16) % 10**6 * 10**15)
+        elif method == 'eth_chainId':
+            result = '0x1'
+        else:
+            result = '0x0'
+        return {'jsonrpc': '2.0', 'id': call.get('id'), 'result': result}
+
+    async def _handle(self, request):
+        self.http_requests += 1
+        await asyncio.sleep(self.latency)
+        body = await request.json()
+        if isinstance(body, list):
+            return web.json_response([self._answer(call) for call in body])
+        return web.json_response(self._answer(body))
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_post('/', self._handle)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        self._loop.run_until_complete(site.start())
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}/'
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> str:
+        self._thread.start()
+        self._ready.wait()
+        return self.url
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+async def run_benchmark(whales: int, latency_ms: float, batch_size: int) -> None:
+    server = MockRPCServer(latency_ms)
+    url = server.start()
+
+    addresses = [f"0x{i:040x}" for i in range(1, whales + 1)]
+
+    manager = Web3Manager()
+    manager.networks[manager.network]['rpc_url'] = url
+    manager.web3 = Web3(Web3.HTTPProvider(url))
+
+    # 1. Sequential per-address calls
+    server.http_requests = 0
+    start = time.perf_counter()
+    sequential = {}
+    for address in addresses:
+        sequential[address] = await manager.get_eth_balance(address)
+    sequential_time = time.perf_counter() - start
+    sequential_requests = server.http_requests
+
+    # 2. Batched JSON-RPC
+    server.http_requests = 0
+    start = time.perf_counter()
+    batched = await manager.get_balances_batch(addresses, batch_size=batch_size)
+    batched_time = time.perf_counter() - start
+    batched_requests = server.http_requests
+
+    server.stop()
+
+    mismatches = sum(1 for a in addresses if sequential[a] != batched[a])
+
+    print("=" * 70)
+    print(f"Balance fetch benchmark: {whales} whales, {latency_ms}ms RPC latency, batch_size={batch_size}")
+    print("=" * 70)
+    print(f"Sequential get_eth_balance: {sequential_time:8.3f}s  ({sequential_requests} HTTP requests)")
+    print(f"get_balances_batch:         {batched_time:8.3f}s  ({batched_requests} HTTP requests)")
+    print(f"Speedup:                    {sequential_time / batched_time:8.1f}x")
+    print(f"Mismatched balances:        {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--whales', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=5.0)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.whales, args.latency_ms, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: ORM row-by-row writes vs bulk upserts
+=================================================
+
+Stores N transactions (in blocks of B) into a SQLite file and compares:
+1. The former TransactionStore path: SELECT existing hashes, then
+   session.add_all() of ORM objects (one INSERT per row at flush)
+2. repository.upsert(): one INSERT ... ON CONFLICT DO NOTHING RETURNING per block
+3. BulkWriter: buffered rows flushed in batches (write-behind)
+
+Usage:
+    python benchmarks/bench_bulk_writes.py [--transactions 20000] [--block-size 200]
+
+Author: Whale Tracker Project
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from models.database import Transaction
+from models.db_connection import AsyncDatabaseManager, DatabaseConfig
+from src.storage.transaction_store import TransactionStore
+
+
+def make_txs(count: int):
+    """Detector-format transactions."""
+    base_time = datetime(2024, 1, 1)
+    return [
+        {
+            'hash': f"0x{i:064x}",
+            'from': f"0x{i % 500:040x}",
+            'to': f"0x{(i * 7) % 900:040x}",
+            'value': i * 10**15,
+            'nonce': i,
+            'gasPrice': 25 * 10**9,
+            'maxFeePerGas': None,
+            'maxPriorityFeePerGas': None,
+            'blockNumber': 19000000 + i // 200,
+            'timestamp': base_time + timedelta(seconds=12 * (i // 200))
+        }
+        for i in range(count)
+    ]
+
+
+async def fresh_db(directory: str, name: str) -> AsyncDatabaseManager:
+    db_manager = AsyncDatabaseManager(DatabaseConfig(db_type='sqlite', sqlite_path=f"{directory}/{name}.db"))
+    await db_manager.create_all_tables()
+    return db_manager
+
+
+async def orm_path(db_manager, blocks):
+    """Former add_transactions: existence query + ORM add_all."""
+    for block in blocks:
+        async with db_manager.session() as session:
+            result = await session.execute(
+                select(Transaction.tx_hash).where(Transaction.tx_hash.in_([tx['hash'] for tx in block]))
+            )
+            existing = set(result.scalars().all())
+            session.add_all([TransactionStore._to_row(tx) for tx in block if tx['hash'] not in existing])
+
+
+async def upsert_path(db_manager, blocks):
+    store = TransactionStore(db_manager)
+    for block in blocks:
+        await store.add_transactions(block)
+
+
+async def writer_path(db_manager, blocks):
+    writer = db_manager.repository.writer(Transaction, batch_size=2000, update_columns=())
+    for block in blocks:
+        await writer.add_many([TransactionStore._to_values(tx) for tx in block])
+    await writer.close()
+
+
+async def run_benchmark(count: int, block_size: int) -> None:
+    txs = make_txs(count)
+    blocks = [txs[i:i + block_size] for i in range(0, count, block_size)]
+
+    print("=" * 70)
+    print(f"Bulk write benchmark: {count} transactions in blocks of {block_size} (SQLite file)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as directory:
+        timings = {}
+        for name, path in (('orm', orm_path), ('upsert', upsert_path), ('writer', writer_path)):
+            db_manager = await fresh_db(directory, name)
+            start = time.perf_counter()
+            await path(db_manager, blocks)
+            timings[name] = time.perf_counter() - start
+
+            async with db_manager.session() as session:
+                stored = len((await session.execute(select(Transaction.tx_hash))).all())
+            await db_manager.close()
+            assert stored == count, f"{name}: stored {stored}"
+
+    for name, label in (('orm', 'ORM add_all per block'), ('upsert', 'Bulk upsert per block'), ('writer', 'BulkWriter (buffered)')):
+        elapsed = timings[name]
+        print(f"{label:26s} {elapsed * 1000:9.0f}ms  {count / elapsed:9.0f} tx/s  ({timings['orm'] / elapsed:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=20000)
+    parser.add_argument('--block-size', type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(run_benchmark(args.transactions, args.block_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Benchmark: end-to-end detection against a simulated chain
+==========================================================
+
+Runs the real detection path - BlockStreamIngester, TransactionIndexer,
+SimpleWhaleWatcher with NonceTracker + GasCorrelator + AddressProfiler,
+TelegramNotifier - against a seeded ChainSimulator served over local
+JSON-RPC / Etherscan endpoints (MockChainServer) and a stub Bot API.
+
+Blocks are revealed blocks_per_poll at a time and polled immediately, so
+the numbers are the pipeline's own capacity, not the 12s block time:
+1. block stream: blocks/s, transactions/s, whale transfers matched
+2. detection latency: block revealed -> alert returned (p50 / p95 / p99 / max)
+3. recall per planted dump type, alerts not matching a planted dump
+4. whale sweep (monitor_all_whales after the stream): whales/s
+   (before the stream, the indexer catches the whales up over the fake
+   Etherscan txlist API, as on startup)
+5. per-component time (inclusive; nested and concurrent calls overlap)
+   and RPC / Etherscan calls served
+
+Same seed and parameters = same chain, so runs are comparable across commits.
+
+Usage:
+    python benchmarks/bench_detection_pipeline.py [--whales 500] [--blocks 600] [--noise 150]
+        [--history-blocks 50] [--blocks-per-poll 1] [--rpc-latency-ms 0]
+        [--nonce-source rpc|etherscan] [--seed 7]
+
+Author: Whale Tracker Project
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import Settings
+from models.db_connection import AsyncDatabaseManager, DatabaseConfig
+from src.analyzers.address_profiler import AddressProfiler
+from src.analyzers.gas_correlator import GasCorrelator
+from src.analyzers.nonce_tracker import NonceTracker
+from src.analyzers.whale_analyzer import WhaleAnalyzer
+from src.core.chain_simulator import ChainSimulator, MockChainServer
+from src.core.rate_limiter import AsyncRateLimiter
+from src.core.web3_manager import Web3Manager
+from src.core.whale_config import WhaleConfig
+from src.monitors.block_stream import BlockStreamIngester
+from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
+from src.notifications.alert_dispatch import percentile
+from src.notifications.stub_bot_api import StubBotAPI
+from src.notifications.telegram_notifier import TelegramNotifier
+from src.storage.transaction_indexer import TransactionIndexer
+from src.storage.transaction_store import TransactionStore
+
+
+class ComponentTimer:
+    """Accumulates wall time per wrapped method."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def wrap(self, obj, method: str, label: str) -> None:
+        original = getattr(obj, method)
+
+        if asyncio.iscoroutinefunction(original):
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self.seconds[label] += time.perf_counter() - started
+                    self.calls[label] += 1
+        else:
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.seconds[label] += time.perf_counter() - started
+                    self.calls[label] += 1
+
+        setattr(obj, method, timed)
+
+
+def alert_key(alert):
+    """Exchange-side tx hash of an alert (matches PlantedEvent.exchange_tx_hash)."""
+    return alert.get('exchange_tx_hash') or alert.get('tx_hash')
+
+
+async def run_benchmark(
+    whale_count: int,
+    block_count: int,
+    history_blocks: int,
+    noise_per_block: float,
+    blocks_per_poll: int,
+    rpc_latency_ms: float,
+    nonce_source: str,
+    seed: int
+) -> None:
+    whale_config = WhaleConfig()
+    chain = ChainSimulator(
+        whale_count=whale_count,
+        exchange_addresses=whale_config.get_all_exchange_addresses(),
+        seed=seed,
+        noise_per_block=noise_per_block
+    )
+    started = time.perf_counter()
+    chain.generate(history_blocks + block_count)
+    generate_time = time.perf_counter() - started
+
+    server = MockChainServer(chain, latency_seconds=rpc_latency_ms / 1000)
+    server.start()
+    stub = StubBotAPI()
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'bench')
+    os.environ.setdefault('TELEGRAM_CHAT_ID', '1')
+
+    settings = Settings()
+    # Every planted dump should be able to alert, even several of one whale
+    settings.whale_monitoring.intervals.alert_cooldown_minutes = 0
+
+    workdir = tempfile.TemporaryDirectory()
+    db_manager = AsyncDatabaseManager(DatabaseConfig(db_type='sqlite', sqlite_path=f"{workdir.name}/bench.db"))
+    await db_manager.create_all_tables()
+    store = TransactionStore(db_manager)
+    await store.initialize()
+    # Unthrottled: measure the pipeline, not the provider quota
+    unthrottled = AsyncRateLimiter(default_rate=1e9, default_burst=10**9)
+
+    web3_manager = Web3Manager(rpc_url=server.rpc_url, rate_limiter=unthrottled)
+    await web3_manager.initialize()
+    web3_manager.transaction_store = store
+
+    notifier = TelegramNotifier(
+        per_chat_interval_seconds=0, global_rate_per_second=1e6, api_base_url=await stub.start()
+    )
+    nonce_tracker = NonceTracker(
+        web3_manager=web3_manager,
+        etherscan_api_key='bench' if nonce_source == 'etherscan' else None,
+        etherscan_url=server.etherscan_url
+    )
+    watcher = SimpleWhaleWatcher(
+        web3_manager=web3_manager,
+        whale_config=whale_config,
+        analyzer=WhaleAnalyzer(),
+        notifier=notifier,
+        settings=settings,
+        nonce_tracker=nonce_tracker,
+        gas_correlator=GasCorrelator(),
+        address_profiler=AddressProfiler(web3_manager=web3_manager),
+        max_concurrent_checks=20,
+        prefetch_balances=True,
+        transaction_store=store
+    )
+    indexer = TransactionIndexer(
+        store,
+        whale_config=whale_config,
+        etherscan_api_key='bench',
+        rate_limiter=unthrottled,
+        etherscan_url=server.etherscan_url
+    )
+
+    # Startup as in main: watch the whales, backfill the history blocks via txlist
+    chain.mine(history_blocks)
+    for whale in chain.whales:
+        await indexer.watch(whale, role='whale', start_block=chain.start_block - 1)
+    started = time.perf_counter()
+    backfilled = await indexer.catch_up(chain.head)
+    catch_up_time = time.perf_counter() - started
+
+    ingester = BlockStreamIngester(
+        watcher,
+        whale_addresses=chain.whales,
+        max_blocks_per_poll=blocks_per_poll,
+        start_block=chain.head + 1,
+        indexer=indexer
+    )
+
+    timer = ComponentTimer()
+    for obj, method, label in (
+        (web3_manager, 'get_block_number', 'rpc eth_blockNumber'),
+        (web3_manager, 'get_block', 'rpc eth_getBlockByNumber'),
+        (web3_manager, 'get_balances_batch', 'rpc eth_getBalance (batch)'),
+        (ingester, 'ingest_block', 'ingest_block (all below)'),
+        (indexer, 'index_block', 'indexer.index_block'),
+        (store, 'get_recent_transactions', 'store.get_recent_transactions'),
+        (watcher, '_check_direct_dump', 'watcher direct dump'),
+        (watcher, '_check_advanced_one_hop', 'watcher advanced one-hop'),
+        (watcher.gas_correlator, 'check_gas_correlation', '  GasCorrelator'),
+        (watcher.nonce_tracker, 'check_nonce_sequence', '  NonceTracker'),
+        (watcher.address_profiler, 'profile_address', '  AddressProfiler'),
+        (notifier, 'send_message', 'notifier.send_message (queue)')
+    ):
+        timer.wrap(obj, method, label)
+
+    # First sweep remembers every whale's balance
+    await watcher.monitor_all_whales(chain.whales)
+
+    # ---- Block stream ----
+    # Dumps that started in the history blocks are out of the stream's reach
+    events = {
+        event.exchange_tx_hash: event for event in chain.events
+        if event.completed and event.started_block > chain.head
+    }
+    revealed_at = {}
+    latencies = []
+    detected = set()
+    unmatched = 0
+
+    started = time.perf_counter()
+    while chain.head < chain.latest_generated_block:
+        first = chain.head + 1
+        chain.mine(min(blocks_per_poll, chain.latest_generated_block - chain.head))
+        now = time.perf_counter()
+        for number in range(first, chain.head + 1):
+            revealed_at[number] = now
+
+        result = await ingester.poll_once()
+        finished = time.perf_counter()
+        for alert in result['alerts']:
+            event = events.get(alert_key(alert))
+            if event is None:
+                unmatched += 1
+                continue
+            detected.add(event.exchange_tx_hash)
+            latencies.append((finished - revealed_at[event.completed_block]) * 1000)
+    stream_time = time.perf_counter() - started
+
+    # ---- Whale sweep at the new head (balances dropped -> history + one-hop checks) ----
+    started = time.perf_counter()
+    sweep = await watcher.monitor_all_whales(chain.whales)
+    sweep_time = time.perf_counter() - started
+
+    await notifier.close(timeout=10)
+    await stub.stop()
+    server.stop()
+    await db_manager.close()
+    workdir.cleanup()
+
+    # ---- Report ----
+    chain_stats = chain.get_stats()
+    stream_stats = ingester.get_stats()
+    latencies.sort()
+
+    print("=" * 70)
+    print(
+        f"Detection pipeline benchmark: {whale_count} whales, {block_count} blocks, "
+        f"{chain_stats['transactions']:,} transactions (seed {seed})"
+    )
+    print(
+        f"blocks/poll {blocks_per_poll}, RPC latency {rpc_latency_ms:g}ms, nonce source {nonce_source}"
+    )
+    print("=" * 70)
+    print(f"Chain generation:          {generate_time:8.2f}s (not part of the measurement)")
+    print(
+        f"Indexer catch-up:          {catch_up_time:8.2f}s  {backfilled:,} transactions over "
+        f"{history_blocks} blocks ({server.calls.get('etherscan:account.txlist', 0)} txlist calls)"
+    )
+    print(
+        f"Block stream:              {stream_time:8.2f}s  {stream_stats['blocks_processed'] / stream_time:8.1f} blocks/s  "
+        f"{stream_stats['transactions_decoded'] / stream_time:10,.0f} tx/s"
+    )
+    print(f"Whale transfers matched:   {stream_stats['transactions_matched']:8,}")
+    if latencies:
+        print(
+            f"Detection latency:         p50 {percentile(latencies, 0.5):.1f}ms, "
+            f"p95 {percentile(latencies, 0.95):.1f}ms, p99 {percentile(latencies, 0.99):.1f}ms, "
+            f"max {latencies[-1]:.1f}ms"
+        )
+    for kind in ('direct_dump', 'one_hop_dump'):
+        planted = [e for e in events.values() if e.kind == kind]
+        found = sum(1 for e in planted if e.exchange_tx_hash in detected)
+        print(f"Recall {kind + ':':19s} {found}/{len(planted)}")
+    print(f"Alerts not planted:        {unmatched}")
+    print(
+        f"Whale sweep:               {sweep_time:8.2f}s  {whale_count / sweep_time:8.1f} whales/s  "
+        f"({sweep.get('total_alerts', 0)} alerts)"
+    )
+    print(f"Telegram messages:         {len(stub.messages)} delivered")
+
+    print("-" * 70)
+    print(f"{'Component':36s} {'calls':>8s} {'total s':>9s} {'avg ms':>9s}")
+    for label in sorted(timer.seconds, key=timer.seconds.get, reverse=True):
+        seconds, calls = timer.seconds[label], timer.calls[label]
+        print(f"{label:36s} {calls:8,} {seconds:9.3f} {seconds / calls * 1000:9.3f}")
+
+    print("-" * 70)
+    print(f"Served: {server.http_requests:,} HTTP requests")
+    for name, count in sorted(server.calls.items(), key=lambda item: -item[1]):
+        print(f"  {name:40s} {count:8,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the detection pipeline on a simulated chain")
+    parser.add_argument('--whales', type=int, default=500, help='Watched whales')
+    parser.add_argument('--blocks', type=int, default=600, help='Blocks streamed')
+    parser.add_argument('--history-blocks', type=int, default=50, help='Blocks backfilled via txlist before the stream')
+    parser.add_argument('--noise', type=float, default=150, help='Ordinary transfers per block')
+    parser.add_argument('--blocks-per-poll', type=int, default=1, help='Blocks revealed between polls')
+    parser.add_argument('--rpc-latency-ms', type=float, default=0.0, help='Delay added to every served request')
+    parser.add_argument('--nonce-source', choices=('rpc', 'etherscan'), default='rpc',
+                        help='NonceTracker source (etherscan keeps its 5 req/s pacing)')
+    parser.add_argument('--seed', type=int, default=7, help='Chain seed')
+    args = parser.parse_args()
+
+    # Detections log at WARNING; keep the report readable
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(run_benchmark(
+        args.whales, args.blocks, args.history_blocks, args.noise, args.blocks_per_poll,
+        args.rpc_latency_ms, args.nonce_source, args.seed
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: multi-hop path queries on a synthetic transfer graph
+================================================================
+
+Builds a FlowGraph with random background transfers (power-law sender
+activity over one day, so a few addresses behave like busy services) and
+plants whale -> 1..4 intermediates -> exchange chains, then measures:
+1. build time and column memory
+2. trace() latency per whale outflow (p50 / p95 / p99 / max)
+3. recall of the planted chains
+
+Usage:
+    python benchmarks/bench_flow_graph.py [--edges 2000000] [--nodes 500000] [--whales 200] [--exchanges 50]
+
+Author: Whale Tracker Project
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analyzers.flow_graph import FlowGraph
+from src.notifications.alert_dispatch import percentile
+
+
+DAY = 24 * 3600
+START = 1_700_000_000
+
+
+def address(prefix: str, i: int) -> str:
+    return f"0x{prefix}{i:0{40 - len(prefix)}x}"
+
+
+def build_graph(edge_count: int, node_count: int, whale_count: int, exchange_count: int, seed: int):
+    """Random background transfers plus planted whale chains."""
+    rng = np.random.default_rng(seed)
+    exchanges = [address('ee', i) for i in range(exchange_count)]
+    graph = FlowGraph(exchanges=exchanges, retention_hours=None)
+
+    nodes = [address('aa', i) for i in range(node_count)]
+    # Zipf-like activity: low ids send far more often than high ids
+    senders = np.minimum(rng.zipf(1.3, edge_count) - 1, node_count - 1)
+    recipients = rng.integers(0, node_count, edge_count)
+    to_exchange = rng.random(edge_count) < 0.05
+    times = np.sort(rng.integers(START, START + DAY, edge_count))
+    values = rng.lognormal(0.0, 2.0, edge_count)
+
+    started = time.perf_counter()
+    chunk = 100_000
+    for lo in range(0, edge_count, chunk):
+        hi = min(lo + chunk, edge_count)
+        graph.add_transfers(
+            [nodes[i] for i in senders[lo:hi]],
+            [
+                exchanges[r % exchange_count] if ex else nodes[r]
+                for r, ex in zip(recipients[lo:hi], to_exchange[lo:hi])
+            ],
+            values[lo:hi],
+            times[lo:hi].tolist()
+        )
+
+    # Planted chains: whale -> k background addresses -> exchange, a few minutes per hop
+    planted = []
+    for w in range(whale_count):
+        whale = address('ff', w)
+        hops = 1 + w % 4
+        amount = float(rng.uniform(500, 5000))
+        t = int(rng.integers(START, START + DAY - 6 * 3600))
+        intermediates = [nodes[i] for i in rng.integers(node_count // 10, node_count, hops)]
+        path = [whale] + intermediates + [exchanges[w % exchange_count]]
+        for h, (sender, recipient) in enumerate(zip(path, path[1:])):
+            t += int(rng.integers(60, 1800))
+            graph.add_transfer(sender, recipient, amount * (1 - 0.001 * h), t, f"0x{w:032x}{h:032x}")
+        planted.append((whale, hops))
+
+    graph.compact()
+    return graph, planted, time.perf_counter() - started
+
+
+def run_benchmark(edge_count: int, node_count: int, whale_count: int, exchange_count: int) -> None:
+    graph, planted, build_time = build_graph(edge_count, node_count, whale_count, exchange_count, seed=7)
+    stats = graph.get_stats()
+
+    latencies = []
+    found = 0
+    for whale, hops in planted:
+        started = time.perf_counter()
+        paths = graph.trace(whale)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if any(path.hops == hops for path in paths):
+            found += 1
+
+    # Busy background senders (worst case for fan-out)
+    busy = []
+    for i in range(20):
+        started = time.perf_counter()
+        graph.trace(address('aa', i), since=START, until=START + 600)
+        busy.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    busy.sort()
+    print("=" * 70)
+    print(
+        f"Flow graph benchmark: {stats['edges']:,} edges, {stats['nodes']:,} nodes, "
+        f"{whale_count} planted chains (1-4 hops)"
+    )
+    print("=" * 70)
+    print(f"Build (incl. compaction):  {build_time:8.2f}s")
+    print(f"Column memory:             {stats['column_bytes'] / 2**20:8.1f} MiB")
+    print(
+        f"trace() per whale:         p50 {percentile(latencies, 0.5):.2f}ms, "
+        f"p95 {percentile(latencies, 0.95):.2f}ms, p99 {percentile(latencies, 0.99):.2f}ms, "
+        f"max {latencies[-1]:.2f}ms"
+    )
+    print(
+        f"trace() busy senders:      p50 {percentile(busy, 0.5):.2f}ms, "
+        f"max {busy[-1]:.2f}ms (10-minute outflow window)"
+    )
+    print(f"Planted chains found:      {found}/{len(planted)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-hop path queries")
+    parser.add_argument('--edges', type=int, default=2_000_000, help='Background transfers')
+    parser.add_argument('--nodes', type=int, default=500_000, help='Background addresses')
+    parser.add_argument('--whales', type=int, default=200, help='Planted whale chains')
+    parser.add_argument('--exchanges', type=int, default=50, help='Exchange addresses')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run_benchmark(args.edges, args.nodes, args.whales, args.exchanges)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: per-whale deques vs columnar WhaleHistory
+=====================================================
+
+Fills the history of W whales with L transactions each and compares:
+1. Memory of one deque of floats + one deque of datetimes per whale
+   (the former WhaleAnalyzer layout) vs the WhaleHistory arrays (tracemalloc)
+2. detect_anomaly() called per whale vs one detect_anomalies() call
+3. export_stats() for the whole fleet
+
+Usage:
+    python benchmarks/bench_whale_history.py [--whales 50000] [--length 30]
+
+Author: Whale Tracker Project
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analyzers.whale_analyzer import WhaleAnalyzer
+
+
+def measure(build):
+    """Bytes allocated (and kept) by build()."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def run_benchmark(whale_count: int, length: int) -> None:
+    rng = random.Random(7)
+    base_time = datetime(2024, 1, 1)
+    addresses = [f"0x{i:040x}" for i in range(whale_count)]
+    rows = [
+        [(rng.lognormvariate(12, 1.5), base_time + timedelta(seconds=rng.randint(0, 10**7))) for _ in range(length)]
+        for _ in range(whale_count)
+    ]
+
+    def build_deques():
+        amounts, timestamps = {}, {}
+        for address, txs in zip(addresses, rows):
+            # New float objects, as amounts computed per transaction would be
+            amounts[address] = deque((amount * 1.0 for amount, _ in txs), maxlen=length)
+            timestamps[address] = deque((datetime.fromtimestamp(ts.timestamp()) for _, ts in txs), maxlen=length)
+        return amounts, timestamps
+
+    def build_columnar():
+        analyzer = WhaleAnalyzer(rolling_window_size=length // 3, expected_whales=whale_count)
+        for address, txs in zip(addresses, rows):
+            for amount, ts in txs:
+                analyzer.add_transaction(address, amount, ts)
+        return analyzer
+
+    _, deque_bytes = measure(build_deques)
+    analyzer, columnar_bytes = measure(build_columnar)
+
+    current = {address: rng.lognormvariate(12.5, 1.5) for address in addresses}
+
+    start = time.perf_counter()
+    single = {address: analyzer.detect_anomaly(address, amount) for address, amount in current.items()}
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = analyzer.detect_anomalies(current)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer.export_stats()
+    export_time = time.perf_counter() - start
+
+    usage = analyzer.get_memory_usage()
+
+    print("=" * 70)
+    print(f"Whale history benchmark: {whale_count} whales x {length} transactions")
+    print("=" * 70)
+    print(f"Deques (floats + datetimes):   {deque_bytes / 2**20:8.1f} MiB  ({deque_bytes / whale_count:6.0f} B/whale)")
+    print(f"WhaleHistory (tracemalloc):    {columnar_bytes / 2**20:8.1f} MiB  ({columnar_bytes / whale_count:6.0f} B/whale)")
+    print(f"WhaleHistory (memory_usage):   {usage['total_bytes'] / 2**20:8.1f} MiB")
+    print(f"Memory reduction:              {deque_bytes / columnar_bytes:8.1f}x")
+    print(f"detect_anomaly per whale:      {single_time * 1000:8.1f}ms")
+    print(f"detect_anomalies batch:        {batch_time * 1000:8.1f}ms  ({single_time / batch_time:.1f}x)")
+    print(f"export_stats:                  {export_time * 1000:8.1f}ms")
+    print(f"Same results:                  {single == batch}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--whales', type=int, default=50000)
+    parser.add_argument('--length', type=int, default=30)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    run_benchmark(args.whales, args.length)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,12 +23,14 @@ class BlockchainProvider(BaseModel):
     priority: int = 1
     networks: List[str] = Field(default_factory=list)
     public_endpoints: bool = False
+    requests_per_second: float = 0  # Provider quota, 0 = unlimited
 
 
 class BlockchainConfig(BaseModel):
     """Blockchain provider configuration."""
     providers: Dict[str, BlockchainProvider] = Field(default_factory=dict)
     default_network: str = "ethereum_sepolia"
+    hedge_reads: bool = False  # Race the two fastest providers for block reads
 
 
 class TelegramConfig(BaseModel):
@@ -37,6 +39,10 @@ class TelegramConfig(BaseModel):
     chat_id: str = ""
     enabled: bool = True
     timeout: int = 30
+    per_chat_interval_seconds: float = 1.0  # Telegram: ~1 message/second per chat
+    global_rate_per_second: float = 25.0  # Telegram: ~30 messages/second per bot
+    max_retries: int = 5
+    max_queue_size: int = 1000
 
 
 class NotificationConfig(BaseModel):
@@ -63,6 +69,16 @@ class WhaleMonitoringIntervals(BaseModel):
     alert_cooldown_minutes: int = 60
     price_update_seconds: int = 300
     onehop_check_hours: int = 2  # How long to check for one-hop transfers
+    block_poll_seconds: int = 12  # Block stream: eth_blockNumber poll interval (~1 block)
+    state_flush_seconds: int = 5  # Write-behind flush of persisted watcher state
+    deposit_clustering_minutes: int = 30  # Exchange deposit-address detection over stored transactions
+    retention_hours: int = 24  # Retention job (expired partitions / rows / rollups)
+    adaptive_tick_seconds: int = 15  # Adaptive scheduling: how often due whales are collected
+    min_check_seconds: int = 60  # Adaptive scheduling: shortest per-whale check interval
+    max_check_seconds: int = 3600  # Adaptive scheduling: longest per-whale check interval
+    multihop_trace_seconds: int = 60  # Block stream: multi-hop tracing over the transfer graph
+    multihop_window_hours: int = 6  # Whale outflows traced (and max time from whale tx to exchange)
+    split_dump_window_hours: int = 6  # Split dump aggregation: lifetime of tracked whale outflows
 
 
 class WhaleThresholds(BaseModel):
@@ -70,6 +86,7 @@ class WhaleThresholds(BaseModel):
     min_amount_usd: float = 100000.0  # Minimum $100k for alerts
     anomaly_multiplier: float = 1.3  # 1.3x above average = anomaly
     onehop_confidence_threshold: float = 0.7  # 70% confidence for one-hop alerts
+    split_dump_share: float = 0.6  # Split dump: share of the whale outflow that must reach exchanges
 
 
 class WhaleMonitoringConfig(BaseModel):
@@ -78,6 +95,13 @@ class WhaleMonitoringConfig(BaseModel):
     intervals: WhaleMonitoringIntervals = Field(default_factory=WhaleMonitoringIntervals)
     thresholds: WhaleThresholds = Field(default_factory=WhaleThresholds)
     onehop_enabled: bool = True  # Enable one-hop tracking
+    block_stream_enabled: bool = False  # Follow new blocks instead of only polling balances
+    persist_state: bool = True  # Keep balances / alert cooldowns across restarts
+    address_label_files: List[str] = Field(default_factory=list)  # CSV/Parquet labeled addresses (e.g. exchange deposits)
+    deposit_clustering_enabled: bool = True  # Learn exchange deposit addresses from stored transactions
+    adaptive_scheduling: bool = True  # Per-whale check intervals by activity / volatility / alerts
+    multihop_max_hops: int = 4  # Block stream: intermediates traced in the transfer graph (< 2 = off)
+    split_dump_enabled: bool = True  # Block stream: aggregate whale outflows split across intermediates
 
 
 class LoggingConfig(BaseModel):
@@ -104,6 +128,8 @@ class Phase2Features(BaseModel):
     enabled: bool = False
     price_impact_tracking: bool = False  # Track price changes after whale tx
     historical_data_storage: bool = False  # Save to database
+    raw_retention_days: int = 90  # Raw transactions / detections kept (monthly partitions on PostgreSQL)
+    rollup_retention_days: int = 730  # Daily whale / exchange rollups kept
     impact_checkpoints: List[int] = Field(default_factory=lambda: [1, 6, 24])  # Hours after tx
 
 
@@ -136,9 +162,15 @@ class PerformanceConfig(BaseModel):
     """Performance settings."""
     max_concurrent_requests: int = 10
     request_timeout_seconds: int = 30
+    whale_check_timeout_seconds: int = 60  # Per-whale budget inside a concurrent sweep
+    onehop_signal_timeout_seconds: int = 10  # Per-signal budget in advanced one-hop
     cache_ttl_seconds: int = 300
     retry_attempts: int = 3
     retry_delay_seconds: int = 1
+    check_budget_per_minute: float = 0  # Adaptive scheduling: whale checks per minute (0 = same as the fixed schedule)
+    metrics_port: int = 0  # Prometheus /metrics endpoint on 127.0.0.1 (0 = disabled)
+    metrics_dump_seconds: int = 0  # Periodic JSON dump of call / span metrics (0 = disabled)
+    metrics_dump_path: str = "logs/metrics.json"
 
 
 class DevelopmentConfig(BaseModel):
@@ -127,7 +127,7 @@ class OnChainAgent:
         
         try:
             # Get total LP supply
-            total_supply = self.rpc_manager.get_token_total_supply(network, lp_token_address)
+            total_supply = await self.rpc_manager.get_token_total_supply(network, lp_token_address)
             details.append(f"Total LP supply: {total_supply}")
             
             # Get top LP holders
@@ -165,7 +165,7 @@ class OnChainAgent:
                     
                 else:
                     # Check if it's a contract
-                    is_contract = self.rpc_manager.is_contract(network, holder.address)
+                    is_contract = await self.rpc_manager.is_contract(network, holder.address)
                     
                     if is_contract:
                         unknown_contract_percentage += percentage
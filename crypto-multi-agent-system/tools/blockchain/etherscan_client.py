@@ -12,6 +12,8 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+from tools.blockchain.rate_limiter import AsyncRateLimiter
+
 load_dotenv()
 
 @dataclass
@@ -65,6 +67,8 @@ class EtherscanClient:
         self.api_keys = {}
         self.call_counts = {}
         self.last_call_time = {}
+        # Free tier: 5 calls/second per API key (one key per network)
+        self.rate_limiter = AsyncRateLimiter(default_rate=5, default_burst=5)
         
         if not mock_mode:
             self._load_api_keys()
@@ -83,18 +87,14 @@ class EtherscanClient:
             else:
                 self.logger.warning(f"⚠️ API ключ для {network} не найден в .env")
 
-    def _rate_limit(self, network: str):
+    async def _rate_limit(self, network: str):
         """
         Rate limiting for Etherscan APIs.
         Free tier: 5 calls/second, 100,000 calls/day
-        """
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time.get(network, 0)
         
-        # Минимальная задержка 200ms между вызовами (5 calls/sec)
-        min_interval = 0.2
-        if time_since_last < min_interval:
-            time.sleep(min_interval - time_since_last)
+        Token bucket per network: waits without blocking the event loop.
+        """
+        await self.rate_limiter.acquire(network)
         
         self.last_call_time[network] = time.time()
         self.call_counts[network] = self.call_counts.get(network, 0) + 1
@@ -119,7 +119,7 @@ class EtherscanClient:
         config = self.NETWORK_APIS[network]
         params["apikey"] = self.api_keys[network]
         
-        self._rate_limit(network)
+        await self._rate_limit(network)
         
         try:
             async with aiohttp.ClientSession() as session:
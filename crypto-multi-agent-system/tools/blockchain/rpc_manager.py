@@ -11,6 +11,8 @@ from web3 import Web3
 from web3.exceptions import Web3Exception, BlockNotFound, TransactionNotFound
 from dotenv import load_dotenv
 
+from tools.blockchain.rate_limiter import AsyncRateLimiter
+
 load_dotenv()
 
 class RPCManager:
@@ -79,6 +81,8 @@ class RPCManager:
         self.providers: Dict[str, Web3] = {}
         self.call_counts: Dict[str, int] = {}
         self.last_call_time: Dict[str, float] = {}
+        # Token bucket per network: 10 calls/second with burst of 10
+        self.rate_limiter = AsyncRateLimiter(default_rate=10, default_burst=10)
         
         if not mock_mode:
             self._initialize_providers()
@@ -110,15 +114,9 @@ class RPCManager:
             self.logger.warning("⚠️ Ни один RPC провайдер не настроен. Переключение в mock режим.")
             self.mock_mode = True
 
-    def _rate_limit(self, network: str):
-        """Simple rate limiting to avoid hitting RPC limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time.get(network, 0)
-        
-        # Минимальная задержка между вызовами (100ms)
-        min_interval = 0.1
-        if time_since_last < min_interval:
-            time.sleep(min_interval - time_since_last)
+    async def _rate_limit(self, network: str):
+        """Rate limiting to avoid hitting RPC limits (waits without blocking the event loop)."""
+        await self.rate_limiter.acquire(network)
         
         self.last_call_time[network] = time.time()
         self.call_counts[network] = self.call_counts.get(network, 0) + 1
@@ -142,7 +140,7 @@ class RPCManager:
             
         return self.providers[network]
 
-    def get_transaction_count(self, network: str, address: str) -> int:
+    async def get_transaction_count(self, network: str, address: str) -> int:
         """
         Get transaction count (nonce) for an address.
         
@@ -167,7 +165,7 @@ class RPCManager:
             raise ValueError(f"RPC провайдер для '{network}' недоступен")
         
         try:
-            self._rate_limit(network)
+            await self._rate_limit(network)
             
             # Проверяем что адрес корректный
             if not Web3.is_address(address):
@@ -183,7 +181,7 @@ class RPCManager:
             self.logger.error(f"❌ Ошибка получения количества транзакций для {address}: {e}")
             raise
 
-    def get_token_total_supply(self, network: str, token_address: str) -> int:
+    async def get_token_total_supply(self, network: str, token_address: str) -> int:
         """
         Get total supply of ERC-20 token.
         
@@ -203,7 +201,7 @@ class RPCManager:
             raise ValueError(f"RPC провайдер для '{network}' недоступен")
         
         try:
-            self._rate_limit(network)
+            await self._rate_limit(network)
             
             checksum_address = Web3.to_checksum_address(token_address)
             contract = provider.eth.contract(address=checksum_address, abi=self.ERC20_ABI)
@@ -217,7 +215,7 @@ class RPCManager:
             self.logger.error(f"❌ Ошибка получения total supply для {token_address}: {e}")
             raise
 
-    def get_token_balance(self, network: str, token_address: str, holder_address: str) -> int:
+    async def get_token_balance(self, network: str, token_address: str, holder_address: str) -> int:
         """
         Get token balance for specific holder.
         
@@ -243,7 +241,7 @@ class RPCManager:
             raise ValueError(f"RPC провайдер для '{network}' недоступен")
         
         try:
-            self._rate_limit(network)
+            await self._rate_limit(network)
             
             token_checksum = Web3.to_checksum_address(token_address)
             holder_checksum = Web3.to_checksum_address(holder_address)
@@ -258,7 +256,7 @@ class RPCManager:
             self.logger.error(f"❌ Ошибка получения баланса токена: {e}")
             raise
 
-    def is_contract(self, network: str, address: str) -> bool:
+    async def is_contract(self, network: str, address: str) -> bool:
         """
         Check if address is a smart contract (vs EOA wallet).
         
@@ -279,7 +277,7 @@ class RPCManager:
             raise ValueError(f"RPC провайдер для '{network}' недоступен")
         
         try:
-            self._rate_limit(network)
+            await self._rate_limit(network)
             
             checksum_address = Web3.to_checksum_address(address)
             code = provider.eth.get_code(checksum_address)
@@ -303,7 +301,8 @@ class RPCManager:
                 stats[network] = {
                     "connected": network in self.providers,
                     "api_calls": self.call_counts.get(network, 0),
-                    "last_call": self.last_call_time.get(network, 0)
+                    "last_call": self.last_call_time.get(network, 0),
+                    "rate_limit": self.rate_limiter.get_stats(network)
                 }
         
         if self.mock_mode:
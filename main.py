@@ -19,20 +19,33 @@ import logging
 import sys
 import signal
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from config.settings import Settings
 from src.core.web3_manager import Web3Manager
+from src.core.instrumentation import MetricsExporter, get_instrumentation
 from src.core.whale_config import WhaleConfig
 from src.analyzers.whale_analyzer import WhaleAnalyzer
 from src.analyzers.nonce_tracker import NonceTracker
 from src.analyzers.gas_correlator import GasCorrelator
 from src.analyzers.address_profiler import AddressProfiler
+from src.analyzers.flow_graph import FlowGraph
+from src.analyzers.split_dump import SplitDumpDetector
 from src.notifications.telegram_notifier import TelegramNotifier
 from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
+from src.monitors.block_stream import BlockStreamIngester
+from src.monitors.adaptive_scheduler import AdaptiveScheduler
+from src.storage.transaction_store import TransactionStore
+from src.storage.transaction_indexer import TransactionIndexer
+from src.storage.state_store import StateStore
+from src.storage.deposit_clusterer import DepositClusterer
+from src.storage.rollups import DailyRollups
+from src.storage.signal_metrics import SignalMetricsAggregator
+from src.storage.partitions import PartitionManager
+from models.db_connection import AsyncDatabaseManager, create_async_db_manager
 
 
 # Setup logging
@@ -118,6 +131,25 @@ class WhaleTrackerOrchestrator:
         self.address_profiler: Optional[AddressProfiler] = None
 
         self.watcher: Optional[SimpleWhaleWatcher] = None
+        self.block_stream: Optional[BlockStreamIngester] = None
+        self.flow_graph: Optional[FlowGraph] = None
+        self.split_detector: Optional[SplitDumpDetector] = None
+        self.check_scheduler: Optional[AdaptiveScheduler] = None
+
+        # Local transaction history (Phase 2 historical_data_storage)
+        self.db_manager: Optional[AsyncDatabaseManager] = None
+        self.transaction_store: Optional[TransactionStore] = None
+        self.transaction_indexer: Optional[TransactionIndexer] = None
+        self.deposit_clusterer: Optional[DepositClusterer] = None
+        self.rollups: Optional[DailyRollups] = None
+        self.partition_manager: Optional[PartitionManager] = None
+        self.signal_metrics: Optional[SignalMetricsAggregator] = None
+
+        # Persistent watcher state (balances, alert cooldowns)
+        self.state_store: Optional[StateStore] = None
+
+        # Call / span metrics endpoint (optional)
+        self.metrics_exporter: Optional[MetricsExporter] = None
 
         # Scheduler
         self.scheduler: Optional[AsyncIOScheduler] = None
@@ -144,12 +176,23 @@ class WhaleTrackerOrchestrator:
             # Initialize Web3Manager
             self.logger.info("Initializing Web3Manager...")
             mock_mode = self.settings.development.mock_data
-            self.web3_manager = Web3Manager(mock_mode=mock_mode)
+            blockchain = self.settings.blockchain
+            self.web3_manager = Web3Manager(
+                mock_mode=mock_mode,
+                provider_quotas={
+                    name: provider.requests_per_second
+                    for name, provider in blockchain.providers.items()
+                    if provider.requests_per_second
+                },
+                hedge_reads=blockchain.hedge_reads
+            )
             self.logger.info(f"Web3Manager initialized (mock_mode={mock_mode})")
 
             # Initialize WhaleConfig
             self.logger.info("Initializing WhaleConfig...")
             self.whale_config = WhaleConfig()
+            for path in self.settings.whale_monitoring.address_label_files:
+                self.whale_config.load_labels(path)
             self.logger.info(f"WhaleConfig initialized ({len(self.whale_config.all_addresses)} known addresses)")
 
             # Initialize WhaleAnalyzer
@@ -163,7 +206,14 @@ class WhaleTrackerOrchestrator:
 
             # Initialize TelegramNotifier
             self.logger.info("Initializing TelegramNotifier...")
-            self.notifier = TelegramNotifier()
+            telegram = self.settings.notifications.telegram
+            self.notifier = TelegramNotifier(
+                per_chat_interval_seconds=telegram.per_chat_interval_seconds,
+                global_rate_per_second=telegram.global_rate_per_second,
+                max_retries=telegram.max_retries,
+                max_queue_size=telegram.max_queue_size,
+                timeout_seconds=telegram.timeout
+            )
             self.logger.info("TelegramNotifier initialized")
 
             # Initialize Advanced One-Hop Analyzers
@@ -173,6 +223,51 @@ class WhaleTrackerOrchestrator:
             import os
             etherscan_api_key = os.getenv('ETHERSCAN_API_KEY')
 
+            # Database for persisted state and/or local transaction history
+            historical_data_storage = self.settings.phases.phase2_price_impact.historical_data_storage
+            persist_state = self.settings.whale_monitoring.persist_state
+            if historical_data_storage or persist_state:
+                self.db_manager = create_async_db_manager(settings=self.settings)
+
+            if persist_state:
+                self.state_store = StateStore(self.db_manager)
+                self.logger.info(f"State store initialized ({self.db_manager.config.db_type})")
+
+            # Initialize local transaction history (optional)
+            if historical_data_storage:
+                self.logger.info("Initializing transaction store...")
+                phase2 = self.settings.phases.phase2_price_impact
+                self.rollups = DailyRollups(
+                    db_manager=self.db_manager,
+                    whale_config=self.whale_config,
+                    whale_addresses=self.settings.WHALE_ADDRESSES
+                )
+                self.partition_manager = PartitionManager(
+                    db_manager=self.db_manager,
+                    retention_days=phase2.raw_retention_days,
+                    rollup_retention_days=phase2.rollup_retention_days
+                )
+                self.transaction_store = TransactionStore(
+                    self.db_manager,
+                    rollups=self.rollups,
+                    partitions=self.partition_manager
+                )
+                self.transaction_indexer = TransactionIndexer(
+                    store=self.transaction_store,
+                    whale_config=self.whale_config,
+                    etherscan_api_key=etherscan_api_key
+                )
+                self.web3_manager.transaction_store = self.transaction_store
+                self.signal_metrics = SignalMetricsAggregator(self.db_manager)
+                self.logger.info(f"Transaction store initialized ({self.db_manager.config.db_type})")
+
+                if self.settings.whale_monitoring.deposit_clustering_enabled:
+                    self.deposit_clusterer = DepositClusterer(
+                        db_manager=self.db_manager,
+                        whale_config=self.whale_config,
+                        exclude=self.settings.WHALE_ADDRESSES
+                    )
+
             # NonceTracker (Signal #3 - STRONGEST)
             self.nonce_tracker = NonceTracker(
                 web3_manager=self.web3_manager,
@@ -187,7 +282,9 @@ class WhaleTrackerOrchestrator:
 
             # AddressProfiler (Signal #5)
             self.address_profiler = AddressProfiler(
-                web3_manager=self.web3_manager
+                web3_manager=self.web3_manager,
+                db_manager=self.db_manager,
+                cache_ttl_seconds=self.settings.performance.cache_ttl_seconds
             )
             self.logger.info("AddressProfiler initialized")
 
@@ -202,14 +299,74 @@ class WhaleTrackerOrchestrator:
                 # Advanced one-hop analyzers
                 nonce_tracker=self.nonce_tracker,
                 gas_correlator=self.gas_correlator,
-                address_profiler=self.address_profiler
+                address_profiler=self.address_profiler,
+                # Concurrent sweep: a cycle must finish before the next one is due
+                max_concurrent_checks=self.settings.performance.max_concurrent_requests,
+                check_timeout_seconds=self.settings.performance.whale_check_timeout_seconds,
+                cycle_deadline_seconds=self.settings.CHECK_INTERVAL_MINUTES * 60,
+                prefetch_balances=True,
+                transaction_store=self.transaction_store,
+                signal_timeout_seconds=self.settings.performance.onehop_signal_timeout_seconds
             )
             self.logger.info("SimpleWhaleWatcher initialized with ADVANCED one-hop detection")
 
+            # Block stream: one block fetch serves every whale (optional)
+            if self.settings.whale_monitoring.block_stream_enabled:
+                intervals = self.settings.whale_monitoring.intervals
+                max_hops = self.settings.whale_monitoring.multihop_max_hops
+
+                # Multi-hop tracing: every streamed transfer goes into an in-memory graph
+                if max_hops >= 2:
+                    self.flow_graph = FlowGraph(
+                        retention_hours=intervals.multihop_window_hours * 2,
+                        max_hops=max_hops,
+                        max_window_hours=intervals.multihop_window_hours
+                    )
+                    self.logger.info(f"FlowGraph initialized (up to {max_hops} intermediates)")
+
+                # Split dumps: windowed exchange-inflow sums per whale outflow
+                if self.settings.whale_monitoring.split_dump_enabled:
+                    self.split_detector = SplitDumpDetector(
+                        share_threshold=self.settings.whale_monitoring.thresholds.split_dump_share,
+                        min_amount_eth=self.settings.MIN_AMOUNT_USD / 3500,  # Rough USD to ETH conversion
+                        window_hours=intervals.split_dump_window_hours
+                    )
+                    self.logger.info("SplitDumpDetector initialized")
+
+                self.block_stream = BlockStreamIngester(
+                    watcher=self.watcher,
+                    poll_interval_seconds=intervals.block_poll_seconds,
+                    indexer=self.transaction_indexer,
+                    flow_graph=self.flow_graph,
+                    multihop_window_hours=intervals.multihop_window_hours,
+                    split_detector=self.split_detector
+                )
+                self.logger.info("BlockStreamIngester initialized")
+
             # Log configuration
             whale_count = len(self.settings.WHALE_ADDRESSES)
             check_interval = self.settings.CHECK_INTERVAL_MINUTES
-            self.logger.info(f"Monitoring {whale_count} whales every {check_interval} minutes")
+
+            # Adaptive scheduling: per-whale intervals within the fixed schedule's RPC budget
+            if self.settings.whale_monitoring.adaptive_scheduling and whale_count:
+                intervals = self.settings.whale_monitoring.intervals
+                budget = (
+                    self.settings.performance.check_budget_per_minute
+                    or whale_count / check_interval
+                )
+                self.check_scheduler = AdaptiveScheduler(
+                    whale_addresses=self.settings.WHALE_ADDRESSES,
+                    checks_per_minute=budget,
+                    analyzer=self.analyzer,
+                    min_interval_seconds=intervals.min_check_seconds,
+                    max_interval_seconds=intervals.max_check_seconds
+                )
+                self.logger.info(
+                    f"Monitoring {whale_count} whales adaptively "
+                    f"({budget:.1f} checks/min, {intervals.min_check_seconds}s-{intervals.max_check_seconds}s per whale)"
+                )
+            else:
+                self.logger.info(f"Monitoring {whale_count} whales every {check_interval} minutes")
             self.logger.info(f"Minimum alert threshold: ${self.settings.MIN_AMOUNT_USD:,.0f}")
 
             self.logger.info("All components initialized successfully!")
@@ -218,6 +375,58 @@ class WhaleTrackerOrchestrator:
             self.logger.error(f"Error during setup: {str(e)}")
             raise
 
+    async def setup_storage(self) -> None:
+        """
+        Prepare persisted state and local transaction history (async part of setup).
+
+        Restores watcher balances and alert cooldowns, so the first cycle after
+        a restart detects instead of re-initializing. Creates tables, restores
+        indexer checkpoints, registers the configured whales, backfills
+        addresses that fell behind while we were down and makes the block
+        stream continue right after the backfilled head.
+        """
+        try:
+            if self.state_store:
+                await self.state_store.initialize()
+                self.watcher.last_balances = await self.state_store.load('last_balances')
+                self.watcher.last_alerts = await self.state_store.load('last_alerts')
+                self.watcher.last_checked_blocks = await self.state_store.load('last_checked_blocks')
+                self.logger.info(
+                    f"Watcher state restored ({len(self.watcher.last_balances)} balances, "
+                    f"{len(self.watcher.last_alerts)} cooldowns)"
+                )
+
+            if not self.transaction_indexer:
+                return
+
+            await self.transaction_store.initialize()
+            await self.partition_manager.ensure_upcoming()
+            await self.signal_metrics.initialize()
+            await self.transaction_indexer.load_checkpoints()
+
+            head = await self.web3_manager.get_block_number()
+            if head is None:
+                self.logger.warning("Could not get block number - indexer checkpoints not updated")
+                return
+
+            for whale_address in self.settings.WHALE_ADDRESSES:
+                await self.transaction_indexer.watch(whale_address, role='whale', start_block=head)
+
+            stored = await self.transaction_indexer.catch_up(head)
+            self.logger.info(f"Transaction store ready (backfilled {stored} transactions up to block {head})")
+
+            # Stream from the block after the checkpoints, not from its own first head:
+            # checkpoints only advance block by block, a gap would stall them
+            if self.block_stream:
+                self.block_stream.last_processed_block = head
+
+            # Rebuild learned deposit addresses from the whole table
+            await self.run_deposit_clustering()
+
+        except Exception as e:
+            self.logger.error(f"Error setting up transaction store: {str(e)}")
+            raise
+
     async def run_monitoring_cycle(self) -> None:
         """
         Run a single monitoring cycle.
@@ -241,6 +450,9 @@ class WhaleTrackerOrchestrator:
 
             # Run monitoring
             result = await self.watcher.monitor_all_whales()
+            if self.check_scheduler:
+                self.check_scheduler.record_results(result.get('results', []), self.watcher.last_balances)
+                self.check_scheduler.replan()
 
             # Log results
             self.logger.info("-" * 80)
@@ -248,6 +460,14 @@ class WhaleTrackerOrchestrator:
             self.logger.info(f"  Status: {result.get('status', 'unknown')}")
             self.logger.info(f"  Whales checked: {result.get('whales_checked', 0)}")
             self.logger.info(f"  Total alerts: {result.get('total_alerts', 0)}")
+            self.logger.info(
+                f"  Latency: avg {result.get('avg_latency_ms', 0):.0f}ms, "
+                f"max {result.get('max_latency_ms', 0):.0f}ms "
+                f"(timeouts: {result.get('timeouts', 0)}, "
+                f"deadline exceeded: {result.get('deadline_exceeded', 0)})"
+            )
+            if self.notifier:
+                self.logger.info(f"  Alert delivery (block -> Telegram ack): {self.notifier.format_latency()}")
             self.logger.info("-" * 80)
 
             # Detailed results
@@ -259,12 +479,123 @@ class WhaleTrackerOrchestrator:
             self.logger.error(f"Error in monitoring cycle: {str(e)}")
             self.logger.exception("Full traceback:")
 
+    async def run_adaptive_checks(self) -> None:
+        """
+        Check the whales whose adaptive check time has come.
+
+        Scheduled every adaptive_tick_seconds instead of the fixed monitoring
+        cycle; results feed back into the per-whale intervals.
+        """
+        if not self.watcher or not self.check_scheduler:
+            return
+
+        due: List[str] = []
+        try:
+            due = self.check_scheduler.due()
+            if not due:
+                return
+
+            result = await self.watcher.monitor_all_whales(due)
+            self.check_scheduler.record_results(result.get('results', []), self.watcher.last_balances)
+            self.check_scheduler.replan()
+
+            stats = self.check_scheduler.get_stats()
+            self.logger.info(
+                f"Adaptive checks: {len(due)} whales, {result.get('total_alerts', 0)} alerts, "
+                f"max latency {result.get('max_latency_ms', 0):.0f}ms "
+                f"(intervals {stats['min_interval_seconds']}s-{stats['max_interval_seconds']}s, "
+                f"{stats['checks_per_minute_planned']}/{stats['checks_per_minute_budget']:.1f} checks/min)"
+            )
+            if self.notifier and result.get('total_alerts'):
+                self.logger.info(f"  Alert delivery (block -> Telegram ack): {self.notifier.format_latency()}")
+
+        except Exception as e:
+            self.logger.error(f"Error in adaptive checks: {str(e)}")
+            self.logger.exception("Full traceback:")
+
+        finally:
+            # Whales taken by due() stay in flight until rescheduled - never drop them
+            stranded = self.check_scheduler.release(due)
+            if stranded:
+                self.logger.warning(f"Adaptive checks: {len(stranded)} whales without a result, retrying soon")
+
+    async def run_deposit_clustering(self) -> None:
+        """
+        Learn exchange deposit addresses from newly stored transactions.
+
+        Detected addresses go into the WhaleConfig index (and the block stream's
+        exchange set), so later transfers to them are direct exchange dumps.
+        """
+        if not self.deposit_clusterer:
+            return
+
+        published = await self.deposit_clusterer.run()
+        if published and self.block_stream:
+            self.block_stream.add_exchanges(published)
+
+    async def run_multihop_trace(self) -> None:
+        """
+        Trace recent whale outflows through the transfer graph.
+
+        Alerts on whale -> 2+ intermediates -> exchange paths (one-hop paths
+        are handled by the watcher's one-hop detectors).
+        """
+        if not self.block_stream or not self.flow_graph:
+            return
+
+        try:
+            alerts = await self.block_stream.trace_multi_hop()
+            if alerts:
+                self.logger.info(f"Multi-hop tracing: {len(alerts)} alerts ({self.flow_graph.edge_count:,} edges in graph)")
+        except Exception as e:
+            self.logger.error(f"Error in multi-hop tracing: {str(e)}")
+
+    async def run_retention(self) -> None:
+        """
+        Drop expired raw history and prepare upcoming partitions.
+
+        Rollups keep the aggregated history after raw rows are gone.
+        """
+        if not self.partition_manager:
+            return
+
+        await self.partition_manager.ensure_upcoming()
+        await self.partition_manager.apply_retention()
+
+    async def run_metrics_dump(self) -> None:
+        """
+        Write RPC / Etherscan call costs and pipeline span timings to a JSON file.
+        """
+        path = self.settings.performance.metrics_dump_path
+        try:
+            get_instrumentation().write_json(path)
+        except Exception as e:
+            self.logger.error(f"Error writing metrics to {path}: {str(e)}")
+
+    async def start_metrics_exporter(self) -> None:
+        """
+        Serve call / span metrics in Prometheus format (if metrics_port is set).
+        """
+        port = self.settings.performance.metrics_port
+        if not port:
+            return
+
+        self.metrics_exporter = MetricsExporter(port=port)
+        await self.metrics_exporter.start()
+
     def setup_scheduler(self) -> None:
         """
         Setup APScheduler for periodic monitoring.
 
         Schedules:
-        - Periodic whale monitoring every CHECK_INTERVAL_MINUTES
+        - Periodic whale monitoring every CHECK_INTERVAL_MINUTES, or (with
+          adaptive_scheduling) due-whale checks every adaptive_tick_seconds
+        - Block stream poll every block_poll_seconds (if block_stream_enabled)
+        - Multi-hop tracing every multihop_trace_seconds (if the block stream has a flow graph)
+        - Watcher state flush every state_flush_seconds (if persist_state)
+        - Deposit-address clustering every deposit_clustering_minutes (if enabled)
+        - Retention (partitions, raw rows, rollups) every retention_hours (if historical storage)
+        - Metrics JSON dump every metrics_dump_seconds (if enabled)
         """
         try:
             self.logger.info("Setting up scheduler...")
@@ -275,16 +606,106 @@ class WhaleTrackerOrchestrator:
             # Add monitoring job
             check_interval_minutes = self.settings.CHECK_INTERVAL_MINUTES
 
-            self.scheduler.add_job(
-                self.run_monitoring_cycle,
-                trigger=IntervalTrigger(minutes=check_interval_minutes),
-                id='whale_monitoring',
-                name='Whale Monitoring Cycle',
-                max_instances=1,  # Only one instance at a time
-                replace_existing=True
-            )
-
-            self.logger.info(f"Scheduled monitoring job: every {check_interval_minutes} minutes")
+            if self.check_scheduler:
+                tick_seconds = self.settings.whale_monitoring.intervals.adaptive_tick_seconds
+                self.scheduler.add_job(
+                    self.run_adaptive_checks,
+                    trigger=IntervalTrigger(seconds=tick_seconds),
+                    id='adaptive_checks',
+                    name='Adaptive Whale Checks',
+                    max_instances=1,
+                    replace_existing=True
+                )
+
+                self.logger.info(f"Scheduled adaptive checks: due whales every {tick_seconds}s")
+            else:
+                self.scheduler.add_job(
+                    self.run_monitoring_cycle,
+                    trigger=IntervalTrigger(minutes=check_interval_minutes),
+                    id='whale_monitoring',
+                    name='Whale Monitoring Cycle',
+                    max_instances=1,  # Only one instance at a time
+                    replace_existing=True
+                )
+
+                self.logger.info(f"Scheduled monitoring job: every {check_interval_minutes} minutes")
+
+            # Add block stream job
+            if self.block_stream:
+                self.scheduler.add_job(
+                    self.block_stream.poll_once,
+                    trigger=IntervalTrigger(seconds=self.block_stream.poll_interval_seconds),
+                    id='block_stream',
+                    name='Block Stream Poll',
+                    max_instances=1,
+                    replace_existing=True
+                )
+                self.logger.info(f"Scheduled block stream job: every {self.block_stream.poll_interval_seconds} seconds")
+
+            # Add multi-hop tracing job
+            if self.flow_graph:
+                trace_seconds = self.settings.whale_monitoring.intervals.multihop_trace_seconds
+                self.scheduler.add_job(
+                    self.run_multihop_trace,
+                    trigger=IntervalTrigger(seconds=trace_seconds),
+                    id='multihop_trace',
+                    name='Multi-Hop Tracing',
+                    max_instances=1,
+                    replace_existing=True
+                )
+                self.logger.info(f"Scheduled multi-hop tracing job: every {trace_seconds} seconds")
+
+            # Add state flush job (write-behind)
+            if self.state_store:
+                flush_seconds = self.settings.whale_monitoring.intervals.state_flush_seconds
+                self.scheduler.add_job(
+                    self.state_store.flush,
+                    trigger=IntervalTrigger(seconds=flush_seconds),
+                    id='state_flush',
+                    name='Watcher State Flush',
+                    max_instances=1,
+                    replace_existing=True
+                )
+                self.logger.info(f"Scheduled state flush job: every {flush_seconds} seconds")
+
+            # Add deposit-address clustering job
+            if self.deposit_clusterer:
+                clustering_minutes = self.settings.whale_monitoring.intervals.deposit_clustering_minutes
+                self.scheduler.add_job(
+                    self.run_deposit_clustering,
+                    trigger=IntervalTrigger(minutes=clustering_minutes),
+                    id='deposit_clustering',
+                    name='Exchange Deposit Clustering',
+                    max_instances=1,
+                    replace_existing=True
+                )
+                self.logger.info(f"Scheduled deposit clustering job: every {clustering_minutes} minutes")
+
+            # Add retention job (also creates next month's partition ahead of time)
+            if self.partition_manager:
+                retention_hours = self.settings.whale_monitoring.intervals.retention_hours
+                self.scheduler.add_job(
+                    self.run_retention,
+                    trigger=IntervalTrigger(hours=retention_hours),
+                    id='retention',
+                    name='Storage Retention',
+                    max_instances=1,
+                    replace_existing=True
+                )
+                self.logger.info(f"Scheduled retention job: every {retention_hours} hours")
+
+            # Add metrics dump job
+            dump_seconds = self.settings.performance.metrics_dump_seconds
+            if dump_seconds:
+                self.scheduler.add_job(
+                    self.run_metrics_dump,
+                    trigger=IntervalTrigger(seconds=dump_seconds),
+                    id='metrics_dump',
+                    name='Metrics Dump',
+                    max_instances=1,
+                    replace_existing=True
+                )
+                self.logger.info(f"Scheduled metrics dump job: every {dump_seconds} seconds")
             self.logger.info("Scheduler setup complete")
 
         except Exception as e:
@@ -364,6 +785,7 @@ async def main_async():
     try:
         # Initialize components
         orchestrator.setup()
+        await orchestrator.setup_storage()
 
         # Check if running in test mode
         if '--once' in sys.argv:
@@ -373,6 +795,7 @@ async def main_async():
             return
 
         # Setup and start scheduler
+        await orchestrator.start_metrics_exporter()
         orchestrator.setup_scheduler()
         orchestrator.start()
 
@@ -392,6 +815,14 @@ async def main_async():
         raise
     finally:
         orchestrator.stop()
+        if orchestrator.metrics_exporter:
+            await orchestrator.metrics_exporter.stop()
+        if orchestrator.notifier:
+            await orchestrator.notifier.close()
+        if orchestrator.state_store:
+            await orchestrator.state_store.close()
+        if orchestrator.db_manager:
+            await orchestrator.db_manager.close()
 
 
 def main():
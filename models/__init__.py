@@ -11,9 +11,13 @@ from models.database import (
     Base,
     OneHopDetection,
     Transaction,
+    IndexedAddress,
     IntermediateAddress,
     WhaleAlert,
-    SignalMetrics
+    SignalMetrics,
+    WatcherState,
+    WhaleDailyRollup,
+    ExchangeDailyRollup
 )
 
 from models.schemas import (
@@ -33,9 +37,13 @@ __all__ = [
     'Base',
     'OneHopDetection',
     'Transaction',
+    'IndexedAddress',
     'IntermediateAddress',
     'WhaleAlert',
     'SignalMetrics',
+    'WatcherState',
+    'WhaleDailyRollup',
+    'ExchangeDailyRollup',
 
     # Pydantic Schemas
     'TransactionCreate',
@@ -2,10 +2,15 @@
 SQLAlchemy ORM Models for Whale Tracker
 
 Database schema for one-hop detection, transactions, and analytics.
+
+On PostgreSQL `transactions` is range-partitioned by block_timestamp month
+(partitions are created by src/storage/partitions.PartitionManager); SQLite
+keeps a single table. Daily rollups per whale and per exchange are kept
+alongside for reporting reads that outlive raw retention.
 """
 
 from sqlalchemy import (
-    Column, Integer, String, BigInteger, Boolean, DateTime,
+    Column, Integer, String, BigInteger, Boolean, Date, DateTime,
     DECIMAL, Text, Index, ForeignKey, JSON
 )
 from sqlalchemy.ext.declarative import declarative_base
@@ -85,6 +90,7 @@ class OneHopDetection(Base):
     # Indexes for performance
     __table_args__ = (
         Index('idx_whale_intermediate', 'whale_address', 'intermediate_address'),
+        Index('idx_whale_time', 'whale_address', 'whale_tx_timestamp'),
         Index('idx_confidence', 'total_confidence'),
         Index('idx_timestamp', 'whale_tx_timestamp'),
         Index('idx_detection_method', 'detection_method'),
@@ -105,15 +111,18 @@ class Transaction(Base):
     Ethereum transaction data.
 
     Stores transaction details for analysis and correlation.
+
+    Partitioned by block_timestamp month on PostgreSQL, so the partition key
+    is part of the primary key.
     """
     __tablename__ = 'transactions'
 
-    # Primary key
+    # Primary key (tx_hash alone is unique; block_timestamp is the partition key)
     tx_hash = Column(String(66), primary_key=True)
+    block_timestamp = Column(DateTime, primary_key=True, index=True)
 
     # Block information
     block_number = Column(BigInteger, nullable=False, index=True)
-    block_timestamp = Column(DateTime, nullable=False, index=True)
     transaction_index = Column(Integer, nullable=True)
 
     # Transaction parties
@@ -152,6 +161,7 @@ class Transaction(Base):
         Index('idx_from_block', 'from_address', 'block_number'),
         Index('idx_to_block', 'to_address', 'block_number'),
         Index('idx_from_nonce', 'from_address', 'nonce'),
+        {'postgresql_partition_by': 'RANGE (block_timestamp)'},
     )
 
     def __repr__(self):
@@ -162,6 +172,42 @@ class Transaction(Base):
         )
 
 
+class IndexedAddress(Base):
+    """
+    Addresses tracked by the transaction indexer.
+
+    high_water_block is the last block up to which all transactions of the
+    address are stored in the transactions table (per-address checkpoint).
+    """
+    __tablename__ = 'indexed_addresses'
+
+    # Primary key
+    address = Column(String(42), primary_key=True)
+
+    # Why the address is indexed
+    role = Column(String(20), nullable=False, default='whale')  # 'whale', 'intermediate'
+    source_address = Column(String(42), nullable=True)  # Whale that funded an intermediate
+
+    # Checkpoint
+    high_water_block = Column(BigInteger, nullable=False, default=0)
+
+    # Metadata
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_indexed_role', 'role'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<IndexedAddress(address={self.address[:8]}..., "
+            f"role={self.role}, "
+            f"high_water={self.high_water_block})>"
+        )
+
+
 class IntermediateAddress(Base):
     """
     Intermediate address profiles.
@@ -296,7 +342,10 @@ class SignalMetrics(Base):
     """
     Signal performance metrics.
 
-    Tracks accuracy and performance of each detection signal.
+    Tracks accuracy and performance of each detection signal. One row per
+    signal and detection day, maintained incrementally by
+    src/storage/signal_metrics.SignalMetricsAggregator when detections are
+    labeled (confirmed / false_positive).
     """
     __tablename__ = 'signal_metrics'
 
@@ -312,22 +361,30 @@ class SignalMetrics(Base):
     positive_signals = Column(Integer, nullable=False, default=0)
     true_positives = Column(Integer, nullable=False, default=0)
     false_positives = Column(Integer, nullable=False, default=0)
+    true_negatives = Column(Integer, nullable=False, default=0, server_default='0')
+    false_negatives = Column(Integer, nullable=False, default=0, server_default='0')
 
     # Calculated metrics
     precision = Column(DECIMAL(5, 4), nullable=True)  # TP / (TP + FP)
+    recall = Column(DECIMAL(5, 4), nullable=True)  # TP / (TP + FN)
     signal_rate = Column(DECIMAL(5, 4), nullable=True)  # Positive / Total
 
-    # Average scores
+    # Average scores (sums kept so averages can be updated exactly)
+    confidence_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    positive_confidence_sum = Column(Integer, nullable=False, default=0, server_default='0')
     avg_confidence_when_positive = Column(DECIMAL(5, 2), nullable=True)
     avg_confidence_overall = Column(DECIMAL(5, 2), nullable=True)
 
+    # Confidence histogram: {'confirmed': [10 buckets], 'false_positive': [10 buckets]}
+    confidence_histogram = Column(JSON, nullable=True)
+
     # Metadata
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Indexes
     __table_args__ = (
-        Index('idx_signal_date', 'signal_name', 'date'),
+        Index('idx_signal_date', 'signal_name', 'date', unique=True),
     )
 
     def __repr__(self):
@@ -336,3 +393,87 @@ class SignalMetrics(Base):
             f"date={self.date.date()}, "
             f"precision={self.precision})>"
         )
+
+
+class WatcherState(Base):
+    """
+    Persistent watcher state (cooldowns, last balances, alert dedup keys).
+
+    One row per (namespace, key); value is JSON-encoded. Lets a restarted
+    watcher resume without an initialization sweep or repeated alerts.
+    """
+    __tablename__ = 'watcher_state'
+
+    # Primary key
+    namespace = Column(String(50), primary_key=True)  # 'last_balances', 'last_alerts', ...
+    key = Column(String(200), primary_key=True)
+
+    # JSON-encoded value
+    value = Column(Text, nullable=False)
+
+    # Metadata
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<WatcherState(namespace={self.namespace}, key={self.key[:16]})>"
+
+
+class WhaleDailyRollup(Base):
+    """
+    Per-whale daily activity, maintained incrementally as transactions are stored.
+
+    Survives raw-transaction retention; counts and volumes are additive.
+    """
+    __tablename__ = 'whale_daily_rollups'
+
+    # Primary key
+    day = Column(Date, primary_key=True)
+    whale_address = Column(String(42), primary_key=True)
+
+    # Outgoing / incoming transfers
+    tx_out_count = Column(Integer, nullable=False, default=0)
+    tx_in_count = Column(Integer, nullable=False, default=0)
+    eth_out = Column(DECIMAL(36, 18), nullable=False, default=0)
+    eth_in = Column(DECIMAL(36, 18), nullable=False, default=0)
+
+    # Direct transfers to exchanges (dumps)
+    exchange_tx_count = Column(Integer, nullable=False, default=0)
+    exchange_eth = Column(DECIMAL(36, 18), nullable=False, default=0)
+
+    # Metadata
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_whale_rollup_address_day', 'whale_address', 'day'),
+    )
+
+    def __repr__(self):
+        return f"<WhaleDailyRollup(day={self.day}, whale={self.whale_address[:8]}..., out={self.eth_out})>"
+
+
+class ExchangeDailyRollup(Base):
+    """
+    Per-exchange daily flows of the stored (watched) transactions.
+    """
+    __tablename__ = 'exchange_daily_rollups'
+
+    # Primary key
+    day = Column(Date, primary_key=True)
+    exchange = Column(String(50), primary_key=True)  # Exchange label, e.g. 'binance'
+
+    # Flows
+    inflow_tx_count = Column(Integer, nullable=False, default=0)
+    inflow_eth = Column(DECIMAL(36, 18), nullable=False, default=0)
+    outflow_tx_count = Column(Integer, nullable=False, default=0)
+    outflow_eth = Column(DECIMAL(36, 18), nullable=False, default=0)
+
+    # Inflows from monitored whales
+    whale_inflow_tx_count = Column(Integer, nullable=False, default=0)
+    whale_inflow_eth = Column(DECIMAL(36, 18), nullable=False, default=0)
+
+    # Metadata
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ExchangeDailyRollup(day={self.day}, exchange={self.exchange}, in={self.inflow_eth})>"
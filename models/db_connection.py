@@ -1,12 +1,13 @@
 """
 Database Connection Manager
 
-Modular, abstracted database connection handling for PostgreSQL.
+Modular, abstracted database connection handling for PostgreSQL and SQLite.
 Supports both sync and async operations.
 """
 
 import logging
-from typing import Optional, AsyncGenerator
+from pathlib import Path
+from typing import Optional, AsyncGenerator, Dict, Any
 from contextlib import asynccontextmanager, contextmanager
 
 from sqlalchemy import create_engine, Engine, event, pool
@@ -19,6 +20,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import sessionmaker, Session
 
 from models.database import Base
+from models.repository import Repository
 
 
 class DatabaseConfig:
@@ -37,7 +39,9 @@ class DatabaseConfig:
         password: str = '',
         pool_size: int = 5,
         max_overflow: int = 10,
-        echo: bool = False
+        echo: bool = False,
+        db_type: str = 'postgresql',
+        sqlite_path: str = 'data/database/whale_tracker.db'
     ):
         """
         Initialize database configuration.
@@ -51,6 +55,8 @@ class DatabaseConfig:
             pool_size: Connection pool size
             max_overflow: Max overflow connections
             echo: Echo SQL queries (for debugging)
+            db_type: 'postgresql' or 'sqlite'
+            sqlite_path: SQLite database file (':memory:' for in-memory)
         """
         self.host = host
         self.port = port
@@ -60,9 +66,18 @@ class DatabaseConfig:
         self.pool_size = pool_size
         self.max_overflow = max_overflow
         self.echo = echo
+        self.db_type = db_type.lower()
+        self.sqlite_path = sqlite_path
+
+    @property
+    def is_sqlite(self) -> bool:
+        """True if configured for SQLite"""
+        return self.db_type == 'sqlite'
 
     def get_sync_url(self) -> str:
         """Get synchronous database URL"""
+        if self.is_sqlite:
+            return f"sqlite:///{self.sqlite_path}"
         return (
             f"postgresql://{self.user}:{self.password}@"
             f"{self.host}:{self.port}/{self.database}"
@@ -70,11 +85,44 @@ class DatabaseConfig:
 
     def get_async_url(self) -> str:
         """Get asynchronous database URL"""
+        if self.is_sqlite:
+            return f"sqlite+aiosqlite:///{self.sqlite_path}"
         return (
             f"postgresql+asyncpg://{self.user}:{self.password}@"
             f"{self.host}:{self.port}/{self.database}"
         )
 
+    def get_engine_kwargs(self, async_mode: bool = False) -> Dict[str, Any]:
+        """
+        Get engine keyword arguments for the configured backend.
+
+        SQLite has no server-side connection pool to size; an in-memory
+        database must share a single connection (StaticPool) or every new
+        connection would see an empty database.
+
+        Args:
+            async_mode: Arguments for create_async_engine
+
+        Returns:
+            Dict of engine kwargs
+        """
+        if self.is_sqlite:
+            kwargs: Dict[str, Any] = {'echo': self.echo}
+            if self.sqlite_path == ':memory:':
+                kwargs['poolclass'] = pool.StaticPool
+                kwargs['connect_args'] = {'check_same_thread': False}
+            else:
+                Path(self.sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+            return kwargs
+
+        return {
+            'poolclass': pool.AsyncAdaptedQueuePool if async_mode else pool.QueuePool,
+            'pool_size': self.pool_size,
+            'max_overflow': self.max_overflow,
+            'echo': self.echo,
+            'pool_pre_ping': True  # Verify connections before using
+        }
+
     @classmethod
     def from_env(cls, settings) -> 'DatabaseConfig':
         """
@@ -94,7 +142,9 @@ class DatabaseConfig:
             password=getattr(settings, 'DB_PASSWORD', ''),
             pool_size=getattr(settings, 'DB_POOL_SIZE', 5),
             max_overflow=getattr(settings, 'DB_MAX_OVERFLOW', 10),
-            echo=getattr(settings, 'DB_ECHO', False)
+            echo=getattr(settings, 'DB_ECHO', False),
+            db_type=getattr(settings, 'DB_TYPE', 'postgresql'),
+            sqlite_path=getattr(settings, 'SQLITE_PATH', 'data/database/whale_tracker.db')
         )
 
 
@@ -129,11 +179,7 @@ class DatabaseManager:
 
             self._engine = create_engine(
                 self.config.get_sync_url(),
-                poolclass=pool.QueuePool,
-                pool_size=self.config.pool_size,
-                max_overflow=self.config.max_overflow,
-                echo=self.config.echo,
-                pool_pre_ping=True  # Verify connections before using
+                **self.config.get_engine_kwargs()
             )
 
             # Setup connection event listeners
@@ -232,6 +278,9 @@ class AsyncDatabaseManager:
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[async_sessionmaker] = None
 
+        # Buffered bulk writers (flushed on close)
+        self.repository = Repository(self)
+
     def init_engine(self) -> AsyncEngine:
         """
         Initialize asynchronous engine.
@@ -244,11 +293,7 @@ class AsyncDatabaseManager:
 
             self._engine = create_async_engine(
                 self.config.get_async_url(),
-                poolclass=pool.AsyncAdaptedQueuePool,
-                pool_size=self.config.pool_size,
-                max_overflow=self.config.max_overflow,
-                echo=self.config.echo,
-                pool_pre_ping=True
+                **self.config.get_engine_kwargs(async_mode=True)
             )
 
         return self._engine
@@ -315,7 +360,9 @@ class AsyncDatabaseManager:
         self.logger.warning("All database tables dropped")
 
     async def close(self):
-        """Close async database connections"""
+        """Flush buffered writes and close async database connections"""
+        await self.repository.close()
+
         if self._engine:
             self.logger.info("Closing async database connections...")
             await self._engine.dispose()
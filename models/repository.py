@@ -0,0 +1,393 @@
+"""
+Bulk Write Repository
+
+Batched writes on top of AsyncDatabaseManager:
+
+- bulk_upsert(): one INSERT ... ON CONFLICT DO UPDATE / DO NOTHING statement
+  per batch (executemany) instead of one ORM add/merge per row. Uses the
+  SQLite / PostgreSQL insert dialects; other databases get a plain insert.
+- BulkWriter: per-table write buffer. Rows are coalesced by primary key and
+  flushed when `batch_size` rows are pending or `flush_interval_seconds` after
+  the first pending row, whichever comes first. When `max_pending` rows are
+  buffered, add() waits for the flush (backpressure) instead of growing
+  without bound.
+- Repository: the writers of one database manager. AsyncDatabaseManager
+  flushes it on close(), so buffered rows survive a graceful shutdown.
+
+Usage:
+    writer = db_manager.repository.writer(IntermediateAddress)
+    await writer.add({'address': ..., 'profile_type': ..., ...})
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, TYPE_CHECKING
+
+from pydantic import BaseModel
+from sqlalchemy import insert as generic_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+if TYPE_CHECKING:
+    from models.db_connection import AsyncDatabaseManager
+
+
+logger = logging.getLogger(__name__)
+
+_DIALECT_INSERTS = {
+    'sqlite': sqlite_insert,
+    'postgresql': postgresql_insert,
+}
+
+# Columns an upsert never overwrites by default
+_INSERT_ONLY_COLUMNS = frozenset({'created_at'})
+
+
+def _as_dict(row: Any) -> Dict[str, Any]:
+    """Row as a column dict (Pydantic schemas are dumped)."""
+    if isinstance(row, BaseModel):
+        return row.model_dump(exclude_unset=True)
+    return dict(row)
+
+
+async def bulk_upsert(
+    session,
+    model,
+    rows: Sequence[Dict[str, Any]],
+    update_columns: Optional[Iterable[str]] = None,
+    conflict_columns: Optional[Iterable[str]] = None,
+    returning: Optional[str] = None,
+    increment_columns: Iterable[str] = ()
+) -> Any:
+    """
+    Insert many rows with one statement per column set.
+
+    Args:
+        session: AsyncSession
+        model: ORM model class
+        rows: Column dicts (or Pydantic schemas)
+        update_columns: Columns overwritten on conflict. None = every supplied
+                        column except the conflict key and created_at; empty =
+                        keep existing rows (DO NOTHING)
+        conflict_columns: Unique key (default: primary key)
+        returning: Column to return for inserted/updated rows
+        increment_columns: Counters added to the existing value on conflict
+                           (column = column + excluded.column)
+
+    Returns:
+        List of `returning` values, else number of affected rows (-1 if unknown)
+    """
+    table = model.__table__
+    conflict_columns = list(conflict_columns or (column.name for column in table.primary_key))
+    dialect_insert = _DIALECT_INSERTS.get(session.bind.dialect.name)
+
+    # executemany needs the same keys in every row
+    groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for row in rows:
+        row = _as_dict(row)
+        groups.setdefault(frozenset(row), []).append(row)
+
+    increment_columns = list(increment_columns)
+    returned: List[Any] = []
+    affected = 0
+
+    for keys, group in groups.items():
+        keyed = dialect_insert is not None and all(column in keys for column in conflict_columns)
+        stmt = (dialect_insert or generic_insert)(table)
+
+        if keyed:
+            if update_columns is None:
+                columns = [
+                    key for key in keys
+                    if key not in conflict_columns and key not in _INSERT_ONLY_COLUMNS and key not in increment_columns
+                ]
+            else:
+                columns = list(update_columns)
+
+            if columns or increment_columns:
+                set_ = {column: stmt.excluded[column] for column in columns}
+                for column in increment_columns:
+                    set_[column] = table.c[column] + stmt.excluded[column]
+                # ON CONFLICT DO UPDATE bypasses Column(onupdate=...)
+                for column in table.columns:
+                    if column.onupdate is not None and column.name not in set_ and column.onupdate.is_callable:
+                        set_[column.name] = column.onupdate.arg(None)
+                stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=set_)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+        if returning is not None:
+            result = await session.execute(stmt.returning(table.c[returning]), group)
+            returned.extend(result.scalars().all())
+        else:
+            result = await session.execute(stmt, group)
+            affected = -1 if affected < 0 or result.rowcount < 0 else affected + result.rowcount
+
+    return returned if returning is not None else affected
+
+
+class BulkWriter:
+    """
+    Buffered, batched writes into one table.
+    """
+
+    def __init__(
+        self,
+        db_manager: 'AsyncDatabaseManager',
+        model,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        max_pending: int = 10000,
+        update_columns: Optional[Iterable[str]] = None,
+        conflict_columns: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize BulkWriter.
+
+        Args:
+            db_manager: Async database manager
+            model: ORM model class
+            batch_size: Pending rows that trigger a flush
+            flush_interval_seconds: Maximum time a row waits in the buffer
+            max_pending: Pending rows at which add() waits for the database
+            update_columns: Columns overwritten on conflict (see bulk_upsert)
+            conflict_columns: Unique key (default: primary key)
+        """
+        self.logger = logging.getLogger(f"{self.__class__.__name__}[{model.__tablename__}]")
+        self.db_manager = db_manager
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max(max_pending, batch_size)
+        self.update_columns = None if update_columns is None else tuple(update_columns)
+        self.conflict_columns = list(
+            conflict_columns or (column.name for column in model.__table__.primary_key)
+        )
+
+        # Key -> row; rows with the same key are coalesced until written
+        self._pending: Dict[Hashable, Dict[str, Any]] = {}
+        # Batch of the running flush (still readable until committed)
+        self._writing: Dict[Hashable, Dict[str, Any]] = {}
+        self._sequence = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.Task] = None
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_coalesced = 0
+        self.rows_dropped = 0
+        self.flush_errors = 0
+        self.backpressure_waits = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _key(self, row: Dict[str, Any]) -> Hashable:
+        """Conflict key of a row (unique sequence number if it has none)."""
+        try:
+            return tuple(row[column] for column in self.conflict_columns)
+        except KeyError:
+            self._sequence += 1
+            return ('__row__', self._sequence)
+
+    def get_pending(self, *key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Buffered row with a conflict key (read-your-writes before the flush).
+
+        Args:
+            *key: Conflict column values, e.g. the primary key
+        """
+        row = self._pending.get(key)
+        return row if row is not None else self._writing.get(key)
+
+    async def add(self, row: Any) -> None:
+        """
+        Buffer one row.
+
+        Args:
+            row: Column dict or Pydantic schema
+        """
+        await self.add_many([row])
+
+    async def add_many(self, rows: Iterable[Any]) -> None:
+        """
+        Buffer rows; waits for a flush while the buffer is full.
+
+        Args:
+            rows: Column dicts or Pydantic schemas
+        """
+        for row in rows:
+            row = _as_dict(row)
+            key = self._key(row)
+            existing = self._pending.get(key)
+
+            if existing is None:
+                self._pending[key] = row
+            else:
+                self.rows_coalesced += 1
+                if self.update_columns is None or self.update_columns:
+                    existing.update(row)
+
+            if len(self._pending) >= self.max_pending:
+                # Backpressure: the producer waits until the database caught up
+                self.backpressure_waits += 1
+                await self.flush()
+            elif len(self._pending) >= self.batch_size:
+                self._start_flush()
+
+        if self._pending and (self._timer is None or self._timer.done()):
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    def _start_flush(self) -> None:
+        """Flush in the background unless a flush is already running."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    async def _flush_later(self) -> None:
+        """Flush once the oldest pending row waited flush_interval_seconds."""
+        await asyncio.sleep(self.flush_interval_seconds)
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write all pending rows in one transaction.
+
+        Returns:
+            Number of rows written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            self._writing = batch
+
+            try:
+                async with self.db_manager.session() as session:
+                    await bulk_upsert(
+                        session,
+                        self.model,
+                        list(batch.values()),
+                        update_columns=self.update_columns,
+                        conflict_columns=self.conflict_columns
+                    )
+
+            except Exception as e:
+                self._writing = {}
+                self.flush_errors += 1
+                self.logger.error(f"Error writing {len(batch)} rows: {e}")
+
+                # Requeue in front of rows added meanwhile (newer values win)
+                newer, self._pending = self._pending, batch
+                for key, row in newer.items():
+                    older = batch.get(key)
+                    if older is None:
+                        batch[key] = row
+                    elif self.update_columns is None or self.update_columns:
+                        older.update(row)
+
+                overflow = len(self._pending) - self.max_pending
+                if overflow > 0:
+                    for key in list(self._pending)[:overflow]:
+                        del self._pending[key]
+                    self.rows_dropped += overflow
+                    self.logger.error(f"Write buffer full - dropped {overflow} oldest rows")
+                return 0
+
+            self._writing = {}
+            self.flushes += 1
+            self.rows_written += len(batch)
+            return len(batch)
+
+    async def close(self) -> int:
+        """
+        Stop the timer and write everything that is pending (call on shutdown).
+
+        Returns:
+            Number of rows written by the final flush
+        """
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        return await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get write statistics."""
+        return {
+            'pending': len(self._pending),
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'rows_coalesced': self.rows_coalesced,
+            'rows_dropped': self.rows_dropped,
+            'flush_errors': self.flush_errors,
+            'backpressure_waits': self.backpressure_waits
+        }
+
+
+class Repository:
+    """
+    Bulk writes of one AsyncDatabaseManager (one BulkWriter per table).
+    """
+
+    def __init__(self, db_manager: 'AsyncDatabaseManager'):
+        """
+        Initialize Repository.
+
+        Args:
+            db_manager: Async database manager
+        """
+        self.db_manager = db_manager
+        self.writers: Dict[str, BulkWriter] = {}
+
+    def writer(self, model, **kwargs) -> BulkWriter:
+        """
+        Get the buffered writer of a table (created on first use).
+
+        Args:
+            model: ORM model class
+            **kwargs: BulkWriter options (only used when the writer is created)
+        """
+        writer = self.writers.get(model.__tablename__)
+        if writer is None:
+            writer = self.writers[model.__tablename__] = BulkWriter(self.db_manager, model, **kwargs)
+        return writer
+
+    async def upsert(
+        self,
+        model,
+        rows: Sequence[Any],
+        update_columns: Optional[Iterable[str]] = None,
+        conflict_columns: Optional[Iterable[str]] = None,
+        returning: Optional[str] = None,
+        increment_columns: Iterable[str] = ()
+    ) -> Any:
+        """
+        Unbuffered bulk upsert in its own transaction (see bulk_upsert).
+        """
+        if not rows:
+            return [] if returning is not None else 0
+
+        async with self.db_manager.session() as session:
+            return await bulk_upsert(
+                session, model, rows, update_columns, conflict_columns, returning, increment_columns
+            )
+
+    async def flush(self) -> int:
+        """Flush all writers."""
+        written = 0
+        for writer in list(self.writers.values()):
+            written += await writer.flush()
+        return written
+
+    async def close(self) -> None:
+        """Write all pending rows (shutdown hook)."""
+        for writer in list(self.writers.values()):
+            written = await writer.close()
+            if written:
+                logger.info(f"Flushed {written} pending '{writer.model.__tablename__}' rows on shutdown")
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Statistics per table."""
+        return {table: writer.get_stats() for table, writer in self.writers.items()}
@@ -352,9 +352,12 @@ class SignalMetricsCreate(SignalMetricsBase):
     positive_signals: int = Field(0, ge=0)
     true_positives: int = Field(0, ge=0)
     false_positives: int = Field(0, ge=0)
+    true_negatives: int = Field(0, ge=0)
+    false_negatives: int = Field(0, ge=0)
 
     # Calculated metrics
     precision: Optional[Decimal] = Field(None, ge=0, le=1)
+    recall: Optional[Decimal] = Field(None, ge=0, le=1)
     signal_rate: Optional[Decimal] = Field(None, ge=0, le=1)
 
     # Average scores
@@ -379,14 +382,18 @@ class SignalMetricsResponse(SignalMetricsBase):
     positive_signals: int
     true_positives: int
     false_positives: int
+    true_negatives: int
+    false_negatives: int
 
     # Calculated metrics
     precision: Optional[Decimal]
+    recall: Optional[Decimal]
     signal_rate: Optional[Decimal]
 
     # Average scores
     avg_confidence_when_positive: Optional[Decimal]
     avg_confidence_overall: Optional[Decimal]
+    confidence_histogram: Optional[Dict[str, List[int]]]
 
     # Metadata
     created_at: datetime
@@ -6,5 +6,9 @@ Statistical analysis modules for whale transaction patterns.
 """
 
 from .whale_analyzer import WhaleAnalyzer, TransactionStats, AnomalyResult, get_analyzer
+from .whale_history import WhaleHistory
+from .flow_graph import FlowGraph, FlowPath
+from .split_dump import SplitDumpDetector, SplitEpisode
 
-__all__ = ['WhaleAnalyzer', 'TransactionStats', 'AnomalyResult', 'get_analyzer']
+__all__ = ['WhaleAnalyzer', 'TransactionStats', 'AnomalyResult', 'get_analyzer', 'WhaleHistory', 'FlowGraph', 'FlowPath',
+           'SplitDumpDetector', 'SplitEpisode']
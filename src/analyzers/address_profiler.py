@@ -8,13 +8,27 @@ Profiles intermediate addresses to determine if they're:
 - Reused intermediate (used for multiple whale->exchange cycles)
 
 Confidence impact: +70 to +95 depending on profile type
+
+Profiles are cached per (address, block bucket) with a TTL and LRU eviction,
+and persisted to the `intermediate_addresses` table when a database manager
+is given, so an intermediate receiving many whale transfers is profiled once.
+Profile writes are buffered and batched (models/repository.py BulkWriter).
+
+Chain reads go through Web3Manager's async JSON-RPC methods (provider pool:
+latency routing, quotas, failover), so a cache miss doesn't stall the event
+loop for every other coroutine.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Union
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 
+from models.database import IntermediateAddress
+
 
 @dataclass
 class AddressProfile:
@@ -48,20 +62,44 @@ class AddressProfiler:
     used specifically for this one-hop transfer.
     """
 
-    def __init__(self, web3_manager=None):
+    def __init__(self,
+                 web3_manager=None,
+                 db_manager=None,
+                 cache_ttl_seconds: int = 300,
+                 cache_max_entries: int = 10000,
+                 block_bucket_size: int = 300):
         """
         Initialize address profiler.
 
         Args:
             web3_manager: Web3Manager instance for blockchain queries
+            db_manager: AsyncDatabaseManager for persisting profiles (optional)
+            cache_ttl_seconds: How long a profile is reused
+            cache_max_entries: Max cached profiles (least recently used evicted)
+            block_bucket_size: Whale tx blocks within one bucket share a profile
+                (300 blocks ~ 1 hour)
         """
         self.logger = logging.getLogger(__name__)
         self.web3_manager = web3_manager
+        self.db_manager = db_manager
 
         # Thresholds
         self.FRESH_THRESHOLD_HOURS = 24
         self.VERY_FRESH_THRESHOLD_HOURS = 1
 
+        # Profile cache: (address, bucket) -> (profile, cached_at monotonic)
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        self.block_bucket_size = block_bucket_size
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[AddressProfile, float]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], asyncio.Task] = {}
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.db_hits = 0
+        self.coalesced_requests = 0
+        self.evictions = 0
+
         self.logger.info("AddressProfiler initialized")
 
     async def profile_address(self,
@@ -69,6 +107,66 @@ class AddressProfiler:
                              whale_tx_block: int,
                              whale_tx_timestamp: Optional[datetime] = None) -> AddressProfile:
         """
+        Get profile of intermediate address (cached).
+
+        Lookup order: in-memory cache, in-flight fetch for the same key,
+        persisted profile, fresh profile from the blockchain.
+
+        Args:
+            address: Address to profile
+            whale_tx_block: Block number of whale transaction
+            whale_tx_timestamp: Timestamp of whale transaction
+
+        Returns:
+            AddressProfile with all signals analyzed
+        """
+        key = (address.lower(), whale_tx_block // self.block_bucket_size)
+
+        cached = self._get_cached(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        # Collapse concurrent requests for the same key into one fetch
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced_requests += 1
+        else:
+            self.cache_misses += 1
+            task = asyncio.create_task(
+                self._load_profile(key, address, whale_tx_block, whale_tx_timestamp)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield: one cancelled caller must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _load_profile(self,
+                            key: Tuple[str, int],
+                            address: str,
+                            whale_tx_block: int,
+                            whale_tx_timestamp: Optional[datetime]) -> AddressProfile:
+        """Load profile from database or blockchain and cache it."""
+        profile = await self._load_persisted(key)
+        if profile is not None:
+            self.db_hits += 1
+            self._put_cached(key, profile)
+            return profile
+
+        profile = await self._build_profile(address, whale_tx_block, whale_tx_timestamp)
+
+        if profile.profile_type != 'error':
+            self._put_cached(key, profile)
+            await self._persist(key, profile)
+
+        return profile
+
+    async def _build_profile(self,
+                             address: str,
+                             whale_tx_block: int,
+                             whale_tx_timestamp: Optional[datetime] = None) -> AddressProfile:
+        """
         Create comprehensive profile of intermediate address.
 
         Checks multiple signals:
@@ -173,7 +271,7 @@ class AddressProfiler:
 
             # For MVP: Use transaction count as proxy
             # If tx count is very low (< 5), likely fresh
-            tx_count = self.web3_manager.w3.eth.get_transaction_count(address)
+            tx_count = await self._tx_count(address)
 
             if tx_count <= 1:
                 # Likely brand new (whale tx was first or second)
@@ -223,10 +321,7 @@ class AddressProfiler:
                 return {'was_empty': False, 'confidence': 0}
 
             # Get balance at block before whale transaction
-            balance = self.web3_manager.w3.eth.get_balance(
-                address,
-                block_identifier=whale_tx_block - 1
-            )
+            balance = await self._balance_wei(address, block=whale_tx_block - 1)
 
             if balance == 0:
                 return {
@@ -269,10 +364,10 @@ class AddressProfiler:
                 return {'is_single_use': False, 'confidence': 0, 'tx_count': None}
 
             # Get current transaction count
-            tx_count = self.web3_manager.w3.eth.get_transaction_count(address)
+            tx_count = await self._tx_count(address)
 
             # Get current balance
-            balance = self.web3_manager.w3.eth.get_balance(address)
+            balance = await self._balance_wei(address)
 
             # Perfect burner pattern: exactly 2 txs, empty now
             if tx_count == 2 and balance < 0.01 * 10**18:
@@ -325,7 +420,7 @@ class AddressProfiler:
                 return {'is_reused': False, 'confidence': 0, 'cycle_count': None}
 
             # Get transaction count
-            tx_count = self.web3_manager.w3.eth.get_transaction_count(address)
+            tx_count = await self._tx_count(address)
 
             # High transaction count suggests reuse
             # Each cycle = 2 txs (in + out), so N cycles = 2N txs
@@ -349,6 +444,20 @@ class AddressProfiler:
             self.logger.error(f"Error checking reuse pattern: {e}")
             return {'is_reused': False, 'confidence': 0, 'cycle_count': None}
 
+    async def _tx_count(self, address: str) -> int:
+        """Current transaction count; raises if the RPC call failed."""
+        tx_count = await self.web3_manager.get_transaction_count(address)
+        if tx_count is None:
+            raise RuntimeError(f"eth_getTransactionCount failed for {address}")
+        return tx_count
+
+    async def _balance_wei(self, address: str, block: Union[int, str] = 'latest') -> int:
+        """Balance in Wei (at `block`); raises if the RPC call failed."""
+        balance = await self.web3_manager.get_balance_wei(address, block=block)
+        if balance is None:
+            raise RuntimeError(f"eth_getBalance failed for {address} at {block}")
+        return balance
+
     def _determine_profile_type(self,
                                 fresh_result: Dict,
                                 empty_result: Dict,
@@ -397,3 +506,114 @@ class AddressProfiler:
 
         # Normal/established address
         return ('normal', 0)
+
+    # ==================== Profile cache ====================
+
+    def _get_cached(self, key: Tuple[str, int]) -> Optional[AddressProfile]:
+        """Get unexpired cached profile and mark it recently used."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        profile, cached_at = entry
+        if time.monotonic() - cached_at > self.cache_ttl_seconds:
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return profile
+
+    def _put_cached(self, key: Tuple[str, int], profile: AddressProfile, age_seconds: float = 0.0):
+        """Cache profile, evicting least recently used entries over the limit."""
+        self._cache[key] = (profile, time.monotonic() - age_seconds)
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    async def _load_persisted(self, key: Tuple[str, int]) -> Optional[AddressProfile]:
+        """
+        Load profile from intermediate_addresses if it was made for the same
+        block bucket and is still within TTL.
+        """
+        if not self.db_manager:
+            return None
+
+        address, bucket = key
+        pending = self._profile_writer().get_pending(address)
+        if pending is not None:
+            # Written recently, still in the write buffer
+            row = IntermediateAddress(**pending)
+        else:
+            try:
+                async with self.db_manager.session() as session:
+                    row = await session.get(IntermediateAddress, address)
+            except Exception as e:
+                self.logger.error(f"Error loading profile for {address}: {e}")
+                return None
+
+        if row is None or (row.profile_details or {}).get('block_bucket') != bucket:
+            return None
+
+        age_seconds = (datetime.utcnow() - row.updated_at).total_seconds()
+        if age_seconds > self.cache_ttl_seconds:
+            return None
+
+        profile = AddressProfile(
+            address=address,
+            is_fresh=row.is_fresh,
+            fresh_confidence=row.fresh_confidence,
+            age_hours=float(row.age_hours) if row.age_hours is not None else None,
+            was_empty=row.was_empty,
+            empty_confidence=row.empty_confidence,
+            is_single_use=row.is_single_use,
+            single_use_confidence=row.single_use_confidence,
+            transaction_count=row.transaction_count,
+            is_reused=row.is_reused,
+            reuse_confidence=row.reuse_confidence,
+            reuse_cycle_count=row.reuse_cycle_count,
+            overall_confidence=row.overall_confidence,
+            profile_type=row.profile_type,
+            details=row.profile_details.get('details', '')
+        )
+        self._put_cached(key, profile, age_seconds)
+        return profile
+
+    def _profile_writer(self):
+        """Buffered upsert writer of intermediate_addresses."""
+        return self.db_manager.repository.writer(IntermediateAddress)
+
+    async def _persist(self, key: Tuple[str, int], profile: AddressProfile):
+        """Queue an upsert of the profile into intermediate_addresses."""
+        if not self.db_manager:
+            return
+
+        address, bucket = key
+        values = asdict(profile)
+        details = values.pop('details')
+        values['address'] = address
+        values['profile_details'] = {'block_bucket': bucket, 'details': details}
+        values['updated_at'] = datetime.utcnow()
+
+        await self._profile_writer().add(values)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get profile cache statistics.
+
+        Returns:
+            Dict with hits, misses, hit rate and cache size
+        """
+        lookups = self.cache_hits + self.cache_misses + self.coalesced_requests
+        return {
+            'size': len(self._cache),
+            'max_entries': self.cache_max_entries,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'db_hits': self.db_hits,
+            'coalesced': self.coalesced_requests,
+            'evictions': self.evictions,
+            'in_flight': len(self._inflight),
+            'hit_rate': (self.cache_hits + self.coalesced_requests) / lookups if lookups else 0.0
+        }
@@ -0,0 +1,599 @@
+"""
+Flow Graph - Multi-Hop Fund Flow Tracing (whale -> N intermediates -> exchange)
+===============================================================================
+
+The one-hop detectors only look at whale -> intermediate -> exchange. This
+module keeps every ingested value transfer in an in-memory directed graph and
+traces whale outflows through up to max_hops intermediates:
+
+Storage (columnar, ~56 bytes per edge):
+- Addresses are interned to compact int32 node ids.
+- Edges live in NumPy columns: src, dst (int32), timestamp (int64 epoch
+  seconds), value (float64 ETH), tx hash (32 raw bytes).
+- compact() sorts edges by (src, timestamp) into CSR form: the out-edges of
+  node u are edges[indptr[u]:indptr[u + 1]], ordered by time, so a time
+  window is two binary searches. Edges added since the last compaction sit
+  in a small per-node tail; compaction runs automatically once the tail
+  grows, and drops edges older than retention_hours (and addresses only they
+  referenced).
+
+Tracing (trace / trace_outflow) is a time-respecting Dijkstra keyed on the
+arrival time at each address, starting from one whale outflow:
+- time windows: every next transfer happens after the previous one, within
+  max_hop_delay of it and within max_window of the whale transfer
+- amount conservation: the amount carried along a path is the minimum of its
+  transfers; a transfer larger than max_amount_ratio x the carried amount
+  (other funds) or a carried amount below min_retention x the whale amount
+  ends the branch
+- dominance: a node is expanded again only if it is reached earlier or with
+  more carried value than before
+- high fan-out nodes (contracts, services) are not expanded (max_fanout)
+- exchange addresses are terminals; every path reaching one is reported
+
+Confidence follows the roadmap in simple_whale_watcher: retention x 100,
+x 0.8 per additional intermediate.
+
+See benchmarks/bench_flow_graph.py for path query latency on synthetic
+graphs with millions of edges.
+
+Author: Whale Tracker Project
+"""
+
+import heapq
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .whale_history import from_epoch_micros, to_epoch_micros
+
+
+WEI_PER_ETH = 10**18
+Timestamp = Union[datetime, int, float]
+
+
+def _to_epoch_seconds(timestamp: Timestamp) -> int:
+    """Convert datetime (or epoch seconds) to int epoch seconds."""
+    if isinstance(timestamp, datetime):
+        return to_epoch_micros(timestamp) // 10**6
+    return int(timestamp)
+
+
+_NO_HASH = np.zeros(32, dtype=np.uint8)
+
+
+def _hash_bytes(tx_hash: Optional[str]) -> np.ndarray:
+    """0x-prefixed tx hash -> 32 raw bytes (all zero if missing or malformed)."""
+    if not tx_hash:
+        return _NO_HASH
+    try:
+        raw = bytes.fromhex(tx_hash[2:] if tx_hash.startswith('0x') else tx_hash)
+    except ValueError:
+        return _NO_HASH
+    return np.frombuffer(raw, dtype=np.uint8) if len(raw) == 32 else _NO_HASH
+
+
+@dataclass
+class FlowPath:
+    """A traced whale -> intermediates -> exchange path."""
+    addresses: List[str]  # whale, intermediates..., exchange
+    tx_hashes: List[str]
+    amounts_eth: List[float]
+    timestamps: List[datetime]
+    origin_amount_eth: float  # Whale transfer amount
+    amount_eth: float  # Smallest transfer along the path (what provably reached the exchange)
+    confidence: float = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def whale_address(self) -> str:
+        return self.addresses[0]
+
+    @property
+    def exchange_address(self) -> str:
+        return self.addresses[-1]
+
+    @property
+    def hops(self) -> int:
+        """Number of intermediate addresses."""
+        return len(self.addresses) - 2
+
+    @property
+    def duration_minutes(self) -> float:
+        return (self.timestamps[-1] - self.timestamps[0]).total_seconds() / 60
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'whale_address': self.whale_address,
+            'exchange_address': self.exchange_address,
+            'hops': self.hops,
+            'addresses': self.addresses,
+            'tx_hashes': self.tx_hashes,
+            'amounts_eth': self.amounts_eth,
+            'timestamps': [t.isoformat() for t in self.timestamps],
+            'origin_amount_eth': self.origin_amount_eth,
+            'amount_eth': self.amount_eth,
+            'duration_minutes': self.duration_minutes,
+            'confidence': self.confidence
+        }
+
+
+class FlowGraph:
+    """
+    Directed value-transfer graph with time-bounded multi-hop path search.
+    """
+
+    def __init__(
+        self,
+        exchanges: Optional[Iterable[str]] = None,
+        retention_hours: Optional[float] = 48.0,
+        compact_threshold: int = 50_000,
+        max_hops: int = 4,
+        max_hop_delay_hours: float = 6.0,
+        max_window_hours: float = 24.0,
+        min_retention: float = 0.5,
+        max_amount_ratio: float = 1.1,
+        max_fanout: int = 500,
+        max_expansions: int = 20_000,
+        initial_capacity: int = 4096
+    ):
+        """
+        Initialize Flow Graph.
+
+        Args:
+            exchanges: Exchange addresses (path terminals)
+            retention_hours: Edges older than this (relative to the newest edge)
+                are dropped on compaction (None = keep everything)
+            compact_threshold: Minimum number of uncompacted edges before an
+                automatic compaction (also at least 1/4 of the compacted edges)
+            max_hops: Maximum number of intermediate addresses on a path
+            max_hop_delay_hours: Maximum time between two consecutive transfers
+            max_window_hours: Maximum time from the whale transfer to the exchange
+            min_retention: Minimum share of the whale amount that must reach the exchange
+            max_amount_ratio: Transfers larger than this x the carried amount are not followed
+            max_fanout: Addresses with more out-edges are not expanded (services, contracts)
+            max_expansions: Safety cap on expanded labels per trace
+            initial_capacity: Initial edge / node capacity
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.retention_seconds = int(retention_hours * 3600) if retention_hours else None
+        self.compact_threshold = compact_threshold
+        self.max_hops = max_hops
+        self.max_hop_delay_seconds = int(max_hop_delay_hours * 3600)
+        self.max_window_seconds = int(max_window_hours * 3600)
+        self.min_retention = min_retention
+        self.max_amount_ratio = max_amount_ratio
+        self.max_fanout = max_fanout
+        self.max_expansions = max_expansions
+
+        # Nodes: address <-> int32 id
+        self._ids: Dict[str, int] = {}
+        self._addresses: List[str] = []
+        self._is_exchange = np.zeros(initial_capacity, dtype=bool)
+
+        # Edge columns; [0, _compacted) is CSR-ordered, the rest is the tail
+        self._src = np.empty(initial_capacity, dtype=np.int32)
+        self._dst = np.empty(initial_capacity, dtype=np.int32)
+        self._ts = np.empty(initial_capacity, dtype=np.int64)
+        self._value = np.empty(initial_capacity, dtype=np.float64)
+        self._hash = np.zeros((initial_capacity, 32), dtype=np.uint8)
+        self._edge_count = 0
+
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._compacted = 0
+        self._tail: Dict[int, List[int]] = {}
+        self._latest_ts: Optional[int] = None
+
+        self.stats = {
+            'edges_added': 0,
+            'compactions': 0,
+            'edges_expired': 0,
+            'traces': 0,
+            'paths_found': 0
+        }
+
+        if exchanges:
+            self.add_exchanges(exchanges)
+
+    # ==================== Nodes ====================
+
+    def _node(self, address: str) -> int:
+        """Intern an address (lowercase) and return its node id."""
+        address = address.lower()
+        node = self._ids.get(address)
+        if node is None:
+            node = len(self._addresses)
+            self._ids[address] = node
+            self._addresses.append(address)
+            if node >= len(self._is_exchange):
+                self._is_exchange = np.concatenate([self._is_exchange, np.zeros(node + 1, dtype=bool)])
+        return node
+
+    def add_exchanges(self, addresses: Iterable[str]) -> None:
+        """Mark addresses as exchanges (path terminals)."""
+        for address in addresses:
+            self._is_exchange[self._node(address)] = True
+
+    def set_exchanges(self, addresses: Iterable[str]) -> None:
+        """Replace the exchange set."""
+        self._is_exchange[:] = False
+        self.add_exchanges(addresses)
+
+    def is_exchange(self, address: str) -> bool:
+        node = self._ids.get(address.lower())
+        return node is not None and bool(self._is_exchange[node])
+
+    @property
+    def node_count(self) -> int:
+        return len(self._addresses)
+
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    @property
+    def latest_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the newest edge (chain time)."""
+        return from_epoch_micros(self._latest_ts * 10**6) if self._latest_ts is not None else None
+
+    # ==================== Edges ====================
+
+    def _reserve(self, count: int) -> None:
+        """Grow the edge columns to hold `count` more edges."""
+        needed = self._edge_count + count
+        capacity = len(self._src)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('_src', '_dst', '_ts', '_value', '_hash'):
+            column = getattr(self, name)
+            grown = np.empty((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self._edge_count] = column[:self._edge_count]
+            setattr(self, name, grown)
+
+    def add_transfer(
+        self,
+        sender: str,
+        recipient: str,
+        value_eth: float,
+        timestamp: Timestamp,
+        tx_hash: Optional[str] = None
+    ) -> None:
+        """
+        Add one value transfer.
+
+        Args:
+            sender: From address
+            recipient: To address
+            value_eth: Amount in ETH
+            timestamp: Block time (datetime or epoch seconds)
+            tx_hash: Transaction hash
+        """
+        self.add_transfers([sender], [recipient], [value_eth], [timestamp], [tx_hash])
+
+    def add_transfers(
+        self,
+        senders: List[str],
+        recipients: List[str],
+        values_eth: List[float],
+        timestamps: List[Timestamp],
+        tx_hashes: Optional[List[Optional[str]]] = None
+    ) -> int:
+        """
+        Add many value transfers at once (columns of equal length).
+
+        Args:
+            senders: From addresses
+            recipients: To addresses
+            values_eth: Amounts in ETH
+            timestamps: Block times (datetime or epoch seconds)
+            tx_hashes: Transaction hashes (optional)
+
+        Returns:
+            Number of edges added
+        """
+        count = len(senders)
+        if not count:
+            return 0
+
+        self._reserve(count)
+        first = self._edge_count
+        end = first + count
+        src = np.fromiter((self._node(address) for address in senders), dtype=np.int32, count=count)
+        self._src[first:end] = src
+        self._dst[first:end] = np.fromiter((self._node(address) for address in recipients), dtype=np.int32, count=count)
+        ts = np.fromiter((_to_epoch_seconds(t) for t in timestamps), dtype=np.int64, count=count)
+        self._ts[first:end] = ts
+        self._value[first:end] = values_eth
+        if tx_hashes is not None:
+            for offset, tx_hash in enumerate(tx_hashes):
+                self._hash[first + offset] = _hash_bytes(tx_hash)
+        else:
+            self._hash[first:end] = 0
+        self._edge_count = end
+
+        for offset, node in enumerate(src.tolist()):
+            self._tail.setdefault(node, []).append(first + offset)
+
+        latest = int(ts.max())
+        if self._latest_ts is None or latest > self._latest_ts:
+            self._latest_ts = latest
+        self.stats['edges_added'] += count
+        self._maybe_compact()
+        return count
+
+    def add_transactions(self, transactions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add decoded transactions (block stream / watcher format).
+
+        Only value transfers to an address are kept (value in wei, timestamp
+        as datetime).
+
+        Args:
+            transactions: Transaction dicts with from, to, value, timestamp, hash
+
+        Returns:
+            Number of edges added
+        """
+        transfers = [
+            tx for tx in transactions
+            if (tx.get('value') or 0) > 0 and tx.get('to') and tx.get('from') and tx.get('timestamp') is not None
+        ]
+        return self.add_transfers(
+            [tx['from'] for tx in transfers],
+            [tx['to'] for tx in transfers],
+            [tx['value'] / WEI_PER_ETH for tx in transfers],
+            [tx['timestamp'] for tx in transfers],
+            [tx.get('hash') for tx in transfers]
+        )
+
+    def _maybe_compact(self) -> None:
+        tail = self._edge_count - self._compacted
+        if tail >= max(self.compact_threshold, self._compacted // 4):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Merge the tail into the CSR arrays and apply retention.
+
+        Expired edges are dropped; addresses no longer referenced by any edge
+        (and not exchanges) are dropped too, and node ids are renumbered.
+        """
+        count = self._edge_count
+        keep = np.arange(count)
+        if self.retention_seconds is not None and count and self._latest_ts is not None:
+            keep = np.flatnonzero(self._ts[:count] >= self._latest_ts - self.retention_seconds)
+        expired = count - len(keep)
+
+        order = keep[np.lexsort((self._ts[keep], self._src[keep]))]
+        kept = len(order)
+        for name in ('_src', '_dst', '_ts', '_value', '_hash'):
+            column = getattr(self, name)
+            column[:kept] = column[order]
+
+        if expired:
+            self._drop_unused_nodes(kept)
+            self.stats['edges_expired'] += expired
+
+        counts = np.bincount(self._src[:kept], minlength=self.node_count)
+        self._indptr = np.zeros(self.node_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._indptr[1:])
+
+        self._edge_count = kept
+        self._compacted = kept
+        self._tail = {}
+        self.stats['compactions'] += 1
+
+    def _drop_unused_nodes(self, edge_count: int) -> None:
+        """Renumber nodes, keeping those referenced by edges or marked as exchange."""
+        nodes = self.node_count
+        used = self._is_exchange[:nodes].copy()
+        used[self._src[:edge_count]] = True
+        used[self._dst[:edge_count]] = True
+        if used.all():
+            return
+
+        remap = np.cumsum(used, dtype=np.int64) - 1
+        self._src[:edge_count] = remap[self._src[:edge_count]]
+        self._dst[:edge_count] = remap[self._dst[:edge_count]]
+        self._addresses = [address for address, keep in zip(self._addresses, used) if keep]
+        self._ids = {address: node for node, address in enumerate(self._addresses)}
+        is_exchange = self._is_exchange[:nodes][used]
+        self._is_exchange = np.zeros(max(len(is_exchange), 1) * 2, dtype=bool)
+        self._is_exchange[:len(is_exchange)] = is_exchange
+
+    def _out_edges(self, node: int, start: int, end: int) -> List[int]:
+        """Edge ids leaving `node` with start <= timestamp <= end."""
+        edges: List[int] = []
+        if node + 1 < len(self._indptr):
+            lo, hi = int(self._indptr[node]), int(self._indptr[node + 1])
+            if hi > lo:
+                times = self._ts[lo:hi]
+                first = lo + int(np.searchsorted(times, start, side='left'))
+                last = lo + int(np.searchsorted(times, end, side='right'))
+                edges.extend(range(first, last))
+        for edge in self._tail.get(node, ()):
+            if start <= self._ts[edge] <= end:
+                edges.append(edge)
+        return edges
+
+    def out_degree(self, address: str) -> int:
+        """Number of stored out-edges of an address."""
+        node = self._ids.get(address.lower())
+        return self._degree(node) if node is not None else 0
+
+    def _degree(self, node: int) -> int:
+        degree = len(self._tail.get(node, ()))
+        if node + 1 < len(self._indptr):
+            degree += int(self._indptr[node + 1] - self._indptr[node])
+        return degree
+
+    # ==================== Tracing ====================
+
+    def trace(
+        self,
+        whale_address: str,
+        since: Optional[Timestamp] = None,
+        until: Optional[Timestamp] = None,
+        min_value_eth: float = 0.0,
+        max_paths: int = 10
+    ) -> List[FlowPath]:
+        """
+        Trace every whale outflow in a time range to exchanges.
+
+        Args:
+            whale_address: Whale address
+            since: Earliest whale transfer (default: all stored)
+            until: Latest whale transfer (default: all stored)
+            min_value_eth: Ignore smaller whale transfers
+            max_paths: Maximum paths per outflow
+
+        Returns:
+            Paths sorted by confidence (highest first)
+        """
+        node = self._ids.get(whale_address.lower())
+        if node is None:
+            return []
+
+        start = _to_epoch_seconds(since) if since is not None else np.iinfo(np.int64).min
+        end = _to_epoch_seconds(until) if until is not None else np.iinfo(np.int64).max
+        paths: List[FlowPath] = []
+        for edge in self._out_edges(node, start, end):
+            if self._value[edge] >= min_value_eth:
+                paths.extend(self._trace_edge(node, edge, max_paths))
+
+        paths.sort(key=lambda path: path.confidence, reverse=True)
+        return paths
+
+    def trace_outflow(self, tx_hash: str, max_paths: int = 10) -> List[FlowPath]:
+        """
+        Trace one stored transfer (by hash) to exchanges.
+
+        Args:
+            tx_hash: Hash of the whale transfer
+            max_paths: Maximum paths returned
+
+        Returns:
+            Paths sorted by confidence (highest first)
+        """
+        raw = _hash_bytes(tx_hash)
+        if raw is _NO_HASH:
+            return []
+        matches = np.flatnonzero((self._hash[:self._edge_count] == raw).all(axis=1))
+        if not len(matches):
+            return []
+        edge = int(matches[0])
+        paths = self._trace_edge(int(self._src[edge]), edge, max_paths)
+        paths.sort(key=lambda path: path.confidence, reverse=True)
+        return paths
+
+    def _trace_edge(self, whale: int, first_edge: int, max_paths: int) -> List[FlowPath]:
+        """Time-respecting Dijkstra from one whale transfer."""
+        self.stats['traces'] += 1
+        origin = float(self._value[first_edge])
+        if origin <= 0:
+            return []
+
+        first_node = int(self._dst[first_edge])
+        if self._is_exchange[first_node]:
+            return []  # Direct transfer - not a multi-hop path
+
+        start_ts = int(self._ts[first_edge])
+        deadline = start_ts + self.max_window_seconds
+        min_carried = origin * self.min_retention
+
+        # Labels: (edge, parent label); heap: (arrival, seq, node, carried, intermediates, label)
+        labels: List[Tuple[int, int]] = [(first_edge, -1)]
+        heap = [(start_ts, 0, first_node, origin, 1, 0)]
+        best: Dict[int, Tuple[int, float]] = {first_node: (start_ts, origin)}
+        paths: List[FlowPath] = []
+        expansions = 0
+
+        while heap and len(paths) < max_paths and expansions < self.max_expansions:
+            arrival, _, node, carried, intermediates, label = heapq.heappop(heap)
+            known = best.get(node)
+            if known != (arrival, carried) and known[0] <= arrival and known[1] >= carried:
+                continue  # Dominated by a label found after this one was queued
+            if self._degree(node) > self.max_fanout:
+                continue
+            expansions += 1
+
+            end = min(arrival + self.max_hop_delay_seconds, deadline)
+            for edge in self._out_edges(node, arrival, end):
+                target = int(self._dst[edge])
+                value = float(self._value[edge])
+                if target == whale or value > carried * self.max_amount_ratio:
+                    continue
+                next_carried = min(carried, value)
+                if next_carried < min_carried:
+                    continue
+
+                edge_ts = int(self._ts[edge])
+                if self._is_exchange[target]:
+                    labels.append((edge, label))
+                    paths.append(self._build_path(len(labels) - 1, labels, origin, next_carried))
+                    if len(paths) >= max_paths:
+                        break
+                    continue
+
+                if intermediates >= self.max_hops:
+                    continue
+                known = best.get(target)
+                if known is not None and known[0] <= edge_ts and known[1] >= next_carried:
+                    continue
+                best[target] = (edge_ts, next_carried)
+                labels.append((edge, label))
+                heapq.heappush(heap, (edge_ts, len(labels), target, next_carried, intermediates + 1, len(labels) - 1))
+
+        self.stats['paths_found'] += len(paths)
+        return paths
+
+    def _build_path(self, label: int, labels: List[Tuple[int, int]], origin: float, carried: float) -> FlowPath:
+        """Materialize a path from its last label."""
+        edges = []
+        while label != -1:
+            edge, label = labels[label]
+            edges.append(edge)
+        edges.reverse()
+
+        addresses = [self._addresses[int(self._src[edges[0]])]]
+        addresses.extend(self._addresses[int(self._dst[edge])] for edge in edges)
+        hops = len(edges) - 1
+        retention = carried / origin
+        return FlowPath(
+            addresses=addresses,
+            tx_hashes=[self._tx_hash(edge) for edge in edges],
+            amounts_eth=[float(self._value[edge]) for edge in edges],
+            timestamps=[from_epoch_micros(int(self._ts[edge]) * 10**6) for edge in edges],
+            origin_amount_eth=origin,
+            amount_eth=carried,
+            confidence=round(100 * retention * 0.8 ** (hops - 1), 1)
+        )
+
+    def _tx_hash(self, edge: int) -> str:
+        raw = self._hash[edge]
+        return '0x' + raw.tobytes().hex() if raw.any() else ''
+
+    # ==================== Stats ====================
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the NumPy columns (without the address table)."""
+        return int(
+            sum(getattr(self, name).nbytes for name in ('_src', '_dst', '_ts', '_value', '_hash'))
+            + self._indptr.nbytes
+            + self._is_exchange.nbytes
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get graph statistics."""
+        return {
+            **self.stats,
+            'nodes': self.node_count,
+            'edges': self._edge_count,
+            'tail_edges': self._edge_count - self._compacted,
+            'exchanges': int(self._is_exchange[:self.node_count].sum()),
+            'column_bytes': self.memory_usage()
+        }
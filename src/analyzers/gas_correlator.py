@@ -8,12 +8,17 @@ Probability of exact gas match by chance: ~0.1%
 Exact match = 95% confidence same entity.
 
 Confidence impact: +70 to +95
+
+For M whale transactions x N intermediate transactions, score_matrix()
+scores all pairs in one vectorized NumPy pass and returns the best pairs.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class GasCorrelationResult:
@@ -27,6 +32,16 @@ class GasCorrelationResult:
     details: Optional[str] = None
 
 
+@dataclass
+class GasPairScore:
+    """Gas correlation of one (whale tx, intermediate tx) pair from score_matrix"""
+    whale_index: int
+    intermediate_index: int
+    confidence: int
+    correlation_type: str  # 'exact', 'close', 'strategy'
+    gas_diff_gwei: float
+
+
 class GasCorrelator:
     """
     Analyzes gas price correlation between transactions.
@@ -144,6 +159,130 @@ class GasCorrelator:
                 details=f'Error: {str(e)}'
             )
 
+    def score_matrix(self,
+                     whale_txs: List[Dict[str, Any]],
+                     intermediate_txs: List[Dict[str, Any]],
+                     top_k: int = 10) -> List[GasPairScore]:
+        """
+        Score gas correlation of every (whale tx, intermediate tx) pair.
+
+        Gas fields are extracted once per transaction into NumPy arrays and
+        the same rules as check_gas_correlation (exact / close / strategy)
+        are applied to the whole M x N matrix at once.
+
+        Args:
+            whale_txs: Transactions from whale
+            intermediate_txs: Transactions from intermediate
+            top_k: Number of best pairs to return
+
+        Returns:
+            Correlated pairs (confidence > 0), best first; ties are broken by
+            smaller gas difference
+        """
+        if not whale_txs or not intermediate_txs or top_k <= 0:
+            return []
+
+        try:
+            confidence, diff_gwei = self._confidence_matrix(whale_txs, intermediate_txs)
+        except Exception as e:
+            self.logger.error(f"Error scoring gas matrix: {e}", exc_info=True)
+            return []
+
+        flat_confidence = confidence.ravel()
+        candidates = np.flatnonzero(flat_confidence)
+        if candidates.size == 0:
+            return []
+
+        # Partial selection first, then exact ordering of the survivors
+        if candidates.size > top_k:
+            keep = np.argpartition(-flat_confidence[candidates], top_k - 1)[:top_k]
+            threshold = flat_confidence[candidates[keep]].min()
+            candidates = candidates[flat_confidence[candidates] >= threshold]
+
+        flat_diff = diff_gwei.ravel()
+        order = np.lexsort((candidates, flat_diff[candidates], -flat_confidence[candidates]))
+        best = candidates[order][:top_k]
+
+        n = len(intermediate_txs)
+        type_names = {95: 'exact', 80: 'close', 70: 'strategy'}
+        return [
+            GasPairScore(
+                whale_index=int(index // n),
+                intermediate_index=int(index % n),
+                confidence=int(flat_confidence[index]),
+                correlation_type=type_names[int(flat_confidence[index])],
+                gas_diff_gwei=float(flat_diff[index])
+            )
+            for index in best
+        ]
+
+    def _confidence_matrix(self,
+                           whale_txs: List[Dict[str, Any]],
+                           intermediate_txs: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Confidence and gas difference (Gwei) for all pairs.
+
+        Returns:
+            Tuple of (M x N int confidence, M x N float gas difference)
+        """
+        whale_gas, whale_has_gas = self._gas_array(whale_txs, self._extract_gas_price)
+        int_gas, int_has_gas = self._gas_array(intermediate_txs, self._extract_gas_price)
+        whale_priority, whale_has_priority = self._gas_array(whale_txs, self._extract_priority_fee)
+        int_priority, int_has_priority = self._gas_array(intermediate_txs, self._extract_priority_fee)
+
+        diff_wei = np.abs(whale_gas[:, None] - int_gas[None, :])
+        diff_gwei = diff_wei / 1e9
+        has_gas = whale_has_gas[:, None] & int_has_gas[None, :]
+
+        exact = has_gas & (diff_wei == self.EXACT_MATCH_TOLERANCE)
+        close = has_gas & ~exact & (diff_gwei <= self.CLOSE_MATCH_THRESHOLD_GWEI)
+        strategy = (
+            has_gas & ~exact & ~close
+            & whale_has_priority[:, None] & int_has_priority[None, :]
+            & (whale_priority[:, None] == int_priority[None, :])
+        )
+
+        confidence = np.select([exact, close, strategy], [95, 80, 70], default=0)
+        return confidence, diff_gwei
+
+    def _gas_array(self, txs: List[Dict[str, Any]], extract) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract one gas field of every transaction into (values, present mask).
+
+        Unparsable values (and values that don't fit int64) count as missing,
+        so one malformed transaction only drops its own pairs.
+        """
+        values = []
+        for tx in txs:
+            try:
+                value = extract(tx)
+                if value is not None and not 0 <= value <= np.iinfo(np.int64).max:
+                    raise OverflowError(f"gas value out of range: {value}")
+            except (ValueError, TypeError, OverflowError) as e:
+                self.logger.warning(f"Unparsable gas field in transaction {tx.get('hash', 'unknown')}: {e}")
+                value = None
+            values.append(value)
+        present = np.array([v is not None for v in values], dtype=bool)
+        array = np.array([v if v is not None else 0 for v in values], dtype=np.int64)
+        return array, present
+
+    def _extract_priority_fee(self, tx: Dict[str, Any]) -> Optional[int]:
+        """
+        Extract maxPriorityFeePerGas (EIP-1559) from transaction.
+
+        Args:
+            tx: Transaction dict
+
+        Returns:
+            Priority fee in Wei, or None if not present
+        """
+        priority = tx.get('maxPriorityFeePerGas')
+        if priority is None:
+            return None
+        if isinstance(priority, str):
+            return int(priority, 16) if priority.startswith('0x') else int(priority)
+        return int(priority)
+
     def _extract_gas_price(self, tx: Dict[str, Any]) -> Optional[int]:
         """
         Extract gas price from transaction.
@@ -6,14 +6,23 @@ Nonce gap = 1 means intermediate address sent to exchange IMMEDIATELY after
 receiving from whale - strongest possible signal for one-hop detection.
 
 Confidence impact: +40 to +95 (highest of all signals)
+
+Historical nonces are cached per address as a timeline of exact
+(block -> nonce) checkpoints. Nonces never decrease, so a block between two
+checkpoints with the same nonce has that nonce too; repeated checks against
+the same intermediate are answered without remote calls.
 """
 
+import bisect
 import logging
-from typing import Dict, Optional, Any
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import aiohttp
 import asyncio
-from web3 import Web3
+
+from ..core.instrumentation import Instrumentation, get_instrumentation, response_size
 
 
 @dataclass
@@ -29,6 +38,86 @@ class NonceCorrelationResult:
     details: Optional[str] = None
 
 
+class NonceTimeline:
+    """
+    Exact nonce checkpoints of one address, sorted by block.
+
+    nonce(block) = transaction count after that block (eth_getTransactionCount
+    semantics) and is non-decreasing in block.
+    """
+
+    def __init__(self, max_checkpoints: int = 256):
+        self.max_checkpoints = max_checkpoints
+        self.blocks: List[int] = []
+        self.nonces: List[int] = []
+
+    def add(self, block_number: int, nonce: int) -> None:
+        """Add (or overwrite) checkpoint, dropping the oldest over the limit."""
+        i = bisect.bisect_left(self.blocks, block_number)
+        if i < len(self.blocks) and self.blocks[i] == block_number:
+            self.nonces[i] = nonce
+            return
+
+        self.blocks.insert(i, block_number)
+        self.nonces.insert(i, nonce)
+
+        if len(self.blocks) > self.max_checkpoints:
+            del self.blocks[0]
+            del self.nonces[0]
+
+    def bracket(self, block_number: int) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+        """
+        Nearest checkpoints at-or-before and at-or-after block_number.
+
+        Returns:
+            Tuple of (block, nonce) or None for each side
+        """
+        i = bisect.bisect_right(self.blocks, block_number)
+        before = (self.blocks[i - 1], self.nonces[i - 1]) if i > 0 else None
+
+        j = bisect.bisect_left(self.blocks, block_number)
+        after = (self.blocks[j], self.nonces[j]) if j < len(self.blocks) else None
+
+        return before, after
+
+    def lookup(self, block_number: int) -> Optional[int]:
+        """
+        Nonce at block if the checkpoints determine it exactly.
+
+        Returns:
+            Nonce, or None if it must be fetched
+        """
+        before, after = self.bracket(block_number)
+
+        if before is not None and before[0] == block_number:
+            return before[1]
+
+        # Monotonic: same nonce on both sides -> same nonce in between
+        if before is not None and after is not None and before[1] == after[1]:
+            return before[1]
+
+        # Nothing sent by the first checkpoint -> nothing sent before it
+        if before is None and after is not None and after[1] == 0:
+            return 0
+
+        return None
+
+    def observe_transaction(self, nonce: int, block_number: int) -> None:
+        """
+        Derive checkpoints from a transaction sent by the address.
+
+        A tx with nonce N in block B means nonce(B - 1) <= N and nonce(B) >= N + 1,
+        which is exact next to a checkpoint with nonce N before it or N + 1 after it.
+        """
+        before, _ = self.bracket(block_number - 1)
+        if before is not None and before[1] == nonce:
+            self.add(block_number - 1, nonce)
+
+        _, after = self.bracket(block_number)
+        if after is not None and after[1] == nonce + 1:
+            self.add(block_number, nonce + 1)
+
+
 class NonceTracker:
     """
     Tracks nonce sequences to detect one-hop patterns.
@@ -40,7 +129,11 @@ class NonceTracker:
     def __init__(self,
                  web3_manager=None,
                  etherscan_api_key: Optional[str] = None,
-                 use_etherscan: bool = True):
+                 use_etherscan: bool = True,
+                 max_cached_addresses: int = 10000,
+                 max_checkpoints_per_address: int = 256,
+                 etherscan_url: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None):
         """
         Initialize nonce tracker.
 
@@ -48,16 +141,30 @@ class NonceTracker:
             web3_manager: Web3Manager instance for RPC calls
             etherscan_api_key: Etherscan API key (optional but recommended)
             use_etherscan: Whether to use Etherscan API (faster, more reliable)
+            max_cached_addresses: Max address timelines kept (least recently used evicted)
+            max_checkpoints_per_address: Max checkpoints per timeline
+            etherscan_url: Etherscan-compatible API (default: ETHERSCAN_API_URL or api.etherscan.io)
+            instrumentation: Per-call latency / bytes metrics (default: shared instance)
         """
         self.logger = logging.getLogger(__name__)
         self.web3_manager = web3_manager
         self.etherscan_api_key = etherscan_api_key
         self.use_etherscan = use_etherscan and etherscan_api_key is not None
+        self.etherscan_url = etherscan_url or os.getenv('ETHERSCAN_API_URL') or "https://api.etherscan.io/api"
+        self.instrumentation = instrumentation or get_instrumentation()
 
         # Rate limiting
         self.last_etherscan_call = 0
         self.etherscan_rate_limit = 0.2  # 5 calls/sec = 0.2s between calls
 
+        # Historical nonce cache: address (lowercase) -> timeline
+        self.max_cached_addresses = max_cached_addresses
+        self.max_checkpoints_per_address = max_checkpoints_per_address
+        self._timelines: "OrderedDict[str, NonceTimeline]" = OrderedDict()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+
         self.logger.info(f"NonceTracker initialized (Etherscan: {self.use_etherscan})")
 
     async def check_nonce_sequence(self,
@@ -95,6 +202,11 @@ class NonceTracker:
                     details='Missing whale_tx fields'
                 )
 
+            # Known exchange tx lets the timeline answer without a remote call
+            exchange_tx_nonce = intermediate_tx.get('nonce')
+            exchange_tx_block = intermediate_tx.get('blockNumber')
+            self._observe_transaction(intermediate_addr, exchange_tx_nonce, exchange_tx_block)
+
             # Get intermediate's nonce at the time of whale transaction
             nonce_at_whale_block = await self._get_nonce_at_block(
                 intermediate_addr,
@@ -111,9 +223,6 @@ class NonceTracker:
                     details='Could not retrieve nonce'
                 )
 
-            # Get intermediate's nonce for exchange transaction
-            exchange_tx_nonce = intermediate_tx.get('nonce')
-
             if exchange_tx_nonce is None:
                 self.logger.warning("Exchange transaction missing nonce field")
                 return NonceCorrelationResult(
@@ -124,6 +233,9 @@ class NonceTracker:
                     details='Exchange tx missing nonce'
                 )
 
+            # New checkpoint may extend what the exchange tx tells us
+            self._observe_transaction(intermediate_addr, exchange_tx_nonce, exchange_tx_block)
+
             # Calculate nonce gap
             nonce_gap = exchange_tx_nonce - nonce_at_whale_block
 
@@ -198,6 +310,33 @@ class NonceTracker:
         """
         Get transaction count (nonce) for address at specific block.
 
+        Answered from the address timeline when its checkpoints determine the
+        nonce; otherwise fetched once and added as a checkpoint.
+
+        Args:
+            address: Ethereum address
+            block_number: Block number
+
+        Returns:
+            Nonce at that block, or None if unable to retrieve
+        """
+        timeline = self._get_timeline(address)
+
+        nonce = timeline.lookup(block_number)
+        if nonce is not None:
+            self.cache_hits += 1
+            return nonce
+
+        self.cache_misses += 1
+        nonce = await self._fetch_nonce_at_block(address, block_number)
+        if nonce is not None:
+            timeline.add(block_number, nonce)
+        return nonce
+
+    async def _fetch_nonce_at_block(self, address: str, block_number: int) -> Optional[int]:
+        """
+        Fetch nonce at block from remote sources.
+
         Tries multiple methods:
         1. Etherscan API (fastest, most reliable)
         2. RPC eth_getTransactionCount (requires archival node)
@@ -240,7 +379,7 @@ class NonceTracker:
                 await asyncio.sleep(self.etherscan_rate_limit - time_since_last_call)
 
             url = (
-                f"https://api.etherscan.io/api"
+                f"{self.etherscan_url}"
                 f"?module=proxy"
                 f"&action=eth_getTransactionCount"
                 f"&address={address}"
@@ -248,25 +387,33 @@ class NonceTracker:
                 f"&apikey={self.etherscan_api_key}"
             )
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    self.last_etherscan_call = asyncio.get_event_loop().time()
-
-                    if response.status != 200:
-                        self.logger.error(f"Etherscan API error: HTTP {response.status}")
-                        return None
-
-                    data = await response.json()
-
-                    if data.get('status') == '1' and 'result' in data:
-                        # Result is hex string
-                        nonce = int(data['result'], 16)
-                        self.logger.debug(f"Etherscan nonce for {address} at block {block_number}: {nonce}")
-                        return nonce
-                    else:
-                        error_msg = data.get('message', 'Unknown error')
-                        self.logger.error(f"Etherscan API error: {error_msg}")
-                        return None
+            with self.instrumentation.track_call('etherscan', 'eth_getTransactionCount') as call:
+                call.bytes_sent = len(url)
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                        self.last_etherscan_call = asyncio.get_event_loop().time()
+                        call.bytes_received = response_size(response)
+
+                        if response.status != 200:
+                            call.error = True
+                            self.logger.error(f"Etherscan API error: HTTP {response.status}")
+                            return None
+
+                        data = await response.json()
+
+                        # Proxy replies are JSON-RPC shaped (no 'status'); key / rate
+                        # errors come back as status '0' with a message
+                        result = data.get('result')
+                        if data.get('status', '1') == '1' and isinstance(result, str) and result.startswith('0x'):
+                            # Result is hex string
+                            nonce = int(result, 16)
+                            self.logger.debug(f"Etherscan nonce for {address} at block {block_number}: {nonce}")
+                            return nonce
+                        else:
+                            call.error = True
+                            error_msg = data.get('message') or data.get('error') or 'Unknown error'
+                            self.logger.error(f"Etherscan API error: {error_msg}")
+                            return None
 
         except asyncio.TimeoutError:
             self.logger.error("Etherscan API timeout")
@@ -283,18 +430,14 @@ class NonceTracker:
         Regular nodes only support recent blocks (~128 blocks back).
         """
         try:
-            if not self.web3_manager or not self.web3_manager.w3:
+            if not self.web3_manager:
                 self.logger.error("Web3Manager not available")
                 return None
 
-            # Convert to checksum address
-            checksum_address = Web3.to_checksum_address(address)
-
-            # Get nonce at specific block
-            nonce = self.web3_manager.w3.eth.get_transaction_count(
-                checksum_address,
-                block_identifier=block_number
-            )
+            # Nonce at a specific block, routed by Web3Manager's provider pool
+            nonce = await self.web3_manager.get_transaction_count(address, block=block_number)
+            if nonce is None:
+                return None
 
             self.logger.debug(f"RPC nonce for {address} at block {block_number}: {nonce}")
             return nonce
@@ -303,6 +446,50 @@ class NonceTracker:
             self.logger.error(f"Error getting nonce via RPC: {e}")
             return None
 
+    def _get_timeline(self, address: str) -> NonceTimeline:
+        """Get (or create) timeline of an address, marking it recently used."""
+        address = address.lower()
+        timeline = self._timelines.get(address)
+        if timeline is None:
+            timeline = NonceTimeline(self.max_checkpoints_per_address)
+            self._timelines[address] = timeline
+            while len(self._timelines) > self.max_cached_addresses:
+                self._timelines.popitem(last=False)
+        else:
+            self._timelines.move_to_end(address)
+        return timeline
+
+    def _observe_transaction(self, address: str, nonce: Optional[int], block_number: Optional[int]) -> None:
+        """Feed a transaction sent by address into its timeline."""
+        if nonce is None or not block_number:
+            return
+        self._get_timeline(address).observe_transaction(nonce, block_number)
+
+    def record_nonce(self, address: str, block_number: int, nonce: int) -> None:
+        """
+        Add a known nonce checkpoint (e.g. from a current-nonce RPC call).
+
+        Args:
+            address: Ethereum address
+            block_number: Block number
+            nonce: Transaction count after that block
+        """
+        self._get_timeline(address).add(block_number, nonce)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get nonce cache statistics.
+
+        Returns:
+            Dict with hits, misses and cached timeline sizes
+        """
+        return {
+            'addresses': len(self._timelines),
+            'checkpoints': sum(len(t.blocks) for t in self._timelines.values()),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses
+        }
+
     def calculate_confidence_from_gap(self, nonce_gap: int) -> int:
         """
         Calculate confidence score based on nonce gap.
@@ -0,0 +1,418 @@
+"""
+Split Dump Detector - Whale Outflows Split Across Many Intermediates
+====================================================================
+
+A whale can move 1,000 ETH as 4 x 250 ETH to fresh addresses, each of which
+sends its part (or splits it again) to a different exchange. No single
+transfer looks like a dump, so the per-transaction one-hop checks miss it.
+
+SplitDumpDetector aggregates instead. It is fed every decoded transfer
+(BlockStreamIngester does this per block) and keeps:
+
+- Episodes: whale outflows to non-exchange addresses. Outflows of the same
+  whale within group_window of the episode start are merged (the split
+  itself). Each episode keeps a running sum of the exchange inflows that
+  can be traced back to it, per exchange and per delivering address.
+- Taint: for every address that received episode funds, the episode and the
+  amount still unaccounted for. Transfers out of a tainted address consume
+  that amount (FIFO over sources):
+  * to an exchange  -> added to the episode's exchange sum
+  * to another address -> taint moves on (up to max_depth hops below the
+    whale, dust below min_forward_share of the episode is not followed)
+
+An episode is flagged once when its exchange sum reaches share_threshold of
+the whale amount through at least min_intermediates delivering addresses
+(a single path is the one-hop / multi-hop detectors' job).
+
+Memory stays flat: both maps are insertion-ordered and expire after
+window_hours of chain time, and are capped at max_episodes / max_tainted
+entries (oldest evicted first); every address keeps at most
+max_sources_per_address sources. Inside an episode, transaction hashes and
+recipients are counted but only the first / last `hash_sample_size` are
+kept, and the per-exchange / per-intermediate sums hold at most
+max_addresses_per_episode addresses (the rest goes to an "other" sum).
+Work per transfer is two dict lookups.
+
+Author: Whale Tracker Project
+"""
+
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+WEI_PER_ETH = 10**18
+
+
+class BoundedSample:
+    """Count of appended items, keeping only the first and the last `size` of them."""
+
+    __slots__ = ('size', 'count', 'first', 'last')
+
+    def __init__(self, size: int = 8):
+        self.size = size
+        self.count = 0
+        self.first: List[str] = []
+        self.last: Deque[str] = deque(maxlen=size)
+
+    def append(self, item: str) -> None:
+        self.count += 1
+        if len(self.first) < self.size:
+            self.first.append(item)
+        else:
+            self.last.append(item)
+
+    @property
+    def omitted(self) -> int:
+        """Items counted but no longer kept."""
+        return self.count - len(self)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.first
+        yield from self.last
+
+    def __len__(self) -> int:
+        return len(self.first) + len(self.last)
+
+    def __getitem__(self, index: int) -> str:
+        return list(self)[index]
+
+
+def _add_capped(sums: Dict[str, float], key: str, amount: float, cap: int) -> bool:
+    """Add to a per-address sum; False if the address is new and the map is full."""
+    if key in sums or len(sums) < cap:
+        sums[key] = sums.get(key, 0.0) + amount
+        return True
+    return False
+
+
+@dataclass
+class SplitEpisode:
+    """Aggregated state of one (possibly split) whale outflow."""
+    episode_id: int
+    whale_address: str
+    started_at: datetime
+    amount_eth: float = 0.0
+    outflow_hashes: BoundedSample = field(default_factory=BoundedSample)
+    recipients: BoundedSample = field(default_factory=BoundedSample)
+    exchange_amount_eth: float = 0.0
+    exchanges: Dict[str, float] = field(default_factory=dict)  # exchange -> ETH (capped)
+    intermediates: Dict[str, float] = field(default_factory=dict)  # delivering address -> ETH (capped)
+    other_exchanges_eth: float = 0.0  # Inflows to exchanges beyond the cap
+    other_intermediates_eth: float = 0.0  # Deliveries by addresses beyond the cap
+    exchange_tx_hashes: BoundedSample = field(default_factory=BoundedSample)
+    last_exchange_at: Optional[datetime] = None
+    flagged: bool = False
+
+    @property
+    def share(self) -> float:
+        return self.exchange_amount_eth / self.amount_eth if self.amount_eth > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'whale_address': self.whale_address,
+            'amount_eth': self.amount_eth,
+            'exchange_amount_eth': self.exchange_amount_eth,
+            'share': self.share,
+            'outflow_hashes': list(self.outflow_hashes),
+            'outflow_count': self.outflow_hashes.count,
+            'recipients': list(self.recipients),
+            'exchanges': self.exchanges,
+            'intermediates': self.intermediates,
+            'other_exchanges_eth': self.other_exchanges_eth,
+            'other_intermediates_eth': self.other_intermediates_eth,
+            'exchange_tx_hashes': list(self.exchange_tx_hashes),
+            'exchange_tx_count': self.exchange_tx_hashes.count,
+            'started_at': self.started_at.isoformat(),
+            'duration_minutes': (
+                (self.last_exchange_at - self.started_at).total_seconds() / 60
+                if self.last_exchange_at else 0.0
+            )
+        }
+
+
+class SplitDumpDetector:
+    """
+    Windowed aggregation of exchange inflows per whale outflow.
+    """
+
+    def __init__(
+        self,
+        share_threshold: float = 0.6,
+        min_intermediates: int = 2,
+        min_amount_eth: float = 0.0,
+        window_hours: float = 6.0,
+        group_window_minutes: float = 30.0,
+        max_depth: int = 2,
+        min_forward_share: float = 0.02,
+        max_episodes: int = 10_000,
+        max_tainted: int = 100_000,
+        max_sources_per_address: int = 4,
+        hash_sample_size: int = 8,
+        max_addresses_per_episode: int = 32
+    ):
+        """
+        Initialize Split Dump Detector.
+
+        Args:
+            share_threshold: Share of the whale amount that must reach exchanges
+            min_intermediates: Distinct addresses that must deliver to exchanges
+            min_amount_eth: Smaller whale outflows are not tracked
+            window_hours: Episode / taint lifetime (chain time)
+            group_window_minutes: Whale outflows this close to the episode start are merged
+            max_depth: Hops below the whale that taint is followed (1 = direct recipients only)
+            min_forward_share: Forwards smaller than this share of the episode are not followed
+            max_episodes: Cap on tracked episodes (oldest evicted)
+            max_tainted: Cap on tracked addresses (oldest evicted)
+            max_sources_per_address: Cap on episodes tracked per address
+            hash_sample_size: Hashes / recipients kept per episode at each end (first and last)
+            max_addresses_per_episode: Cap on exchanges and on intermediates summed per
+                episode (at least min_intermediates)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.share_threshold = share_threshold
+        self.min_intermediates = min_intermediates
+        self.min_amount_eth = min_amount_eth
+        self.window = timedelta(hours=window_hours)
+        self.group_window = timedelta(minutes=group_window_minutes)
+        self.max_depth = max_depth
+        self.min_forward_share = min_forward_share
+        self.max_episodes = max_episodes
+        self.max_tainted = max_tainted
+        self.max_sources_per_address = max_sources_per_address
+        self.hash_sample_size = hash_sample_size
+        self.max_addresses_per_episode = max(max_addresses_per_episode, min_intermediates)
+
+        self.episodes: "OrderedDict[int, SplitEpisode]" = OrderedDict()
+        self._open_episode: Dict[str, int] = {}  # whale -> episode still accepting outflows
+        # address -> [[episode id, remaining ETH, depth], ...]; value = (sources, tainted at)
+        self.tainted: "OrderedDict[str, tuple]" = OrderedDict()
+        self._next_id = 0
+
+        self.stats = {
+            'episodes_opened': 0,
+            'episodes_expired': 0,
+            'episodes_evicted': 0,
+            'addresses_evicted': 0,
+            'exchange_inflows_matched': 0,
+            'flagged': 0
+        }
+
+    # ==================== Ingestion ====================
+
+    def observe(
+        self,
+        tx: Dict[str, Any],
+        whale_address: Optional[str] = None,
+        to_exchange: bool = False
+    ) -> Optional[SplitEpisode]:
+        """
+        Feed one decoded transfer.
+
+        Args:
+            tx: Transaction (from, to, value in wei, timestamp, hash)
+            whale_address: Configured whale address if the sender is a watched whale
+            to_exchange: Recipient is a known exchange
+
+        Returns:
+            The episode if this transfer made it cross the threshold, else None
+        """
+        value = (tx.get('value') or 0) / WEI_PER_ETH
+        recipient = tx.get('to')
+        timestamp = tx.get('timestamp')
+        if value <= 0 or not recipient or timestamp is None:
+            return None
+
+        if whale_address is not None:
+            if not to_exchange:
+                self._record_outflow(whale_address, recipient, value, timestamp, tx.get('hash', ''))
+            return None
+
+        entry = self.tainted.get(tx.get('from') or '')
+        if entry is None:
+            return None
+        return self._spend(tx['from'], entry[0], recipient, value, timestamp, tx.get('hash', ''), to_exchange)
+
+    def observe_block(
+        self,
+        transactions: List[Dict[str, Any]],
+        whales: Dict[str, str],
+        exchanges: Any
+    ) -> List[SplitEpisode]:
+        """
+        Feed all transfers of a block.
+
+        Args:
+            transactions: Decoded transactions (lowercase addresses)
+            whales: Lowercase whale address -> configured address
+            exchanges: Set of lowercase exchange addresses
+
+        Returns:
+            Episodes flagged by this block
+        """
+        if transactions:
+            self.expire(transactions[0]['timestamp'])
+
+        flagged = []
+        for tx in transactions:
+            episode = self.observe(tx, whales.get(tx['from']), tx['to'] in exchanges)
+            if episode is not None:
+                flagged.append(episode)
+        return flagged
+
+    def _record_outflow(
+        self,
+        whale_address: str,
+        recipient: str,
+        value: float,
+        timestamp: datetime,
+        tx_hash: str
+    ) -> None:
+        """Open or extend the whale's episode and taint the recipient."""
+        episode = self.episodes.get(self._open_episode.get(whale_address, -1))
+        if episode is None or timestamp - episode.started_at > self.group_window or episode.flagged:
+            episode = SplitEpisode(
+                episode_id=self._next_id,
+                whale_address=whale_address,
+                started_at=timestamp,
+                outflow_hashes=BoundedSample(self.hash_sample_size),
+                recipients=BoundedSample(self.hash_sample_size),
+                exchange_tx_hashes=BoundedSample(self.hash_sample_size)
+            )
+            self._next_id += 1
+            self.episodes[episode.episode_id] = episode
+            self._open_episode[whale_address] = episode.episode_id
+            self.stats['episodes_opened'] += 1
+            while len(self.episodes) > self.max_episodes:
+                self._drop_episode(next(iter(self.episodes)))
+                self.stats['episodes_evicted'] += 1
+
+        episode.amount_eth += value
+        episode.outflow_hashes.append(tx_hash)
+        episode.recipients.append(recipient)
+        self._taint(recipient, episode.episode_id, value, 1, timestamp)
+
+    def _taint(self, address: str, episode_id: int, amount: float, depth: int, timestamp: datetime) -> None:
+        entry = self.tainted.pop(address, None)
+        sources = entry[0] if entry is not None else []
+        for source in sources:
+            if source[0] == episode_id:
+                source[1] += amount
+                source[2] = min(source[2], depth)
+                break
+        else:
+            sources.append([episode_id, amount, depth])
+            if len(sources) > self.max_sources_per_address:
+                sources.pop(0)
+
+        # Re-inserted at the end: the map stays ordered by last taint time
+        self.tainted[address] = (sources, timestamp)
+        while len(self.tainted) > self.max_tainted:
+            self.tainted.popitem(last=False)
+            self.stats['addresses_evicted'] += 1
+
+    def _spend(
+        self,
+        sender: str,
+        sources: List[list],
+        recipient: str,
+        value: float,
+        timestamp: datetime,
+        tx_hash: str,
+        to_exchange: bool
+    ) -> Optional[SplitEpisode]:
+        """Attribute a transfer out of a tainted address to its episodes (FIFO)."""
+        left = value
+        crossed = None
+
+        for source in list(sources):
+            if left <= 0:
+                break
+            episode_id, remaining, depth = source
+            episode = self.episodes.get(episode_id)
+            if episode is None:
+                sources.remove(source)
+                continue
+
+            take = min(left, remaining)
+            if to_exchange:
+                left -= take
+                source[1] -= take
+                if self._credit(episode, sender, recipient, take, timestamp, tx_hash):
+                    crossed = episode
+            elif depth < self.max_depth and take >= self.min_forward_share * episode.amount_eth:
+                left -= take
+                source[1] -= take
+                self._taint(recipient, episode_id, take, depth + 1, timestamp)
+            else:
+                continue
+
+            if source[1] <= 1e-9:
+                sources.remove(source)
+
+        if not sources:
+            self.tainted.pop(sender, None)
+        return crossed
+
+    def _credit(
+        self,
+        episode: SplitEpisode,
+        sender: str,
+        exchange: str,
+        amount: float,
+        timestamp: datetime,
+        tx_hash: str
+    ) -> bool:
+        """Add an exchange inflow to an episode; True if it crossed the threshold now."""
+        episode.exchange_amount_eth += amount
+        if not _add_capped(episode.exchanges, exchange, amount, self.max_addresses_per_episode):
+            episode.other_exchanges_eth += amount
+        if not _add_capped(episode.intermediates, sender, amount, self.max_addresses_per_episode):
+            episode.other_intermediates_eth += amount
+        episode.exchange_tx_hashes.append(tx_hash)
+        episode.last_exchange_at = timestamp
+        self.stats['exchange_inflows_matched'] += 1
+
+        if (
+            not episode.flagged
+            and episode.amount_eth >= self.min_amount_eth
+            and len(episode.intermediates) >= self.min_intermediates
+            and episode.share >= self.share_threshold
+        ):
+            episode.flagged = True
+            self.stats['flagged'] += 1
+            return True
+        return False
+
+    # ==================== Expiry ====================
+
+    def expire(self, now: datetime) -> None:
+        """Drop episodes and taint older than the window (chain time)."""
+        cutoff = now - self.window
+        while self.episodes:
+            episode = next(iter(self.episodes.values()))
+            if episode.started_at >= cutoff:
+                break
+            self._drop_episode(episode.episode_id)
+            self.stats['episodes_expired'] += 1
+
+        while self.tainted:
+            _, (_, tainted_at) = next(iter(self.tainted.items()))
+            if tainted_at >= cutoff:
+                break
+            self.tainted.popitem(last=False)
+
+    def _drop_episode(self, episode_id: int) -> None:
+        episode = self.episodes.pop(episode_id)
+        if self._open_episode.get(episode.whale_address) == episode_id:
+            del self._open_episode[episode.whale_address]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get detector statistics."""
+        return {
+            **self.stats,
+            'episodes': len(self.episodes),
+            'tainted_addresses': len(self.tainted)
+        }
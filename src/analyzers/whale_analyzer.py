@@ -7,18 +7,21 @@ This module implements statistical analysis for detecting anomalous whale behavi
 - Statistical anomaly detection (threshold multiplier approach)
 - Pattern recognition for whale dumping signals
 
+History of all whales lives in one columnar WhaleHistory store
+(see whale_history.py), so fleet-wide queries are vectorized.
+
 Inspired by: whale_agent/whale_agent.py (open interest analysis)
 Adapted for: On-chain wallet transaction analysis
 
 Author: Whale Tracker Project
 """
 
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
-from collections import deque
+
+from .whale_history import WhaleHistory, HistoryView, from_epoch_micros
 
 
 @dataclass
@@ -33,6 +36,7 @@ class TransactionStats:
     transaction_count: int
     avg_frequency_hours: float
     last_seen: datetime
+    ewma_frequency_hours: float = 0.0
 
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -45,6 +49,7 @@ class TransactionStats:
             'min_amount_usd': self.min_amount_usd,
             'transaction_count': self.transaction_count,
             'avg_frequency_hours': self.avg_frequency_hours,
+            'ewma_frequency_hours': self.ewma_frequency_hours,
             'last_seen': self.last_seen.isoformat() if isinstance(self.last_seen, datetime) else str(self.last_seen)
         }
 
@@ -73,7 +78,9 @@ class WhaleAnalyzer:
         self,
         anomaly_multiplier: float = 1.3,
         rolling_window_size: int = 10,
-        min_history_required: int = 5
+        min_history_required: int = 5,
+        frequency_ewma_alpha: float = 0.3,
+        expected_whales: int = 1024
     ):
         """
         Initialize WhaleAnalyzer.
@@ -82,18 +89,25 @@ class WhaleAnalyzer:
             anomaly_multiplier: Multiplier above average to trigger anomaly (default 1.3 = 30% above avg)
             rolling_window_size: Number of transactions to use for rolling average (default 10)
             min_history_required: Minimum number of transactions needed for analysis (default 5)
+            frequency_ewma_alpha: Weight of the newest interval in the EWMA frequency (default 0.3)
+            expected_whales: Number of whales to preallocate history for (grows as needed)
         """
         self.anomaly_multiplier = anomaly_multiplier
         self.rolling_window_size = rolling_window_size
         self.min_history_required = min_history_required
+        self.frequency_ewma_alpha = frequency_ewma_alpha
+
+        # Columnar history + incremental statistics of all whales
+        self.history = WhaleHistory(
+            max_length=rolling_window_size * 3,
+            rolling_window=rolling_window_size,
+            ewma_alpha=frequency_ewma_alpha,
+            initial_capacity=expected_whales
+        )
 
-        # Transaction history storage
-        # Format: {whale_address: deque of transaction amounts}
-        self.transaction_history: Dict[str, deque] = {}
-
-        # Timestamp history for frequency analysis
-        # Format: {whale_address: deque of timestamps}
-        self.timestamp_history: Dict[str, deque] = {}
+        # Read-only views: {whale_address: amounts / timestamps, oldest first}
+        self.transaction_history = HistoryView(self.history, self.history.get_amounts)
+        self.timestamp_history = HistoryView(self.history, self.history.get_timestamps)
 
     def add_transaction(
         self,
@@ -109,19 +123,15 @@ class WhaleAnalyzer:
             amount_usd: Transaction amount in USD
             timestamp: When the transaction occurred (default: now)
         """
-        if whale_address not in self.transaction_history:
-            self.transaction_history[whale_address] = deque(maxlen=self.rolling_window_size * 3)
-            self.timestamp_history[whale_address] = deque(maxlen=self.rolling_window_size * 3)
-
-        self.transaction_history[whale_address].append(amount_usd)
-
         if timestamp is None:
             timestamp = datetime.now()
-        self.timestamp_history[whale_address].append(timestamp)
+        self.history.add(whale_address, amount_usd, timestamp)
 
     def get_whale_stats(self, whale_address: str) -> Optional[TransactionStats]:
         """
-        Calculate statistics for a whale's transaction history.
+        Get statistics for a whale's transaction history.
+
+        Constant-time read of the incrementally maintained WhaleHistory row.
 
         Args:
             whale_address: Ethereum address of the whale
@@ -129,39 +139,26 @@ class WhaleAnalyzer:
         Returns:
             TransactionStats object or None if no history
         """
-        if whale_address not in self.transaction_history:
+        row = self.history.row_of(whale_address)
+        if row is None:
             return None
 
-        amounts = list(self.transaction_history[whale_address])
-        timestamps = list(self.timestamp_history[whale_address])
-
-        if not amounts:
-            return None
-
-        # Calculate basic statistics
-        avg_amount = np.mean(amounts)
-        median_amount = np.median(amounts)
-        std_dev = np.std(amounts) if len(amounts) > 1 else 0.0
-        max_amount = max(amounts)
-        min_amount = min(amounts)
-
-        # Calculate frequency (average hours between transactions)
-        avg_frequency_hours = 0.0
-        if len(timestamps) > 1:
-            time_diffs = [(timestamps[i] - timestamps[i-1]).total_seconds() / 3600
-                          for i in range(1, len(timestamps))]
-            avg_frequency_hours = np.mean(time_diffs)
+        return self._stats_from_summary(whale_address, self.history.row_summary(row))
 
+    @staticmethod
+    def _stats_from_summary(whale_address: str, summary: Mapping) -> TransactionStats:
+        """Build TransactionStats from one whale's WhaleHistory summary values."""
         return TransactionStats(
             whale_address=whale_address,
-            avg_amount_usd=float(avg_amount),
-            median_amount_usd=float(median_amount),
-            std_dev_usd=float(std_dev),
-            max_amount_usd=float(max_amount),
-            min_amount_usd=float(min_amount),
-            transaction_count=len(amounts),
-            avg_frequency_hours=avg_frequency_hours,
-            last_seen=timestamps[-1] if timestamps else datetime.now()
+            avg_amount_usd=float(summary['mean']),
+            median_amount_usd=float(summary['median']),
+            std_dev_usd=float(summary['std']),
+            max_amount_usd=float(summary['max']),
+            min_amount_usd=float(summary['min']),
+            transaction_count=int(summary['count']),
+            avg_frequency_hours=float(summary['avg_interval_hours']),
+            last_seen=from_epoch_micros(summary['last_seen']),
+            ewma_frequency_hours=float(summary['ewma_interval_hours'])
         )
 
     def detect_anomaly(
@@ -184,71 +181,95 @@ class WhaleAnalyzer:
         Returns:
             AnomalyResult with detection details
         """
-        if whale_address not in self.transaction_history:
-            return AnomalyResult(
-                is_anomaly=False,
-                current_amount=current_amount,
-                average_amount=0.0,
-                threshold=0.0,
-                multiplier=self.anomaly_multiplier,
-                confidence=0.0,
-                reason="No historical data available"
-            )
+        return self.detect_anomalies({whale_address: current_amount})[whale_address]
 
-        history = list(self.transaction_history[whale_address])
-
-        # Check if we have enough history
-        if len(history) < self.min_history_required:
-            return AnomalyResult(
-                is_anomaly=False,
-                current_amount=current_amount,
-                average_amount=0.0,
-                threshold=0.0,
-                multiplier=self.anomaly_multiplier,
-                confidence=0.0,
-                reason=f"Insufficient history (need {self.min_history_required}, have {len(history)})"
-            )
+    def detect_anomalies(self, current_amounts: Mapping[str, float]) -> Dict[str, AnomalyResult]:
+        """
+        Detect anomalies for many whales in one vectorized pass.
 
-        # Calculate rolling average
-        if len(history) <= self.rolling_window_size:
-            # Use all history if we don't have enough for full window
-            avg_amount = np.mean(history)
-        else:
-            # Use rolling window
-            df = pd.DataFrame({'amount': history})
-            rolling_avg = df['amount'].rolling(window=self.rolling_window_size).mean()
-            avg_amount = rolling_avg.iloc[-1]
+        Same rules as detect_anomaly(); rolling averages, thresholds and
+        confidences are computed as arrays over all whales at once.
+
+        Args:
+            current_amounts: {whale_address: current transaction amount in USD}
 
-        # Calculate threshold
-        threshold = avg_amount * self.anomaly_multiplier
+        Returns:
+            {whale_address: AnomalyResult}, in input order
+        """
+        results: Dict[str, AnomalyResult] = {}
+        addresses: List[str] = []
+        rows: List[int] = []
+
+        for whale_address, current_amount in current_amounts.items():
+            row = self.history.row_of(whale_address)
+            if row is None:
+                results[whale_address] = AnomalyResult(
+                    is_anomaly=False,
+                    current_amount=current_amount,
+                    average_amount=0.0,
+                    threshold=0.0,
+                    multiplier=self.anomaly_multiplier,
+                    confidence=0.0,
+                    reason="No historical data available"
+                )
+                continue
+
+            # Check if we have enough history
+            count = int(self.history.count[row])
+            if count < self.min_history_required:
+                results[whale_address] = AnomalyResult(
+                    is_anomaly=False,
+                    current_amount=current_amount,
+                    average_amount=0.0,
+                    threshold=0.0,
+                    multiplier=self.anomaly_multiplier,
+                    confidence=0.0,
+                    reason=f"Insufficient history (need {self.min_history_required}, have {count})"
+                )
+                continue
+
+            addresses.append(whale_address)
+            rows.append(row)
+
+        if rows:
+            row_index = np.array(rows, dtype=np.intp)
+            current = np.array([current_amounts[address] for address in addresses], dtype=np.float64)
+
+            # Rolling average (all history if we don't have enough for full window)
+            counts = self.history.count[row_index]
+            avg_amount = self.history.window_sum[row_index] / np.minimum(counts, self.rolling_window_size)
+
+            threshold = avg_amount * self.anomaly_multiplier
+            is_anomaly = current > threshold
+
+            # Confidence: how far above (or below) threshold
+            with np.errstate(divide='ignore', invalid='ignore'):
+                excess_ratio = (current - threshold) / threshold
+                ratio = np.where(threshold > 0, current / threshold, 0.0)
+                percentage_above = (current - avg_amount) / avg_amount * 100
+            confidence = np.where(
+                is_anomaly,
+                np.minimum(100.0, 50.0 + excess_ratio * 100),
+                np.maximum(0.0, 50.0 - (1 - ratio) * 50)
+            )
 
-        # Detect anomaly
-        is_anomaly = current_amount > threshold
+            for i, whale_address in enumerate(addresses):
+                if is_anomaly[i]:
+                    reason = f"Amount ${current[i]:,.0f} is {percentage_above[i]:.1f}% above avg ${avg_amount[i]:,.0f}"
+                else:
+                    reason = f"Amount ${current[i]:,.0f} is within normal range (avg: ${avg_amount[i]:,.0f})"
 
-        # Calculate confidence (how far above threshold)
-        if is_anomaly:
-            excess_ratio = (current_amount - threshold) / threshold
-            confidence = min(100.0, 50.0 + (excess_ratio * 100))
-        else:
-            ratio = current_amount / threshold if threshold > 0 else 0
-            confidence = max(0.0, 50.0 - ((1 - ratio) * 50))
+                results[whale_address] = AnomalyResult(
+                    is_anomaly=bool(is_anomaly[i]),
+                    current_amount=current_amounts[whale_address],
+                    average_amount=float(avg_amount[i]),
+                    threshold=float(threshold[i]),
+                    multiplier=self.anomaly_multiplier,
+                    confidence=float(confidence[i]),
+                    reason=reason
+                )
 
-        # Generate reason
-        if is_anomaly:
-            percentage_above = ((current_amount - avg_amount) / avg_amount * 100)
-            reason = f"Amount ${current_amount:,.0f} is {percentage_above:.1f}% above avg ${avg_amount:,.0f}"
-        else:
-            reason = f"Amount ${current_amount:,.0f} is within normal range (avg: ${avg_amount:,.0f})"
-
-        return AnomalyResult(
-            is_anomaly=is_anomaly,
-            current_amount=current_amount,
-            average_amount=float(avg_amount),
-            threshold=float(threshold),
-            multiplier=self.anomaly_multiplier,
-            confidence=float(confidence),
-            reason=reason
-        )
+        return {whale_address: results[whale_address] for whale_address in current_amounts}
 
     def detect_dump_pattern(
         self,
@@ -353,23 +374,28 @@ class WhaleAnalyzer:
 
     def clear_history(self, whale_address: str) -> None:
         """Clear transaction history for a whale."""
-        if whale_address in self.transaction_history:
-            del self.transaction_history[whale_address]
-        if whale_address in self.timestamp_history:
-            del self.timestamp_history[whale_address]
+        self.history.remove(whale_address)
 
     def get_all_whale_addresses(self) -> List[str]:
         """Get list of all whales being tracked."""
-        return list(self.transaction_history.keys())
+        return self.history.addresses()
 
     def export_stats(self) -> Dict:
-        """Export statistics for all tracked whales."""
+        """Export statistics for all tracked whales (one vectorized pass)."""
+        addresses = self.history.addresses()
+        if not addresses:
+            return {}
+
+        summary = self.history.summary(self.history.all_rows())
         return {
-            address: self.get_whale_stats(address).to_dict()
-            if self.get_whale_stats(address) else None
-            for address in self.get_all_whale_addresses()
+            address: self._stats_from_summary(address, {key: values[i] for key, values in summary.items()}).to_dict()
+            for i, address in enumerate(addresses)
         }
 
+    def get_memory_usage(self) -> Dict[str, float]:
+        """Memory footprint of the transaction history (see WhaleHistory.memory_usage)."""
+        return self.history.memory_usage()
+
 
 # Global instance
 _analyzer_instance = None
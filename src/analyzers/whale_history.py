@@ -0,0 +1,370 @@
+"""
+Whale History - Columnar Transaction History for All Whales
+============================================================
+
+Stores the recent transactions of every tracked whale in preallocated NumPy
+arrays instead of per-whale deques of Python objects:
+
+- amounts:    float64 [whales, max_length] ring buffers (unused slots are NaN)
+- order:      uint8   [whales, max_length] ring slots sorted by amount (binary
+              search + one shift per update), so median, min and max are
+              read without sorting
+- timestamps: int64   [whales, max_length] epoch microseconds
+- per-whale columns: head, count and the incrementally maintained
+  aggregates (Welford mean/M2, rolling-window sum, EWMA interval)
+
+Each whale owns one row (address -> row index). Rows of cleared whales are
+reused; the arrays grow by 1.5x when all rows are taken.
+
+Per whale with the default 30-transaction window this is ~0.6 KB against
+~3.5 KB for two deques of float/datetime objects (see
+benchmarks/bench_whale_history.py).
+
+Single-whale updates are O(1) for the running sums plus a binary search and
+one short shift of the sorted order; statistics for any set of whales are
+read in one vectorized pass (summary()), which is what fleet-wide queries
+such as export_stats and batch anomaly detection use.
+
+Author: Whale Tracker Project
+"""
+
+import sys
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+MICROS_PER_HOUR = 3600 * 10**6
+
+
+def to_epoch_micros(timestamp: datetime) -> int:
+    """Convert datetime to epoch microseconds (aware datetimes via UTC)."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_micros(micros: int) -> datetime:
+    """Convert epoch microseconds back to a naive datetime."""
+    return _EPOCH + timedelta(microseconds=int(micros))
+
+
+class WhaleHistory:
+    """
+    Columnar ring-buffer history with incremental statistics per whale.
+    """
+
+    def __init__(
+        self,
+        max_length: int,
+        rolling_window: int,
+        ewma_alpha: float = 0.3,
+        initial_capacity: int = 1024
+    ):
+        """
+        Initialize WhaleHistory.
+
+        Args:
+            max_length: Number of transactions kept per whale
+            rolling_window: Number of latest transactions in the rolling average
+            ewma_alpha: Weight of the newest interval in the EWMA (0-1)
+            initial_capacity: Number of whales to preallocate rows for
+        """
+        self.max_length = max_length
+        self.rolling_window = rolling_window
+        self.ewma_alpha = ewma_alpha
+        self.capacity = 0
+
+        # Empty rows: unused ring slots in order (they are NaN, the sorted tail)
+        self._fills = dict(self._COLUMNS, order=np.arange(max_length))
+
+        self._index: Dict[str, int] = {}
+        self._next_row = 0
+        self._free_rows: List[int] = []
+
+        self.amounts = np.empty((0, max_length), dtype=np.float64)
+        self.order = np.empty((0, max_length), dtype=np.min_scalar_type(max_length - 1))
+        self.timestamps = np.empty((0, max_length), dtype=np.int64)
+        self.head = np.empty(0, dtype=np.int32)
+        self.count = np.empty(0, dtype=np.int32)
+        self.mean = np.empty(0, dtype=np.float64)
+        self.m2 = np.empty(0, dtype=np.float64)
+        self.window_sum = np.empty(0, dtype=np.float64)
+        self.ewma = np.empty(0, dtype=np.float64)
+
+        self._grow(max(1, initial_capacity))
+
+    # Column name -> fill value of an empty row
+    _COLUMNS = {
+        'amounts': np.nan,
+        'order': None,  # per-instance fill, see _fills
+        'timestamps': 0,
+        'head': 0,
+        'count': 0,
+        'mean': 0.0,
+        'm2': 0.0,
+        'window_sum': 0.0,
+        'ewma': np.nan
+    }
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocate all columns with room for `capacity` whales."""
+        for name, fill in self._fills.items():
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+
+        self.capacity = capacity
+
+    def _allocate(self, address: str) -> int:
+        """Assign a row to a new whale (released rows first)."""
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            if self._next_row == self.capacity:
+                self._grow(self.capacity + max(1, self.capacity // 2))
+            row = self._next_row
+            self._next_row += 1
+
+        self._index[address] = row
+        return row
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def addresses(self) -> List[str]:
+        """Addresses of all whales with history."""
+        return list(self._index)
+
+    def row_of(self, address: str) -> Optional[int]:
+        """Row index of a whale (None if not tracked)."""
+        return self._index.get(address)
+
+    def add(self, address: str, amount: float, timestamp: datetime) -> None:
+        """
+        Append a transaction, evicting the whale's oldest one when its row is full.
+
+        Args:
+            address: Whale address
+            amount: Transaction amount in USD
+            timestamp: When the transaction occurred
+        """
+        row = self._index.get(address)
+        if row is None:
+            row = self._allocate(address)
+
+        max_length = self.max_length
+        n = int(self.count[row])
+        head = int(self.head[row])
+        amounts = self.amounts[row]
+        micros = to_epoch_micros(timestamp)
+
+        if n:
+            interval = (micros - int(self.timestamps[row, (head - 1) % max_length])) / MICROS_PER_HOUR
+            ewma = float(self.ewma[row])
+            self.ewma[row] = interval if np.isnan(ewma) else ewma + self.ewma_alpha * (interval - ewma)
+
+        evicted = float(amounts[head]) if n == max_length else None
+        leaving_window = float(amounts[(head - self.rolling_window) % max_length]) if n >= self.rolling_window else 0.0
+
+        self._insert_order(row, n, head, amount, evicted is not None)
+
+        amounts[head] = amount
+        self.timestamps[row, head] = micros
+        self.head[row] = (head + 1) % max_length
+        self.count[row] = min(n + 1, max_length)
+        self.window_sum[row] += amount - leaving_window
+
+        # Welford add, then remove the evicted value
+        mean, m2 = float(self.mean[row]), float(self.m2[row])
+        k = n + 1
+        delta = amount - mean
+        mean += delta / k
+        m2 += delta * (amount - mean)
+
+        if evicted is not None:
+            k -= 1
+            delta = evicted - mean
+            mean -= delta / k
+            m2 -= delta * (evicted - mean)
+
+        self.mean[row] = mean
+        self.m2[row] = m2
+
+        # Recompute running sums once per max_length evictions (floating-point drift)
+        if evicted is not None and head == max_length - 1:
+            self._resync(row)
+
+    def _insert_order(self, row: int, n: int, slot: int, amount: float, evicting: bool) -> None:
+        """Place ring slot `slot` (about to hold `amount`) in the row's sorted order."""
+        order = self.order[row]
+        if evicting:
+            # Slot is being overwritten: drop its old position first
+            i = int(np.flatnonzero(order[:n] == slot)[0])
+            order[i:n - 1] = order[i + 1:n]
+            n -= 1
+        j = int(np.searchsorted(self.amounts[row, order[:n]], amount))
+        order[j + 1:n + 1] = order[j:n]
+        order[j] = slot
+
+    def _resync(self, row: int) -> None:
+        """Recompute running sums of a row from its window."""
+        window = self.amounts[row, self._chronological(row)]
+        self.mean[row] = window.mean()
+        self.m2[row] = ((window - self.mean[row]) ** 2).sum()
+        self.window_sum[row] = window[-self.rolling_window:].sum()
+
+    def _chronological(self, row: int) -> np.ndarray:
+        """Ring positions of a row, oldest first."""
+        n = int(self.count[row])
+        return (int(self.head[row]) - n + np.arange(n)) % self.max_length
+
+    def get_amounts(self, address: str) -> np.ndarray:
+        """Amounts of a whale, oldest first (copy)."""
+        row = self._index[address]
+        return self.amounts[row, self._chronological(row)]
+
+    def get_timestamps(self, address: str) -> List[datetime]:
+        """Timestamps of a whale, oldest first."""
+        row = self._index[address]
+        return [from_epoch_micros(m) for m in self.timestamps[row, self._chronological(row)]]
+
+    def remove(self, address: str) -> None:
+        """Drop a whale's history and free its row."""
+        row = self._index.pop(address, None)
+        if row is None:
+            return
+
+        for name, fill in self._fills.items():
+            getattr(self, name)[row] = fill
+        self._free_rows.append(row)
+
+    def row_summary(self, row: int) -> Dict[str, float]:
+        """
+        Statistics of one whale (same keys as summary(), scalar values).
+
+        Args:
+            row: Row index (whale with at least one transaction)
+        """
+        n = int(self.count[row])
+        head = int(self.head[row])
+
+        ordered = self.amounts[row, self.order[row, :n]]
+        mid = n // 2
+        first_ts = int(self.timestamps[row, (head - n) % self.max_length])
+        last_ts = int(self.timestamps[row, (head - 1) % self.max_length])
+        ewma = float(self.ewma[row])
+
+        return {
+            'count': n,
+            'mean': float(self.mean[row]),
+            'median': float(ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2),
+            'std': float(np.sqrt(max(float(self.m2[row]), 0.0) / n)) if n > 1 else 0.0,
+            'min': float(ordered[0]),
+            'max': float(ordered[-1]),
+            'rolling_mean': float(self.window_sum[row]) / min(n, self.rolling_window),
+            'avg_interval_hours': (last_ts - first_ts) / MICROS_PER_HOUR / (n - 1) if n > 1 else 0.0,
+            'ewma_interval_hours': 0.0 if np.isnan(ewma) else ewma,
+            'last_seen': last_ts
+        }
+
+    def summary(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Statistics for many whales in one vectorized pass.
+
+        Args:
+            rows: Row indices (whales with at least one transaction)
+
+        Returns:
+            Dict of arrays aligned with `rows`: count, mean, median, std, min, max,
+            rolling_mean, avg_interval_hours, ewma_interval_hours, last_seen (epoch us)
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        positions = np.arange(len(rows))
+        counts = self.count[rows].astype(np.int64)
+        heads = self.head[rows].astype(np.int64)
+
+        # Gather in the maintained order; unused (NaN) slots are the tail of each row
+        ordered = np.take_along_axis(self.amounts[rows], self.order[rows].astype(np.intp), axis=1)
+        mid = counts // 2
+        upper = ordered[positions, mid]
+        lower = ordered[positions, np.maximum(mid - 1, 0)]
+
+        first_ts = self.timestamps[rows, (heads - counts) % self.max_length]
+        last_ts = self.timestamps[rows, (heads - 1) % self.max_length]
+        intervals = np.maximum(counts - 1, 1)
+
+        return {
+            'count': counts,
+            'mean': self.mean[rows],
+            'median': np.where(counts % 2 == 1, upper, (lower + upper) / 2),
+            'std': np.where(counts > 1, np.sqrt(np.maximum(self.m2[rows], 0.0) / np.maximum(counts, 1)), 0.0),
+            'min': ordered[:, 0],
+            'max': ordered[positions, counts - 1],
+            'rolling_mean': self.window_sum[rows] / np.minimum(counts, self.rolling_window),
+            'avg_interval_hours': np.where(counts > 1, (last_ts - first_ts) / MICROS_PER_HOUR / intervals, 0.0),
+            'ewma_interval_hours': np.nan_to_num(self.ewma[rows], nan=0.0),
+            'last_seen': last_ts
+        }
+
+    def all_rows(self) -> np.ndarray:
+        """Rows of all tracked whales, in insertion order of addresses()."""
+        return np.fromiter(self._index.values(), dtype=np.intp, count=len(self._index))
+
+    def memory_usage(self) -> Dict[str, float]:
+        """
+        Memory footprint of the store.
+
+        Returns:
+            Dict with whales, capacity, array_bytes, index_bytes, total_bytes, bytes_per_whale
+        """
+        array_bytes = sum(getattr(self, name).nbytes for name in self._fills)
+        # Dict plus its int row objects (address strings belong to the caller)
+        index_bytes = (
+            sys.getsizeof(self._index)
+            + sum(sys.getsizeof(row) for row in self._index.values())
+            + sys.getsizeof(self._free_rows)
+        )
+        total = array_bytes + index_bytes
+        return {
+            'whales': len(self._index),
+            'capacity': self.capacity,
+            'array_bytes': array_bytes,
+            'index_bytes': index_bytes,
+            'total_bytes': total,
+            'bytes_per_whale': total / max(len(self._index), 1)
+        }
+
+
+class HistoryView(Mapping):
+    """
+    Read-only address -> history mapping over a WhaleHistory column.
+
+    Keeps the dict-of-sequences interface of the former per-whale deques.
+    """
+
+    def __init__(self, history: WhaleHistory, getter: Callable[[str], object]):
+        self._history = history
+        self._getter = getter
+
+    def __getitem__(self, address: str):
+        if address not in self._history:
+            raise KeyError(address)
+        return self._getter(address)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._history.addresses())
+
+    def __len__(self) -> int:
+        return len(self._history)
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._history
@@ -0,0 +1,687 @@
+"""
+Chain Simulator - Deterministic Local Chain for Tests and Load Runs
+===================================================================
+
+Generates Ethereum-like blocks from a seed (same seed and parameters = same
+chain, byte for byte) with three kinds of traffic:
+
+- noise: transfers between a pool of ordinary addresses, a share of them
+  deposits to exchanges
+- whale activity: benign whale transfers to ordinary addresses (candidate
+  intermediates that mostly never reach an exchange)
+- planted dumps with ground truth in `events`:
+  * direct_dump:  whale -> exchange
+  * one_hop_dump: whale -> fresh address -> exchange a few blocks later,
+    sent with the whale's priority fee
+
+Balances and nonces are kept per block, so historical queries answer like
+an archive node. Blocks are generated ahead and revealed with mine(), which
+moves the head that 'latest', eth_blockNumber and the explorer see.
+
+MockChainServer serves the chain over JSON-RPC (single and batch calls)
+and the Etherscan API subset used by TransactionIndexer and NonceTracker:
+
+    chain = ChainSimulator(whale_count=200, seed=7)
+    server = MockChainServer(chain)
+    server.start()
+    web3_manager = Web3Manager(rpc_url=server.rpc_url)
+    tracker = NonceTracker(web3_manager, 'key', etherscan_url=server.etherscan_url)
+    chain.mine(10)
+    ...
+    server.stop()
+
+The server runs its own event loop in a background thread: web3.py's
+synchronous provider (used by AddressProfiler and the NonceTracker RPC
+fallback) blocks the calling thread, which would deadlock a server living
+on the caller's event loop.
+
+Simplifications: plain value transfers only (21000 gas, no contracts, no
+reverts), gas fees are not deducted from balances.
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import random
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from aiohttp import web
+
+
+WEI_PER_ETH = 10**18
+GWEI = 10**9
+TRANSFER_GAS = 21000
+
+# Priority fees ordinary senders pick from (Gwei); whales and their burners
+# use odd values so a fee match is meaningful
+COMMON_PRIORITY_FEES_GWEI = (0.05, 0.1, 0.5, 1.0, 1.5, 2.0)
+
+
+@dataclass
+class PlantedEvent:
+    """Ground truth of one planted dump."""
+    kind: str  # 'direct_dump' | 'one_hop_dump'
+    whale_address: str
+    exchange_address: str
+    amount_eth: float
+    whale_tx_hash: str
+    started_block: int
+    intermediate: Optional[str] = None
+    exchange_tx_hash: Optional[str] = None
+    completed_block: Optional[int] = None  # block of the transfer that reaches the exchange
+
+    @property
+    def completed(self) -> bool:
+        return self.completed_block is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ChainSimulator:
+    """
+    Seeded block generator with archive-style state queries.
+    """
+
+    def __init__(
+        self,
+        whale_addresses: Optional[List[str]] = None,
+        whale_count: int = 100,
+        exchange_addresses: Optional[List[str]] = None,
+        exchange_count: int = 20,
+        seed: int = 0,
+        start_block: int = 19_000_000,
+        start_timestamp: int = 1_700_000_000,
+        block_time_seconds: int = 12,
+        noise_per_block: float = 100.0,
+        noise_addresses: int = 10_000,
+        exchange_deposit_share: float = 0.1,
+        whale_transfer_rate: float = 0.1,
+        direct_dump_rate: float = 0.02,
+        one_hop_rate: float = 0.05,
+        dump_amount_eth: Tuple[float, float] = (500.0, 5000.0),
+        one_hop_delay_blocks: Tuple[int, int] = (25, 150),
+        whale_balance_eth: float = 100_000.0,
+        noise_balance_eth: float = 1_000.0,
+        chain_id: int = 1
+    ):
+        """
+        Initialize Chain Simulator.
+
+        Rates are expected counts per block (fractions are drawn, 2.5 means
+        2 or 3).
+
+        Args:
+            whale_addresses: Whale addresses (default: whale_count generated addresses)
+            whale_count: Number of generated whales if whale_addresses is None
+            exchange_addresses: Exchange deposit addresses (default: exchange_count generated)
+            exchange_count: Number of generated exchanges if exchange_addresses is None
+            seed: Random seed (also salts every generated address and hash)
+            start_block: Number of the first block
+            start_timestamp: Unix time of the first block
+            block_time_seconds: Seconds between blocks
+            noise_per_block: Ordinary transfers per block
+            noise_addresses: Size of the ordinary address pool
+            exchange_deposit_share: Share of noise transfers that go to an exchange
+            whale_transfer_rate: Benign whale -> ordinary address transfers per block
+            direct_dump_rate: Planted whale -> exchange dumps per block
+            one_hop_rate: Planted whale -> fresh address -> exchange dumps per block
+            dump_amount_eth: (min, max) amount of planted dumps
+            one_hop_delay_blocks: (min, max) blocks between the two legs of a one-hop dump
+            whale_balance_eth: Starting balance of every whale
+            noise_balance_eth: Starting balance of every ordinary address
+            chain_id: Served by eth_chainId (Web3Manager checks it against the network)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.seed = seed
+        self.start_block = start_block
+        self.start_timestamp = start_timestamp
+        self.block_time_seconds = block_time_seconds
+        self.noise_per_block = noise_per_block
+        self.exchange_deposit_share = exchange_deposit_share
+        self.whale_transfer_rate = whale_transfer_rate
+        self.direct_dump_rate = direct_dump_rate
+        self.one_hop_rate = one_hop_rate
+        self.dump_amount_eth = dump_amount_eth
+        self.one_hop_delay_blocks = one_hop_delay_blocks
+        self.chain_id = chain_id
+
+        self._rng = random.Random(seed)
+
+        self.whales = [a.lower() for a in whale_addresses] if whale_addresses else [
+            self._address('whale', i) for i in range(whale_count)
+        ]
+        self.exchanges = [a.lower() for a in exchange_addresses] if exchange_addresses else [
+            self._address('exchange', i) for i in range(exchange_count)
+        ]
+        self.noise = [self._address('noise', i) for i in range(noise_addresses)]
+
+        # Fee strategy per whale (Gwei, 3 decimals): repeated by its burners
+        self._whale_fee = {
+            whale: int(self._rng.uniform(0.2, 5.0) * 1000) * GWEI // 1000 for whale in self.whales
+        }
+        # Whales dump in a shuffled round robin, so dumps of one whale are far apart
+        self._dump_order = list(self.whales)
+        self._rng.shuffle(self._dump_order)
+        self._dump_cursor = 0
+
+        self._initial_balance: Dict[str, int] = {}
+        for whale in self.whales:
+            self._initial_balance[whale] = int(whale_balance_eth * WEI_PER_ETH)
+        for address in self.noise:
+            self._initial_balance[address] = int(noise_balance_eth * WEI_PER_ETH)
+
+        # Current (generation-time) state
+        self._balances: Dict[str, int] = dict(self._initial_balance)
+        self._nonces: Dict[str, int] = {}
+        self._base_fee = 20 * GWEI
+
+        # address -> ([block, ...], [value, ...]) after each block that changed it
+        self._balance_history: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._nonce_history: Dict[str, Tuple[List[int], List[int]]] = {}
+        # address -> transactions sent or received, in chain order
+        self._address_txs: Dict[str, List[Dict[str, Any]]] = {}
+
+        self.blocks: List[Dict[str, Any]] = []
+        self.events: List[PlantedEvent] = []
+        # block -> one-hop exchange legs due in that block
+        self._scheduled: Dict[int, List[PlantedEvent]] = {}
+        self._burners = 0
+
+        self.head = start_block - 1
+
+    # ==================== Generation ====================
+
+    def _address(self, kind: str, i: int) -> str:
+        return '0x' + hashlib.sha256(f"{self.seed}:{kind}:{i}".encode()).hexdigest()[:40]
+
+    def _hash(self, *parts: Any) -> str:
+        return '0x' + hashlib.sha256(':'.join(str(p) for p in (self.seed, *parts)).encode()).hexdigest()
+
+    def _draw_count(self, rate: float) -> int:
+        count = int(rate)
+        if self._rng.random() < rate - count:
+            count += 1
+        return count
+
+    def _next_dumping_whale(self) -> str:
+        whale = self._dump_order[self._dump_cursor % len(self._dump_order)]
+        self._dump_cursor += 1
+        return whale
+
+    @property
+    def latest_generated_block(self) -> int:
+        return self.start_block + len(self.blocks) - 1
+
+    def generate(self, count: int) -> int:
+        """
+        Generate blocks ahead of the head (not visible until mined).
+
+        Args:
+            count: Number of blocks to generate
+
+        Returns:
+            Number of the last generated block
+        """
+        for _ in range(count):
+            self._generate_block(self.latest_generated_block + 1)
+        return self.latest_generated_block
+
+    def mine(self, count: int = 1) -> int:
+        """
+        Reveal the next blocks, generating them if needed.
+
+        Args:
+            count: Number of blocks to reveal
+
+        Returns:
+            New head block number
+        """
+        target = self.head + count
+        if target > self.latest_generated_block:
+            self.generate(target - self.latest_generated_block)
+        self.head = target
+        return self.head
+
+    def _generate_block(self, number: int) -> None:
+        rng = self._rng
+        timestamp = self.block_timestamp(number)
+        self._base_fee = max(GWEI, int(self._base_fee * rng.uniform(0.9, 1.1)))
+
+        # (sender, recipient, value wei, priority fee wei, event, leg)
+        specs: List[Tuple[str, str, int, int, Optional[PlantedEvent], Optional[str]]] = []
+
+        for _ in range(self._draw_count(self.noise_per_block)):
+            sender = rng.choice(self.noise)
+            if rng.random() < self.exchange_deposit_share:
+                recipient = rng.choice(self.exchanges)
+            else:
+                recipient = rng.choice(self.noise)
+            value = min(int(rng.lognormvariate(0.0, 1.5) * WEI_PER_ETH), self._balances.get(sender, 0) // 2)
+            fee = int(rng.choice(COMMON_PRIORITY_FEES_GWEI) * GWEI)
+            specs.append((sender, recipient, value, fee, None, None))
+
+        for _ in range(self._draw_count(self.whale_transfer_rate)):
+            whale = rng.choice(self.whales)
+            value = int(rng.uniform(0.5, 50.0) * WEI_PER_ETH)
+            specs.append((whale, rng.choice(self.noise), value, self._whale_fee[whale], None, None))
+
+        for kind, rate in (('direct_dump', self.direct_dump_rate), ('one_hop_dump', self.one_hop_rate)):
+            for _ in range(self._draw_count(rate)):
+                whale = self._next_dumping_whale()
+                value = int(rng.uniform(*self.dump_amount_eth) * 1000) * WEI_PER_ETH // 1000
+                if value > self._balances.get(whale, 0):
+                    continue
+                event = PlantedEvent(
+                    kind=kind,
+                    whale_address=whale,
+                    exchange_address=rng.choice(self.exchanges),
+                    amount_eth=value / WEI_PER_ETH,
+                    whale_tx_hash='',
+                    started_block=number
+                )
+                if kind == 'direct_dump':
+                    specs.append((whale, event.exchange_address, value, self._whale_fee[whale], event, 'whale'))
+                else:
+                    event.intermediate = self._address('burner', self._burners)
+                    self._burners += 1
+                    specs.append((whale, event.intermediate, value, self._whale_fee[whale], event, 'whale'))
+                    due = number + rng.randint(*self.one_hop_delay_blocks)
+                    self._scheduled.setdefault(due, []).append(event)
+                self.events.append(event)
+
+        for event in self._scheduled.pop(number, []):
+            # Forward almost everything (what a burner would keep for gas)
+            value = self._balances.get(event.intermediate, 0) - WEI_PER_ETH // 100
+            if value > 0:
+                fee = self._whale_fee[event.whale_address]
+                specs.append((event.intermediate, event.exchange_address, value, fee, event, 'exchange'))
+
+        rng.shuffle(specs)
+
+        block_hash = self._hash('block', number)
+        transactions = []
+        for index, (sender, recipient, value, fee, event, leg) in enumerate(specs):
+            tx = self._apply(number, block_hash, index, sender, recipient, value, fee)
+            transactions.append(tx)
+            if leg == 'whale':
+                event.whale_tx_hash = tx['hash']
+                if event.kind == 'direct_dump':
+                    event.exchange_tx_hash = tx['hash']
+                    event.completed_block = number
+            elif leg == 'exchange':
+                event.exchange_tx_hash = tx['hash']
+                event.completed_block = number
+
+        self.blocks.append({
+            'number': hex(number),
+            'hash': block_hash,
+            'parentHash': self._hash('block', number - 1),
+            'timestamp': hex(timestamp),
+            'baseFeePerGas': hex(self._base_fee),
+            'gasLimit': hex(30_000_000),
+            'gasUsed': hex(TRANSFER_GAS * len(transactions)),
+            'miner': self._address('miner', 0),
+            'transactions': transactions
+        })
+
+    def _apply(
+        self,
+        number: int,
+        block_hash: str,
+        index: int,
+        sender: str,
+        recipient: str,
+        value: int,
+        priority_fee: int
+    ) -> Dict[str, Any]:
+        """Build a raw transaction and apply it to the state."""
+        nonce = self._nonces.get(sender, 0)
+        self._nonces[sender] = nonce + 1
+        self._record(self._nonce_history, sender, number, nonce + 1)
+
+        self._balances[sender] = self._balances.get(sender, 0) - value
+        self._balances[recipient] = self._balances.get(recipient, 0) + value
+        self._record(self._balance_history, sender, number, self._balances[sender])
+        self._record(self._balance_history, recipient, number, self._balances[recipient])
+
+        tx = {
+            'hash': self._hash('tx', number, index),
+            'blockHash': block_hash,
+            'blockNumber': hex(number),
+            'transactionIndex': hex(index),
+            'type': '0x2',
+            'chainId': hex(self.chain_id),
+            'from': sender,
+            'to': recipient,
+            'value': hex(value),
+            'nonce': hex(nonce),
+            'gas': hex(TRANSFER_GAS),
+            'gasPrice': hex(self._base_fee + priority_fee),
+            'maxFeePerGas': hex(2 * self._base_fee + priority_fee),
+            'maxPriorityFeePerGas': hex(priority_fee),
+            'input': '0x'
+        }
+        self._address_txs.setdefault(sender, []).append(tx)
+        if recipient != sender:
+            self._address_txs.setdefault(recipient, []).append(tx)
+        return tx
+
+    @staticmethod
+    def _record(history: Dict[str, Tuple[List[int], List[int]]], address: str, number: int, value: int) -> None:
+        blocks, values = history.setdefault(address, ([], []))
+        if blocks and blocks[-1] == number:
+            values[-1] = value
+        else:
+            blocks.append(number)
+            values.append(value)
+
+    # ==================== Queries (head-bounded) ====================
+
+    def block_timestamp(self, number: int) -> int:
+        return self.start_timestamp + (number - self.start_block) * self.block_time_seconds
+
+    def resolve_block(self, block: Union[int, str, None] = None) -> int:
+        """
+        Block number for a number, hex quantity or tag, capped at the head.
+
+        Raises:
+            ValueError: Unknown tag or malformed quantity
+        """
+        if block is None or block in ('latest', 'pending', 'safe', 'finalized'):
+            return self.head
+        if block == 'earliest':
+            return self.start_block
+        number = int(block, 16) if isinstance(block, str) else int(block)
+        return min(number, self.head)
+
+    def get_block(self, number: int, full_transactions: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Raw block (eth_getBlockByNumber format), None if not mined yet.
+        """
+        if not self.start_block <= number <= self.head:
+            return None
+        block = self.blocks[number - self.start_block]
+        if full_transactions:
+            return block
+        return {**block, 'transactions': [tx['hash'] for tx in block['transactions']]}
+
+    def get_balance(self, address: str, block: Union[int, str, None] = None) -> int:
+        """Balance in wei after the given block (default: head)."""
+        address = address.lower()
+        return self._lookup(self._balance_history, address, self.resolve_block(block),
+                            self._initial_balance.get(address, 0))
+
+    def get_transaction_count(self, address: str, block: Union[int, str, None] = None) -> int:
+        """Nonce (transactions sent) after the given block (default: head)."""
+        return self._lookup(self._nonce_history, address.lower(), self.resolve_block(block), 0)
+
+    @staticmethod
+    def _lookup(history, address: str, number: int, initial: int) -> int:
+        entry = history.get(address)
+        if entry is None:
+            return initial
+        blocks, values = entry
+        i = bisect.bisect_right(blocks, number)
+        return values[i - 1] if i > 0 else initial
+
+    def get_transactions(self, address: str, start_block: int = 0, end_block: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Raw transactions sent or received by an address, ascending, up to the head."""
+        end_block = self.head if end_block is None else min(end_block, self.head)
+        return [
+            tx for tx in self._address_txs.get(address.lower(), [])
+            if start_block <= int(tx['blockNumber'], 16) <= end_block
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get generation statistics."""
+        return {
+            'head': self.head,
+            'generated_blocks': len(self.blocks),
+            'transactions': sum(len(block['transactions']) for block in self.blocks),
+            'whales': len(self.whales),
+            'exchanges': len(self.exchanges),
+            'planted': {
+                kind: sum(1 for e in self.events if e.kind == kind)
+                for kind in ('direct_dump', 'one_hop_dump')
+            },
+            'completed_events': sum(1 for e in self.events if e.completed)
+        }
+
+
+class MockChainServer:
+    """
+    JSON-RPC and Etherscan endpoints for a ChainSimulator on 127.0.0.1.
+    """
+
+    def __init__(
+        self,
+        chain: ChainSimulator,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency_seconds: float = 0.0
+    ):
+        """
+        Initialize Mock Chain Server.
+
+        Args:
+            chain: Simulated chain to serve
+            host: Interface to bind
+            port: Port (0 = any free port)
+            latency_seconds: Delay before every reply (simulated provider round trip)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.chain = chain
+        self.host = host
+        self.port = port
+        self.latency_seconds = latency_seconds
+
+        # JSON-RPC method / Etherscan action -> calls (batch members counted one by one)
+        self.calls: Dict[str, int] = {}
+        self.http_requests = 0
+        self.url: Optional[str] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runner: Optional[web.AppRunner] = None
+
+        self._methods = {
+            'eth_chainId': lambda: hex(self.chain.chain_id),
+            'net_version': lambda: str(self.chain.chain_id),
+            'web3_clientVersion': lambda: 'MockChainServer/1.0',
+            'eth_blockNumber': lambda: hex(self.chain.head),
+            'eth_gasPrice': self._gas_price,
+            'eth_getBlockByNumber': self._get_block_by_number,
+            'eth_getBalance': lambda address, block='latest': hex(self.chain.get_balance(address, block)),
+            'eth_getTransactionCount': lambda address, block='latest': hex(
+                self.chain.get_transaction_count(address, block)
+            ),
+            'eth_getCode': lambda address, block='latest': '0x'
+        }
+
+    @property
+    def rpc_url(self) -> Optional[str]:
+        """JSON-RPC endpoint (Web3Manager(rpc_url=...))."""
+        return f"{self.url}/rpc" if self.url else None
+
+    @property
+    def etherscan_url(self) -> Optional[str]:
+        """Etherscan API endpoint (etherscan_url=... of TransactionIndexer / NonceTracker)."""
+        return f"{self.url}/api" if self.url else None
+
+    def start(self, timeout: float = 10.0) -> str:
+        """
+        Start serving in a background thread.
+
+        Args:
+            timeout: Seconds to wait for the server to come up
+
+        Returns:
+            Base URL (rpc_url / etherscan_url are derived from it)
+
+        Raises:
+            RuntimeError: Server did not start
+        """
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, args=(ready,), name='mock-chain-server', daemon=True)
+        self._thread.start()
+        ready.wait(timeout)
+        if self.url is None:
+            raise RuntimeError("Mock chain server failed to start")
+        self.logger.debug(f"Mock chain server listening on {self.url}")
+        return self.url
+
+    def stop(self) -> None:
+        """Stop serving and join the thread."""
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop = None
+        self._thread = None
+
+    def _serve(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._start_site())
+        except Exception as e:
+            self.logger.error(f"Error starting mock chain server: {e}")
+            loop.close()
+            return
+        finally:
+            ready.set()
+
+        loop.run_forever()
+        loop.run_until_complete(self._runner.cleanup())
+        loop.close()
+
+    async def _start_site(self) -> None:
+        app = web.Application()
+        app.router.add_post('/rpc', self._handle_rpc)
+        app.router.add_get('/api', self._handle_etherscan)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    # ==================== JSON-RPC ====================
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        payload = await request.json()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        if isinstance(payload, list):
+            return web.json_response([self._rpc_reply(call) for call in payload])
+        return web.json_response(self._rpc_reply(payload))
+
+    def _rpc_reply(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        method = call.get('method')
+        reply: Dict[str, Any] = {'jsonrpc': '2.0', 'id': call.get('id')}
+        self._count(method)
+
+        handler = self._methods.get(method)
+        if handler is None:
+            reply['error'] = {'code': -32601, 'message': f"the method {method} does not exist/is not available"}
+            return reply
+
+        try:
+            reply['result'] = handler(*(call.get('params') or []))
+        except (TypeError, ValueError) as e:
+            reply['error'] = {'code': -32602, 'message': f"invalid params: {e}"}
+        return reply
+
+    def _get_block_by_number(self, block: str, full_transactions: bool = False) -> Optional[Dict[str, Any]]:
+        if block in ('latest', 'pending', 'safe', 'finalized', 'earliest'):
+            number = self.chain.resolve_block(block)
+        else:
+            number = int(block, 16)
+        return self.chain.get_block(number, full_transactions)
+
+    def _gas_price(self) -> str:
+        block = self.chain.get_block(self.chain.head)
+        base_fee = int(block['baseFeePerGas'], 16) if block else 20 * GWEI
+        return hex(base_fee + GWEI)
+
+    # ==================== Etherscan ====================
+
+    async def _handle_etherscan(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        params = request.query
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        module, action = params.get('module'), params.get('action')
+        self._count(f"etherscan:{module}.{action}")
+
+        try:
+            if module == 'account' and action == 'txlist':
+                return web.json_response(self._txlist(params))
+            if module == 'account' and action == 'balance':
+                return web.json_response({
+                    'status': '1', 'message': 'OK',
+                    'result': str(self.chain.get_balance(params['address'], params.get('tag', 'latest')))
+                })
+            if module == 'proxy' and action == 'eth_getTransactionCount':
+                # Proxy replies are JSON-RPC shaped, without status / message
+                count = self.chain.get_transaction_count(params['address'], params.get('tag', 'latest'))
+                return web.json_response({'jsonrpc': '2.0', 'id': 1, 'result': hex(count)})
+        except (KeyError, ValueError) as e:
+            return web.json_response({'status': '0', 'message': 'NOTOK', 'result': f"Error! {e}"})
+
+        return web.json_response({'status': '0', 'message': 'NOTOK', 'result': 'Error! Missing Or invalid Action name'})
+
+    def _txlist(self, params) -> Dict[str, Any]:
+        transactions = self.chain.get_transactions(
+            params['address'],
+            int(params.get('startblock', 0)),
+            int(params.get('endblock', 99_999_999))
+        )
+        if params.get('sort') == 'desc':
+            transactions = transactions[::-1]
+
+        offset = int(params.get('offset', 0) or 0)
+        if offset:
+            page = max(1, int(params.get('page', 1)))
+            transactions = transactions[(page - 1) * offset:page * offset]
+
+        if not transactions:
+            return {'status': '0', 'message': 'No transactions found', 'result': []}
+
+        return {'status': '1', 'message': 'OK', 'result': [self._explorer_tx(tx) for tx in transactions]}
+
+    def _explorer_tx(self, tx: Dict[str, Any]) -> Dict[str, str]:
+        """Raw JSON-RPC transaction -> Etherscan txlist entry (decimal strings)."""
+        number = int(tx['blockNumber'], 16)
+        return {
+            'blockNumber': str(number),
+            'timeStamp': str(self.chain.block_timestamp(number)),
+            'hash': tx['hash'],
+            'nonce': str(int(tx['nonce'], 16)),
+            'blockHash': tx['blockHash'],
+            'transactionIndex': str(int(tx['transactionIndex'], 16)),
+            'from': tx['from'],
+            'to': tx['to'],
+            'value': str(int(tx['value'], 16)),
+            'gas': str(int(tx['gas'], 16)),
+            'gasPrice': str(int(tx['gasPrice'], 16)),
+            'isError': '0',
+            'txreceipt_status': '1',
+            'input': tx['input'],
+            'contractAddress': '',
+            'gasUsed': str(TRANSFER_GAS),
+            'confirmations': str(self.chain.head - number + 1)
+        }
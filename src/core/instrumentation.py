@@ -0,0 +1,452 @@
+"""
+Instrumentation - Call Costs, Hot-Path Spans and Metrics Export
+===============================================================
+
+Where cycle time and API quota go, measured in-process:
+
+- Calls: every outbound RPC / Etherscan / Telegram request, keyed by
+  (service, method), with a latency histogram, error count and bytes sent /
+  received. Web3Manager, TransactionIndexer, NonceTracker and TelegramNotifier
+  record into the shared instance (get_instrumentation()).
+- Spans: timed sections of the whale pipeline. Spans nest through a context
+  variable, so `check_whale` -> `one_hop` -> `signal.nonce` is recorded as the
+  path 'check_whale/one_hop/signal.nonce', also across asyncio tasks started
+  inside a span.
+- Export: Prometheus text format (MetricsExporter serves /metrics and
+  /metrics.json) or a JSON file written periodically by the orchestrator.
+  Nothing external is needed to read either.
+
+Pipeline methods are traced with the @traced(name) decorator, which records
+into the instance's `self.instrumentation`.
+
+Usage:
+    instrumentation = get_instrumentation()
+    with instrumentation.track_call('rpc', 'eth_getBalance') as call:
+        call.bytes_sent = len(body)
+        ...
+    with instrumentation.span('check_whale'):
+        ...
+
+Author: Whale Tracker Project
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aiohttp import web
+
+
+# Upper bounds (seconds) of the latency buckets; +Inf is implicit
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = 'whale_tracker'
+
+# Path of the innermost open span in the current task ('' = none)
+_current_span: contextvars.ContextVar[str] = contextvars.ContextVar('current_span', default='')
+
+
+@dataclass
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus semantics)."""
+    buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    counts: List[int] = field(init=False)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        # One slot per bucket plus the +Inf overflow
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float) -> None:
+        """Add one sample."""
+        seconds = max(seconds, 0.0)
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimated quantile, interpolated linearly inside its bucket.
+
+        Args:
+            fraction: Quantile (0-1)
+
+        Returns:
+            Seconds (0.0 without samples)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, ending with '+Inf'."""
+        pairs = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            pairs.append((f'{bound:g}', running))
+        pairs.append(('+Inf', self.count))
+        return pairs
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary (milliseconds)."""
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 2),
+            'avg_ms': round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.50) * 1000, 2),
+            'p95_ms': round(self.quantile(0.95) * 1000, 2),
+            'p99_ms': round(self.quantile(0.99) * 1000, 2),
+            'max_ms': round(self.max * 1000, 2),
+        }
+
+
+@dataclass
+class CallStats:
+    """Cost of one (service, method) pair."""
+    latency: Histogram
+    errors: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        return {
+            'calls': self.latency.count,
+            'errors': self.errors,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            **self.latency.to_dict()
+        }
+
+
+@dataclass
+class CallRecord:
+    """Filled in by the caller inside track_call()."""
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: bool = False
+
+
+def response_size(response) -> int:
+    """Body size from Content-Length (0 if the response is chunked)."""
+    length = getattr(response, 'content_length', None)
+    return length if isinstance(length, int) else 0
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: str) -> str:
+    """Prometheus label set."""
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+class Instrumentation:
+    """
+    Per-call and per-span metrics of one process.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize Instrumentation.
+
+        Args:
+            buckets: Latency bucket upper bounds in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.calls: Dict[Tuple[str, str], CallStats] = {}
+        self.spans: Dict[str, Histogram] = {}
+        self.span_errors: Dict[str, int] = {}
+        self.started_at = time.time()
+
+    # ============================================
+    # CALLS
+    # ============================================
+
+    def record_call(
+        self,
+        service: str,
+        method: str,
+        seconds: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        error: bool = False
+    ) -> None:
+        """
+        Record one outbound call.
+
+        Args:
+            service: 'rpc', 'etherscan', 'telegram', ...
+            method: JSON-RPC method / API action
+            seconds: Round-trip time
+            bytes_sent: Request body size
+            bytes_received: Response body size
+            error: Call failed (transport error, HTTP or API error)
+        """
+        stats = self.calls.get((service, method))
+        if stats is None:
+            stats = self.calls[(service, method)] = CallStats(latency=Histogram(self.buckets))
+        stats.latency.observe(seconds)
+        stats.bytes_sent += bytes_sent
+        stats.bytes_received += bytes_received
+        if error:
+            stats.errors += 1
+
+    @contextmanager
+    def track_call(self, service: str, method: str) -> Iterator[CallRecord]:
+        """
+        Time the enclosed call; an exception counts as an error and propagates.
+
+        Args:
+            service: Service name
+            method: Method name
+
+        Yields:
+            CallRecord for sizes and errors the caller handles itself
+        """
+        record = CallRecord()
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception:
+            record.error = True
+            raise
+        finally:
+            self.record_call(
+                service, method, time.perf_counter() - started,
+                record.bytes_sent, record.bytes_received, record.error
+            )
+
+    # ============================================
+    # SPANS
+    # ============================================
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[str]:
+        """
+        Time a section of the pipeline, nested under the enclosing span.
+
+        Args:
+            name: Span name (e.g. 'check_whale', 'signal.nonce')
+
+        Yields:
+            Full span path
+        """
+        parent = _current_span.get()
+        path = f'{parent}/{name}' if parent else name
+        token = _current_span.set(path)
+        started = time.perf_counter()
+        try:
+            yield path
+        except Exception:
+            self.span_errors[path] = self.span_errors.get(path, 0) + 1
+            raise
+        finally:
+            _current_span.reset(token)
+            histogram = self.spans.get(path)
+            if histogram is None:
+                histogram = self.spans[path] = Histogram(self.buckets)
+            histogram.observe(time.perf_counter() - started)
+
+    # ============================================
+    # EXPORT
+    # ============================================
+
+    def get_stats(self, service: Optional[str] = None) -> Dict:
+        """
+        Metrics as a dictionary.
+
+        Args:
+            service: Only calls of this service (and no spans), or None for everything
+
+        Returns:
+            Dict with 'calls' (service -> method -> stats) and 'spans' (path -> stats)
+        """
+        calls: Dict[str, Dict[str, Dict]] = {}
+        for (call_service, method), stats in sorted(self.calls.items()):
+            if service is None or call_service == service:
+                calls.setdefault(call_service, {})[method] = stats.to_dict()
+
+        if service is not None:
+            return calls.get(service, {})
+
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'calls': calls,
+            'spans': {
+                path: {**histogram.to_dict(), 'errors': self.span_errors.get(path, 0)}
+                for path, histogram in sorted(self.spans.items())
+            }
+        }
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+
+        def histogram_lines(name: str, labels: Dict[str, str], histogram: Histogram) -> None:
+            for le, cumulative in histogram.cumulative():
+                lines.append(f'{name}_bucket{_labels(**labels, le=le)} {cumulative}')
+            lines.append(f'{name}_sum{_labels(**labels)} {histogram.total:.6f}')
+            lines.append(f'{name}_count{_labels(**labels)} {histogram.count}')
+
+        calls = sorted(self.calls.items())
+        name = f'{METRIC_PREFIX}_call_duration_seconds'
+        lines += [f'# HELP {name} Round-trip time of outbound API calls.', f'# TYPE {name} histogram']
+        for (service, method), stats in calls:
+            histogram_lines(name, {'service': service, 'method': method}, stats.latency)
+
+        for suffix, attribute, help_text in (
+            ('call_errors_total', 'errors', 'Failed outbound API calls.'),
+            ('call_bytes_sent_total', 'bytes_sent', 'Request bytes of outbound API calls.'),
+            ('call_bytes_received_total', 'bytes_received', 'Response bytes of outbound API calls.'),
+        ):
+            name = f'{METRIC_PREFIX}_{suffix}'
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for (service, method), stats in calls:
+                lines.append(f'{name}{_labels(service=service, method=method)} {getattr(stats, attribute)}')
+
+        name = f'{METRIC_PREFIX}_span_duration_seconds'
+        lines += [f'# HELP {name} Duration of whale pipeline sections.', f'# TYPE {name} histogram']
+        for path, histogram in sorted(self.spans.items()):
+            histogram_lines(name, {'span': path}, histogram)
+
+        name = f'{METRIC_PREFIX}_span_errors_total'
+        lines += [f'# HELP {name} Pipeline sections that raised.', f'# TYPE {name} counter']
+        for path, errors in sorted(self.span_errors.items()):
+            lines.append(f'{name}{_labels(span=path)} {errors}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str) -> None:
+        """
+        Write get_stats() to a JSON file (atomically replaced).
+
+        Args:
+            path: Output file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        snapshot = {'timestamp': datetime.now().isoformat(), **self.get_stats()}
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temporary, path)
+
+    def reset(self) -> None:
+        """Drop all samples."""
+        self.calls.clear()
+        self.spans.clear()
+        self.span_errors.clear()
+        self.started_at = time.time()
+
+
+def traced(name: str):
+    """
+    Decorator running an async method inside self.instrumentation.span(name).
+
+    Args:
+        name: Span name
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            with self.instrumentation.span(name):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsExporter:
+    """
+    HTTP endpoint serving an Instrumentation: /metrics (Prometheus) and /metrics.json.
+    """
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, host: str = '127.0.0.1', port: int = 9108):
+        """
+        Initialize Metrics Exporter.
+
+        Args:
+            instrumentation: Metrics to serve (default: the shared instance)
+            host: Interface to bind
+            port: Port (0 = any free port)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.host = host
+        self.port = port
+        self.url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _prometheus(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.instrumentation.render_prometheus(),
+            content_type='text/plain',
+            headers={'X-Content-Type-Options': 'nosniff'}
+        )
+
+    async def _json(self, request: web.Request) -> web.Response:
+        return web.json_response(self.instrumentation.get_stats())
+
+    async def start(self) -> str:
+        """
+        Start serving.
+
+        Returns:
+            Base URL of the endpoint
+        """
+        app = web.Application()
+        app.router.add_get('/metrics', self._prometheus)
+        app.router.add_get('/metrics.json', self._json)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://{self.host}:{self.port}'
+        self.logger.info(f"Metrics endpoint at {self.url}/metrics")
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# Global instance
+_instrumentation_instance = None
+
+
+def get_instrumentation() -> Instrumentation:
+    """Get singleton instrumentation instance."""
+    global _instrumentation_instance
+    if _instrumentation_instance is None:
+        _instrumentation_instance = Instrumentation()
+    return _instrumentation_instance
@@ -0,0 +1,379 @@
+"""
+Provider Pool - Latency-Aware RPC Routing with Failover
+=======================================================
+
+Web3Manager used to send every request to the one URL _get_rpc_url()
+picked, so a slow or rate-limiting provider slowed down every check. The
+pool keeps all configured providers (Infura, Alchemy, Ankr, custom URLs) and
+routes each request to the fastest healthy one:
+
+- Score: moving average (EWMA) of each endpoint's latency, inflated by its
+  moving error rate. The lowest score wins; ties keep configuration order.
+- Quotas: an endpoint may have its own token bucket (requests/s). Endpoints
+  without a free token are passed over while another one has capacity.
+- Failover: a failed request is retried on the next best endpoint.
+- Eviction: an endpoint with `max_consecutive_failures` failures in a row,
+  or a moving error rate above `max_error_rate`, is evicted for
+  `eviction_seconds` (doubling on each repeated eviction, capped). After
+  that it is re-admitted on probation: one success restores it fully, one
+  failure evicts it again.
+- Probing: an endpoint idle for `probe_interval_seconds` gets the next
+  request, so a provider that was slow once is measured again.
+- Hedging (optional, for latency-critical reads): if the first endpoint has
+  not answered within its usual latency, the request is also sent to the
+  second best endpoint and the first answer wins.
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+from urllib.parse import urlparse
+
+from .rate_limiter import AsyncRateLimiter
+
+
+T = TypeVar('T')
+
+
+class ProviderUnavailable(Exception):
+    """No endpoint could serve the request."""
+
+
+class ProviderRejected(Exception):
+    """Endpoint answered, but refused to serve the request (rate limit, quota)."""
+
+
+@dataclass
+class ProviderEndpoint:
+    """Health and routing state of one RPC endpoint."""
+    name: str
+    url: str
+    priority: int
+    latency: Optional[float] = None  # EWMA seconds, None until the first answer
+    error_rate: float = 0.0          # EWMA of failures (0-1)
+    consecutive_failures: int = 0
+    evictions: int = 0               # Evictions since the last success
+    evicted_until: float = 0.0
+    probation: bool = False
+    in_flight: int = 0
+    last_used: float = 0.0           # Last request (pool creation until the first one)
+    stats: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(('requests', 'failures', 'evictions', 'hedges_won'), 0)
+    )
+
+    def is_evicted(self, now: float) -> bool:
+        """Check whether the endpoint is still out of rotation."""
+        return now < self.evicted_until
+
+    def to_dict(self, now: float) -> Dict:
+        """Convert to dictionary (the URL is left out, it may contain an API key)."""
+        return {
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'error_rate': round(self.error_rate, 3),
+            'state': 'evicted' if self.is_evicted(now) else 'probation' if self.probation else 'healthy',
+            'evicted_for_seconds': round(max(0.0, self.evicted_until - now), 1),
+            'in_flight': self.in_flight,
+            **self.stats
+        }
+
+
+def endpoint_name(url: str) -> str:
+    """Endpoint name from its URL: host (and port), never the path holding an API key."""
+    return urlparse(url).netloc or url
+
+
+class ProviderPool:
+    """
+    Routes requests across RPC endpoints by latency and health.
+
+    Usage:
+        pool = ProviderPool(['https://mainnet.infura.io/v3/KEY', 'https://rpc.ankr.com/eth'])
+        result = await pool.request(lambda endpoint: post(endpoint.url, payload))
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        quotas: Optional[Dict[str, float]] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        smoothing: float = 0.3,
+        error_penalty: float = 4.0,
+        initial_latency_seconds: float = 0.25,
+        max_consecutive_failures: int = 3,
+        max_error_rate: float = 0.5,
+        eviction_seconds: float = 30.0,
+        max_eviction_seconds: float = 600.0,
+        probe_interval_seconds: Optional[float] = 60.0,
+        hedge_after_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize Provider Pool.
+
+        Args:
+            urls: Endpoint URLs in preference order (duplicates are dropped)
+            quotas: Requests per second per endpoint, keyed by a fragment of
+                its name (e.g. {'infura': 10, 'ankr': 30}); unmatched endpoints are unlimited
+            rate_limiter: Limiter holding the quota buckets (default: own limiter)
+            smoothing: EWMA weight of the newest latency / error sample
+            error_penalty: Score multiplier per unit of error rate
+            initial_latency_seconds: Assumed latency of an endpoint not measured yet
+            max_consecutive_failures: Failures in a row that evict an endpoint
+            max_error_rate: Moving error rate that evicts an endpoint
+            eviction_seconds: First eviction period (doubles per repeated eviction)
+            max_eviction_seconds: Eviction period cap
+            probe_interval_seconds: Idle time after which an endpoint is probed, None = never
+            hedge_after_seconds: Delay before a hedged request goes to the second
+                endpoint (default: the first endpoint's moving latency)
+            clock: Time source (monotonic seconds)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.clock = clock
+
+        self.endpoints: List[ProviderEndpoint] = []
+        names: Set[str] = set()
+        for url in urls:
+            if not url or any(endpoint.url == url for endpoint in self.endpoints):
+                continue
+            # Same host with different keys: keep names unique for the stats
+            name = base = endpoint_name(url)
+            while name in names:
+                name = f'{base}#{len(names) + 1}'
+            names.add(name)
+            self.endpoints.append(ProviderEndpoint(
+                name=name, url=url, priority=len(self.endpoints), last_used=clock()
+            ))
+        if not self.endpoints:
+            raise ValueError("ProviderPool needs at least one endpoint URL")
+
+        self.smoothing = smoothing
+        self.error_penalty = error_penalty
+        self.initial_latency_seconds = initial_latency_seconds
+        self.max_consecutive_failures = max_consecutive_failures
+        self.max_error_rate = max_error_rate
+        self.eviction_seconds = eviction_seconds
+        self.max_eviction_seconds = max_eviction_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.hedge_after_seconds = hedge_after_seconds
+
+        self.rate_limiter = rate_limiter or AsyncRateLimiter()
+        self._quota_keys: Dict[str, str] = {}
+        for fragment, rate in (quotas or {}).items():
+            for endpoint in self.endpoints:
+                if fragment.lower() in endpoint.name.lower() and endpoint.url not in self._quota_keys:
+                    key = f'provider:{endpoint.name}'
+                    self.rate_limiter.configure(key, rate=rate)
+                    self._quota_keys[endpoint.url] = key
+
+        self.stats = dict.fromkeys(('requests', 'failovers', 'hedged', 'unavailable'), 0)
+
+    @property
+    def urls(self) -> List[str]:
+        """Endpoint URLs in configuration order."""
+        return [endpoint.url for endpoint in self.endpoints]
+
+    # ============================================
+    # ROUTING
+    # ============================================
+
+    def score(self, endpoint: ProviderEndpoint) -> float:
+        """Routing score (lower is better): moving latency inflated by the error rate."""
+        latency = endpoint.latency if endpoint.latency is not None else self.initial_latency_seconds
+        return latency * (1 + self.error_penalty * endpoint.error_rate)
+
+    def _has_quota(self, endpoint: ProviderEndpoint) -> bool:
+        key = self._quota_keys.get(endpoint.url)
+        return key is None or self.rate_limiter.available(key) >= 1
+
+    def ranked(self, exclude: Optional[Set[str]] = None) -> List[ProviderEndpoint]:
+        """
+        Endpoints in routing order.
+
+        Admitted endpoints come first: idle ones due for a probe, then by
+        score, with endpoints out of quota after those that have a free
+        token. Evicted endpoints follow, soonest re-admission first, so a
+        request still has somewhere to go when every endpoint is evicted.
+
+        Args:
+            exclude: URLs already tried for this request
+
+        Returns:
+            Endpoints, best first
+        """
+        now = self.clock()
+        candidates = [e for e in self.endpoints if not exclude or e.url not in exclude]
+
+        def admitted_order(endpoint: ProviderEndpoint):
+            probe_due = (
+                self.probe_interval_seconds is not None
+                and now - endpoint.last_used >= self.probe_interval_seconds
+            )
+            return (not probe_due, not self._has_quota(endpoint), self.score(endpoint), endpoint.priority)
+
+        admitted = sorted((e for e in candidates if not e.is_evicted(now)), key=admitted_order)
+        evicted = sorted((e for e in candidates if e.is_evicted(now)), key=lambda e: (e.evicted_until, e.priority))
+        return admitted + evicted
+
+    def select(self, exclude: Optional[Set[str]] = None) -> Optional[ProviderEndpoint]:
+        """Best endpoint for the next request (None if every endpoint is excluded)."""
+        ranked = self.ranked(exclude)
+        return ranked[0] if ranked else None
+
+    # ============================================
+    # HEALTH
+    # ============================================
+
+    def record_success(self, endpoint: ProviderEndpoint, seconds: float) -> None:
+        """Update an endpoint after an answer that took `seconds`."""
+        a = self.smoothing
+        endpoint.latency = seconds if endpoint.latency is None else a * seconds + (1 - a) * endpoint.latency
+        endpoint.error_rate = (1 - a) * endpoint.error_rate
+        endpoint.consecutive_failures = 0
+        endpoint.evictions = 0
+        if endpoint.probation:
+            endpoint.probation = False
+            self.logger.info(f"RPC endpoint {endpoint.name} re-admitted")
+
+    def record_failure(self, endpoint: ProviderEndpoint, error: Exception) -> None:
+        """Update an endpoint after a failed request; evicts it when unhealthy."""
+        a = self.smoothing
+        endpoint.error_rate = a + (1 - a) * endpoint.error_rate
+        endpoint.consecutive_failures += 1
+        endpoint.stats['failures'] += 1
+
+        if (
+            endpoint.probation
+            or endpoint.consecutive_failures >= self.max_consecutive_failures
+            or endpoint.error_rate > self.max_error_rate
+        ):
+            self._evict(endpoint, error)
+
+    def _evict(self, endpoint: ProviderEndpoint, error: Exception) -> None:
+        period = min(self.max_eviction_seconds, self.eviction_seconds * 2 ** endpoint.evictions)
+        endpoint.evictions += 1
+        endpoint.evicted_until = self.clock() + period
+        endpoint.probation = True
+        endpoint.consecutive_failures = 0
+        endpoint.stats['evictions'] += 1
+        self.logger.warning(f"RPC endpoint {endpoint.name} evicted for {period:.0f}s ({error})")
+
+    # ============================================
+    # REQUESTS
+    # ============================================
+
+    async def _attempt(self, endpoint: ProviderEndpoint, send: Callable[[ProviderEndpoint], Awaitable[T]]) -> T:
+        """Send on one endpoint within its quota and record the outcome."""
+        key = self._quota_keys.get(endpoint.url)
+        if key is not None:
+            await self.rate_limiter.acquire(key)
+
+        endpoint.in_flight += 1
+        endpoint.stats['requests'] += 1
+        endpoint.last_used = self.clock()
+        started = time.perf_counter()
+        try:
+            result = await send(endpoint)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.record_failure(endpoint, e)
+            raise
+        finally:
+            endpoint.in_flight -= 1
+
+        self.record_success(endpoint, time.perf_counter() - started)
+        return result
+
+    async def _hedged(
+        self,
+        primary: ProviderEndpoint,
+        send: Callable[[ProviderEndpoint], Awaitable[T]],
+        tried: Set[str]
+    ) -> T:
+        """Send on primary; if it is slower than usual, also on the next endpoint. First answer wins."""
+        tasks = {asyncio.ensure_future(self._attempt(primary, send)): primary}
+        delay = self.hedge_after_seconds
+        if delay is None:
+            delay = primary.latency if primary.latency is not None else self.initial_latency_seconds
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                secondary = self.select(exclude=tried)
+                if secondary is not None and not secondary.is_evicted(self.clock()):
+                    tried.add(secondary.url)
+                    self.stats['hedged'] += 1
+                    tasks[asyncio.ensure_future(self._attempt(secondary, send))] = secondary
+
+            error: Optional[Exception] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if len(tasks) > 1:
+                            tasks[task].stats['hedges_won'] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            # Let the losers unwind so their in-flight counts are settled
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    async def request(
+        self,
+        send: Callable[[ProviderEndpoint], Awaitable[T]],
+        hedge: bool = False,
+        max_attempts: Optional[int] = None
+    ) -> T:
+        """
+        Route a request, failing over to the next endpoint when it fails.
+
+        Args:
+            send: Sends the request to the given endpoint; raises on failure
+            hedge: Race the two best endpoints when the first is slow
+            max_attempts: Endpoints tried at most (default: all)
+
+        Returns:
+            The first successful result of send
+
+        Raises:
+            ProviderUnavailable: Every attempt failed (chained to the last error)
+        """
+        self.stats['requests'] += 1
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+
+        for attempt in range(max_attempts or len(self.endpoints)):
+            endpoint = self.select(exclude=tried)
+            if endpoint is None:
+                break
+            tried.add(endpoint.url)
+            if attempt:
+                self.stats['failovers'] += 1
+
+            try:
+                if hedge and len(self.endpoints) > 1:
+                    return await self._hedged(endpoint, send, tried)
+                return await self._attempt(endpoint, send)
+            except Exception as e:
+                last_error = e
+                self.logger.debug(f"RPC request failed on {endpoint.name}: {e}")
+
+        self.stats['unavailable'] += 1
+        raise ProviderUnavailable(f"All RPC endpoints failed: {last_error}") from last_error
+
+    def get_stats(self) -> Dict:
+        """Routing counters and per-endpoint health (by endpoint name)."""
+        now = self.clock()
+        return {
+            **self.stats,
+            'endpoints': {endpoint.name: endpoint.to_dict(now) for endpoint in self.endpoints}
+        }
@@ -0,0 +1,199 @@
+"""
+Async Rate Limiter - Token Bucket per Endpoint
+==============================================
+
+Non-blocking replacement for the time.sleep() based _rate_limit() helpers.
+
+Each endpoint (RPC network, Etherscan network, ...) gets its own token bucket:
+- rate: sustained requests per second
+- burst: how many requests may go out back-to-back after an idle period
+
+Callers reserve a token synchronously (no await between reading and updating
+the bucket), so reservations are handed out strictly in arrival order and
+concurrent callers queue fairly. Waiting is done with asyncio.sleep(), so the
+event loop keeps serving other tasks (scheduler jobs, Telegram sends) while a
+caller is throttled.
+
+Used by Web3Manager. crypto-multi-agent-system/tools/blockchain/rate_limiter.py
+is the same implementation for RPCManager and EtherscanClient - keep in sync.
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class BucketStats:
+    """Wait-time metrics for a single endpoint bucket."""
+    acquired: int = 0
+    throttled: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    waiting: int = 0
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        return {
+            'acquired': self.acquired,
+            'throttled': self.throttled,
+            'waiting': self.waiting,
+            'total_wait_ms': round(self.total_wait * 1000, 2),
+            'avg_wait_ms': round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0.0,
+            'max_wait_ms': round(self.max_wait * 1000, 2),
+        }
+
+
+@dataclass
+class TokenBucket:
+    """
+    Token bucket for one endpoint.
+
+    Tokens may go negative: a negative balance is the queue of callers that
+    already hold a reservation and are sleeping until their slot comes up.
+    """
+    rate: float
+    burst: int
+    tokens: float = field(init=False)
+    updated: float = field(init=False)
+    stats: BucketStats = field(default_factory=BucketStats)
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError(f"rate must be positive, got {self.rate}")
+        if self.burst < 1:
+            raise ValueError(f"burst must be >= 1, got {self.burst}")
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait for it.
+
+        Returns:
+            Delay in seconds (0.0 if a token was available immediately)
+        """
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def cancel(self) -> None:
+        """Give back a reservation whose caller stopped waiting."""
+        self.tokens = min(float(self.burst), self.tokens + 1)
+
+    def available(self) -> float:
+        """Tokens available right now (negative while callers are queued)."""
+        self._refill(time.monotonic())
+        return self.tokens
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter with per-endpoint budgets.
+
+    Usage:
+        limiter = AsyncRateLimiter(default_rate=10, default_burst=10)
+        limiter.configure('etherscan:ethereum', rate=5, burst=5)
+        await limiter.acquire('etherscan:ethereum')
+    """
+
+    def __init__(self, default_rate: float = 10.0, default_burst: int = 10):
+        """
+        Initialize limiter.
+
+        Args:
+            default_rate: Requests per second for endpoints without an explicit budget
+            default_burst: Burst capacity for endpoints without an explicit budget
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._budgets: Dict[str, Tuple[float, int]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def configure(self, endpoint: str, rate: float, burst: Optional[int] = None) -> None:
+        """
+        Set the budget for an endpoint.
+
+        Args:
+            endpoint: Endpoint key (e.g. network name)
+            rate: Requests per second
+            burst: Burst capacity (defaults to max(1, int(rate)))
+        """
+        burst = burst if burst is not None else max(1, int(rate))
+        self._budgets[endpoint] = (rate, burst)
+        # Rebuild the bucket so the new budget takes effect immediately (metrics are kept)
+        previous = self._buckets.get(endpoint)
+        self._buckets[endpoint] = TokenBucket(
+            rate=rate, burst=burst, stats=previous.stats if previous else BucketStats()
+        )
+
+    def _get_bucket(self, endpoint: str) -> TokenBucket:
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            rate, burst = self._budgets.get(endpoint, (self.default_rate, self.default_burst))
+            bucket = TokenBucket(rate=rate, burst=burst)
+            self._buckets[endpoint] = bucket
+        return bucket
+
+    async def acquire(self, endpoint: str) -> float:
+        """
+        Wait (without blocking the event loop) until a request to endpoint is allowed.
+
+        Args:
+            endpoint: Endpoint key
+
+        Returns:
+            Seconds spent waiting
+        """
+        bucket = self._get_bucket(endpoint)
+        delay = bucket.reserve()
+
+        if delay > 0:
+            bucket.stats.throttled += 1
+            bucket.stats.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                bucket.cancel()
+                raise
+            finally:
+                bucket.stats.waiting -= 1
+
+        bucket.stats.acquired += 1
+        bucket.stats.total_wait += delay
+        bucket.stats.max_wait = max(bucket.stats.max_wait, delay)
+        return delay
+
+    def available(self, endpoint: str) -> float:
+        """
+        Tokens an endpoint has right now, without reserving one.
+
+        Args:
+            endpoint: Endpoint key
+
+        Returns:
+            Available tokens (>= 1 means acquire() would not wait)
+        """
+        return self._get_bucket(endpoint).available()
+
+    def get_stats(self, endpoint: Optional[str] = None) -> Dict:
+        """
+        Get wait-time metrics.
+
+        Args:
+            endpoint: Single endpoint, or None for all endpoints
+
+        Returns:
+            Dict with metrics (per endpoint when endpoint is None)
+        """
+        if endpoint is not None:
+            bucket = self._buckets.get(endpoint)
+            return bucket.stats.to_dict() if bucket else BucketStats().to_dict()
+        return {name: bucket.stats.to_dict() for name, bucket in self._buckets.items()}
@@ -3,13 +3,20 @@ Web3 Manager - Enhanced Blockchain Interaction
 ===============================================
 
 This module handles all Web3 interactions including:
-- RPC connections with failover (Infura → Alchemy → Ankr)
+- RPC connections with failover (Infura → Alchemy → Ankr), routed by
+  latency and health through ProviderPool
 - Contract calls
 - Gas price monitoring
 - Network management
 - Transaction tracking
 - Mock mode for testing
 
+Every plain JSON-RPC read (blocks, balances, nonces, code, gas price) goes
+out over aiohttp through the ProviderPool, so it gets latency routing,
+per-provider quotas and failover. Contract calls (get_erc20_balance,
+call_contract_function) and get_transaction_receipt still use web3.py's
+single HTTPProvider on rpc_url; health_check reports that endpoint.
+
 Combined best features from:
 - lp_health_tracker/src/web3_utils.py (async, RPC failover)
 - crypto-multi-agent-system/tools/blockchain/rpc_manager.py (mock mode, is_contract, rate limiting)
@@ -18,18 +25,31 @@ Author: Whale Tracker Project
 """
 
 import os
+import json
 import logging
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from web3 import Web3
 from web3.exceptions import Web3Exception
 import aiohttp
 import asyncio
 from dotenv import load_dotenv
 
+from .rate_limiter import AsyncRateLimiter
+from .instrumentation import Instrumentation, get_instrumentation
+from .provider_pool import ProviderEndpoint, ProviderPool, ProviderRejected, endpoint_name
+
 # Load environment variables
 load_dotenv()
 
+# JSON-RPC error codes meaning "this provider won't serve you now" (fail over)
+PROVIDER_ERROR_CODES = {-32005, -32029, 429}
+
+
+def _block_tag(block: Union[int, str]) -> str:
+    """JSON-RPC block parameter: hex number or tag ('latest', 'pending', ...)."""
+    return hex(block) if isinstance(block, int) else block
+
 
 class Web3Manager:
     """
@@ -37,18 +57,39 @@ class Web3Manager:
 
     Features:
     - Async/await support
-    - RPC failover (Infura → Alchemy → Ankr)
+    - RPC failover (Infura → Alchemy → Ankr), latency-aware routing and
+      optional hedged reads across all configured providers
     - Mock mode for testing
     - Rate limiting
+    - Per-call latency / bytes instrumentation
     - Transaction tracking
     """
 
-    def __init__(self, mock_mode: bool = False):
+    def __init__(
+        self,
+        mock_mode: bool = False,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        rpc_url: Optional[str] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        rpc_urls: Optional[List[str]] = None,
+        provider_quotas: Optional[Dict[str, float]] = None,
+        hedge_reads: bool = False
+    ):
         """
         Initialize Web3Manager.
 
         Args:
             mock_mode: If True, return mock data instead of real RPC calls (for testing)
+            rate_limiter: Shared limiter (default: own limiter, 10 req/s with burst 10 per network)
+            rpc_url: RPC endpoint for the selected network, e.g. a local node or
+                MockChainServer (default: RPC_URL, else Infura / Alchemy / Ankr)
+            instrumentation: Per-call latency / bytes metrics (default: shared instance)
+            rpc_urls: Provider pool for the selected network, best first
+                (default: RPC_URLS, comma-separated, else every keyed provider)
+            provider_quotas: Requests per second per provider, keyed by a fragment
+                of its host (e.g. {'infura': 10}); others are unlimited
+            hedge_reads: Race the two best providers for block reads when the
+                first is slower than usual
         """
         self.logger = logging.getLogger(__name__)
         self.web3 = None #создаем пустое место куда после подключения запишем объект для связи с блокчейном
@@ -58,6 +99,17 @@ class Web3Manager:
         self.mock_mode = mock_mode
         self.call_counts: Dict[str, int] = {}
         self.last_call_time: Dict[str, float] = {}
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(default_rate=10, default_burst=10)
+        self.instrumentation = instrumentation or get_instrumentation()
+
+        # Local transaction history (src/storage/TransactionStore), attached by the orchestrator
+        self.transaction_store = None
+
+        # Provider routing (pool built on first use for the selected network)
+        self.provider_quotas = provider_quotas or {}
+        self.hedge_reads = hedge_reads
+        self.provider_pool: Optional[ProviderPool] = None
+        self._provider_pool_key: Optional[tuple] = None
 
         if mock_mode:
             self.logger.info("🔧 Web3Manager initialized in MOCK mode")
@@ -69,27 +121,44 @@ class Web3Manager:
                 'name': 'Ethereum Mainnet',
                 'chain_id': 1,
                 'rpc_url': self._get_rpc_url('ethereum_mainnet'),
+                'rpc_urls': self._get_rpc_urls('ethereum_mainnet'),
                 'explorer': 'https://etherscan.io'
             },
             'ethereum_sepolia': {
                 'name': 'Ethereum Sepolia Testnet',
                 'chain_id': 11155111,
                 'rpc_url': self._get_rpc_url('ethereum_sepolia'),
+                'rpc_urls': self._get_rpc_urls('ethereum_sepolia'),
                 'explorer': 'https://sepolia.etherscan.io'
             },
             'polygon': {
                 'name': 'Polygon',
                 'chain_id': 137,
                 'rpc_url': self._get_rpc_url('polygon'),
+                'rpc_urls': self._get_rpc_urls('polygon'),
                 'explorer': 'https://polygonscan.com'
             },
             'arbitrum': {
                 'name': 'Arbitrum One',
                 'chain_id': 42161,
                 'rpc_url': self._get_rpc_url('arbitrum'),
+                'rpc_urls': self._get_rpc_urls('arbitrum'),
                 'explorer': 'https://arbiscan.io'
             }
         }
+
+        rpc_url = rpc_url or os.getenv('RPC_URL')
+        if not rpc_urls:
+            rpc_urls = [url.strip() for url in os.getenv('RPC_URLS', '').split(',') if url.strip()]
+        if (rpc_url or rpc_urls) and self.network in self.networks:
+            urls = ([rpc_url] if rpc_url else []) + [url for url in rpc_urls if url != rpc_url]
+            self.networks[self.network]['rpc_url'] = urls[0]
+            self.networks[self.network]['rpc_urls'] = urls
+
+    @property
+    def w3(self) -> Optional[Web3]:
+        """Web3 instance (alias of self.web3, used by the analyzers)."""
+        return self.web3
     
     def _get_rpc_url(self, network: str) -> str:
         """
@@ -101,6 +170,19 @@ class Web3Manager:
         Returns:
             str: RPC URL
         """
+        return self._get_rpc_urls(network)[0]
+
+    def _get_rpc_urls(self, network: str) -> List[str]:
+        """
+        Get every configured RPC URL for a network, in priority order.
+
+        Args:
+            network: Network name
+
+        Returns:
+            List[str]: RPC URLs (Infura, Alchemy if keyed, Ankr always)
+        """
+        urls = []
         infura_key = os.getenv('INFURA_API_KEY')
         alchemy_key = os.getenv('ALCHEMY_API_KEY')
         ankr_key = os.getenv('ANKR_API_KEY')
@@ -114,7 +196,7 @@ class Web3Manager:
                 'arbitrum': f'https://arbitrum-mainnet.infura.io/v3/{infura_key}'
             }
             if network in infura_urls:
-                return infura_urls[network]
+                urls.append(infura_urls[network])
         
         # Alchemy URLs
         if alchemy_key:
@@ -125,7 +207,7 @@ class Web3Manager:
                 'arbitrum': f'https://arb-mainnet.alchemyapi.io/v2/{alchemy_key}'
             }
             if network in alchemy_urls:
-                return alchemy_urls[network]
+                urls.append(alchemy_urls[network])
         
         # Ankr URLs (free public endpoints)
         ankr_urls = {
@@ -135,7 +217,72 @@ class Web3Manager:
             'arbitrum': 'https://rpc.ankr.com/arbitrum'
         }
         
-        return ankr_urls.get(network, ankr_urls['ethereum_sepolia'])
+        urls.append(ankr_urls.get(network, ankr_urls['ethereum_sepolia']))
+        return urls
+
+    def _get_provider_pool(self) -> ProviderPool:
+        """
+        Provider pool of the selected network.
+
+        The pool is rpc_urls when rpc_url is one of them; an rpc_url set on
+        its own (e.g. a local node) replaces the list. Rebuilt when either changes.
+        """
+        config = self.networks[self.network]
+        urls = config.get('rpc_urls') or []
+        if config['rpc_url'] not in urls:
+            urls = [config['rpc_url']]
+
+        key = (self.network, tuple(urls))
+        if self._provider_pool_key != key:
+            self.provider_pool = ProviderPool(urls, quotas=self.provider_quotas, rate_limiter=self.rate_limiter)
+            self._provider_pool_key = key
+        return self.provider_pool
+
+    async def _post_json(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+        method: str,
+        hedge: bool = False
+    ) -> Any:
+        """
+        POST a JSON-RPC payload through the provider pool.
+
+        Transport errors, HTTP errors and provider-side JSON-RPC errors (rate
+        limits, quota) fail over to the next provider; other JSON-RPC errors
+        are returned as answered.
+
+        Args:
+            session: aiohttp session
+            payload: Single call or batch
+            method: Method name for instrumentation
+            hedge: Race the two best providers if the first is slow
+
+        Returns:
+            Decoded JSON response
+        """
+        body = json.dumps(payload).encode()
+
+        async def send(endpoint: ProviderEndpoint) -> Any:
+            with self.instrumentation.track_call('rpc', method) as call:
+                call.bytes_sent = len(body)
+                async with session.post(endpoint.url, data=body, headers={'Content-Type': 'application/json'},
+                                        timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    response.raise_for_status()
+                    raw = await response.read()
+                call.bytes_received = len(raw)
+                data = json.loads(raw)
+
+                error = data.get('error') if isinstance(data, dict) else None
+                call.error = error is not None
+                if isinstance(error, dict) and (
+                    error.get('code') in PROVIDER_ERROR_CODES
+                    or 'rate limit' in str(error.get('message', '')).lower()
+                ):
+                    raise ProviderRejected(f"{endpoint.name}: {error.get('message', error)}")
+            return data
+
+        return await self._get_provider_pool().request(send, hedge=hedge)
     
     async def initialize(self) -> bool:
         """
@@ -189,14 +336,11 @@ class Web3Manager:
             Optional[int]: Gas price in Wei, None if error
         """
         try:
-            if not self.web3:
+            result = await self._rpc_call('eth_gasPrice', [])
+            if result is None:
                 return None
-            
-            gas_price = self.web3.eth.gas_price
-            #ы обращаемся к нашему объекту подключения self.web3, 
-            # заходим в его модуль для работы с Ethereum (eth) и запрашиваем свойство gas_price. 
-            # В этот момент ваша программа отправляет запрос в блокчейн и получает в ответ 
-            # текущую цену газа. Цена возвращается в самой маленькой единице, называемой Wei.
+            # eth_gasPrice through the provider pool; the price comes back in Wei
+            gas_price = int(result, 16)
             self.logger.debug(f"Current gas price: {Web3.from_wei(gas_price, 'gwei')} Gwei")
             #Эта строка не обязательна для работы, она нужна для отладки. 
             # Она записывает в журнал цену, которую мы получили, но переводит её из Wei 
@@ -218,25 +362,150 @@ class Web3Manager:
         Returns:
             Optional[float]: Balance in ETH, None if error
         """
-        try:
-            if not self.web3:
-                return None
-            
-            # Convert to checksum address #приводим адрес к стандартному формату
-            address = Web3.to_checksum_address(address)
-            
-            # Get balance in Wei
-            balance_wei = self.web3.eth.get_balance(address)
-            
-            # Convert to ETH для удобства чтения
-            balance_eth = Web3.from_wei(balance_wei, 'ether')
-            
-            return float(balance_eth)
-            
-        except Exception as e:
-            self.logger.error(f"Error getting ETH balance for {address}: {e}")
+        balance_wei = await self.get_balance_wei(address)
+        if balance_wei is None:
+            return None
+
+        # Convert to ETH для удобства чтения
+        return float(Web3.from_wei(balance_wei, 'ether'))
+
+    async def get_balance_wei(self, address: str, block: Union[int, str] = 'latest') -> Optional[int]:
+        """
+        Get ETH balance in Wei, optionally at a past block (routed by the provider pool).
+
+        Args:
+            address: Wallet address
+            block: Block number or tag (past blocks need an archive node)
+
+        Returns:
+            Optional[int]: Balance in Wei, None if error
+        """
+        if self.mock_mode:
+            return 1000 * 10**18
+
+        if not Web3.is_address(address):
+            self.logger.error(f"Invalid address: {address}")
             return None
+
+        result = await self._rpc_call('eth_getBalance', [Web3.to_checksum_address(address), _block_tag(block)])
+        return int(result, 16) if result is not None else None
     
+    async def get_balance(self, address: str) -> Optional[float]:
+        """
+        Get ETH balance for address (alias used by SimpleWhaleWatcher).
+
+        Args:
+            address: Wallet address
+
+        Returns:
+            Optional[float]: Balance in ETH, None if error
+        """
+        return await self.get_eth_balance(address)
+
+    async def get_balances_batch(
+        self,
+        addresses: List[str],
+        block: Union[int, str] = 'latest',
+        batch_size: int = 100
+    ) -> Dict[str, Optional[float]]:
+        """
+        Get ETH balances for many addresses with JSON-RPC batch requests.
+
+        Instead of one eth_getBalance round trip per address, the queries are
+        packed into JSON-RPC batches of batch_size calls each, so a sweep of
+        500 whales costs 5 HTTP requests. Batches are sent concurrently.
+
+        Args:
+            addresses: Wallet addresses
+            block: Block number or tag ('latest', 'pending', ...)
+            batch_size: Max calls per JSON-RPC batch (providers cap this, ~100-1000)
+
+        Returns:
+            Dict[str, Optional[float]]: Balance in ETH per address (as passed in),
+            None for invalid addresses or failed calls
+        """
+        if self.mock_mode:
+            return {address: 1000.0 for address in addresses}
+
+        balances: Dict[str, Optional[float]] = {address: None for address in addresses}
+
+        # Validate once, keep original spelling as the result key
+        valid = []
+        for address in addresses:
+            if Web3.is_address(address):
+                valid.append(address)
+            else:
+                self.logger.error(f"Invalid address: {address}")
+
+        if not valid:
+            return balances
+
+        block_tag = _block_tag(block)
+        chunks = [valid[i:i + batch_size] for i in range(0, len(valid), batch_size)]
+
+        async with aiohttp.ClientSession() as session:
+            chunk_results = await asyncio.gather(
+                *(self._fetch_balance_chunk(session, chunk, block_tag) for chunk in chunks)
+            )
+
+        for chunk_balances in chunk_results:
+            balances.update(chunk_balances)
+
+        return balances
+
+    async def _fetch_balance_chunk(
+        self,
+        session: aiohttp.ClientSession,
+        addresses: List[str],
+        block_tag: str
+    ) -> Dict[str, Optional[float]]:
+        """
+        Send one JSON-RPC batch of eth_getBalance calls (routed by the provider pool).
+
+        Args:
+            session: Shared aiohttp session
+            addresses: Addresses in this batch
+            block_tag: Hex block number or block tag
+
+        Returns:
+            Dict[str, Optional[float]]: Balance in ETH per address
+        """
+        payload = [
+            {
+                'jsonrpc': '2.0',
+                'id': request_id,
+                'method': 'eth_getBalance',
+                'params': [Web3.to_checksum_address(address), block_tag]
+            }
+            for request_id, address in enumerate(addresses)
+        ]
+
+        try:
+            await self._rate_limit('get_balances_batch')
+
+            data = await self._post_json(session, payload, 'eth_getBalance[batch]')
+
+            # A provider that rejects the whole batch answers with a single error object
+            if not isinstance(data, list):
+                self.logger.error(f"Batch balance request rejected: {data}")
+                return {address: None for address in addresses}
+
+            results: Dict[str, Optional[float]] = {address: None for address in addresses}
+            for item in data:
+                request_id = item.get('id')
+                if not isinstance(request_id, int) or not 0 <= request_id < len(addresses):
+                    continue
+                if 'error' in item or item.get('result') is None:
+                    self.logger.error(f"Error getting ETH balance for {addresses[request_id]}: {item.get('error')}")
+                    continue
+                results[addresses[request_id]] = float(Web3.from_wei(int(item['result'], 16), 'ether'))
+
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error in batch balance request ({len(addresses)} addresses): {e}")
+            return {address: None for address in addresses}
+
     async def get_erc20_balance(self, token_address: str, wallet_address: str) -> Optional[float]:
         """
         Эта функция сложнее: она проверяет баланс не основной монеты, 
@@ -407,20 +676,17 @@ class Web3Manager:
     # ENHANCED METHODS (from rpc_manager.py)
     # ============================================
 
-    def _rate_limit(self, operation: str):
+    async def _rate_limit(self, operation: str):
         """
-        Simple rate limiting to avoid hitting RPC limits.
+        Rate limiting to avoid hitting RPC limits.
+
+        Waits for a token from the current network's bucket without blocking
+        the event loop, so concurrent callers queue in arrival order.
 
         Args:
             operation: Operation name for tracking
         """
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time.get(operation, 0)
-
-        # Minimum interval between calls (100ms)
-        min_interval = 0.1
-        if time_since_last < min_interval:
-            time.sleep(min_interval - time_since_last)
+        await self.rate_limiter.acquire(self.network)
 
         self.last_call_time[operation] = time.time()
         self.call_counts[operation] = self.call_counts.get(operation, 0) + 1
@@ -440,31 +706,27 @@ class Web3Manager:
             contract_indicators = ["0x000000", "0x111111", "0xdead"]
             return any(indicator in address.lower() for indicator in contract_indicators)
 
-        try:
-            if not self.web3:
-                return False
-
-            self._rate_limit('is_contract')
-
-            checksum_address = Web3.to_checksum_address(address)
-            code = self.web3.eth.get_code(checksum_address)
+        if not Web3.is_address(address):
+            self.logger.error(f"Invalid address: {address}")
+            return False
 
-            # If there is code, it's a contract
-            is_contract = len(code) > 0
-            self.logger.debug(f"Address {address} is {'contract' if is_contract else 'EOA'}")
+        code = await self._rpc_call('eth_getCode', [Web3.to_checksum_address(address), 'latest'])
+        if code is None:
+            return False
 
-            return is_contract
+        # If there is code ('0x' = none), it's a contract
+        is_contract = len(code) > 2
+        self.logger.debug(f"Address {address} is {'contract' if is_contract else 'EOA'}")
 
-        except Exception as e:
-            self.logger.error(f"Error checking address type {address}: {e}")
-            return False
+        return is_contract
 
-    async def get_transaction_count(self, address: str) -> Optional[int]:
+    async def get_transaction_count(self, address: str, block: Union[int, str] = 'latest') -> Optional[int]:
         """
-        Get transaction count (nonce) for an address.
+        Get transaction count (nonce) for an address, optionally at a past block.
 
         Args:
             address: Address to check
+            block: Block number or tag (past blocks need an archive node)
 
         Returns:
             Optional[int]: Transaction count, None if error
@@ -478,27 +740,84 @@ class Web3Manager:
             }
             return mock_counts.get(address[:10], 5)
 
+        # Validate address
+        if not Web3.is_address(address):
+            self.logger.error(f"Invalid address: {address}")
+            return None
+
+        result = await self._rpc_call(
+            'eth_getTransactionCount', [Web3.to_checksum_address(address), _block_tag(block)]
+        )
+        if result is None:
+            return None
+
+        count = int(result, 16)
+        self.logger.debug(f"Address {address} has {count} transactions")
+        return count
+
+    async def _rpc_call(self, method: str, params: List[Any], hedge: bool = False) -> Any:
+        """
+        Send a single JSON-RPC call over aiohttp (does not block the event loop).
+
+        Args:
+            method: JSON-RPC method name
+            params: JSON-RPC params
+            hedge: Race the two best providers if the first is slow
+
+        Returns:
+            The 'result' field (raw hex-encoded JSON), or None on error
+        """
+        payload = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params}
+
         try:
-            if not self.web3:
-                return None
+            await self._rate_limit(method)
 
-            self._rate_limit('get_transaction_count')
+            async with aiohttp.ClientSession() as session:
+                data = await self._post_json(session, payload, method, hedge=hedge)
 
-            # Validate address
-            if not Web3.is_address(address):
-                self.logger.error(f"Invalid address: {address}")
+            if 'error' in data:
+                self.logger.error(f"RPC error for {method}: {data['error']}")
                 return None
 
-            checksum_address = Web3.to_checksum_address(address)
-            count = self.web3.eth.get_transaction_count(checksum_address)
-
-            self.logger.debug(f"Address {address} has {count} transactions")
-            return count
+            return data.get('result')
 
         except Exception as e:
-            self.logger.error(f"Error getting transaction count for {address}: {e}")
+            self.logger.error(f"RPC call {method} failed: {e}")
             return None
 
+    async def get_block_number(self) -> Optional[int]:
+        """
+        Get the latest block number.
+
+        Returns:
+            Optional[int]: Latest block number or None on error
+        """
+        if self.mock_mode:
+            return 19000000
+
+        result = await self._rpc_call('eth_blockNumber', [], hedge=self.hedge_reads)
+        return int(result, 16) if result else None
+
+    async def get_block(self, block_number: int, full_transactions: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get a block with its transactions (raw JSON-RPC format, hex-encoded fields).
+
+        Args:
+            block_number: Block number
+            full_transactions: Include full transaction objects instead of hashes
+
+        Returns:
+            Optional[Dict]: Raw block, or None if not available yet / on error
+        """
+        if self.mock_mode:
+            return {
+                'number': hex(block_number),
+                'timestamp': hex(int(time.time())),
+                'transactions': []
+            }
+
+        return await self._rpc_call('eth_getBlockByNumber', [hex(block_number), full_transactions], hedge=self.hedge_reads)
+
     async def get_recent_transactions(
         self,
         address: str,
@@ -507,7 +826,7 @@ class Web3Manager:
     ) -> List[Dict[str, Any]]:
         """
         Get recent transactions for an address.
-        Note: This requires Etherscan API integration (Phase 2).
+        Note: Requires a local TransactionStore (set self.transaction_store).
 
         Args:
             address: Address to check
@@ -529,8 +848,11 @@ class Web3Manager:
                 }
             ]
 
-        # TODO: Implement Etherscan API integration in Phase 2
-        self.logger.warning("get_recent_transactions requires Etherscan API (not implemented in MVP)")
+        # Served from the local transaction index (src/storage), if attached
+        if self.transaction_store is not None:
+            return await self.transaction_store.get_recent_transactions(address, limit, direction)
+
+        self.logger.warning("get_recent_transactions requires a transaction store (none attached)")
         return []
 
     async def health_check(self) -> Dict[str, Any]:
@@ -544,18 +866,22 @@ class Web3Manager:
             return {"mock_mode": True, "status": "healthy"}
 
         try:
-            if not self.web3:
-                return {"status": "disconnected", "connected": False}
-
-            # Simple check - get latest block
-            latest_block = self.web3.eth.block_number
+            # Simple check - get latest block (through the provider pool)
+            latest_block = await self.get_block_number()
+            if latest_block is None:
+                return {"status": "unhealthy", "connected": False, "error": "no provider answered eth_blockNumber"}
 
             return {
                 "status": "healthy",
                 "connected": True,
                 "network": self.network,
                 "latest_block": latest_block,
-                "call_counts": self.call_counts
+                "call_counts": self.call_counts,
+                "rpc_calls": self.instrumentation.get_stats('rpc'),
+                "rpc_providers": self._get_provider_pool().get_stats(),
+                # Contract calls / receipts: web3.py, single endpoint, no failover
+                "contract_call_provider": endpoint_name(self.networks[self.network]['rpc_url']) if self.web3 else None,
+                "rate_limiter": self.rate_limiter.get_stats()
             }
 
         except Exception as e:
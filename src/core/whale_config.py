@@ -13,10 +13,19 @@ These addresses are used for:
 2. Classifying transaction destinations (exchange vs unknown)
 3. One-hop tracking validation
 
+Lookups go through AddressIndex: 20-byte binary keys (any address casing),
+a category bitmask per address and an inverted tag index. Large labeled
+lists (e.g. exchange deposit addresses) can be bulk loaded from CSV/Parquet.
+
 Author: Whale Tracker Project
 """
 
-from typing import Dict, List, Optional
+import csv
+import logging
+from pathlib import Path
+
+import numpy as np
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -56,6 +65,334 @@ class WhaleMetadata:
         }
 
 
+# One bit per category (UNKNOWN = no bits). Enum order is the priority when
+# an address is in several categories.
+CATEGORY_BITS: Dict[WhaleCategory, int] = {
+    category: 1 << i
+    for i, category in enumerate(c for c in WhaleCategory if c is not WhaleCategory.UNKNOWN)
+}
+_CATEGORY_MASK = 0xFF
+_EXCHANGE_BIT = CATEGORY_BITS[WhaleCategory.EXCHANGE]
+_DEFI_PROTOCOL_BIT = CATEGORY_BITS[WhaleCategory.DEFI_PROTOCOL]
+_KNOWN_WHALE_BIT = CATEGORY_BITS[WhaleCategory.KNOWN_WHALE]
+_BRIDGE_BIT = CATEGORY_BITS[WhaleCategory.BRIDGE]
+
+
+def address_key(address: str) -> Optional[bytes]:
+    """
+    20-byte binary key of a hex address in any casing.
+
+    Returns:
+        bytes, or None if address is not a 40-hex-digit address
+    """
+    if not address:
+        return None
+    hex_part = address[2:] if address[:2] in ('0x', '0X') else address
+    if len(hex_part) != 40:
+        return None
+    try:
+        return bytes.fromhex(hex_part)
+    except (TypeError, ValueError):
+        return None
+
+
+class AddressIndex:
+    """
+    Normalized address classification index.
+
+    - key: 20-byte address (casing can't cause misses)
+    - value: category bitmask | label id << 8 (one int per address)
+    - inverted indexes: tag -> keys, category -> keys
+    - prefilter: bitmap over the first 20 address bits. classify_many() decodes
+      all addresses of a block in one call and tests the bitmap with NumPy;
+      only the few hits are looked up in the dict
+    """
+
+    PREFIX_BITS = 20
+
+    def __init__(self):
+        """Initialize empty index."""
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._entries: Dict[bytes, int] = {}
+        self._labels: List[str] = ['']
+        self._label_ids: Dict[str, int] = {'': 0}
+        self._tags_of: Dict[bytes, Tuple[str, ...]] = {}
+        self._tag_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._by_tag: Dict[str, Set[bytes]] = {}
+        self._by_category: Dict[WhaleCategory, Set[bytes]] = {category: set() for category in CATEGORY_BITS}
+
+        # Curated entries keep their full metadata (and checksum address)
+        self._metadata: Dict[bytes, WhaleMetadata] = {}
+
+        self._prefilter = bytearray(1 << (self.PREFIX_BITS - 3))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, address: object) -> bool:
+        return isinstance(address, str) and self._key_if_present(address) is not None
+
+    def might_contain(self, address: str) -> bool:
+        """
+        Prefilter check for one address.
+
+        Returns:
+            False if address is definitely not indexed
+        """
+        key = address_key(address)
+        if key is None:
+            return False
+        prefix = int.from_bytes(key[:3], 'big') >> (24 - self.PREFIX_BITS)
+        return bool(self._prefilter[prefix >> 3] & (1 << (prefix & 7)))
+
+    def _key_if_present(self, address: str) -> Optional[bytes]:
+        """Binary key of an indexed address, None otherwise."""
+        key = address_key(address)
+        return key if key in self._entries else None
+
+    def add(
+        self,
+        address: str,
+        category: WhaleCategory,
+        name: str = '',
+        tags: Iterable[str] = ()
+    ) -> bool:
+        """
+        Add an address (categories and tags merge with existing entries).
+
+        Args:
+            address: Hex address in any casing
+            category: Address category
+            name: Human-readable label
+            tags: Tags for get_addresses_by_tag
+
+        Returns:
+            True if added/merged, False if address is invalid
+        """
+        key = address_key(address)
+        if key is None or category not in CATEGORY_BITS:
+            return False
+
+        value = self._entries.get(key, 0)
+        label_id = value >> 8
+        if not label_id and name:
+            label_id = self._label_ids.setdefault(name, len(self._labels))
+            if label_id == len(self._labels):
+                self._labels.append(name)
+        self._entries[key] = (value & _CATEGORY_MASK) | CATEGORY_BITS[category] | (label_id << 8)
+        self._by_category[category].add(key)
+
+        tags = tuple(tag for tag in tags if tag)
+        if tags:
+            merged = tuple(dict.fromkeys(self._tags_of.get(key, ()) + tags))
+            self._tags_of[key] = self._tag_tuples.setdefault(merged, merged)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+
+        prefix = int.from_bytes(key[:3], 'big') >> (24 - self.PREFIX_BITS)
+        self._prefilter[prefix >> 3] |= 1 << (prefix & 7)
+        return True
+
+    def add_metadata(self, metadata: WhaleMetadata, listed_as: Optional[WhaleCategory] = None) -> bool:
+        """
+        Add a curated address with its full metadata.
+
+        Args:
+            metadata: Address metadata
+            listed_as: Category of the list the address is curated in, if it
+                       differs from metadata.category (e.g. an institutional
+                       holder listed among known whales)
+        """
+        if not self.add(metadata.address, metadata.category, metadata.name, metadata.tags):
+            return False
+        if listed_as is not None:
+            self.add(metadata.address, listed_as)
+        self._metadata.setdefault(address_key(metadata.address), metadata)
+        return True
+
+    def get_mask(self, address: str) -> int:
+        """Category bitmask of an address (0 if unknown)."""
+        # Hot path: decode inline (a wrong length can't match a 20-byte key)
+        try:
+            value = self._entries.get(bytes.fromhex(address[2:] if address[:2] in ('0x', '0X') else address))
+        except (TypeError, ValueError):
+            return 0
+        return value & _CATEGORY_MASK if value else 0
+
+    def has_category(self, address: str, category: WhaleCategory) -> bool:
+        """Check if address is in a category."""
+        return bool(self.get_mask(address) & CATEGORY_BITS.get(category, 0))
+
+    def classify_many(self, addresses: Iterable[str]) -> Dict[str, int]:
+        """
+        Category bitmasks of the known addresses among many (e.g. a block).
+
+        Returns:
+            {address: bitmask} for indexed addresses only
+        """
+        batch = [address for address in addresses if address]
+        if not batch:
+            return {}
+
+        # Decode the whole batch in one call ('x' only occurs in 0x prefixes)
+        try:
+            raw = bytes.fromhex(''.join(batch).replace('0x', '').replace('0X', ''))
+        except (TypeError, ValueError):
+            raw = b''
+        if len(raw) != 20 * len(batch):
+            # Some entry isn't a 0x-prefixed 40-hex-digit address - classify one by one
+            result = {}
+            for address in batch:
+                mask = self.get_mask(address)
+                if mask:
+                    result[address] = mask
+            return result
+
+        result = {}
+
+        # Prefilter: first PREFIX_BITS of every key against the bitmap, vectorized
+        keys = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 20).astype(np.uint32)
+        prefixes = ((keys[:, 0] << 16) | (keys[:, 1] << 8) | keys[:, 2]) >> (24 - self.PREFIX_BITS)
+        bitmap = np.frombuffer(self._prefilter, dtype=np.uint8)
+        candidates = np.flatnonzero((bitmap[prefixes >> 3] >> (prefixes & 7)) & 1)
+
+        for i in candidates.tolist():
+            value = self._entries.get(raw[i * 20:(i + 1) * 20])
+            if value:
+                result[batch[i]] = value & _CATEGORY_MASK
+        return result
+
+    @staticmethod
+    def primary_category(mask: int) -> WhaleCategory:
+        """Highest-priority category in a bitmask."""
+        for category, bit in CATEGORY_BITS.items():
+            if mask & bit:
+                return category
+        return WhaleCategory.UNKNOWN
+
+    def get_metadata(self, address: str) -> Optional[WhaleMetadata]:
+        """Metadata of an address (built from the index for bulk-loaded entries)."""
+        key = self._key_if_present(address)
+        if key is None:
+            return None
+
+        metadata = self._metadata.get(key)
+        if metadata is not None:
+            return metadata
+
+        value = self._entries[key]
+        return WhaleMetadata(
+            address=self._address_of(key),
+            name=self._labels[value >> 8] or 'Labeled Address',
+            category=self.primary_category(value & _CATEGORY_MASK),
+            tags=list(self._tags_of.get(key, ()))
+        )
+
+    def _address_of(self, key: bytes) -> str:
+        """Address string of a key (checksum for curated entries)."""
+        metadata = self._metadata.get(key)
+        return metadata.address if metadata is not None else '0x' + key.hex()
+
+    def addresses(self) -> List[str]:
+        """All indexed addresses."""
+        return [self._address_of(key) for key in self._entries]
+
+    def addresses_by_tag(self, tag: str) -> List[str]:
+        """Addresses with a tag (inverted index)."""
+        return [self._address_of(key) for key in self._by_tag.get(tag, ())]
+
+    def addresses_by_category(self, category: WhaleCategory) -> List[str]:
+        """Addresses in a category (inverted index)."""
+        return [self._address_of(key) for key in self._by_category.get(category, ())]
+
+    def load_records(
+        self,
+        records: Iterable[Mapping],
+        default_category: WhaleCategory = WhaleCategory.EXCHANGE
+    ) -> int:
+        """
+        Bulk load labeled addresses.
+
+        Args:
+            records: Mappings with 'address' and optional 'name' (or 'label'),
+                     'category' (WhaleCategory value) and 'tags' ('|' or ';' separated)
+            default_category: Category for records without a valid one
+
+        Returns:
+            Number of addresses loaded
+        """
+        categories = {category.value: category for category in CATEGORY_BITS}
+        loaded = 0
+        skipped = 0
+
+        for record in records:
+            raw_category = str(record.get('category') or '').strip().lower()
+            category = categories.get(raw_category, default_category)
+
+            raw_tags = record.get('tags') or ''
+            if isinstance(raw_tags, str):
+                tags = [tag.strip() for tag in raw_tags.replace(';', '|').split('|')]
+            else:
+                tags = [str(tag).strip() for tag in raw_tags]
+
+            name = record.get('name') or record.get('label') or ''
+            if self.add(str(record.get('address') or '').strip(), category, str(name).strip(), tags):
+                loaded += 1
+            else:
+                skipped += 1
+
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} records without a valid address")
+        return loaded
+
+    def load_file(self, path: str, default_category: WhaleCategory = WhaleCategory.EXCHANGE) -> int:
+        """
+        Bulk load a CSV or Parquet file (by extension).
+
+        Args:
+            path: .csv or .parquet file with an 'address' column
+            default_category: Category for rows without a valid one
+
+        Returns:
+            Number of addresses loaded (0 on error)
+        """
+        path = Path(path)
+        try:
+            if path.suffix.lower() == '.parquet':
+                import pandas as pd  # Needs pyarrow or fastparquet
+
+                frame = pd.read_parquet(path)
+                loaded = self.load_records(frame.to_dict('records'), default_category)
+            else:
+                with open(path, newline='', encoding='utf-8') as f:
+                    loaded = self.load_records(csv.DictReader(f), default_category)
+        except ImportError as e:
+            self.logger.error(f"Cannot read {path} (Parquet support not installed): {e}")
+            return 0
+        except Exception as e:
+            self.logger.error(f"Error loading address labels from {path}: {e}")
+            return 0
+
+        self.logger.info(f"Loaded {loaded} labeled addresses from {path}")
+        return loaded
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate memory footprint of the index (bytes)."""
+        import sys
+
+        key_bytes = sum(sys.getsizeof(key) for key in self._entries)
+        tag_bytes = sum(sys.getsizeof(keys) for keys in self._by_tag.values())
+        category_bytes = sum(sys.getsizeof(keys) for keys in self._by_category.values())
+        return {
+            'addresses': len(self._entries),
+            'entries_bytes': sys.getsizeof(self._entries) + key_bytes,
+            'tag_index_bytes': sys.getsizeof(self._tags_of) + tag_bytes,
+            'category_index_bytes': category_bytes,
+            'prefilter_bytes': len(self._prefilter)
+        }
+
+
 # Exchange Addresses - These are KNOWN destinations for whale dumps
 EXCHANGE_ADDRESSES = {
     # Binance
@@ -268,25 +605,62 @@ class WhaleConfig:
             **self.bridges
         }
 
+        # Normalized index over curated + bulk-loaded addresses
+        # (RPC/Etherscan addresses are usually lowercase, config keys are checksum)
+        self.index = AddressIndex()
+        for listed_as, addresses in (
+            (WhaleCategory.EXCHANGE, self.exchanges),
+            (WhaleCategory.DEFI_PROTOCOL, self.defi_protocols),
+            (WhaleCategory.KNOWN_WHALE, self.known_whales),
+            (WhaleCategory.BRIDGE, self.bridges)
+        ):
+            for metadata in addresses.values():
+                self.index.add_metadata(metadata, listed_as)
+
+    def load_labels(self, path: str, default_category: WhaleCategory = WhaleCategory.EXCHANGE) -> int:
+        """
+        Bulk load labeled addresses (e.g. exchange deposit addresses).
+
+        Args:
+            path: CSV or Parquet file with 'address' and optional 'name', 'category', 'tags' columns
+            default_category: Category for rows without one
+
+        Returns:
+            Number of addresses loaded
+        """
+        return self.index.load_file(path, default_category)
+
     def is_exchange(self, address: str) -> bool:
         """Check if address is a known exchange."""
-        return address in self.exchanges
+        return bool(self.index.get_mask(address) & _EXCHANGE_BIT)
 
     def is_defi_protocol(self, address: str) -> bool:
         """Check if address is a DeFi protocol."""
-        return address in self.defi_protocols
+        return bool(self.index.get_mask(address) & _DEFI_PROTOCOL_BIT)
 
     def is_known_whale(self, address: str) -> bool:
         """Check if address is a known whale."""
-        return address in self.known_whales
+        return bool(self.index.get_mask(address) & _KNOWN_WHALE_BIT)
 
     def is_bridge(self, address: str) -> bool:
         """Check if address is a bridge."""
-        return address in self.bridges
+        return bool(self.index.get_mask(address) & _BRIDGE_BIT)
 
     def get_metadata(self, address: str) -> Optional[WhaleMetadata]:
         """Get metadata for an address."""
-        return self.all_addresses.get(address)
+        return self.index.get_metadata(address)
+
+    def get_exchange_label(self, address: str) -> Optional[str]:
+        """
+        Exchange an address belongs to (first tag, e.g. 'binance').
+
+        Returns:
+            Lowercase exchange label, None if address is not an exchange
+        """
+        if not self.is_exchange(address):
+            return None
+        metadata = self.get_metadata(address)
+        return (metadata.tags[0] if metadata.tags else metadata.name).lower()
 
     def get_name(self, address: str) -> str:
         """Get human-readable name for address."""
@@ -304,11 +678,11 @@ class WhaleConfig:
 
     def get_all_exchange_addresses(self) -> List[str]:
         """Get list of all exchange addresses."""
-        return list(self.exchanges.keys())
+        return self.index.addresses_by_category(WhaleCategory.EXCHANGE)
 
     def get_all_known_addresses(self) -> List[str]:
         """Get list of all known addresses (any category)."""
-        return list(self.all_addresses.keys())
+        return self.index.addresses()
 
     def classify_transaction_destination(self, address: str) -> Dict:
         """
@@ -335,23 +709,17 @@ class WhaleConfig:
             'is_known': True,
             'category': metadata.category,
             'name': metadata.name,
-            'is_dump_risk': metadata.category == WhaleCategory.EXCHANGE,
+            'is_dump_risk': self.is_exchange(address),
             'tags': metadata.tags
         }
 
     def get_addresses_by_tag(self, tag: str) -> List[str]:
         """Get all addresses with a specific tag."""
-        return [
-            addr for addr, metadata in self.all_addresses.items()
-            if tag in metadata.tags
-        ]
+        return self.index.addresses_by_tag(tag)
 
     def get_addresses_by_category(self, category: WhaleCategory) -> List[str]:
         """Get all addresses in a category."""
-        return [
-            addr for addr, metadata in self.all_addresses.items()
-            if metadata.category == category
-        ]
+        return self.index.addresses_by_category(category)
 
     def to_dict(self) -> Dict:
         """Export all configuration to dictionary."""
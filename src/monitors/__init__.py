@@ -6,5 +6,6 @@ Whale monitoring modules for different tracking strategies.
 """
 
 from .simple_whale_watcher import SimpleWhaleWatcher
+from .block_stream import BlockStreamIngester, decode_block, load_recorded_blocks
 
-__all__ = ['SimpleWhaleWatcher']
+__all__ = ['SimpleWhaleWatcher', 'BlockStreamIngester', 'decode_block', 'load_recorded_blocks']
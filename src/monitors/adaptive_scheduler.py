@@ -0,0 +1,317 @@
+"""
+Adaptive Scheduler - Per-Whale Check Intervals within an RPC Budget
+===================================================================
+
+The fixed schedule checks every whale every CHECK_INTERVAL_MINUTES: a dormant
+whale costs as much RPC as one that is moving funds, and active whales wait
+as long as everyone else.
+
+AdaptiveScheduler keeps a heap of next-check times, one entry per whale, and
+spends a fixed budget of checks per minute where it matters:
+
+1. Urgency weight per whale:
+       weight = 1 + activity + volatility / volatility_scale + alert_weight * alerts
+   - activity: transactions per hour from WhaleAnalyzer's EWMA interval
+   - volatility: EWMA of |balance change| / balance seen by the checks
+   - alerts: alert count with exponential decay (alert_half_life_hours)
+2. Check rates follow the square-root rule: rate_i ~ sqrt(weight_i), scaled
+   so that sum(rate_i) = budget. With detection latency ~ interval / 2 and
+   events arriving at rate ~ weight, this minimizes the expected latency of
+   a detection for a fixed total number of checks.
+3. Rates are clamped to [1 / max_interval, 1 / min_interval] (water-filling:
+   the budget freed or consumed by clamped whales is redistributed). Every
+   whale is still checked at least every max_interval.
+
+The orchestrator calls due() on a short tick, checks those whales, feeds the
+results back with record_results() and calls replan().
+
+Author: Whale Tracker Project
+"""
+
+import heapq
+import logging
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..analyzers.whale_analyzer import WhaleAnalyzer
+
+
+class AdaptiveScheduler:
+    """
+    Priority queue of per-whale check times under a global check budget.
+    """
+
+    def __init__(
+        self,
+        whale_addresses: Iterable[str],
+        checks_per_minute: float,
+        analyzer: Optional[WhaleAnalyzer] = None,
+        min_interval_seconds: float = 60.0,
+        max_interval_seconds: float = 3600.0,
+        volatility_scale: float = 0.01,
+        volatility_alpha: float = 0.3,
+        alert_weight: float = 5.0,
+        alert_half_life_hours: float = 6.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize Adaptive Scheduler.
+
+        Args:
+            whale_addresses: Whales to schedule
+            checks_per_minute: Global budget (one check = one balance lookup)
+            analyzer: WhaleAnalyzer providing transaction frequency (optional)
+            min_interval_seconds: Shortest interval between two checks of a whale
+            max_interval_seconds: Longest interval between two checks of a whale
+            volatility_scale: Relative balance change per check that adds 1 to the weight
+            volatility_alpha: EWMA weight of the newest balance change
+            alert_weight: Weight added per recent alert
+            alert_half_life_hours: Half-life of the alert history
+            clock: Monotonic time source in seconds (injectable for tests)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.checks_per_minute = checks_per_minute
+        self.analyzer = analyzer
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max(max_interval_seconds, min_interval_seconds)
+        self.volatility_scale = volatility_scale
+        self.volatility_alpha = volatility_alpha
+        self.alert_weight = alert_weight
+        self.alert_decay = math.log(2) / (alert_half_life_hours * 3600)
+        self.clock = clock
+
+        # Heap of (due time, sequence, address); stale entries are skipped
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._due: Dict[str, float] = {}
+        self._in_flight: Dict[str, float] = {}
+        self._last_check: Dict[str, float] = {}
+        self._intervals: Dict[str, float] = {}
+
+        self._volatility: Dict[str, float] = {}
+        self._alerts: Dict[str, Tuple[float, float]] = {}  # address -> (decayed count, updated)
+
+        self.checks_dispatched = 0
+        self.replans = 0
+
+        addresses = list(dict.fromkeys(whale_addresses))
+        now = self.clock()
+        self._intervals = self._allocate(addresses)
+        # Stagger first checks over one interval so they don't all fire together
+        for i, address in enumerate(addresses):
+            self._schedule(address, now + self._intervals[address] * i / max(len(addresses), 1))
+
+    # ==================== Heap ====================
+
+    def _schedule(self, address: str, due_at: float) -> None:
+        self._due[address] = due_at
+        self._sequence += 1
+        heapq.heappush(self._heap, (due_at, self._sequence, address))
+
+    def add_whale(self, address: str) -> None:
+        """Start scheduling a whale (checked on the next tick)."""
+        if address in self._due or address in self._in_flight:
+            return
+        self._intervals = self._allocate(self.addresses + [address])
+        self._schedule(address, self.clock())
+
+    @property
+    def addresses(self) -> List[str]:
+        """Scheduled whales (queued or being checked)."""
+        return list(self._due) + [address for address in self._in_flight if address not in self._due]
+
+    def due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Take the whales whose check is due, most overdue first.
+
+        They stay "in flight" until record_results() reschedules them.
+
+        Args:
+            now: Current clock value (default: clock())
+            limit: Maximum number of whales to return
+
+        Returns:
+            Whale addresses to check now
+        """
+        now = self.clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+            due_at, _, address = heapq.heappop(self._heap)
+            if self._due.get(address) != due_at:
+                continue  # Superseded entry
+            del self._due[address]
+            self._in_flight[address] = now
+            due.append(address)
+
+        self.checks_dispatched += len(due)
+        return due
+
+    def next_due_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next check is due (None if nothing is queued)."""
+        now = self.clock() if now is None else now
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return max(self._heap[0][0] - now, 0.0) if self._heap else None
+
+    # ==================== Signals ====================
+
+    def _alert_score(self, address: str, now: float) -> float:
+        count, updated = self._alerts.get(address, (0.0, now))
+        return count * math.exp(-self.alert_decay * (now - updated))
+
+    def _activity(self, address: str) -> float:
+        """Transactions per hour from the analyzer's EWMA interval."""
+        if self.analyzer is None:
+            return 0.0
+        stats = self.analyzer.get_whale_stats(address)
+        if stats is None or stats.transaction_count < 2:
+            return 0.0
+        hours = stats.ewma_frequency_hours or stats.avg_frequency_hours
+        return 1.0 / hours if hours > 0 else 0.0
+
+    def weight(self, address: str, now: Optional[float] = None) -> float:
+        """Urgency weight of a whale (1.0 = dormant)."""
+        now = self.clock() if now is None else now
+        return (
+            1.0
+            + self._activity(address)
+            + self._volatility.get(address, 0.0) / self.volatility_scale
+            + self.alert_weight * self._alert_score(address, now)
+        )
+
+    def record_results(
+        self,
+        results: Iterable[Mapping],
+        balances: Optional[Mapping[str, float]] = None,
+        now: Optional[float] = None
+    ) -> None:
+        """
+        Feed check results back and schedule the next check of each whale.
+
+        Args:
+            results: monitor_all_whales() results (need 'whale_address')
+            balances: Last known balance per whale (for relative volatility)
+            now: Current clock value (default: clock())
+        """
+        now = self.clock() if now is None else now
+        balances = balances or {}
+
+        for result in results:
+            address = result.get('whale_address')
+            if not address:
+                continue
+
+            change = result.get('balance_change')
+            if change is not None:
+                # Relative to the larger of the balances before / after the change
+                # (change = previous - current, balances hold the current one)
+                balance = balances.get(address) or 0.0
+                relative = abs(change) / max(balance, balance + change, 1.0)
+                previous = self._volatility.get(address, relative)
+                self._volatility[address] = (
+                    self.volatility_alpha * relative + (1 - self.volatility_alpha) * previous
+                )
+
+            alerts = len(result.get('alerts') or [])
+            if alerts:
+                self._alerts[address] = (self._alert_score(address, now) + alerts, now)
+
+            self._in_flight.pop(address, None)
+            self._last_check[address] = now
+            interval = self._intervals.get(address, self.max_interval_seconds)
+            if result.get('status') in ('timeout', 'deadline_exceeded', 'error'):
+                # Retry soon instead of waiting a full (possibly long) interval
+                interval = self.min_interval_seconds
+            self._schedule(address, now + interval)
+
+    def release(self, addresses: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """
+        Reschedule whales still in flight without a recorded result (their
+        check or its bookkeeping failed) for a retry after min_interval.
+
+        Args:
+            addresses: Whales returned by due()
+            now: Current clock value (default: clock())
+
+        Returns:
+            Whales that were still in flight
+        """
+        stranded = [address for address in addresses if address in self._in_flight]
+        self.record_results([{'whale_address': address, 'status': 'error'} for address in stranded], now=now)
+        return stranded
+
+    # ==================== Budget ====================
+
+    def _allocate(self, addresses: List[str], now: Optional[float] = None) -> Dict[str, float]:
+        """Check interval per whale (square-root rule with water-filling clamps)."""
+        if not addresses:
+            return {}
+
+        now = self.clock() if now is None else now
+        min_rate = 1.0 / self.max_interval_seconds
+        max_rate = 1.0 / self.min_interval_seconds
+        remaining = self.checks_per_minute / 60.0
+        free = {address: math.sqrt(self.weight(address, now)) for address in addresses}
+        rates: Dict[str, float] = {}
+
+        while free:
+            total = sum(free.values())
+            proposal = {address: remaining * w / total for address, w in free.items()}
+            over = [address for address, rate in proposal.items() if rate > max_rate]
+            under = [address for address, rate in proposal.items() if rate < min_rate]
+            if not over and not under:
+                rates.update(proposal)
+                break
+
+            # Clamp the over-served first: what they give back may lift the rest
+            for address in over or under:
+                rates[address] = max_rate if over else min_rate
+                remaining = max(remaining - rates[address], 0.0)
+                del free[address]
+
+        if sum(rates.values()) * 60 > self.checks_per_minute * 1.001:
+            self.logger.debug(
+                f"Check budget ({self.checks_per_minute}/min) below the max_interval floor - "
+                f"using {sum(rates.values()) * 60:.1f}/min"
+            )
+        return {address: 1.0 / rate for address, rate in rates.items()}
+
+    def replan(self, now: Optional[float] = None) -> None:
+        """
+        Recompute intervals from the current weights.
+
+        Whales whose interval shrank are pulled forward (last check + new
+        interval); later checks are never pushed back, so a whale that just
+        became quiet still gets its pending check.
+        """
+        now = self.clock() if now is None else now
+        self._intervals = self._allocate(self.addresses, now)
+        for address, due_at in list(self._due.items()):
+            last = self._last_check.get(address)
+            if last is None:
+                continue
+            sooner = max(last + self._intervals[address], now)
+            if sooner < due_at:
+                self._schedule(address, sooner)
+        self.replans += 1
+
+    # ==================== Reads ====================
+
+    def get_interval(self, address: str) -> Optional[float]:
+        """Current check interval of a whale in seconds."""
+        return self._intervals.get(address)
+
+    def get_stats(self) -> Dict:
+        """Get scheduling statistics."""
+        intervals = sorted(self._intervals.values())
+        return {
+            'whales': len(intervals),
+            'checks_per_minute_budget': self.checks_per_minute,
+            'checks_per_minute_planned': round(sum(60.0 / i for i in intervals), 2) if intervals else 0.0,
+            'min_interval_seconds': round(intervals[0], 1) if intervals else None,
+            'max_interval_seconds': round(intervals[-1], 1) if intervals else None,
+            'in_flight': len(self._in_flight),
+            'checks_dispatched': self.checks_dispatched,
+            'replans': self.replans
+        }
@@ -0,0 +1,425 @@
+"""
+Block Stream Ingester - One Block Fetch Serves Every Whale
+==========================================================
+
+Follows the chain block by block instead of polling balances per whale:
+
+1. Poll eth_blockNumber, fetch each new block once with full transactions
+2. Decode the transactions once per block
+3. Match from/to against in-memory sets of watched whales and exchanges (O(1))
+4. Push matches straight into SimpleWhaleWatcher detectors:
+   - whale -> exchange          -> _check_direct_dump()
+   - whale -> unknown address   -> remembered as pending intermediate
+   - intermediate -> exchange   -> one-hop analyzers (simple or advanced)
+
+Cost per cycle: 1 eth_blockNumber + 1 eth_getBlockByNumber per new block,
+independent of the number of whales (vs N balance calls + N history calls).
+
+With a FlowGraph attached, every value transfer of every block also goes
+into the graph, and trace_multi_hop() follows whale outflows through up to
+max_hops intermediates (paths with 2+ intermediates; one-hop paths stay with
+the detectors above). A SplitDumpDetector sees every transfer as well and
+flags whale outflows that reach exchanges split over several intermediates.
+
+Blocks can also be fed directly with ingest_block() - e.g. from a recorded
+fixture file loaded with load_recorded_blocks().
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from .simple_whale_watcher import SimpleWhaleWatcher
+from ..analyzers.flow_graph import FlowGraph
+from ..analyzers.split_dump import SplitDumpDetector
+from ..storage.transaction_indexer import TransactionIndexer
+
+
+logger = logging.getLogger(__name__)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Convert a JSON-RPC quantity (hex string) or plain int to int."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return int(value, 16) if value.startswith('0x') else int(value)
+    return int(value)
+
+
+def decode_block(raw_block: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Decode the transactions of a raw eth_getBlockByNumber result.
+
+    Addresses are lowercased, quantities converted to int, and every
+    transaction gets the block number and block timestamp (datetime), which
+    is the format the watcher's detectors expect.
+
+    Args:
+        raw_block: Block as returned by JSON-RPC (full transactions)
+
+    Returns:
+        List of decoded transaction dicts
+    """
+    block_number = _to_int(raw_block.get('number'))
+    timestamp = datetime.fromtimestamp(_to_int(raw_block.get('timestamp')) or 0)
+
+    transactions = []
+    for raw_tx in raw_block.get('transactions', []):
+        # Block fetched without full transactions - only hashes available
+        if not isinstance(raw_tx, dict):
+            continue
+
+        transactions.append({
+            'hash': raw_tx.get('hash', ''),
+            'from': (raw_tx.get('from') or '').lower(),
+            'to': (raw_tx.get('to') or '').lower(),  # '' for contract creation
+            'value': _to_int(raw_tx.get('value')) or 0,
+            'nonce': _to_int(raw_tx.get('nonce')),
+            'gasPrice': _to_int(raw_tx.get('gasPrice')),
+            'maxFeePerGas': _to_int(raw_tx.get('maxFeePerGas')),
+            'maxPriorityFeePerGas': _to_int(raw_tx.get('maxPriorityFeePerGas')),
+            'blockNumber': block_number,
+            'timestamp': timestamp
+        })
+
+    return transactions
+
+
+def load_recorded_blocks(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Load recorded raw blocks from a JSON file.
+
+    The file holds either a list of blocks or {"blocks": [...]}, each block in
+    eth_getBlockByNumber(number, true) format.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        List of raw blocks
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data['blocks'] if isinstance(data, dict) else data
+
+
+class BlockStreamIngester:
+    """
+    Streams new blocks and routes whale transfers to the watcher's detectors.
+    """
+
+    def __init__(
+        self,
+        watcher: SimpleWhaleWatcher,
+        whale_addresses: Optional[List[str]] = None,
+        poll_interval_seconds: float = 12.0,
+        confirmations: int = 0,
+        max_blocks_per_poll: int = 20,
+        start_block: Optional[int] = None,
+        max_pending_intermediates: int = 10000,
+        indexer: Optional[TransactionIndexer] = None,
+        flow_graph: Optional[FlowGraph] = None,
+        multihop_window_hours: float = 6.0,
+        split_detector: Optional[SplitDumpDetector] = None
+    ):
+        """
+        Initialize Block Stream Ingester.
+
+        Args:
+            watcher: SimpleWhaleWatcher whose detectors receive matched transfers
+            whale_addresses: Whales to watch (default: watcher.settings.WHALE_ADDRESSES)
+            poll_interval_seconds: Delay between eth_blockNumber polls in run()
+            confirmations: Only process blocks this deep below the head
+            max_blocks_per_poll: Catch-up limit per poll after a pause
+            start_block: First block to process (default: current head)
+            max_pending_intermediates: Cap on remembered whale -> unknown transfers
+            indexer: Stores matched transactions in the local history before detection (optional)
+            flow_graph: Transfer graph fed with every block, enables trace_multi_hop() (optional)
+            multihop_window_hours: trace_multi_hop() looks at whale outflows this recent
+            split_detector: Aggregates split whale outflows over every block (optional)
+        """
+        self.watcher = watcher
+        self.web3_manager = watcher.web3_manager
+        self.poll_interval_seconds = poll_interval_seconds
+        self.confirmations = max(0, confirmations)
+        self.max_blocks_per_poll = max(1, max_blocks_per_poll)
+        self.last_processed_block: Optional[int] = start_block - 1 if start_block is not None else None
+        self.max_pending_intermediates = max_pending_intermediates
+        self.indexer = indexer
+        self.flow_graph = flow_graph
+        self.multihop_window_hours = multihop_window_hours
+        self.split_detector = split_detector
+
+        # lowercase address -> address as configured (passed to the detectors)
+        self.watched_whales: Dict[str, str] = {}
+        self.exchanges: Set[str] = set()
+
+        # intermediate (lowercase) -> (whale address, whale tx), oldest first
+        self.pending_intermediates: "OrderedDict[str, Tuple[str, Dict]]" = OrderedDict()
+
+        # (whale tx hash, exchange tx hash) of multi-hop paths already evaluated
+        # (alerted, or skipped by cooldown / amount - never re-alerted later)
+        self.reported_paths: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+
+        self._running = False
+        self.stats = {
+            'blocks_processed': 0,
+            'transactions_decoded': 0,
+            'transactions_matched': 0,
+            'alerts': 0,
+            'multihop_alerts': 0,
+            'split_dump_alerts': 0
+        }
+
+        self.refresh_watchlist(whale_addresses)
+
+    def refresh_watchlist(self, whale_addresses: Optional[List[str]] = None) -> None:
+        """
+        Rebuild the in-memory lookup sets.
+
+        Args:
+            whale_addresses: Whales to watch (default: watcher.settings.WHALE_ADDRESSES)
+        """
+        if whale_addresses is None:
+            whale_addresses = self.watcher.settings.WHALE_ADDRESSES or []
+
+        self.watched_whales = {address.lower(): address for address in whale_addresses}
+        self.exchanges = {
+            address.lower() for address in self.watcher.whale_config.get_all_exchange_addresses()
+        }
+        if self.flow_graph is not None:
+            self.flow_graph.set_exchanges(self.exchanges)
+
+        logger.info(
+            f"Block stream watchlist: {len(self.watched_whales)} whales, "
+            f"{len(self.exchanges)} exchange addresses"
+        )
+
+    async def ingest_block(self, raw_block: Dict[str, Any]) -> Dict:
+        """
+        Decode one block and run detectors for every matched transfer.
+
+        Args:
+            raw_block: Block in eth_getBlockByNumber(number, true) format
+
+        Returns:
+            Dict with block number, counts and generated alerts
+        """
+        transactions = decode_block(raw_block)
+        block_number = _to_int(raw_block.get('number'))
+        alerts = []
+        matched = 0
+
+        # Index first, so history lookups made by the detectors include this block
+        if self.indexer is not None:
+            await self.indexer.index_block(block_number, transactions)
+        if self.flow_graph is not None:
+            self.flow_graph.add_transactions(transactions)
+
+        if transactions:
+            self._expire_pending(transactions[0]['timestamp'])
+
+        for tx in transactions:
+            sender = tx['from']
+
+            if sender in self.watched_whales:
+                matched += 1
+                alert = await self._handle_whale_tx(self.watched_whales[sender], tx)
+                # Evaluated here: the balance-drop path must not re-check it later
+                self.watcher.mark_checked(self.watched_whales[sender], block_number)
+            elif sender in self.pending_intermediates and tx['to'] in self.exchanges:
+                matched += 1
+                alert = await self._handle_intermediate_tx(sender, tx)
+            else:
+                continue
+
+            if alert:
+                alerts.append(alert)
+
+        if self.split_detector is not None:
+            for episode in self.split_detector.observe_block(transactions, self.watched_whales, self.exchanges):
+                async with self.watcher._get_whale_lock(episode.whale_address):
+                    alert = await self.watcher._check_split_dump(episode.whale_address, episode)
+                if alert:
+                    alerts.append(alert)
+                    self.stats['split_dump_alerts'] += 1
+
+        self.stats['blocks_processed'] += 1
+        self.stats['transactions_decoded'] += len(transactions)
+        self.stats['transactions_matched'] += matched
+        self.stats['alerts'] += len(alerts)
+
+        if matched:
+            logger.info(f"Block {block_number}: {matched} whale transfers matched, {len(alerts)} alerts")
+
+        return {
+            'block_number': block_number,
+            'transactions': len(transactions),
+            'matched': matched,
+            'alerts': alerts
+        }
+
+    async def _handle_whale_tx(self, whale_address: str, tx: Dict) -> Optional[Dict]:
+        """Route an outgoing whale transfer to the direct dump check or one-hop tracking."""
+        destination = tx['to']
+
+        if destination in self.exchanges:
+            async with self.watcher._get_whale_lock(whale_address):
+                return await self.watcher._check_direct_dump(whale_address, tx)
+
+        # Candidate intermediate: plain value transfer to an unknown, non-whale address
+        if (
+            destination
+            and tx['value'] > 0
+            and destination not in self.watched_whales
+            and not self.watcher.whale_config.classify_transaction_destination(destination)['is_known']
+        ):
+            self.pending_intermediates.pop(destination, None)
+            self.pending_intermediates[destination] = (whale_address, tx)
+            while len(self.pending_intermediates) > self.max_pending_intermediates:
+                self.pending_intermediates.popitem(last=False)
+
+        return None
+
+    async def _handle_intermediate_tx(self, intermediate: str, tx: Dict) -> Optional[Dict]:
+        """Run one-hop analysis for an intermediate -> exchange transfer."""
+        whale_address, whale_tx = self.pending_intermediates[intermediate]
+
+        async with self.watcher._get_whale_lock(whale_address):
+            if self.watcher.has_advanced_onehop:
+                alert = await self.watcher._check_advanced_one_hop(whale_address, whale_tx, intermediate_txs=[tx])
+            else:
+                alert = await self.watcher._check_simple_one_hop(whale_address, whale_tx, intermediate_txs=[tx])
+
+        if alert:
+            self.pending_intermediates.pop(intermediate, None)
+
+        return alert
+
+    def add_exchanges(self, addresses: List[str]) -> None:
+        """Add exchange addresses (e.g. detected deposit addresses) to the watchlist."""
+        addresses = [address.lower() for address in addresses]
+        self.exchanges.update(addresses)
+        if self.flow_graph is not None:
+            self.flow_graph.add_exchanges(addresses)
+
+    async def trace_multi_hop(self) -> List[Dict]:
+        """
+        Trace recent whale outflows through the flow graph and alert on new paths.
+
+        Uses chain time (newest ingested block), so replays of recorded
+        blocks behave like live runs. Each (whale tx, exchange tx) pair is
+        evaluated once: a path skipped (e.g. during the alert cooldown) is
+        not alerted later, when it would be stale.
+
+        Returns:
+            Generated alerts
+        """
+        if self.flow_graph is None or self.flow_graph.latest_timestamp is None:
+            return []
+
+        since = self.flow_graph.latest_timestamp - timedelta(hours=self.multihop_window_hours)
+        alerts = []
+
+        for whale_address in self.watched_whales.values():
+            for path in self.flow_graph.trace(whale_address, since=since):
+                key = (path.tx_hashes[0], path.tx_hashes[-1])
+                if path.hops < 2 or key in self.reported_paths:
+                    continue
+
+                async with self.watcher._get_whale_lock(whale_address):
+                    alert = await self.watcher._check_multi_hop(whale_address, path)
+
+                self.reported_paths[key] = None
+                while len(self.reported_paths) > self.max_pending_intermediates:
+                    self.reported_paths.popitem(last=False)
+                if alert:
+                    alerts.append(alert)
+
+        self.stats['multihop_alerts'] += len(alerts)
+        return alerts
+
+    def _expire_pending(self, now: datetime) -> None:
+        """Drop pending intermediates older than the one-hop time window."""
+        window = timedelta(hours=self.watcher.settings.whale_monitoring.intervals.onehop_check_hours)
+        while self.pending_intermediates:
+            _, whale_tx = next(iter(self.pending_intermediates.values()))
+            if now - whale_tx['timestamp'] <= window:
+                break
+            self.pending_intermediates.popitem(last=False)
+
+    async def poll_once(self) -> Dict:
+        """
+        Process all new blocks since the last poll (up to max_blocks_per_poll).
+
+        Returns:
+            Dict with processed block range and generated alerts
+        """
+        head = await self.web3_manager.get_block_number()
+        if head is None:
+            return {'status': 'error', 'error': 'could not get block number', 'blocks': 0, 'alerts': []}
+
+        target = head - self.confirmations
+
+        # First poll without start_block: start from the current head
+        if self.last_processed_block is None:
+            self.last_processed_block = target - 1
+
+        alerts = []
+        processed = 0
+        last_block = min(target, self.last_processed_block + self.max_blocks_per_poll)
+
+        for block_number in range(self.last_processed_block + 1, last_block + 1):
+            raw_block = await self.web3_manager.get_block(block_number, full_transactions=True)
+            if raw_block is None:
+                # Not available yet (or RPC error) - retry from here next poll
+                break
+
+            result = await self.ingest_block(raw_block)
+            alerts.extend(result['alerts'])
+            self.last_processed_block = block_number
+            processed += 1
+
+        return {
+            'status': 'ok',
+            'head': head,
+            'last_processed_block': self.last_processed_block,
+            'blocks': processed,
+            'alerts': alerts
+        }
+
+    async def run(self) -> None:
+        """Poll for new blocks until stop() is called."""
+        self._running = True
+        logger.info(f"Block stream started (poll every {self.poll_interval_seconds}s)")
+
+        while self._running:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.error(f"Error in block stream poll: {e}")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+        logger.info("Block stream stopped")
+
+    def stop(self) -> None:
+        """Stop the run() loop after the current poll."""
+        self._running = False
+
+    def get_stats(self) -> Dict:
+        """Get ingestion statistics."""
+        return {
+            **self.stats,
+            'last_processed_block': self.last_processed_block,
+            'watched_whales': len(self.watched_whales),
+            'pending_intermediates': len(self.pending_intermediates),
+            'flow_graph': self.flow_graph.get_stats() if self.flow_graph is not None else None,
+            'split_detector': self.split_detector.get_stats() if self.split_detector is not None else None
+        }
@@ -572,18 +572,24 @@ Last Updated: 2024
 """
 
 import asyncio
+import itertools
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Awaitable, Dict, List, MutableMapping, Optional, Tuple
 from web3 import Web3
 
+from ..core.instrumentation import Instrumentation, get_instrumentation, traced
 from ..core.web3_manager import Web3Manager
-from ..core.whale_config import WhaleConfig, classify_address
+from ..core.whale_config import WhaleConfig
 from ..analyzers.whale_analyzer import WhaleAnalyzer
 from ..analyzers.nonce_tracker import NonceTracker
 from ..analyzers.gas_correlator import GasCorrelator
 from ..analyzers.address_profiler import AddressProfiler
+from ..analyzers.flow_graph import FlowPath
+from ..analyzers.split_dump import SplitEpisode
 from ..notifications.telegram_notifier import TelegramNotifier
+from ..storage.transaction_store import TransactionStore
 from config.settings import Settings
 
 
@@ -604,6 +610,13 @@ class SimpleWhaleWatcher:
     See file header for detailed evolution roadmap to advanced system.
     """
 
+    # Non-zero confidence each async one-hop signal can produce (min, max),
+    # used to decide a candidate before every signal has finished
+    SIGNAL_CONFIDENCE_RANGES = {
+        'nonce': (40, 95),    # NonceTracker: gap 4-10 .. gap 1
+        'profile': (70, 95)   # AddressProfiler: fresh/empty .. perfect burner
+    }
+
     def __init__(
         self,
         web3_manager: Optional[Web3Manager] = None,
@@ -614,7 +627,17 @@ class SimpleWhaleWatcher:
         # Advanced one-hop analyzers (optional)
         nonce_tracker: Optional[NonceTracker] = None,
         gas_correlator: Optional[GasCorrelator] = None,
-        address_profiler: Optional[AddressProfiler] = None
+        address_profiler: Optional[AddressProfiler] = None,
+        # Sweep concurrency (defaults keep the sequential MVP behaviour)
+        max_concurrent_checks: int = 1,
+        check_timeout_seconds: Optional[float] = None,
+        cycle_deadline_seconds: Optional[float] = None,
+        prefetch_balances: bool = False,
+        # Local transaction history (optional)
+        transaction_store: Optional[TransactionStore] = None,
+        # Per-signal budget in advanced one-hop, None = no limit
+        signal_timeout_seconds: Optional[float] = None,
+        instrumentation: Optional[Instrumentation] = None
     ):
         """
         Initialize Simple Whale Watcher.
@@ -628,23 +651,47 @@ class SimpleWhaleWatcher:
             nonce_tracker: Nonce sequence tracker for advanced one-hop (optional)
             gas_correlator: Gas price correlator for advanced one-hop (optional)
             address_profiler: Address profiler for advanced one-hop (optional)
+            max_concurrent_checks: Max whales checked at the same time in monitor_all_whales (1 = sequential)
+            check_timeout_seconds: Per-whale time budget, None = no limit
+            cycle_deadline_seconds: Time budget for the whole sweep, None = no limit
+            prefetch_balances: Fetch all whale balances with one batched RPC call per sweep
+            transaction_store: Local transaction history serving _get_recent_transactions (optional)
+            signal_timeout_seconds: Time budget per async one-hop signal (nonce, profile), None = no limit
+            instrumentation: Hot-path spans (default: shared instance)
         """
         self.web3_manager = web3_manager or Web3Manager()
         self.whale_config = whale_config or WhaleConfig()
         self.analyzer = analyzer or WhaleAnalyzer()
         self.notifier = notifier or TelegramNotifier()
         self.settings = settings or Settings()
+        self.instrumentation = instrumentation or get_instrumentation()
 
         # Advanced one-hop analyzers (optional - if None, uses simple one-hop)
         self.nonce_tracker = nonce_tracker
         self.gas_correlator = gas_correlator
         self.address_profiler = address_profiler
+        self.signal_timeout_seconds = signal_timeout_seconds
+
+        # Local transaction history (if None, recent transactions are unavailable)
+        self.transaction_store = transaction_store
+
+        # Track last known balances and last alert times (for cooldown).
+        # Replaced by persistent mappings (StateStore.load) when state is persisted.
+        self.last_balances: MutableMapping[str, float] = {}
+        self.last_alerts: MutableMapping[str, datetime] = {}
+        # Highest block whose outgoing transfers were already evaluated, per whale
+        # (a later balance drop only looks at newer stored transfers)
+        self.last_checked_blocks: MutableMapping[str, int] = {}
 
-        # Track last known balances
-        self.last_balances: Dict[str, float] = {}
+        # Concurrent sweep configuration
+        self.max_concurrent_checks = max(1, int(max_concurrent_checks))
+        self.check_timeout_seconds = check_timeout_seconds
+        self.cycle_deadline_seconds = cycle_deadline_seconds
+        self.prefetch_balances = prefetch_balances
 
-        # Track last alert times (for cooldown)
-        self.last_alerts: Dict[str, datetime] = {}
+        # One lock per whale: checks of the SAME whale never overlap, so the
+        # read-compare-write on last_balances / last_alerts stays consistent
+        self._whale_locks: Dict[str, asyncio.Lock] = {}
 
         # Determine if advanced one-hop is available
         self.has_advanced_onehop = all([
@@ -658,7 +705,8 @@ class SimpleWhaleWatcher:
         else:
             logger.info("SimpleWhaleWatcher initialized with simple one-hop detection")
 
-    async def check_whale(self, whale_address: str) -> Dict:
+    @traced('check_whale')
+    async def check_whale(self, whale_address: str, balance: Optional[float] = None) -> Dict:
         """
         Check a single whale for suspicious activity.
 
@@ -671,6 +719,8 @@ class SimpleWhaleWatcher:
 
         Args:
             whale_address: Ethereum address to monitor
+            balance: Pre-fetched balance in ETH (e.g. from get_balances_batch),
+                fetched individually if None
 
         Returns:
             Dict with check results and any alerts generated
@@ -678,8 +728,12 @@ class SimpleWhaleWatcher:
         try:
             logger.info(f"Checking whale: {whale_address}")
 
-            # Get current balance
-            current_balance = await self.web3_manager.get_balance(whale_address)
+            # Get current balance (unless the sweep already batch-fetched it)
+            if balance is not None:
+                current_balance = balance
+            else:
+                with self.instrumentation.span('balance'):
+                    current_balance = await self.web3_manager.get_balance(whale_address)
 
             # First time seeing this whale
             if whale_address not in self.last_balances:
@@ -702,8 +756,10 @@ class SimpleWhaleWatcher:
 
             logger.warning(f"Significant balance decrease detected: {balance_change} ETH")
 
-            # Get recent transactions
-            recent_txs = await self._get_recent_transactions(whale_address, limit=10)
+            # Get recent transactions not evaluated by an earlier check (or the block stream)
+            recent_txs = await self._get_recent_transactions(
+                whale_address, limit=10, after_block=self.last_checked_blocks.get(whale_address)
+            )
 
             # Analyze transactions
             alerts = []
@@ -722,6 +778,9 @@ class SimpleWhaleWatcher:
                 if one_hop:
                     alerts.append(one_hop)
 
+            for tx in recent_txs:
+                self.mark_checked(whale_address, tx.get('blockNumber'))
+
             return {
                 'status': 'alerts_generated' if alerts else 'checked',
                 'balance_change': balance_change,
@@ -732,32 +791,49 @@ class SimpleWhaleWatcher:
             logger.error(f"Error checking whale {whale_address}: {str(e)}")
             return {'status': 'error', 'error': str(e)}
 
+    def mark_checked(self, whale_address: str, block_number: Optional[int]) -> None:
+        """
+        Record that a whale's outgoing transfers up to block_number were evaluated.
+
+        Args:
+            whale_address: Whale address (as configured)
+            block_number: Block of an evaluated transfer (ignored if None)
+        """
+        if block_number is None:
+            return
+        if block_number > self.last_checked_blocks.get(whale_address, -1):
+            self.last_checked_blocks[whale_address] = block_number
+
+    @traced('recent_transactions')
     async def _get_recent_transactions(
         self,
         address: str,
-        limit: int = 10
+        limit: int = 10,
+        after_block: Optional[int] = None
     ) -> List[Dict]:
         """
-        Get recent transactions for an address.
+        Get recent outgoing transactions for an address, newest first.
 
-        MVP implementation: Use Web3Manager stub.
-        Phase 2: Use get_recent_transactions() from web3_manager.
-        Phase 3: Use database for historical lookup.
+        Served from the local transaction store (filled by TransactionIndexer),
+        an indexed query instead of a remote API call per lookup.
 
         Args:
             address: Ethereum address
             limit: Maximum number of transactions to return
+            after_block: Only transactions in later blocks (None = no lower bound)
 
         Returns:
             List of transaction dictionaries
         """
-        # TODO PHASE 2: Implement actual transaction fetching
-        # return await self.web3_manager.get_recent_transactions(address, limit)
+        if self.transaction_store is None:
+            logger.warning("No transaction store configured - recent transactions unavailable")
+            return []
 
-        # MVP: Return empty for now (stub)
-        logger.warning("get_recent_transactions not implemented yet (Phase 2)")
-        return []
+        return await self.transaction_store.get_recent_transactions(
+            address, limit, direction='outgoing', after_block=after_block
+        )
 
+    @traced('direct_dump')
     async def _check_direct_dump(
         self,
         whale_address: str,
@@ -814,7 +890,8 @@ class SimpleWhaleWatcher:
             whale_address=whale_address,
             tx_data={
                 'value_usd': amount_usd,
-                'hash': tx.get('hash', '')
+                'hash': tx.get('hash', ''),
+                'timestamp': tx.get('timestamp')
             },
             destination_info={
                 'name': exchange_info.name if exchange_info else 'Unknown Exchange'
@@ -829,10 +906,12 @@ class SimpleWhaleWatcher:
 
         return alert
 
+    @traced('one_hop')
     async def _check_simple_one_hop(
         self,
         whale_address: str,
-        whale_tx: Dict
+        whale_tx: Dict,
+        intermediate_txs: Optional[List[Dict]] = None
     ) -> Optional[Dict]:
         """
         Simple one-hop detection (MVP version).
@@ -854,14 +933,17 @@ class SimpleWhaleWatcher:
         Args:
             whale_address: The whale's address
             whale_tx: Transaction from whale
+            intermediate_txs: Transactions sent by the intermediate address, if the
+                caller already has them (block stream); fetched if None
 
         Returns:
             Alert dict if one-hop detected, None otherwise
         """
         intermediate = whale_tx.get('to', '').lower()
 
-        # Skip if destination is known (exchange, DeFi, etc.)
-        destination_class = classify_address(intermediate)
+        # Skip if destination is known (exchange, DeFi, etc.) - this watcher's
+        # config, which holds the loaded label files and clustered deposits
+        destination_class = self.whale_config.classify_transaction_destination(intermediate)
         if destination_class['is_known']:
             return None
 
@@ -869,7 +951,8 @@ class SimpleWhaleWatcher:
 
         # Get transactions from intermediate address
         # TODO PHASE 2: Implement this properly
-        intermediate_txs = await self._get_recent_transactions(intermediate, limit=20)
+        if intermediate_txs is None:
+            intermediate_txs = await self._get_recent_transactions(intermediate, limit=20)
 
         whale_tx_time = whale_tx.get('timestamp', datetime.now())
         time_window_hours = self.settings.whale_monitoring.intervals.onehop_check_hours
@@ -920,7 +1003,8 @@ class SimpleWhaleWatcher:
                     whale_address=whale_address,
                     whale_tx={
                         'value_usd': amount_usd,
-                        'hash': whale_tx.get('hash', '')
+                        'hash': whale_tx.get('hash', ''),
+                        'timestamp': whale_tx.get('timestamp')
                     },
                     intermediate_address=intermediate,
                     onehop_result={
@@ -936,10 +1020,133 @@ class SimpleWhaleWatcher:
 
         return None
 
+    @traced('multi_hop')
+    async def _check_multi_hop(self, whale_address: str, path: FlowPath) -> Optional[Dict]:
+        """
+        Alert on a traced whale -> N intermediates -> exchange path.
+
+        Args:
+            whale_address: The whale's address
+            path: Path found by FlowGraph.trace()
+
+        Returns:
+            Alert dict if the path is alert-worthy, None otherwise
+        """
+        # Only what provably reached the exchange counts
+        amount_eth = path.amount_eth
+        amount_usd = amount_eth * 3500  # TODO PHASE 2: Real price
+
+        if amount_usd < self.settings.MIN_AMOUNT_USD:
+            return None
+
+        if not self._can_send_alert(whale_address):
+            logger.info(f"Skipping multi-hop alert due to cooldown: {whale_address}")
+            return None
+
+        logger.warning(
+            f"{path.hops}-hop dump detected: {whale_address} -> ... -> {path.exchange_address} "
+            f"({amount_eth:.2f} ETH, confidence {path.confidence:.0f}%)"
+        )
+        exchange_info = self.whale_config.get_metadata(path.exchange_address)
+
+        alert = {
+            'type': 'multi_hop_dump',
+            'whale_address': whale_address,
+            'hops': path.hops,
+            'path': path.addresses,
+            'exchange': exchange_info.name if exchange_info else path.exchange_address,
+            'amount_eth': amount_eth,
+            'amount_usd': amount_usd,
+            'whale_tx_hash': path.tx_hashes[0],
+            'exchange_tx_hash': path.tx_hashes[-1],
+            'time_delay_minutes': path.duration_minutes,
+            'confidence': path.confidence,
+            'timestamp': datetime.now()
+        }
+
+        await self.notifier.send_whale_multihop_alert(
+            whale_address=whale_address,
+            whale_tx={
+                'value_usd': amount_usd,
+                'hash': path.tx_hashes[0],
+                'timestamp': path.timestamps[0]
+            },
+            path=path,
+            exchange_name=exchange_info.name if exchange_info else 'Unknown Exchange'
+        )
+
+        self.last_alerts[whale_address] = datetime.now()
+        self.analyzer.add_transaction(whale_address, amount_usd)
+
+        return alert
+
+    @traced('split_dump')
+    async def _check_split_dump(self, whale_address: str, episode: SplitEpisode) -> Optional[Dict]:
+        """
+        Alert on a whale outflow that reached exchanges split across intermediates.
+
+        Args:
+            whale_address: The whale's address
+            episode: Episode flagged by SplitDumpDetector
+
+        Returns:
+            Alert dict if the episode is alert-worthy, None otherwise
+        """
+        amount_eth = episode.exchange_amount_eth
+        amount_usd = amount_eth * 3500  # TODO PHASE 2: Real price
+
+        if amount_usd < self.settings.MIN_AMOUNT_USD:
+            return None
+
+        if not self._can_send_alert(whale_address):
+            logger.info(f"Skipping split dump alert due to cooldown: {whale_address}")
+            return None
+
+        logger.warning(
+            f"Split dump detected: {whale_address} -> {len(episode.intermediates)} intermediates -> "
+            f"{len(episode.exchanges)} exchanges ({amount_eth:.2f} of {episode.amount_eth:.2f} ETH)"
+        )
+        exchange_names = []
+        for exchange in episode.exchanges:
+            exchange_info = self.whale_config.get_metadata(exchange)
+            exchange_names.append(exchange_info.name if exchange_info else exchange)
+
+        alert = {
+            'type': 'split_dump',
+            'whale_address': whale_address,
+            'intermediates': list(episode.intermediates),
+            'exchanges': exchange_names,
+            'amount_eth': amount_eth,
+            'amount_usd': amount_usd,
+            'whale_amount_eth': episode.amount_eth,
+            'share': episode.share,
+            'whale_tx_hashes': list(episode.outflow_hashes),
+            'exchange_tx_hashes': list(episode.exchange_tx_hashes),
+            'timestamp': datetime.now()
+        }
+
+        await self.notifier.send_whale_split_dump_alert(
+            whale_address=whale_address,
+            whale_tx={
+                'value_usd': amount_usd,
+                'hash': episode.outflow_hashes[0] if episode.outflow_hashes else '',
+                'timestamp': episode.started_at
+            },
+            episode=episode,
+            exchange_names=exchange_names
+        )
+
+        self.last_alerts[whale_address] = datetime.now()
+        self.analyzer.add_transaction(whale_address, amount_usd)
+
+        return alert
+
+    @traced('one_hop')
     async def _check_advanced_one_hop(
         self,
         whale_address: str,
-        whale_tx: Dict
+        whale_tx: Dict,
+        intermediate_txs: Optional[List[Dict]] = None
     ) -> Optional[Dict]:
         """
         ADVANCED one-hop detection using multiple signals (Phase 2).
@@ -954,26 +1161,33 @@ class SimpleWhaleWatcher:
         Args:
             whale_address: The whale's address
             whale_tx: Transaction from whale
+            intermediate_txs: Transactions sent by the intermediate address, if the
+                caller already has them (block stream); fetched if None
 
         Returns:
             Alert dict with confidence score if one-hop detected, None otherwise
         """
         intermediate = whale_tx.get('to', '').lower()
 
-        # Skip if destination is known (exchange, DeFi, etc.)
-        destination_class = classify_address(intermediate)
+        # Skip if destination is known (exchange, DeFi, etc.) - this watcher's
+        # config, which holds the loaded label files and clustered deposits
+        destination_class = self.whale_config.classify_transaction_destination(intermediate)
         if destination_class['is_known']:
             return None
 
         logger.info(f"Advanced one-hop check for intermediate: {intermediate}")
 
         # Get transactions from intermediate address
-        intermediate_txs = await self._get_recent_transactions(intermediate, limit=20)
+        if intermediate_txs is None:
+            intermediate_txs = await self._get_recent_transactions(intermediate, limit=20)
 
         whale_tx_time = whale_tx.get('timestamp', datetime.now())
         whale_tx_block = whale_tx.get('blockNumber', 0)
         time_window_hours = self.settings.whale_monitoring.intervals.onehop_check_hours
 
+        # High confidence threshold for alerting
+        MIN_CONFIDENCE = 60  # Требуем минимум 60% уверенности
+
         # Check each intermediate transaction
         for int_tx in intermediate_txs:
             int_destination = int_tx.get('to', '').lower()
@@ -989,9 +1203,19 @@ class SimpleWhaleWatcher:
             if not (0 < time_diff < time_window_hours):
                 continue
 
+            # Cheap checks first - no RPC-backed signals for candidates that can't alert
+            amount_eth = float(whale_tx.get('value', 0)) / 1e18
+            amount_usd = amount_eth * 3500  # TODO PHASE 2: Real price
+
+            if amount_usd < self.settings.MIN_AMOUNT_USD:
+                continue
+
+            # Check cooldown
+            if not self._can_send_alert(whale_address):
+                continue
+
             # ADVANCED SIGNAL ANALYSIS
             signals = {}
-            total_confidence = 0
 
             # Signal #1: Time Correlation (basic, already checked above)
             time_diff_minutes = time_diff * 60
@@ -1007,77 +1231,40 @@ class SimpleWhaleWatcher:
                 'confidence': time_confidence,
                 'details': f'{time_diff_minutes:.1f} minutes delay'
             }
-            total_confidence += time_confidence
 
-            # Signal #2: Gas Price Correlation
+            # Signal #2: Gas Price Correlation (local computation)
             if self.gas_correlator:
-                gas_result = self.gas_correlator.check_gas_correlation(whale_tx, int_tx)
+                with self.instrumentation.span('signal.gas'):
+                    gas_result = self.gas_correlator.check_gas_correlation(whale_tx, int_tx)
                 signals['gas'] = {
                     'match': gas_result.match,
                     'confidence': gas_result.confidence,
                     'type': gas_result.correlation_type,
                     'details': gas_result.details
                 }
-                total_confidence += gas_result.confidence
                 logger.info(f"Gas correlation: {gas_result.correlation_type} ({gas_result.confidence}%)")
 
-            # Signal #3: Nonce Tracking (STRONGEST)
+            # Signals #3 and #4 are I/O bound and independent - run them concurrently
+            evaluations = {}
             if self.nonce_tracker:
-                nonce_result = await self.nonce_tracker.check_nonce_sequence(whale_tx, int_tx)
-                signals['nonce'] = {
-                    'match': nonce_result.match,
-                    'confidence': nonce_result.confidence,
-                    'gap': nonce_result.nonce_gap,
-                    'strength': nonce_result.signal_strength,
-                    'details': nonce_result.details
-                }
-                total_confidence += nonce_result.confidence
-                if nonce_result.match:
-                    logger.warning(f"Nonce correlation: {nonce_result.signal_strength} (gap={nonce_result.nonce_gap}, {nonce_result.confidence}%)")
-
-            # Signal #4: Address Profiling
+                evaluations['nonce'] = self._nonce_signal(whale_tx, int_tx)
             if self.address_profiler:
-                profile = await self.address_profiler.profile_address(
-                    intermediate,
-                    whale_tx_block,
-                    whale_tx_time
-                )
-                signals['profile'] = {
-                    'type': profile.profile_type,
-                    'confidence': profile.overall_confidence,
-                    'is_fresh': profile.is_fresh,
-                    'is_burner': profile.is_single_use,
-                    'is_reused': profile.is_reused,
-                    'details': profile.details
-                }
-                total_confidence += profile.overall_confidence
-                logger.info(f"Address profile: {profile.profile_type} ({profile.overall_confidence}%)")
+                evaluations['profile'] = self._profile_signal(intermediate, whale_tx_block, whale_tx_time)
+
+            await self._collect_signals(signals, evaluations, MIN_CONFIDENCE)
 
             # Normalize confidence (average of signals)
-            num_signals = len([s for s in signals.values() if s.get('confidence', 0) > 0])
+            confidences = [s.get('confidence', 0) for s in signals.values()]
+            num_signals = len([c for c in confidences if c > 0])
             if num_signals > 0:
-                average_confidence = int(total_confidence / max(num_signals, 1))
+                average_confidence = int(sum(confidences) / max(num_signals, 1))
             else:
                 average_confidence = 0
 
-            # High confidence threshold for alerting
-            MIN_CONFIDENCE = 60  # Требуем минимум 60% уверенности
-
             if average_confidence < MIN_CONFIDENCE:
                 logger.info(f"Confidence too low: {average_confidence}% < {MIN_CONFIDENCE}%")
                 continue
 
-            # Calculate amounts
-            amount_eth = float(whale_tx.get('value', 0)) / 1e18
-            amount_usd = amount_eth * 3500  # TODO PHASE 2: Real price
-
-            if amount_usd < self.settings.MIN_AMOUNT_USD:
-                continue
-
-            # Check cooldown
-            if not self._can_send_alert(whale_address):
-                continue
-
             exchange_info = self.whale_config.get_metadata(int_destination)
 
             # Create alert with detailed signal analysis
@@ -1101,7 +1288,8 @@ class SimpleWhaleWatcher:
                 whale_address=whale_address,
                 whale_tx={
                     'value_usd': amount_usd,
-                    'hash': whale_tx.get('hash', '')
+                    'hash': whale_tx.get('hash', ''),
+                    'timestamp': whale_tx.get('timestamp')
                 },
                 intermediate_address=intermediate,
                 onehop_result={
@@ -1130,6 +1318,147 @@ class SimpleWhaleWatcher:
 
         return None
 
+    async def _nonce_signal(self, whale_tx: Dict, int_tx: Dict) -> Dict:
+        """Signal #3: Nonce Tracking (STRONGEST)."""
+        nonce_result = await self.nonce_tracker.check_nonce_sequence(whale_tx, int_tx)
+        if nonce_result.match:
+            logger.warning(f"Nonce correlation: {nonce_result.signal_strength} (gap={nonce_result.nonce_gap}, {nonce_result.confidence}%)")
+        return {
+            'match': nonce_result.match,
+            'confidence': nonce_result.confidence,
+            'gap': nonce_result.nonce_gap,
+            'strength': nonce_result.signal_strength,
+            'details': nonce_result.details
+        }
+
+    async def _profile_signal(self, intermediate: str, whale_tx_block: int, whale_tx_time: datetime) -> Dict:
+        """Signal #4: Address Profiling."""
+        profile = await self.address_profiler.profile_address(
+            intermediate,
+            whale_tx_block,
+            whale_tx_time
+        )
+        logger.info(f"Address profile: {profile.profile_type} ({profile.overall_confidence}%)")
+        return {
+            'type': profile.profile_type,
+            'confidence': profile.overall_confidence,
+            'is_fresh': profile.is_fresh,
+            'is_burner': profile.is_single_use,
+            'is_reused': profile.is_reused,
+            'details': profile.details
+        }
+
+    async def _run_signal(self, name: str, evaluation) -> Dict:
+        """
+        Evaluate one signal within the per-signal time budget.
+
+        A signal that times out or fails counts as no signal (confidence 0)
+        instead of failing the whole one-hop check.
+        """
+        try:
+            with self.instrumentation.span(f'signal.{name}'):
+                return await asyncio.wait_for(evaluation, timeout=self.signal_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"Signal '{name}' timed out after {self.signal_timeout_seconds}s")
+            return {'confidence': 0, 'details': 'Timed out'}
+        except Exception as e:
+            logger.error(f"Error evaluating signal '{name}': {e}")
+            return {'confidence': 0, 'details': f'Error: {e}'}
+
+    async def _collect_signals(
+        self,
+        signals: Dict[str, Dict],
+        evaluations: Dict[str, Awaitable[Dict]],
+        min_confidence: int
+    ) -> None:
+        """
+        Evaluate async signals concurrently until the alert decision is fixed.
+
+        Before starting and after each completed signal, the confidence bounds
+        are recomputed from SIGNAL_CONFIDENCE_RANGES. Once the average can no
+        longer reach min_confidence, or can no longer drop below it, the
+        remaining signals are cancelled (or never started) and recorded as
+        skipped.
+
+        Args:
+            signals: Completed signals (updated in place)
+            evaluations: Signal name -> signal coroutine
+            min_confidence: Alert threshold
+        """
+        pending: Dict[str, asyncio.Task] = {}
+        try:
+            if self._signals_decided(signals, list(evaluations), min_confidence):
+                return
+
+            pending = {
+                name: asyncio.create_task(self._run_signal(name, evaluation))
+                for name, evaluation in evaluations.items()
+            }
+            while pending:
+                done, _ = await asyncio.wait(pending.values(), return_when=asyncio.FIRST_COMPLETED)
+                for name in [name for name, task in pending.items() if task in done]:
+                    signals[name] = pending.pop(name).result()
+
+                if pending and self._signals_decided(signals, list(pending), min_confidence):
+                    return
+        finally:
+            for name, evaluation in evaluations.items():
+                if name in signals:
+                    continue
+                if name in pending:
+                    pending[name].cancel()
+                else:
+                    evaluation.close()
+                signals[name] = {'confidence': 0, 'details': 'Skipped (decided early)'}
+
+    def _signals_decided(self, signals: Dict[str, Dict], pending: List[str], min_confidence: int) -> bool:
+        """Check whether pending signals can still change the alert decision."""
+        if not pending:
+            return False
+
+        lowest, highest = self._confidence_bounds(
+            [s.get('confidence', 0) for s in signals.values()],
+            [self.SIGNAL_CONFIDENCE_RANGES[name] for name in pending]
+        )
+        if highest < min_confidence or lowest >= min_confidence:
+            logger.info(
+                f"One-hop decided early ({lowest}-{highest}% vs {min_confidence}%), "
+                f"skipping: {', '.join(pending)}"
+            )
+            return True
+        return False
+
+    @staticmethod
+    def _confidence_bounds(known: List[int], pending_ranges: List[Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Bounds of the final average confidence given still-running signals.
+
+        A pending signal ends either at 0 (not counted) or within its
+        (min, max) non-zero range, so every subset of pending signals is tried.
+
+        Args:
+            known: Confidences of completed signals
+            pending_ranges: (min, max) non-zero confidence of each pending signal
+
+        Returns:
+            Tuple of (lowest, highest) possible average confidence
+        """
+        base = [c for c in known if c > 0]
+        lowest = highest = None
+
+        for included in itertools.product([False, True], repeat=len(pending_ranges)):
+            chosen = [r for r, use in zip(pending_ranges, included) if use]
+            count = len(base) + len(chosen)
+            if count == 0:
+                low = high = 0
+            else:
+                low = int((sum(base) + sum(r[0] for r in chosen)) / count)
+                high = int((sum(base) + sum(r[1] for r in chosen)) / count)
+            lowest = low if lowest is None else min(lowest, low)
+            highest = high if highest is None else max(highest, high)
+
+        return lowest, highest
+
     def _can_send_alert(self, whale_address: str) -> bool:
         """
         Check if we can send alert (cooldown period).
@@ -1149,33 +1478,171 @@ class SimpleWhaleWatcher:
 
         return time_since_last >= cooldown_minutes
 
-    async def monitor_all_whales(self) -> Dict:
+    def _get_whale_lock(self, whale_address: str) -> asyncio.Lock:
+        """Get (or create) the per-whale lock guarding cooldown state."""
+        lock = self._whale_locks.get(whale_address)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._whale_locks[whale_address] = lock
+        return lock
+
+    async def _check_whale_timed(
+        self,
+        whale_address: str,
+        semaphore: asyncio.Semaphore,
+        balance: Optional[float] = None
+    ) -> Dict:
         """
-        Check all configured whale addresses.
+        Run check_whale under the sweep semaphore, per-whale lock and timeout.
+
+        If the check is timed out or cancelled (cycle deadline), the whale's
+        previous balance is restored so the next sweep sees the same balance
+        drop again instead of silently losing it.
+
+        Args:
+            whale_address: Whale address to check
+            semaphore: Sweep-wide concurrency limiter
+            balance: Pre-fetched balance in ETH (optional)
+
+        Returns:
+            check_whale result extended with whale_address and latency_ms
+        """
+        async with semaphore:
+            async with self._get_whale_lock(whale_address):
+                had_balance = whale_address in self.last_balances
+                previous_balance = self.last_balances.get(whale_address)
+                started = time.perf_counter()
+
+                try:
+                    if self.check_timeout_seconds:
+                        result = await asyncio.wait_for(
+                            self.check_whale(whale_address, balance),
+                            timeout=self.check_timeout_seconds
+                        )
+                    else:
+                        result = await self.check_whale(whale_address, balance)
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Check timed out for {whale_address} after {self.check_timeout_seconds}s"
+                    )
+                    self._restore_balance(whale_address, had_balance, previous_balance)
+                    result = {'status': 'timeout', 'error': 'check timed out'}
+                except asyncio.CancelledError:
+                    self._restore_balance(whale_address, had_balance, previous_balance)
+                    raise
+
+                result['whale_address'] = whale_address
+                result['latency_ms'] = (time.perf_counter() - started) * 1000
+                return result
+
+    def _restore_balance(self, whale_address: str, had_balance: bool, previous_balance: Optional[float]) -> None:
+        """Undo a partial check so the balance change is re-evaluated next sweep."""
+        if had_balance:
+            self.last_balances[whale_address] = previous_balance
+        else:
+            self.last_balances.pop(whale_address, None)
+
+    async def monitor_all_whales(self, whale_addresses: Optional[List[str]] = None) -> Dict:
+        """
+        Check all configured whale addresses (or the given subset).
+
+        Whales are checked concurrently, at most max_concurrent_checks at a
+        time (1 = the original sequential sweep). Results are returned in the
+        same order as WHALE_ADDRESSES. cycle_deadline_seconds covers the
+        balance prefetch and the checks; whales still unfinished when it runs
+        out are cancelled and reported with status 'deadline_exceeded'.
+
+        Args:
+            whale_addresses: Whales to check (default: WHALE_ADDRESSES), e.g.
+                the ones AdaptiveScheduler marks as due
 
         Returns:
             Summary of monitoring results
         """
-        whale_addresses = self.settings.WHALE_ADDRESSES
+        if whale_addresses is None:
+            whale_addresses = self.settings.WHALE_ADDRESSES
 
         if not whale_addresses:
             logger.warning("No whale addresses configured")
             return {'status': 'no_whales_configured'}
 
-        logger.info(f"Monitoring {len(whale_addresses)} whales")
+        logger.info(
+            f"Monitoring {len(whale_addresses)} whales "
+            f"(concurrency={self.max_concurrent_checks})"
+        )
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        cycle_started = time.perf_counter()
+
+        # One batched RPC round for every balance instead of one call per whale;
+        # it spends the same cycle budget as the checks
+        balances: Dict[str, Optional[float]] = {}
+        if self.prefetch_balances:
+            try:
+                balances = await asyncio.wait_for(
+                    self.web3_manager.get_balances_batch(whale_addresses),
+                    timeout=self.cycle_deadline_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"Batch balance prefetch exceeded the cycle deadline "
+                    f"({self.cycle_deadline_seconds}s), falling back to per-whale calls"
+                )
+            except Exception as e:
+                logger.error(f"Batch balance prefetch failed, falling back to per-whale calls: {e}")
+
+        remaining = None
+        if self.cycle_deadline_seconds is not None:
+            remaining = max(0.0, self.cycle_deadline_seconds - (time.perf_counter() - cycle_started))
+
+        tasks = [
+            asyncio.ensure_future(
+                self._check_whale_timed(whale_addr, semaphore, balances.get(whale_addr))
+            )
+            for whale_addr in whale_addresses
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=remaining)
+
+        if pending:
+            logger.warning(
+                f"Cycle deadline ({self.cycle_deadline_seconds}s) reached - "
+                f"cancelling {len(pending)} unfinished whale checks"
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
         results = []
-        for whale_addr in whale_addresses:
-            result = await self.check_whale(whale_addr)
-            results.append(result)
+        for whale_addr, task in zip(whale_addresses, tasks):
+            if task in pending:
+                results.append({
+                    'status': 'deadline_exceeded',
+                    'whale_address': whale_addr,
+                    'latency_ms': None
+                })
+            elif task.exception() is not None:
+                results.append({
+                    'status': 'error',
+                    'error': str(task.exception()),
+                    'whale_address': whale_addr,
+                    'latency_ms': None
+                })
+            else:
+                results.append(task.result())
 
         # Summary
         total_alerts = sum(len(r.get('alerts', [])) for r in results)
+        latencies = [r['latency_ms'] for r in results if r.get('latency_ms') is not None]
 
         return {
-            'status': 'completed',
+            'status': 'completed' if not pending else 'deadline_exceeded',
             'whales_checked': len(whale_addresses),
             'total_alerts': total_alerts,
             'results': results,
+            'timeouts': sum(1 for r in results if r.get('status') == 'timeout'),
+            'deadline_exceeded': len(pending),
+            'avg_latency_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            'max_latency_ms': max(latencies) if latencies else 0.0,
+            'cycle_duration_ms': (time.perf_counter() - cycle_started) * 1000,
             'timestamp': datetime.now()
         }
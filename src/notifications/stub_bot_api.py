@@ -0,0 +1,115 @@
+"""
+Stub Bot API - Local Telegram Bot API for Tests and Load Runs
+=============================================================
+
+Serves getMe / sendMessage on 127.0.0.1 so TelegramNotifier can be exercised
+end to end (pooled session, queue, retries, latency) without Telegram:
+
+    stub = StubBotAPI(latency_seconds=0.05)
+    api_url = await stub.start()
+    notifier = TelegramNotifier(api_base_url=api_url)
+    ...
+    await stub.stop()
+    stub.messages  # [{'chat_id': ..., 'text': ..., 'received_at': ...}, ...]
+
+fail_next() queues error replies (429 with retry_after, 5xx, 400) for the
+following requests.
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+
+class StubBotAPI:
+    """
+    In-process HTTP stand-in for api.telegram.org.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_seconds: float = 0.0):
+        """
+        Initialize Stub Bot API.
+
+        Args:
+            host: Interface to bind
+            port: Port (0 = any free port)
+            latency_seconds: Delay before every reply (simulated network + API time)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.host = host
+        self.port = port
+        self.latency_seconds = latency_seconds
+
+        self.messages: List[Dict[str, Any]] = []
+        self.requests = 0
+        self._failures: List[Dict[str, Any]] = []
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    def fail_next(self, error_code: int, count: int = 1, retry_after: Optional[int] = None) -> None:
+        """
+        Reply to the next `count` sendMessage calls with an error.
+
+        Args:
+            error_code: HTTP / Bot API error code (429, 500, 400, ...)
+            count: Number of requests to fail
+            retry_after: retry_after parameter of 429 replies
+        """
+        reply: Dict[str, Any] = {'ok': False, 'error_code': error_code, 'description': f"stub error {error_code}"}
+        if retry_after is not None:
+            reply['parameters'] = {'retry_after': retry_after}
+        self._failures.extend([reply] * count)
+
+    async def start(self) -> str:
+        """
+        Start serving.
+
+        Returns:
+            Base URL to pass as TelegramNotifier(api_base_url=...)
+        """
+        app = web.Application()
+        app.router.add_route('*', '/bot{token}/getMe', self._get_me)
+        app.router.add_post('/bot{token}/sendMessage', self._send_message)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        self.logger.debug(f"Stub Bot API listening on {self.url}")
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _get_me(self, request: web.Request) -> web.Response:
+        return web.json_response({'ok': True, 'result': {'id': 1, 'is_bot': True, 'username': 'stub_bot'}})
+
+    async def _send_message(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        form = await request.post()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        if self._failures:
+            reply = self._failures.pop(0)
+            return web.json_response(reply, status=reply['error_code'])
+
+        message = {
+            'message_id': len(self.messages) + 1,
+            'chat_id': form.get('chat_id'),
+            'text': form.get('text'),
+            'parse_mode': form.get('parse_mode'),
+            'received_at': time.time()
+        }
+        self.messages.append(message)
+        return web.json_response({'ok': True, 'result': {'message_id': message['message_id']}})
@@ -9,6 +9,20 @@ This module handles all notifications:
 - Statistical anomaly alerts
 - Daily reports
 
+Delivery:
+- One pooled aiohttp session (keep-alive) instead of a TCP/TLS handshake per message
+- send_message() only enqueues; a worker per chat sends in the background, so
+  detection never waits for Telegram
+- Per-chat pacing (Telegram allows ~1 message/second per chat) plus a global
+  token bucket (~30 messages/second per bot)
+- Priority lanes (alert_dispatch.AlertPriority): a chat's worker sends the
+  most urgent queued lane first
+- Alerts queued while a chat is throttled are coalesced into digest messages
+- 429 (retry_after), 5xx and network errors are retried with exponential backoff
+- Block-to-ack and enqueue-to-ack latency per lane (p50 / p95 / p99)
+- TELEGRAM_API_URL points the notifier at another Bot API server
+  (e.g. stub_bot_api.StubBotAPI in tests)
+
 Adapted from: lp_health_tracker/src/notification_manager.py
 Enhanced for: Whale Tracker Project
 
@@ -18,10 +32,48 @@ Author: Whale Tracker Project
 import os
 import logging
 import asyncio
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, MutableMapping, Optional
 import aiohttp
 import json
+from urllib.parse import urlencode
+
+from ..core.instrumentation import Instrumentation, get_instrumentation, response_size, traced
+from ..core.rate_limiter import AsyncRateLimiter
+from .alert_dispatch import AlertPriority, LatencyTracker, onehop_priority
+
+
+MAX_MESSAGE_LENGTH = 4096
+DIGEST_SEPARATOR = "\n➖➖➖➖➖➖\n"
+
+
+@dataclass
+class OutboundMessage:
+    """Message waiting in a chat queue."""
+    chat_id: str
+    text: str
+    parse_mode: Optional[str] = 'Markdown'
+    disable_notification: bool = False
+    digest: bool = False
+    priority: AlertPriority = AlertPriority.NORMAL
+    block_time: Optional[float] = None  # Unix time of the triggering block
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # Messages merged into this digest (latency is recorded for each)
+    sources: List['OutboundMessage'] = field(default_factory=list)
+
+
+def _unix_time(timestamp: Any) -> Optional[float]:
+    """Unix time of a block timestamp (datetime or seconds)."""
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    try:
+        return float(timestamp)
+    except (TypeError, ValueError):
+        return None
 
 
 class TelegramNotifier:
@@ -29,13 +81,95 @@ class TelegramNotifier:
     Handles Telegram notifications for the LP Health Tracker.
     """
     
-    def __init__(self):
-        """Initialize Telegram Notifier."""
+    def __init__(
+        self,
+        per_chat_interval_seconds: float = 1.0,
+        global_rate_per_second: float = 25.0,
+        max_retries: int = 5,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+        max_queue_size: int = 1000,
+        timeout_seconds: float = 10.0,
+        api_base_url: Optional[str] = None,
+        latency_window: int = 1000,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        Initialize Telegram Notifier.
+
+        Args:
+            per_chat_interval_seconds: Minimum time between two messages to one chat
+            global_rate_per_second: Messages per second across all chats
+            max_retries: Retries of a failed send (429, 5xx, network errors)
+            backoff_base_seconds: First retry delay (doubles per retry)
+            backoff_max_seconds: Retry delay cap
+            max_queue_size: Queued messages per chat before new ones are dropped
+            timeout_seconds: HTTP request timeout
+            api_base_url: Bot API server (default: TELEGRAM_API_URL or api.telegram.org)
+            latency_window: Latency samples kept per lane
+            instrumentation: Per-call latency / bytes metrics (default: shared instance)
+        """
         self.logger = logging.getLogger(__name__)
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
-    
+        api_base_url = api_base_url or os.getenv('TELEGRAM_API_URL') or 'https://api.telegram.org'
+        self.base_url = f"{api_base_url.rstrip('/')}/bot{self.bot_token}"
+
+        self.per_chat_interval_seconds = per_chat_interval_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.max_queue_size = max_queue_size
+        self.timeout_seconds = timeout_seconds
+
+        self.rate_limiter = AsyncRateLimiter()
+        self.rate_limiter.configure('telegram', rate=global_rate_per_second)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._next_send: Dict[str, float] = {}
+        self._sequence = 0
+        self.latency = LatencyTracker(window=latency_window)
+        self.instrumentation = instrumentation or get_instrumentation()
+
+        self.stats = dict.fromkeys(
+            ('queued', 'sent', 'failed', 'retried', 'dropped', 'digests', 'coalesced'), 0
+        )
+
+    # ==================== Transport ====================
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session (created on first use, reused for every request)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)
+            )
+        return self._session
+
+    async def close(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Deliver queued messages, stop the workers and close the session.
+
+        Args:
+            timeout: Maximum seconds to wait for the queues to drain
+        """
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            pending = sum(queue.qsize() for queue in self._queues.values())
+            self.logger.warning(f"Telegram queue not drained on shutdown ({pending} messages lost)")
+
+        for task in self._workers.values():
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def test_connection(self) -> bool:
         """
         Test Telegram bot connection.
@@ -50,12 +184,10 @@ class TelegramNotifier:
             
             # Test by getting bot info
             url = f"{self.base_url}/getMe"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-            
-            # data уже получена выше
+            session = await self._get_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                data = await response.json()
             
             if data.get('ok'):
                 bot_info = data.get('result', {})
@@ -70,53 +202,259 @@ class TelegramNotifier:
             self.logger.error(f"Error testing Telegram connection: {e}")
             return False
     
+    @traced('notify')
     async def send_message(
         self, 
         message: str, 
         parse_mode: str = 'Markdown',
-        disable_notification: bool = False
+        disable_notification: bool = False,
+        chat_id: Optional[str] = None,
+        digest: bool = False,
+        priority: AlertPriority = AlertPriority.NORMAL,
+        block_timestamp: Any = None
     ) -> bool:
         """
-        Send message to Telegram.
+        Queue a message for Telegram (returns without waiting for the send).
         
         Args:
             message: Message text
             parse_mode: 'Markdown' or 'HTML'
             disable_notification: Silent notification
+            chat_id: Target chat (default: TELEGRAM_CHAT_ID)
+            digest: May be merged with other alerts queued for the chat
+            priority: Dispatch lane (more urgent lanes are sent first)
+            block_timestamp: Timestamp of the block that triggered the alert
+                             (datetime or unix seconds; for latency tracking)
             
         Returns:
-            bool: True if sent successfully
+            bool: True if queued
         """
+        chat_id = chat_id or self.chat_id
+        if not chat_id:
+            self.logger.error("Telegram chat ID not configured")
+            return False
+
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = asyncio.PriorityQueue(maxsize=self.max_queue_size)
+
+        outbound = OutboundMessage(
+            chat_id=chat_id,
+            text=message,
+            parse_mode=parse_mode,
+            disable_notification=disable_notification,
+            digest=digest,
+            priority=AlertPriority(priority),
+            block_time=_unix_time(block_timestamp)
+        )
         try:
-            url = f"{self.base_url}/sendMessage"
-            
-            payload = {
-                'chat_id': int(self.chat_id),
-                'text': message,
-                'disable_notification': disable_notification
-            }
-            
-            # Only add parse_mode if it's not None
-            if parse_mode:
-                payload['parse_mode'] = parse_mode
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=payload, timeout=10) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-            
-            # data уже получена выше
-            
-            if data.get('ok'):
-                self.logger.debug("Telegram message sent successfully")
-                return True
-            else:
-                self.logger.error(f"Telegram send error: {data}")
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Error sending Telegram message: {e}")
+            self._put(queue, outbound)
+        except asyncio.QueueFull:
+            self.stats['dropped'] += 1
+            self.logger.error(f"Telegram queue of chat {chat_id} full - message dropped")
             return False
+
+        self.stats['queued'] += 1
+        worker = self._workers.get(chat_id)
+        if worker is None or worker.done():
+            self._workers[chat_id] = asyncio.get_running_loop().create_task(self._chat_worker(chat_id))
+        return True
+
+    def _put(self, queue: asyncio.PriorityQueue, outbound: OutboundMessage) -> None:
+        """Queue by (lane, arrival order)."""
+        self._sequence += 1
+        queue.put_nowait((outbound.priority, self._sequence, outbound))
+
+    async def flush(self) -> None:
+        """Wait until every queued message was sent (or given up)."""
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+    # ==================== Queue worker ====================
+
+    async def _wait_for_slot(self, chat_id: str) -> None:
+        """Sleep until the chat may receive its next message."""
+        delay = self._next_send.get(chat_id, 0.0) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _chat_worker(self, chat_id: str) -> None:
+        """Send one chat's queue lane by lane, coalescing alerts that piled up."""
+        queue = self._queues[chat_id]
+        while True:
+            items = [await queue.get()]
+            try:
+                await self._wait_for_slot(chat_id)
+                # Everything queued while we waited, most urgent first
+                while not queue.empty():
+                    items.append(queue.get_nowait())
+
+                # Only the most urgent lane goes now; the rest is re-queued, so
+                # anything more urgent that arrives meanwhile overtakes it
+                lane = items[0][0]
+                for item in items:
+                    if item[0] != lane:
+                        queue.put_nowait(item)
+                batch = [outbound for priority, _, outbound in items if priority == lane]
+
+                for i, outbound in enumerate(self._compose(batch)):
+                    if i:
+                        await self._wait_for_slot(chat_id)
+                    await self.rate_limiter.acquire('telegram')
+                    if await self._deliver(outbound):
+                        self._record_latency(outbound)
+                    self._next_send[chat_id] = time.monotonic() + self.per_chat_interval_seconds
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Telegram worker error (chat {chat_id}): {e}")
+            finally:
+                for _ in items:
+                    queue.task_done()
+
+    def _record_latency(self, outbound: OutboundMessage) -> None:
+        """Latency samples of a delivered message (each alert of a digest)."""
+        now, acked = time.time(), time.monotonic()
+        for source in outbound.sources or [outbound]:
+            lane = source.priority.name.lower()
+            self.latency.record('queue', lane, acked - source.enqueued_at)
+            if source.block_time is not None:
+                self.latency.record('detection_to_delivery', lane, now - source.block_time)
+
+    def _compose(self, batch: List[OutboundMessage]) -> List[OutboundMessage]:
+        """Merge consecutive digest messages; others are sent as they are."""
+        composed: List[OutboundMessage] = []
+        group: List[OutboundMessage] = []
+
+        def close_group():
+            if group:
+                composed.extend(self._digest(group))
+                group.clear()
+
+        for outbound in batch:
+            if not outbound.digest:
+                close_group()
+                composed.append(outbound)
+                continue
+            if group and (outbound.priority, outbound.parse_mode, outbound.disable_notification) != (
+                group[0].priority,
+                group[0].parse_mode, group[0].disable_notification
+            ):
+                close_group()
+            group.append(outbound)
+
+        close_group()
+        return composed
+
+    def _digest(self, group: List[OutboundMessage]) -> List[OutboundMessage]:
+        """Join alerts into as few messages as fit Telegram's length limit."""
+        if len(group) == 1:
+            return list(group)
+
+        chunks: List[List[OutboundMessage]] = [[]]
+        length = 0
+        for outbound in group:
+            text = outbound.text.strip()
+            if chunks[-1] and length + len(DIGEST_SEPARATOR) + len(text) > MAX_MESSAGE_LENGTH - 100:
+                chunks.append([])
+                length = 0
+            chunks[-1].append(outbound)
+            length += len(text) + len(DIGEST_SEPARATOR)
+
+        first = group[0]
+        digests = []
+        for chunk in chunks:
+            if len(chunk) == 1:
+                digests.append(chunk[0])
+                continue
+            text = f"📦 **{len(chunk)} alerts**\n\n" + DIGEST_SEPARATOR.join(o.text.strip() for o in chunk)
+            self.stats['digests'] += 1
+            self.stats['coalesced'] += len(chunk) - 1
+            digests.append(OutboundMessage(
+                chat_id=first.chat_id,
+                text=text[:MAX_MESSAGE_LENGTH],
+                parse_mode=first.parse_mode,
+                disable_notification=first.disable_notification,
+                priority=first.priority,
+                enqueued_at=first.enqueued_at,
+                sources=chunk
+            ))
+        return digests
+
+    def _backoff(self, attempt: int) -> float:
+        """Retry delay of an attempt (exponential, capped)."""
+        return min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt)
+
+    async def _deliver(self, outbound: OutboundMessage) -> bool:
+        """
+        POST one message, retrying rate limits, server and network errors.
+
+        Returns:
+            bool: True if Telegram accepted the message
+        """
+        url = f"{self.base_url}/sendMessage"
+        payload = {
+            'chat_id': int(outbound.chat_id),
+            'text': outbound.text,
+            'disable_notification': str(outbound.disable_notification).lower()
+        }
+        # Only add parse_mode if it's not None
+        if outbound.parse_mode:
+            payload['parse_mode'] = outbound.parse_mode
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                session = await self._get_session()
+                with self.instrumentation.track_call('telegram', 'sendMessage') as call:
+                    call.bytes_sent = len(urlencode(payload))
+                    async with session.post(url, data=payload) as response:
+                        call.bytes_received = response_size(response)
+                        status = response.status
+                        data = await response.json(content_type=None)
+                    call.error = not data.get('ok')
+
+                if data.get('ok'):
+                    self.stats['sent'] += 1
+                    self.logger.debug("Telegram message sent successfully")
+                    return True
+
+                error_code = data.get('error_code', status)
+                if error_code == 429:
+                    delay = float(data.get('parameters', {}).get('retry_after', self._backoff(attempt)))
+                elif error_code >= 500:
+                    delay = self._backoff(attempt)
+                else:
+                    self.stats['failed'] += 1
+                    self.logger.error(f"Telegram send error: {data}")
+                    return False
+                error = data.get('description', error_code)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                delay = self._backoff(attempt)
+                error = e
+
+            if attempt == self.max_retries:
+                break
+            self.stats['retried'] += 1
+            self.logger.warning(f"Telegram send failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        self.stats['failed'] += 1
+        self.logger.error(f"Giving up on Telegram message after {self.max_retries + 1} attempts: {error}")
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery statistics (latency percentiles in seconds)."""
+        return {
+            **self.stats,
+            'pending': sum(queue.qsize() for queue in self._queues.values()),
+            'chats': len(self._queues),
+            'latency': self.latency.get_stats()
+        }
+
+    def format_latency(self) -> str:
+        """Detection-to-delivery percentiles for logs."""
+        return self.latency.format()
     
     async def send_il_alert(
         self, 
@@ -411,7 +749,7 @@ Monitoring has been suspended.
 
         Args:
             whale_address: Whale wallet address
-            tx_data: Transaction data
+            tx_data: Transaction data (value_usd, hash, timestamp of the block)
             destination_info: Information about destination (exchange)
             current_price: Current token price (optional)
 
@@ -441,7 +779,12 @@ Monitoring has been suspended.
 🕐 **Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
-            return await self.send_message(message)
+            return await self.send_message(
+                message,
+                digest=True,
+                priority=AlertPriority.CRITICAL,
+                block_timestamp=tx_data.get('timestamp')
+            )
 
         except Exception as e:
             self.logger.error(f"Error sending direct transfer alert: {e}")
@@ -460,7 +803,7 @@ Monitoring has been suspended.
 
         Args:
             whale_address: Whale wallet address
-            whale_tx: Initial whale transaction
+            whale_tx: Initial whale transaction (value_usd, hash, timestamp of the block)
             intermediate_address: Intermediate address
             onehop_result: One-hop detection result
             current_price: Current token price (optional)
@@ -498,12 +841,119 @@ Monitoring has been suspended.
 🕐 **Detected:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
-            return await self.send_message(message)
+            return await self.send_message(
+                message,
+                digest=True,
+                priority=onehop_priority(onehop_result.get('confidence')),
+                block_timestamp=whale_tx.get('timestamp')
+            )
 
         except Exception as e:
             self.logger.error(f"Error sending one-hop alert: {e}")
             return False
 
+    async def send_whale_multihop_alert(
+        self,
+        whale_address: str,
+        whale_tx: Dict[str, Any],
+        path: Any,
+        exchange_name: str = 'Unknown Exchange'
+    ) -> bool:
+        """
+        Send alert for multi-hop detection (whale → N intermediates → exchange).
+
+        Args:
+            whale_address: Whale wallet address
+            whale_tx: Initial whale transaction (value_usd, hash, timestamp of the block)
+            path: FlowPath traced by FlowGraph
+            exchange_name: Exchange name
+
+        Returns:
+            bool: True if sent successfully
+        """
+        try:
+            whale_amount = whale_tx.get('value_usd', 0)
+            whale_tx_hash = whale_tx.get('hash', '')
+            intermediates = path.addresses[1:-1]
+
+            message = f"""
+🕸️ **WHALE → {len(intermediates)} HOPS → EXCHANGE**
+
+🐋 **Whale:** `{whale_address[:10]}...{whale_address[-8:]}`
+💰 **Amount:** ${whale_amount:,.0f} ({path.amount_eth:,.2f} ETH reached the exchange)
+"""
+            for i, address in enumerate(intermediates, 1):
+                message += f"{i}. `{address[:10]}...{address[-8:]}` ({path.amounts_eth[i]:,.2f} ETH)\n"
+
+            message += f"""💱 **Exchange:** {exchange_name}
+⏱️ Total delay: {path.duration_minutes:.0f} minutes
+🎯 Confidence: {path.confidence:.0f}%
+
+🔗 [View Whale TX](https://etherscan.io/tx/{whale_tx_hash})
+🕐 **Detected:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+
+            return await self.send_message(
+                message,
+                digest=True,
+                priority=onehop_priority(path.confidence),
+                block_timestamp=whale_tx.get('timestamp')
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error sending multi-hop alert: {e}")
+            return False
+
+    async def send_whale_split_dump_alert(
+        self,
+        whale_address: str,
+        whale_tx: Dict[str, Any],
+        episode: Any,
+        exchange_names: List[str]
+    ) -> bool:
+        """
+        Send alert for a split dump (whale → several intermediates → exchanges).
+
+        Args:
+            whale_address: Whale wallet address
+            whale_tx: First whale transaction (value_usd, hash, timestamp of the block)
+            episode: SplitEpisode flagged by SplitDumpDetector
+            exchange_names: Names of the receiving exchanges
+
+        Returns:
+            bool: True if sent successfully
+        """
+        try:
+            amount_usd = whale_tx.get('value_usd', 0)
+            whale_tx_hash = whale_tx.get('hash', '')
+
+            message = f"""
+🧩 **WHALE SPLIT DUMP**
+
+🐋 **Whale:** `{whale_address[:10]}...{whale_address[-8:]}`
+💰 **Reached exchanges:** ${amount_usd:,.0f} ({episode.exchange_amount_eth:,.2f} of {episode.amount_eth:,.2f} ETH, {episode.share:.0%})
+🔀 **Intermediates:** {len(episode.intermediates)}
+💱 **Exchanges:** {', '.join(exchange_names)}
+"""
+            for address, amount in list(episode.intermediates.items())[:5]:
+                message += f"• `{address[:10]}...{address[-8:]}` → {amount:,.2f} ETH\n"
+
+            message += f"""
+🔗 [View Whale TX](https://etherscan.io/tx/{whale_tx_hash})
+🕐 **Detected:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+"""
+
+            return await self.send_message(
+                message,
+                digest=True,
+                priority=AlertPriority.HIGH,
+                block_timestamp=whale_tx.get('timestamp')
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error sending split dump alert: {e}")
+            return False
+
     async def send_anomaly_alert(
         self,
         whale_address: str,
@@ -542,7 +992,12 @@ Monitoring has been suspended.
 🕐 **Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
-            return await self.send_message(message)
+            return await self.send_message(
+                message,
+                digest=True,
+                priority=AlertPriority.LOW,
+                block_timestamp=tx_data.get('timestamp')
+            )
 
         except Exception as e:
             self.logger.error(f"Error sending anomaly alert: {e}")
@@ -554,11 +1009,18 @@ class AlertManager:
     Manages alert rules and notifications.
     """
     
-    def __init__(self, notifier: TelegramNotifier):
-        """Initialize Alert Manager."""
+    def __init__(self, notifier: TelegramNotifier, last_alerts: Optional[MutableMapping] = None):
+        """
+        Initialize Alert Manager.
+
+        Args:
+            notifier: Telegram notifier
+            last_alerts: Alert key -> sent time mapping; pass a persistent
+                mapping (StateStore) to keep dedup across restarts
+        """
         self.logger = logging.getLogger(__name__)
         self.notifier = notifier
-        self.last_alerts = {}  # Prevent spam
+        self.last_alerts = last_alerts if last_alerts is not None else {}  # Prevent spam
     
     async def check_and_send_alerts(
         self, 
@@ -621,13 +1083,12 @@ class AlertManager:
         """Mark alert as sent."""
         self.last_alerts[alert_key] = datetime.now()
 
-        # Clean up old alerts (keep only last 24 hours)
+        # Clean up old alerts (keep only last 24 hours), in place so a
+        # persistent mapping stays attached
         cutoff = datetime.now() - timedelta(hours=24)
 
-        self.last_alerts = {
-            k: v for k, v in self.last_alerts.items()
-            if v > cutoff
-        }
+        for key in [k for k, v in self.last_alerts.items() if v <= cutoff]:
+            del self.last_alerts[key]
 
 
 # Message formatting utilities
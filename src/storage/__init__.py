@@ -0,0 +1,29 @@
+"""
+Storage Package
+================
+
+Local persistence of blockchain data (transaction history, indexer checkpoints)
+and of watcher state (balances, alert cooldowns). Exchange deposit addresses
+are learned from the stored transactions; daily rollups and monthly partitions
+with retention keep the history bounded. Signal metrics track the precision
+and recall of the one-hop signals as detections are labeled.
+"""
+
+from .transaction_store import TransactionStore
+from .transaction_indexer import TransactionIndexer
+from .state_store import StateStore, PersistentState
+from .deposit_clusterer import DepositClusterer
+from .rollups import DailyRollups
+from .partitions import PartitionManager
+from .signal_metrics import SignalMetricsAggregator
+
+__all__ = [
+    'TransactionStore',
+    'TransactionIndexer',
+    'StateStore',
+    'PersistentState',
+    'DepositClusterer',
+    'DailyRollups',
+    'PartitionManager',
+    'SignalMetricsAggregator'
+]
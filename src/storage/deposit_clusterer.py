@@ -0,0 +1,325 @@
+"""
+Deposit Clusterer - Exchange Deposit Addresses from Local History
+=================================================================
+
+Exchanges give every customer a personal deposit address and periodically
+sweep it into a hot wallet. A whale dumping through such an address looks
+like a transfer to an unknown intermediate, which sends the one-hop path
+into RPC-heavy profiling.
+
+This job scans the local `transactions` table and finds those addresses:
+
+- For every unknown sender it counts outgoing value transfers per recipient
+  (deposit addresses have one or two recipients; senders with more are
+  dropped early, which keeps memory bounded).
+- A sender is a deposit address when at least `min_sweeps` of its transfers,
+  and at least `min_sweep_ratio` of all of them, go to addresses of ONE
+  exchange.
+- Exchange membership is kept in a union-find forest: known exchange wallets
+  seed components labeled with their exchange, every detected deposit address
+  is joined to the component it sweeps to. A newly labeled address may in turn
+  qualify senders that sweep to it (e.g. deposit -> consolidation wallet ->
+  hot wallet), so detection propagates until nothing changes.
+- Senders sweeping to several exchanges are ambiguous and skipped.
+
+Detected addresses are published into the WhaleConfig AddressIndex as
+EXCHANGE entries (tags: <exchange>, deposit, clustered), so is_exchange() and
+classify_transaction_destination() treat transfers to them as direct dumps.
+
+run() is incremental: rows are read in (created_at, tx_hash) order from a
+watermark. The first run after a restart rebuilds everything from the table.
+
+Author: Whale Tracker Project
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, or_, select
+
+from models.database import Transaction
+from models.db_connection import AsyncDatabaseManager
+from src.core.whale_config import WhaleCategory, WhaleConfig
+
+
+class DepositClusterer:
+    """
+    Incremental exchange deposit-address detection over stored transactions.
+    """
+
+    def __init__(
+        self,
+        db_manager: AsyncDatabaseManager,
+        whale_config: WhaleConfig,
+        exclude: Optional[Iterable[str]] = None,
+        min_sweeps: int = 2,
+        min_sweep_ratio: float = 0.9,
+        max_recipients: int = 3,
+        batch_size: int = 5000
+    ):
+        """
+        Initialize Deposit Clusterer.
+
+        Args:
+            db_manager: Async database manager
+            whale_config: Whale configuration (its index receives the detected addresses)
+            exclude: Addresses never published (e.g. the monitored whales)
+            min_sweeps: Transfers to one exchange needed to call a sender a deposit address
+            min_sweep_ratio: Share of the sender's transfers that must go to that exchange
+            max_recipients: Senders with more distinct recipients are not deposit addresses
+            batch_size: Rows read per query
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_manager = db_manager
+        self.whale_config = whale_config
+        self.exclude: Set[str] = {address.lower() for address in (exclude or ())}
+        self.min_sweeps = min_sweeps
+        self.min_sweep_ratio = min_sweep_ratio
+        self.max_recipients = max_recipients
+        self.batch_size = batch_size
+
+        # Union-find over exchange addresses; labels live on the roots
+        self._parent: Dict[str, str] = {}
+        self._size: Dict[str, int] = {}
+        self._labels: Dict[str, Set[str]] = {}
+
+        # Candidate sender -> recipient -> transfer count
+        self._recipients: Dict[str, Dict[str, int]] = {}
+        # Recipient -> candidate senders (re-evaluated when recipient gets labeled)
+        self._senders_to: Dict[str, Set[str]] = {}
+        self._rejected: Set[str] = set()
+
+        # Published deposit address -> exchange
+        self.deposits: Dict[str, str] = {}
+
+        # Watermark: last processed (created_at, tx_hash)
+        self._watermark = None
+
+        self.rows_processed = 0
+        self.ambiguous = 0
+        self.runs = 0
+
+    # ==================== Union-find ====================
+
+    def _find(self, address: str) -> str:
+        """Root of an address's component (path halving)."""
+        parent = self._parent
+        while parent[address] != address:
+            parent[address] = parent[parent[address]]
+            address = parent[address]
+        return address
+
+    def _union(self, a: str, b: str) -> str:
+        """Merge two components (union by size); returns the new root."""
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return root_a
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        labels = self._labels.pop(root_b, None)
+        if labels:
+            self._labels.setdefault(root_a, set()).update(labels)
+        return root_a
+
+    def _exchange_of(self, address: str) -> Optional[str]:
+        """
+        Exchange label of an address's component.
+
+        Known exchange wallets join the forest on first sight. Returns None for
+        non-exchange addresses and for components spanning several exchanges.
+        """
+        if address not in self._parent:
+            label = self.whale_config.get_exchange_label(address)
+            if label is None:
+                return None
+            self._parent[address] = address
+            self._size[address] = 1
+            self._labels[address] = {label}
+
+        labels = self._labels.get(self._find(address), ())
+        return next(iter(labels)) if len(labels) == 1 else None
+
+    # ==================== Detection ====================
+
+    def _observe(self, sender: str, recipient: str) -> bool:
+        """
+        Count one transfer of a candidate sender.
+
+        Returns:
+            True if the sender should be (re-)evaluated
+        """
+        if sender in self._rejected or sender in self.exclude or sender in self._parent:
+            return False
+        recipients = self._recipients.get(sender)
+        if recipients is None:
+            # Curated / bulk-loaded addresses are already classified
+            if self.whale_config.index.get_mask(sender):
+                self._rejected.add(sender)
+                return False
+            recipients = self._recipients[sender] = {}
+
+        recipients[recipient] = recipients.get(recipient, 0) + 1
+        if len(recipients) > self.max_recipients:
+            # Pays many parties: a user wallet, not a deposit address
+            self._drop(sender)
+            return False
+
+        self._senders_to.setdefault(recipient, set()).add(sender)
+        return True
+
+    def _drop(self, sender: str) -> None:
+        """Forget a sender's counters."""
+        self._rejected.add(sender)
+        for recipient in self._recipients.pop(sender, {}):
+            senders = self._senders_to.get(recipient)
+            if senders is not None:
+                senders.discard(sender)
+                if not senders:
+                    del self._senders_to[recipient]
+
+    def _evaluate(self, sender: str) -> Optional[str]:
+        """
+        Decide whether a candidate is a deposit address.
+
+        Returns:
+            Exchange label if the sender qualifies
+        """
+        recipients = self._recipients.get(sender)
+        if not recipients:
+            return None
+
+        total = sum(recipients.values())
+        per_exchange: Dict[str, int] = {}
+        for recipient, count in recipients.items():
+            exchange = self._exchange_of(recipient)
+            if exchange is not None:
+                per_exchange[exchange] = per_exchange.get(exchange, 0) + count
+
+        if len(per_exchange) > 1:
+            self.ambiguous += 1
+            self._drop(sender)
+            return None
+        if not per_exchange:
+            return None
+
+        exchange, sweeps = next(iter(per_exchange.items()))
+        if sweeps < self.min_sweeps or sweeps / total < self.min_sweep_ratio:
+            return None
+        return exchange
+
+    def _publish(self, sender: str, exchange: str) -> None:
+        """Join a deposit address to its exchange and add it to the index."""
+        self._parent[sender] = sender
+        self._size[sender] = 1
+        for recipient in self._recipients.get(sender, {}):
+            if self._exchange_of(recipient) == exchange:
+                self._union(sender, recipient)
+                break
+
+        self._drop(sender)
+        self._rejected.discard(sender)
+        self.deposits[sender] = exchange
+        self.whale_config.index.add(
+            sender,
+            WhaleCategory.EXCHANGE,
+            name=f"{exchange.title()} Deposit",
+            tags=[exchange, 'deposit', 'clustered']
+        )
+
+    def _propagate(self, pending: Set[str]) -> List[str]:
+        """Evaluate senders until no new deposit address is found."""
+        published = []
+        while pending:
+            sender = pending.pop()
+            exchange = self._evaluate(sender)
+            if exchange is None:
+                continue
+
+            self._publish(sender, exchange)
+            published.append(sender)
+            # Senders sweeping to the new deposit address may qualify now
+            pending.update(self._senders_to.get(sender, ()))
+
+        return published
+
+    # ==================== Job ====================
+
+    async def run(self) -> List[str]:
+        """
+        Process transactions stored since the last run and publish new deposit addresses.
+
+        Returns:
+            Newly detected deposit addresses (lowercase)
+        """
+        published: List[str] = []
+        try:
+            while True:
+                rows = await self._fetch_batch()
+                if not rows:
+                    break
+
+                pending: Set[str] = set()
+                for sender, recipient, _, _ in rows:
+                    if recipient and sender != recipient and self._observe(sender, recipient):
+                        pending.add(sender)
+
+                published.extend(self._propagate(pending))
+                self.rows_processed += len(rows)
+                self._watermark = (rows[-1][2], rows[-1][3])
+
+                if len(rows) < self.batch_size:
+                    break
+
+        except Exception as e:
+            self.logger.error(f"Error clustering deposit addresses: {e}")
+
+        self.runs += 1
+        if published:
+            self.logger.info(
+                f"Detected {len(published)} exchange deposit addresses "
+                f"({len(self.deposits)} total)"
+            )
+        return published
+
+    async def _fetch_batch(self) -> list:
+        """Next successful value transfers after the watermark."""
+        query = (
+            select(
+                Transaction.from_address,
+                Transaction.to_address,
+                Transaction.created_at,
+                Transaction.tx_hash
+            )
+            .where(Transaction.status.is_(True))
+            .where(Transaction.value_wei != '0')
+            .order_by(Transaction.created_at, Transaction.tx_hash)
+            .limit(self.batch_size)
+        )
+        if self._watermark is not None:
+            created_at, tx_hash = self._watermark
+            query = query.where(or_(
+                Transaction.created_at > created_at,
+                and_(Transaction.created_at == created_at, Transaction.tx_hash > tx_hash)
+            ))
+
+        async with self.db_manager.session() as session:
+            result = await session.execute(query)
+            return result.all()
+
+    def get_exchange(self, address: str) -> Optional[str]:
+        """Exchange a detected deposit address belongs to."""
+        return self.deposits.get(address.lower())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get clustering statistics."""
+        return {
+            'deposits': len(self.deposits),
+            'candidates': len(self._recipients),
+            'rejected': len(self._rejected),
+            'ambiguous': self.ambiguous,
+            'rows_processed': self.rows_processed,
+            'runs': self.runs
+        }
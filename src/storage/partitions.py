@@ -0,0 +1,271 @@
+"""
+Partitions and Retention - Bounded Raw History
+==============================================
+
+PostgreSQL: `transactions` is declared PARTITION BY RANGE (block_timestamp)
+(see models/database.py). PartitionManager creates one partition per month
+(`transactions_y2024m01`) before rows of that month are inserted, and
+retention drops whole expired partitions, which is O(1) and leaves no bloat.
+Queries filtered by block_timestamp only touch the matching partitions, and
+per-partition indexes stay small.
+
+SQLite (tests, single-node deployments): one table; retention deletes expired
+rows in batches through the block_timestamp index.
+
+Retention also removes one-hop detections (and their alerts) older than the
+raw retention window, and daily rollups older than their own, longer window.
+
+Author: Whale Tracker Project
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, select, text
+
+from models.database import (
+    ExchangeDailyRollup,
+    OneHopDetection,
+    Transaction,
+    WhaleAlert,
+    WhaleDailyRollup
+)
+from models.db_connection import AsyncDatabaseManager
+
+
+_PARTITION_SUFFIX = re.compile(r'_y(\d{4})m(\d{2})$')
+
+
+def month_start(timestamp: datetime) -> datetime:
+    """First instant of the timestamp's month."""
+    return datetime(timestamp.year, timestamp.month, 1)
+
+
+def next_month(month: datetime) -> datetime:
+    """First instant of the following month."""
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Partition table name of a month, e.g. transactions_y2024m01."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+class PartitionManager:
+    """
+    Monthly partitions of `transactions` and the retention job.
+    """
+
+    TABLE = Transaction.__tablename__
+
+    def __init__(
+        self,
+        db_manager: AsyncDatabaseManager,
+        retention_days: int = 90,
+        rollup_retention_days: int = 730,
+        delete_batch_size: int = 5000
+    ):
+        """
+        Initialize Partition Manager.
+
+        Args:
+            db_manager: Async database manager
+            retention_days: Raw transactions / detections older than this are removed
+            rollup_retention_days: Daily rollups older than this are removed
+            delete_batch_size: Rows deleted per statement (row-wise retention)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_manager = db_manager
+        self.retention_days = retention_days
+        self.rollup_retention_days = rollup_retention_days
+        self.delete_batch_size = delete_batch_size
+
+        # Months with an existing partition (None until loaded)
+        self._months: Optional[Set[datetime]] = None
+
+        self.partitions_created = 0
+        self.partitions_dropped = 0
+
+    @property
+    def partitioned(self) -> bool:
+        """True if the database partitions natively (PostgreSQL)."""
+        return not self.db_manager.config.is_sqlite
+
+    # ==================== Partitions ====================
+
+    async def list_partitions(self) -> List[Tuple[str, datetime]]:
+        """
+        Existing monthly partitions, oldest first.
+
+        Returns:
+            List of (partition name, month start); empty on SQLite
+        """
+        if not self.partitioned:
+            return []
+
+        async with self.db_manager.session() as session:
+            result = await session.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                    "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                    "WHERE parent.relname = :table"
+                ),
+                {'table': self.TABLE}
+            )
+            names = result.scalars().all()
+
+        partitions = []
+        for name in names:
+            match = _PARTITION_SUFFIX.search(name)
+            if match:
+                partitions.append((name, datetime(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    async def ensure_partitions(self, timestamps: Iterable[datetime]) -> int:
+        """
+        Create the monthly partitions that rows with these timestamps need.
+
+        Known months are cached, so the call costs a set lookup per batch.
+
+        Args:
+            timestamps: Block timestamps about to be inserted
+
+        Returns:
+            Number of partitions created
+        """
+        if not self.partitioned:
+            return 0
+
+        if self._months is None:
+            self._months = {month for _, month in await self.list_partitions()}
+
+        missing = {month_start(timestamp) for timestamp in timestamps} - self._months
+        if not missing:
+            return 0
+
+        async with self.db_manager.session() as session:
+            for month in sorted(missing):
+                await session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(self.TABLE, month)} "
+                    f"PARTITION OF {self.TABLE} "
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month(month):%Y-%m-%d}')"
+                ))
+
+        self._months |= missing
+        self.partitions_created += len(missing)
+        self.logger.info(f"Created {len(missing)} transaction partitions")
+        return len(missing)
+
+    async def ensure_upcoming(self, now: Optional[datetime] = None, months_ahead: int = 1) -> int:
+        """Create the partitions of the current and the next months_ahead months."""
+        month = month_start(now or datetime.utcnow())
+        months = [month]
+        for _ in range(months_ahead):
+            month = next_month(month)
+            months.append(month)
+        return await self.ensure_partitions(months)
+
+    # ==================== Retention ====================
+
+    async def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Remove raw history older than retention_days and rollups older than
+        rollup_retention_days.
+
+        Returns:
+            Dict with partitions_dropped, transactions_deleted, detections_deleted,
+            alerts_deleted, rollups_deleted
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.retention_days)
+        rollup_cutoff = (now - timedelta(days=self.rollup_retention_days)).date()
+        stats = dict.fromkeys(
+            ('partitions_dropped', 'transactions_deleted', 'detections_deleted', 'alerts_deleted', 'rollups_deleted'), 0
+        )
+
+        try:
+            if self.partitioned:
+                stats['partitions_dropped'] = await self._drop_expired_partitions(cutoff)
+
+            # Row-wise for SQLite, and for the partly expired month on PostgreSQL
+            stats['transactions_deleted'] = await self._delete_transactions(cutoff)
+            stats['detections_deleted'], stats['alerts_deleted'] = await self._delete_detections(cutoff)
+
+            async with self.db_manager.session() as session:
+                for model in (WhaleDailyRollup, ExchangeDailyRollup):
+                    result = await session.execute(delete(model).where(model.day < rollup_cutoff))
+                    stats['rollups_deleted'] += max(result.rowcount, 0)
+
+        except Exception as e:
+            self.logger.error(f"Error applying retention: {e}")
+
+        self.logger.info(
+            f"Retention (raw < {cutoff:%Y-%m-%d}, rollups < {rollup_cutoff}): "
+            + ", ".join(f"{key}={value}" for key, value in stats.items())
+        )
+        return stats
+
+    async def _drop_expired_partitions(self, cutoff: datetime) -> int:
+        """Drop partitions whose whole month is before cutoff."""
+        expired = [name for name, month in await self.list_partitions() if next_month(month) <= cutoff]
+        if not expired:
+            return 0
+
+        async with self.db_manager.session() as session:
+            for name in expired:
+                await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+        if self._months is not None:
+            self._months = {month for month in self._months if next_month(month) > cutoff}
+        self.partitions_dropped += len(expired)
+        return len(expired)
+
+    async def _delete_transactions(self, cutoff: datetime) -> int:
+        """Delete expired transactions in batches (keeps write locks short)."""
+        deleted = 0
+        while True:
+            async with self.db_manager.session() as session:
+                hashes = (await session.execute(
+                    select(Transaction.tx_hash)
+                    .where(Transaction.block_timestamp < cutoff)
+                    .limit(self.delete_batch_size)
+                )).scalars().all()
+                if not hashes:
+                    return deleted
+
+                await session.execute(
+                    delete(Transaction)
+                    .where(Transaction.block_timestamp < cutoff)
+                    .where(Transaction.tx_hash.in_(hashes))
+                )
+            deleted += len(hashes)
+
+    async def _delete_detections(self, cutoff: datetime) -> Tuple[int, int]:
+        """Delete expired one-hop detections and their alerts in batches."""
+        detections = alerts = 0
+        while True:
+            async with self.db_manager.session() as session:
+                ids = (await session.execute(
+                    select(OneHopDetection.id)
+                    .where(OneHopDetection.whale_tx_timestamp < cutoff)
+                    .limit(self.delete_batch_size)
+                )).scalars().all()
+                if not ids:
+                    return detections, alerts
+
+                result = await session.execute(delete(WhaleAlert).where(WhaleAlert.detection_id.in_(ids)))
+                alerts += max(result.rowcount, 0)
+                await session.execute(delete(OneHopDetection).where(OneHopDetection.id.in_(ids)))
+            detections += len(ids)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get partition statistics."""
+        return {
+            'partitioned': self.partitioned,
+            'known_partitions': len(self._months or ()),
+            'partitions_created': self.partitions_created,
+            'partitions_dropped': self.partitions_dropped
+        }
@@ -0,0 +1,300 @@
+"""
+Daily Rollups - Pre-aggregated Whale and Exchange Activity
+==========================================================
+
+Maintains `whale_daily_rollups` and `exchange_daily_rollups` while
+transactions are stored: TransactionStore passes every newly inserted batch
+to apply(), which adds the batch totals to the day rows with one
+INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col per table, in
+the same database transaction as the raw rows (no double counting on retries).
+
+get_whale_days() / get_exchange_days() read the day rows back for reporting
+and ad-hoc inspection; nothing in the monitoring loop depends on them. The
+rows outlive raw history, which retention may already have dropped.
+
+rebuild() recomputes the rollups of a period from raw transactions (first
+deployment, or after changing the whale list).
+
+Author: Whale Tracker Project
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select
+
+from models.database import ExchangeDailyRollup, Transaction, WhaleDailyRollup
+from models.db_connection import AsyncDatabaseManager
+from models.repository import bulk_upsert
+from src.core.whale_config import WhaleConfig
+
+
+WEI_PER_ETH = Decimal(10**18)
+
+_WHALE_COUNTERS = ('tx_out_count', 'tx_in_count', 'eth_out', 'eth_in', 'exchange_tx_count', 'exchange_eth')
+_EXCHANGE_COUNTERS = (
+    'inflow_tx_count', 'inflow_eth', 'outflow_tx_count', 'outflow_eth',
+    'whale_inflow_tx_count', 'whale_inflow_eth'
+)
+
+# (timestamp, from, to, value in ETH)
+Record = Tuple[datetime, str, Optional[str], Decimal]
+
+
+class DailyRollups:
+    """
+    Incrementally maintained per-day aggregates of stored transactions.
+    """
+
+    def __init__(
+        self,
+        db_manager: AsyncDatabaseManager,
+        whale_config: WhaleConfig,
+        whale_addresses: Iterable[str] = (),
+        rebuild_page_size: int = 5000
+    ):
+        """
+        Initialize Daily Rollups.
+
+        Args:
+            db_manager: Async database manager
+            whale_config: Whale configuration (exchange labels)
+            whale_addresses: Monitored whales (get a per-whale rollup)
+            rebuild_page_size: Raw rows read per query in rebuild()
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_manager = db_manager
+        self.whale_config = whale_config
+        self.whales = {address.lower() for address in whale_addresses}
+        self.rebuild_page_size = rebuild_page_size
+
+        self.batches_applied = 0
+        self.transactions_applied = 0
+
+    def add_whale(self, address: str) -> None:
+        """Start rolling up a whale (from now on; use rebuild() for its past)."""
+        self.whales.add(address.lower())
+
+    # ==================== Aggregation ====================
+
+    def _aggregate(self, records: Iterable[Record]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Sum records per (day, whale) and (day, exchange).
+
+        Returns:
+            (whale rollup rows, exchange rollup rows) with counter deltas
+        """
+        whales: Dict[Tuple[date, str], Dict[str, Any]] = defaultdict(lambda: dict.fromkeys(_WHALE_COUNTERS, 0))
+        exchanges: Dict[Tuple[date, str], Dict[str, Any]] = defaultdict(lambda: dict.fromkeys(_EXCHANGE_COUNTERS, 0))
+        labels: Dict[str, Optional[str]] = {}
+
+        def exchange_of(address: Optional[str]) -> Optional[str]:
+            if not address:
+                return None
+            if address not in labels:
+                labels[address] = self.whale_config.get_exchange_label(address)
+            return labels[address]
+
+        for timestamp, sender, recipient, eth in records:
+            day = timestamp.date()
+            source_exchange = exchange_of(sender)
+            target_exchange = exchange_of(recipient)
+            from_whale = sender in self.whales
+
+            if from_whale:
+                row = whales[(day, sender)]
+                row['tx_out_count'] += 1
+                row['eth_out'] += eth
+                if target_exchange is not None:
+                    row['exchange_tx_count'] += 1
+                    row['exchange_eth'] += eth
+
+            if recipient in self.whales:
+                row = whales[(day, recipient)]
+                row['tx_in_count'] += 1
+                row['eth_in'] += eth
+
+            if target_exchange is not None:
+                row = exchanges[(day, target_exchange)]
+                row['inflow_tx_count'] += 1
+                row['inflow_eth'] += eth
+                if from_whale:
+                    row['whale_inflow_tx_count'] += 1
+                    row['whale_inflow_eth'] += eth
+
+            if source_exchange is not None:
+                row = exchanges[(day, source_exchange)]
+                row['outflow_tx_count'] += 1
+                row['outflow_eth'] += eth
+
+        return (
+            [{'day': day, 'whale_address': whale, **counters} for (day, whale), counters in whales.items()],
+            [{'day': day, 'exchange': exchange, **counters} for (day, exchange), counters in exchanges.items()]
+        )
+
+    async def _write(self, session, records: Iterable[Record]) -> None:
+        """Add aggregated records to the rollup rows."""
+        whale_rows, exchange_rows = self._aggregate(records)
+        if whale_rows:
+            await bulk_upsert(session, WhaleDailyRollup, whale_rows, update_columns=(),
+                              increment_columns=_WHALE_COUNTERS)
+        if exchange_rows:
+            await bulk_upsert(session, ExchangeDailyRollup, exchange_rows, update_columns=(),
+                              increment_columns=_EXCHANGE_COUNTERS)
+
+    async def apply(self, session, transactions: List[Dict[str, Any]]) -> None:
+        """
+        Add newly stored transactions to the rollups.
+
+        Args:
+            session: Session of the transaction that inserted them
+            transactions: Detector-format transaction dicts (each exactly once)
+        """
+        if not transactions:
+            return
+
+        await self._write(session, (
+            (
+                tx['timestamp'],
+                tx['from'].lower(),
+                tx['to'].lower() if tx.get('to') else None,
+                Decimal(int(tx.get('value') or 0)) / WEI_PER_ETH
+            )
+            for tx in transactions
+        ))
+        self.batches_applied += 1
+        self.transactions_applied += len(transactions)
+
+    async def rebuild(self, since: date, until: Optional[date] = None) -> int:
+        """
+        Recompute the rollups of [since, until) from raw transactions.
+
+        Args:
+            since: First day
+            until: Day after the last one (default: no end)
+
+        Returns:
+            Number of raw transactions read
+        """
+        start = datetime.combine(since, time.min)
+        end = datetime.combine(until, time.min) if until else None
+        read = 0
+
+        try:
+            async with self.db_manager.session() as session:
+                for model in (WhaleDailyRollup, ExchangeDailyRollup):
+                    query = delete(model).where(model.day >= since)
+                    if until:
+                        query = query.where(model.day < until)
+                    await session.execute(query)
+
+                # Keyset pagination over the partition key
+                cursor = None
+                while True:
+                    query = (
+                        select(
+                            Transaction.block_timestamp,
+                            Transaction.tx_hash,
+                            Transaction.from_address,
+                            Transaction.to_address,
+                            Transaction.value
+                        )
+                        .where(Transaction.block_timestamp >= start)
+                        .order_by(Transaction.block_timestamp, Transaction.tx_hash)
+                        .limit(self.rebuild_page_size)
+                    )
+                    if end is not None:
+                        query = query.where(Transaction.block_timestamp < end)
+                    if cursor is not None:
+                        query = query.where(or_(
+                            Transaction.block_timestamp > cursor[0],
+                            and_(Transaction.block_timestamp == cursor[0], Transaction.tx_hash > cursor[1])
+                        ))
+
+                    rows = (await session.execute(query)).all()
+                    if not rows:
+                        break
+
+                    await self._write(session, (
+                        (row.block_timestamp, row.from_address, row.to_address, Decimal(row.value))
+                        for row in rows
+                    ))
+                    read += len(rows)
+                    cursor = (rows[-1].block_timestamp, rows[-1].tx_hash)
+
+                    if len(rows) < self.rebuild_page_size:
+                        break
+
+        except Exception as e:
+            self.logger.error(f"Error rebuilding rollups since {since}: {e}")
+            return 0
+
+        self.logger.info(f"Rebuilt daily rollups since {since} from {read} transactions")
+        return read
+
+    # ==================== Reads ====================
+
+    async def get_whale_days(self, address: str, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Daily activity of a whale, oldest first.
+
+        Args:
+            address: Whale address
+            days: Number of days back from today
+        """
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        try:
+            async with self.db_manager.session() as session:
+                result = await session.execute(
+                    select(WhaleDailyRollup)
+                    .where(WhaleDailyRollup.whale_address == address.lower())
+                    .where(WhaleDailyRollup.day >= since)
+                    .order_by(WhaleDailyRollup.day)
+                )
+                return [
+                    {'day': row.day, **{column: getattr(row, column) for column in _WHALE_COUNTERS}}
+                    for row in result.scalars().all()
+                ]
+        except Exception as e:
+            self.logger.error(f"Error reading rollups of {address}: {e}")
+            return []
+
+    async def get_exchange_days(self, exchange: Optional[str] = None, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Daily flows per exchange, oldest first.
+
+        Args:
+            exchange: Exchange label (all exchanges if None)
+            days: Number of days back from today
+        """
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        query = (
+            select(ExchangeDailyRollup)
+            .where(ExchangeDailyRollup.day >= since)
+            .order_by(ExchangeDailyRollup.day, ExchangeDailyRollup.exchange)
+        )
+        if exchange is not None:
+            query = query.where(ExchangeDailyRollup.exchange == exchange.lower())
+
+        try:
+            async with self.db_manager.session() as session:
+                result = await session.execute(query)
+                return [
+                    {'day': row.day, 'exchange': row.exchange,
+                     **{column: getattr(row, column) for column in _EXCHANGE_COUNTERS}}
+                    for row in result.scalars().all()
+                ]
+        except Exception as e:
+            self.logger.error(f"Error reading exchange rollups: {e}")
+            return []
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get rollup statistics."""
+        return {
+            'whales': len(self.whales),
+            'batches_applied': self.batches_applied,
+            'transactions_applied': self.transactions_applied
+        }
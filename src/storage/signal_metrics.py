@@ -0,0 +1,456 @@
+"""
+Signal Metrics - Incremental Precision/Recall per Detection Signal
+==================================================================
+
+Keeps `signal_metrics` (one row per signal and detection day) up to date
+while one-hop detections are labeled, instead of recomputing it from
+`one_hop_detections` with full-table scans.
+
+record_outcome() sets a detection's status and, in the same database
+transaction, moves its signal scores between the confusion counts:
+
+- a signal is "positive" when its score reaches `positive_threshold`
+- confirmed + positive = TP, confirmed + negative = FN,
+  false_positive + positive = FP, false_positive + negative = TN
+- relabeling (confirmed -> false_positive, or back to pending) first removes
+  the previous contribution, so the counts never drift
+
+Per-signal totals are kept in memory next to the day rows (loaded once in
+initialize()), so get_metrics() / suggest_weights() are O(1) reads. Updates
+are serialized: each one writes absolute day counts computed from the
+in-memory copy, so two concurrent outcomes for the same signal-day (or two
+relabels of one detection) must not start from the same counts.
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from models.database import OneHopDetection, SignalMetrics
+from models.db_connection import AsyncDatabaseManager
+from models.repository import bulk_upsert
+
+
+# Signal name -> OneHopDetection score column
+SIGNAL_COLUMNS = {
+    'time': 'time_correlation_score',
+    'gas': 'gas_correlation_score',
+    'nonce': 'nonce_correlation_score',
+    'amount': 'amount_correlation_score',
+    'address': 'address_profile_score',
+    'composite': 'total_confidence'
+}
+
+# signal_details keys of the watcher that differ from the signal name
+_DETAIL_ALIASES = {'profile': 'address'}
+
+LABELS = ('confirmed', 'false_positive')
+STATUSES = ('pending',) + LABELS
+HISTOGRAM_BUCKETS = 10
+
+
+def _ratio(numerator: int, denominator: int) -> Optional[float]:
+    return numerator / denominator if denominator else None
+
+
+def _decimal(value: Optional[float], places: int) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(round(value, places)))
+
+
+@dataclass
+class SignalCounts:
+    """Confusion counts, score sums and histogram of one signal."""
+    total_checks: int = 0
+    positive_signals: int = 0
+    true_positives: int = 0
+    false_positives: int = 0
+    true_negatives: int = 0
+    false_negatives: int = 0
+    confidence_sum: int = 0
+    positive_confidence_sum: int = 0
+    histogram: Dict[str, List[int]] = field(
+        default_factory=lambda: {label: [0] * HISTOGRAM_BUCKETS for label in LABELS}
+    )
+
+    def add(self, confidence: int, positive: bool, label: str, sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one labeled score."""
+        self.total_checks += sign
+        self.confidence_sum += sign * confidence
+        if positive:
+            self.positive_signals += sign
+            self.positive_confidence_sum += sign * confidence
+
+        if label == 'confirmed':
+            if positive:
+                self.true_positives += sign
+            else:
+                self.false_negatives += sign
+        elif positive:
+            self.false_positives += sign
+        else:
+            self.true_negatives += sign
+
+        bucket = min(max(confidence, 0) * HISTOGRAM_BUCKETS // 100, HISTOGRAM_BUCKETS - 1)
+        self.histogram[label][bucket] += sign
+
+    def copy(self) -> 'SignalCounts':
+        """Independent copy (histogram lists included)."""
+        counts = SignalCounts(**{
+            name: getattr(self, name) for name in self.__dataclass_fields__ if name != 'histogram'
+        })
+        counts.histogram = {label: list(buckets) for label, buckets in self.histogram.items()}
+        return counts
+
+    @property
+    def precision(self) -> Optional[float]:
+        return _ratio(self.true_positives, self.true_positives + self.false_positives)
+
+    @property
+    def recall(self) -> Optional[float]:
+        return _ratio(self.true_positives, self.true_positives + self.false_negatives)
+
+    @property
+    def signal_rate(self) -> Optional[float]:
+        return _ratio(self.positive_signals, self.total_checks)
+
+    @property
+    def f1(self) -> Optional[float]:
+        precision, recall = self.precision, self.recall
+        if not precision or not recall:
+            return None
+        return 2 * precision * recall / (precision + recall)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counts with derived metrics."""
+        return {
+            'total_checks': self.total_checks,
+            'positive_signals': self.positive_signals,
+            'true_positives': self.true_positives,
+            'false_positives': self.false_positives,
+            'true_negatives': self.true_negatives,
+            'false_negatives': self.false_negatives,
+            'precision': self.precision,
+            'recall': self.recall,
+            'f1': self.f1,
+            'signal_rate': self.signal_rate,
+            'avg_confidence_when_positive': _ratio(self.positive_confidence_sum, self.positive_signals),
+            'avg_confidence_overall': _ratio(self.confidence_sum, self.total_checks),
+            'histogram': {label: list(buckets) for label, buckets in self.histogram.items()}
+        }
+
+
+class SignalMetricsAggregator:
+    """
+    Per-signal performance maintained on every detection label change.
+    """
+
+    def __init__(
+        self,
+        db_manager: AsyncDatabaseManager,
+        positive_threshold: int = 50,
+        batch_size: int = 1000
+    ):
+        """
+        Initialize Signal Metrics Aggregator.
+
+        Args:
+            db_manager: Async database manager
+            positive_threshold: Score at which a signal counts as "fired"
+            batch_size: Detections read per query in rebuild()
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_manager = db_manager
+        self.positive_threshold = positive_threshold
+        self.batch_size = batch_size
+
+        # (signal, day) -> counts, mirrors the signal_metrics rows
+        self._days: Dict[Tuple[str, datetime], SignalCounts] = {}
+        # signal -> counts over all days
+        self._totals: Dict[str, SignalCounts] = {}
+        # Serializes record_outcome() / rebuild() (read-modify-write of the counts)
+        self._lock = asyncio.Lock()
+
+        self.outcomes_recorded = 0
+
+    async def initialize(self) -> None:
+        """Load the persisted day rows and totals."""
+        self._days.clear()
+        self._totals.clear()
+
+        async with self.db_manager.session() as session:
+            result = await session.execute(select(SignalMetrics))
+            for row in result.scalars().all():
+                counts = SignalCounts(
+                    total_checks=row.total_checks,
+                    positive_signals=row.positive_signals,
+                    true_positives=row.true_positives,
+                    false_positives=row.false_positives,
+                    true_negatives=row.true_negatives,
+                    false_negatives=row.false_negatives,
+                    confidence_sum=row.confidence_sum,
+                    positive_confidence_sum=row.positive_confidence_sum
+                )
+                for label, buckets in (row.confidence_histogram or {}).items():
+                    if label in counts.histogram:
+                        counts.histogram[label] = list(buckets)
+                self._days[(row.signal_name, row.date)] = counts
+                self._merge_total(row.signal_name, counts)
+
+        self.logger.info(f"Signal metrics loaded ({len(self._days)} signal-days)")
+
+    def _merge_total(self, signal: str, counts: SignalCounts) -> None:
+        """Add a day's counts to the signal total."""
+        total = self._totals.setdefault(signal, SignalCounts())
+        for name in total.__dataclass_fields__:
+            if name != 'histogram':
+                setattr(total, name, getattr(total, name) + getattr(counts, name))
+        for label, buckets in counts.histogram.items():
+            total.histogram[label] = [a + b for a, b in zip(total.histogram[label], buckets)]
+
+    # ==================== Updates ====================
+
+    @staticmethod
+    def _scores(detection: OneHopDetection) -> Dict[str, int]:
+        """Scores of the signals a detection evaluated (columns, else signal_details)."""
+        scores = {}
+        for signal, column in SIGNAL_COLUMNS.items():
+            score = getattr(detection, column)
+            if score is not None:
+                scores[signal] = int(score)
+
+        for name, details in (detection.signal_details or {}).items():
+            signal = _DETAIL_ALIASES.get(name, name)
+            if signal in SIGNAL_COLUMNS and signal not in scores and isinstance(details, dict):
+                confidence = details.get('confidence')
+                if confidence is not None:
+                    scores[signal] = int(confidence)
+        return scores
+
+    def _contributions(
+        self,
+        detection: OneHopDetection,
+        previous: str,
+        status: str
+    ) -> List[Tuple[str, datetime, int, bool, str, int]]:
+        """(signal, day, confidence, positive, label, sign) changes of a relabel."""
+        day = datetime.combine(detection.whale_tx_timestamp.date(), datetime.min.time())
+        changes = []
+        for label, sign in ((previous, -1), (status, 1)):
+            if label not in LABELS:
+                continue
+            for signal, confidence in self._scores(detection).items():
+                changes.append((signal, day, confidence, confidence >= self.positive_threshold, label, sign))
+        return changes
+
+    @staticmethod
+    def _row(signal: str, day: datetime, counts: SignalCounts) -> Dict[str, Any]:
+        """signal_metrics column values of a day."""
+        metrics = counts.to_dict()
+        return {
+            'signal_name': signal,
+            'date': day,
+            'total_checks': counts.total_checks,
+            'positive_signals': counts.positive_signals,
+            'true_positives': counts.true_positives,
+            'false_positives': counts.false_positives,
+            'true_negatives': counts.true_negatives,
+            'false_negatives': counts.false_negatives,
+            'confidence_sum': counts.confidence_sum,
+            'positive_confidence_sum': counts.positive_confidence_sum,
+            'precision': _decimal(metrics['precision'], 4),
+            'recall': _decimal(metrics['recall'], 4),
+            'signal_rate': _decimal(metrics['signal_rate'], 4),
+            'avg_confidence_when_positive': _decimal(metrics['avg_confidence_when_positive'], 2),
+            'avg_confidence_overall': _decimal(metrics['avg_confidence_overall'], 2),
+            'confidence_histogram': metrics['histogram']
+        }
+
+    async def record_outcome(self, detection_id: int, status: str, notes: Optional[str] = None) -> bool:
+        """
+        Label a detection and update the metrics of its signals.
+
+        Args:
+            detection_id: OneHopDetection id
+            status: 'confirmed', 'false_positive' or 'pending' (removes the label)
+            notes: Optional reviewer notes stored on the detection
+
+        Returns:
+            True if the detection exists and was updated
+        """
+        if status not in STATUSES:
+            self.logger.error(f"Unknown detection status '{status}'")
+            return False
+
+        async with self._lock:
+            return await self._record_outcome(detection_id, status, notes)
+
+    async def _record_outcome(self, detection_id: int, status: str, notes: Optional[str]) -> bool:
+        """record_outcome() body, run under the update lock."""
+        try:
+            async with self.db_manager.session() as session:
+                detection = await session.get(OneHopDetection, detection_id)
+                if detection is None:
+                    self.logger.warning(f"Detection {detection_id} not found")
+                    return False
+
+                changes = self._contributions(detection, detection.status, status)
+                detection.status = status
+                if notes is not None:
+                    detection.notes = notes
+
+                # Updated copies become current only after the commit
+                days: Dict[Tuple[str, datetime], SignalCounts] = {}
+                for signal, day, confidence, positive, label, sign in changes:
+                    key = (signal, day)
+                    if key not in days:
+                        days[key] = self._days[key].copy() if key in self._days else SignalCounts()
+                    days[key].add(confidence, positive, label, sign)
+
+                if days:
+                    await bulk_upsert(
+                        session,
+                        SignalMetrics,
+                        [self._row(signal, day, counts) for (signal, day), counts in days.items()],
+                        conflict_columns=('signal_name', 'date')
+                    )
+
+        except Exception as e:
+            self.logger.error(f"Error recording outcome of detection {detection_id}: {e}")
+            return False
+
+        self._days.update(days)
+        for signal, _, confidence, positive, label, sign in changes:
+            self._totals.setdefault(signal, SignalCounts()).add(confidence, positive, label, sign)
+        self.outcomes_recorded += 1
+        return True
+
+    async def rebuild(self) -> int:
+        """
+        Recompute all metrics from labeled detections (backfill / after
+        changing positive_threshold).
+
+        Returns:
+            Number of labeled detections read
+        """
+        async with self._lock:
+            return await self._rebuild()
+
+    async def _rebuild(self) -> int:
+        """rebuild() body, run under the update lock."""
+        days: Dict[Tuple[str, datetime], SignalCounts] = {}
+        read = 0
+
+        try:
+            async with self.db_manager.session() as session:
+                last_id = 0
+                while True:
+                    result = await session.execute(
+                        select(OneHopDetection)
+                        .where(OneHopDetection.status.in_(LABELS))
+                        .where(OneHopDetection.id > last_id)
+                        .order_by(OneHopDetection.id)
+                        .limit(self.batch_size)
+                    )
+                    detections = result.scalars().all()
+                    if not detections:
+                        break
+
+                    for detection in detections:
+                        for signal, day, confidence, positive, label, sign in self._contributions(
+                            detection, 'pending', detection.status
+                        ):
+                            days.setdefault((signal, day), SignalCounts()).add(confidence, positive, label, sign)
+                    read += len(detections)
+                    last_id = detections[-1].id
+
+                await session.execute(delete(SignalMetrics))
+                if days:
+                    await bulk_upsert(
+                        session,
+                        SignalMetrics,
+                        [self._row(signal, day, counts) for (signal, day), counts in days.items()],
+                        conflict_columns=('signal_name', 'date')
+                    )
+
+        except Exception as e:
+            self.logger.error(f"Error rebuilding signal metrics: {e}")
+            return 0
+
+        self._days = days
+        self._totals = {}
+        for (signal, _), counts in days.items():
+            self._merge_total(signal, counts)
+
+        self.logger.info(f"Rebuilt signal metrics from {read} labeled detections")
+        return read
+
+    # ==================== Reads ====================
+
+    def get_metrics(self, signal: str) -> Dict[str, Any]:
+        """
+        All-time metrics of a signal.
+
+        Args:
+            signal: Signal name ('time', 'gas', 'nonce', 'amount', 'address', 'composite')
+        """
+        return self._totals.get(signal, SignalCounts()).to_dict()
+
+    def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """All-time metrics of every signal with labeled detections."""
+        return {signal: counts.to_dict() for signal, counts in self._totals.items()}
+
+    def get_daily(self, signal: str, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Daily metrics of a signal, oldest first.
+
+        Args:
+            signal: Signal name
+            days: Number of days back from today
+        """
+        since = datetime.combine(datetime.utcnow().date() - timedelta(days=days - 1), datetime.min.time())
+        return [
+            {'date': day, **counts.to_dict()}
+            for (name, day), counts in sorted(self._days.items(), key=lambda item: item[0][1])
+            if name == signal and day >= since
+        ]
+
+    def suggest_weights(self, min_checks: int = 20, signals: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Signal weights proportional to precision, normalized to mean 1.0.
+
+        Signals with fewer than min_checks labeled detections (or no positive
+        ones) keep weight 1.0.
+
+        Args:
+            min_checks: Labeled detections needed before a signal is reweighted
+            signals: Signals to weigh (default: all but 'composite')
+        """
+        names = list(signals) if signals is not None else [s for s in SIGNAL_COLUMNS if s != 'composite']
+        precisions = {}
+        for name in names:
+            counts = self._totals.get(name)
+            if counts is not None and counts.total_checks >= min_checks and counts.precision is not None:
+                precisions[name] = counts.precision
+
+        weights = dict.fromkeys(names, 1.0)
+        if precisions:
+            mean = sum(precisions.values()) / len(precisions)
+            if mean > 0:
+                for name, precision in precisions.items():
+                    weights[name] = precision / mean
+        return weights
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get aggregator statistics."""
+        return {
+            'signals': len(self._totals),
+            'signal_days': len(self._days),
+            'outcomes_recorded': self.outcomes_recorded
+        }
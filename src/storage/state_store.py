@@ -0,0 +1,234 @@
+"""
+State Store - Persistent Watcher State
+======================================
+
+Keeps small pieces of in-process state (last known balances, alert
+cooldowns, alert dedup keys) in the `watcher_state` table so a restart
+resumes where the previous run stopped.
+
+- load(namespace) returns a dict-like PersistentState. All reads are served
+  from memory (the namespace is loaded once at startup).
+- Writes only mark the key dirty; flush() writes all dirty keys of all
+  namespaces in one transaction (write-behind). Repeated updates of a key
+  between flushes cost one row write.
+
+Values are JSON-encoded; datetimes are supported.
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from sqlalchemy import delete, select
+
+from models.database import WatcherState
+from models.db_connection import AsyncDatabaseManager
+
+
+def _encode(value: Any) -> str:
+    """JSON-encode a state value (datetimes as tagged ISO strings)."""
+    def default(obj):
+        if isinstance(obj, datetime):
+            return {'__datetime__': obj.isoformat()}
+        raise TypeError(f"Cannot persist value of type {type(obj).__name__}")
+
+    return json.dumps(value, default=default)
+
+
+def _decode(raw: str) -> Any:
+    """Decode a value written by _encode."""
+    def object_hook(obj):
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        return obj
+
+    return json.loads(raw, object_hook=object_hook)
+
+
+class PersistentState(MutableMapping):
+    """
+    dict-like view of one state namespace.
+
+    Reads come from memory; writes and deletes are recorded in the owning
+    StateStore and persisted on its next flush.
+    """
+
+    def __init__(self, store: 'StateStore', namespace: str, data: Dict[str, Any]):
+        self._store = store
+        self.namespace = namespace
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._store._mark_dirty(self.namespace, key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self._store._mark_dirty(self.namespace, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f"PersistentState({self.namespace!r}, {self._data!r})"
+
+
+class StateStore:
+    """
+    Write-behind persistent key/value state on top of AsyncDatabaseManager.
+    """
+
+    def __init__(self, db_manager: AsyncDatabaseManager, max_pending: int = 500):
+        """
+        Initialize State Store.
+
+        Args:
+            db_manager: Async database manager
+            max_pending: Dirty keys that trigger an early flush (between scheduled flushes)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_manager = db_manager
+        self.max_pending = max_pending
+
+        self.namespaces: Dict[str, PersistentState] = {}
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+
+    async def initialize(self) -> None:
+        """Create tables if they don't exist."""
+        await self.db_manager.create_all_tables()
+
+    async def load(self, namespace: str) -> PersistentState:
+        """
+        Load a namespace into memory (once; later calls return the same mapping).
+
+        Args:
+            namespace: State namespace, e.g. 'last_alerts'
+
+        Returns:
+            dict-like PersistentState
+        """
+        if namespace in self.namespaces:
+            return self.namespaces[namespace]
+
+        data: Dict[str, Any] = {}
+        try:
+            async with self.db_manager.session() as session:
+                result = await session.execute(
+                    select(WatcherState).where(WatcherState.namespace == namespace)
+                )
+                for row in result.scalars().all():
+                    data[row.key] = _decode(row.value)
+        except Exception as e:
+            self.logger.error(f"Error loading state '{namespace}': {e}")
+
+        state = PersistentState(self, namespace, data)
+        self.namespaces[namespace] = state
+        self.logger.info(f"Loaded {len(data)} '{namespace}' entries")
+        return state
+
+    def _mark_dirty(self, namespace: str, key: str) -> None:
+        """Record a changed key; flush early if too many are pending."""
+        self._dirty.add((namespace, key))
+
+        if len(self._dirty) >= self.max_pending and (self._flush_task is None or self._flush_task.done()):
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                # No running loop (sync caller) - next scheduled flush picks it up
+                pass
+
+    async def flush(self) -> int:
+        """
+        Write all dirty keys in one transaction.
+
+        Returns:
+            Number of keys written or deleted
+        """
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+
+            batch, self._dirty = self._dirty, set()
+
+            # Encode up front: a value that can't be stored is dropped with an
+            # error instead of failing (and endlessly retrying) the whole batch
+            by_namespace: Dict[str, Dict[str, Any]] = {}
+            for namespace, key in list(batch):
+                data = self.namespaces[namespace]._data
+                encoded = None
+                if key in data:
+                    try:
+                        encoded = _encode(data[key])
+                    except (TypeError, ValueError) as e:
+                        batch.discard((namespace, key))
+                        self.flush_errors += 1
+                        self.logger.error(f"Cannot persist state '{namespace}/{key}': {e}")
+                        continue
+                by_namespace.setdefault(namespace, {})[key] = encoded
+
+            if not batch:
+                return 0
+
+            try:
+                async with self.db_manager.session() as session:
+                    for namespace, values in by_namespace.items():
+                        keys = list(values)
+
+                        for i in range(0, len(keys), 500):
+                            await session.execute(
+                                delete(WatcherState)
+                                .where(WatcherState.namespace == namespace)
+                                .where(WatcherState.key.in_(keys[i:i + 500]))
+                            )
+
+                        session.add_all([
+                            WatcherState(namespace=namespace, key=key, value=value)
+                            for key, value in values.items() if value is not None
+                        ])
+
+            except Exception as e:
+                # Keep the keys dirty, retry on next flush
+                self._dirty |= batch
+                self.flush_errors += 1
+                self.logger.error(f"Error flushing {len(batch)} state entries: {e}")
+                return 0
+
+            self.flushes += 1
+            self.rows_written += len(batch)
+            return len(batch)
+
+    async def close(self) -> None:
+        """Flush pending changes (call on shutdown)."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get write-behind statistics."""
+        return {
+            'namespaces': len(self.namespaces),
+            'pending': len(self._dirty),
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'flush_errors': self.flush_errors
+        }
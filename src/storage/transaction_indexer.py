@@ -0,0 +1,357 @@
+"""
+Transaction Indexer - Incremental History for Watched Addresses
+===============================================================
+
+Fills the `transactions` table for watched whales and the intermediates they
+fund, and keeps a per-address high-water mark (`indexed_addresses`):
+
+- index_block(): called for every block the block stream processes. Stores
+  the block's transactions that touch a watched address and advances the
+  checkpoint of every address whose history is contiguous up to this block.
+  A whale sending to an unknown address starts indexing that intermediate.
+- backfill(): catches an address up from its high-water mark with the
+  Etherscan txlist API (for addresses that lag behind or were just added).
+
+Author: Whale Tracker Project
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from sqlalchemy import select, update
+from urllib.parse import urlencode
+
+from models.database import IndexedAddress
+from ..core.instrumentation import Instrumentation, get_instrumentation, response_size
+from ..core.rate_limiter import AsyncRateLimiter
+from ..core.whale_config import WhaleConfig, get_whale_config
+from .transaction_store import TransactionStore
+
+
+class TransactionIndexer:
+    """
+    Incremental transaction indexer with per-address checkpoints.
+    """
+
+    ETHERSCAN_URL = "https://api.etherscan.io/api"
+
+    def __init__(
+        self,
+        store: TransactionStore,
+        whale_config: Optional[WhaleConfig] = None,
+        etherscan_api_key: Optional[str] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        backfill_page_size: int = 1000,
+        etherscan_url: Optional[str] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        Initialize Transaction Indexer.
+
+        Args:
+            store: Transaction store to write to
+            whale_config: Known address classification (to skip exchanges/DeFi as intermediates)
+            etherscan_api_key: Enables backfill() via Etherscan txlist
+            rate_limiter: Limiter for Etherscan calls (default: 5 req/s)
+            backfill_page_size: Max transactions per txlist call
+            etherscan_url: Etherscan-compatible API (default: ETHERSCAN_API_URL or api.etherscan.io)
+            instrumentation: Per-call latency / bytes metrics (default: shared instance)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store
+        self.db_manager = store.db_manager
+        self.whale_config = whale_config or get_whale_config()
+        self.etherscan_api_key = etherscan_api_key
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(default_rate=5, default_burst=5)
+        self.backfill_page_size = backfill_page_size
+        self.etherscan_url = etherscan_url or os.getenv('ETHERSCAN_API_URL') or self.ETHERSCAN_URL
+        self.instrumentation = instrumentation or get_instrumentation()
+
+        # address (lowercase) -> high-water block
+        self.checkpoints: Dict[str, int] = {}
+        # address (lowercase) -> role
+        self.roles: Dict[str, str] = {}
+
+    async def load_checkpoints(self) -> int:
+        """
+        Load watched addresses and checkpoints from the database.
+
+        Returns:
+            Number of watched addresses
+        """
+        try:
+            async with self.db_manager.session() as session:
+                result = await session.execute(select(IndexedAddress))
+                for row in result.scalars().all():
+                    self.checkpoints[row.address] = row.high_water_block
+                    self.roles[row.address] = row.role
+        except Exception as e:
+            self.logger.error(f"Error loading indexer checkpoints: {e}")
+
+        self.logger.info(f"Loaded {len(self.checkpoints)} indexer checkpoints")
+        return len(self.checkpoints)
+
+    async def watch(
+        self,
+        address: str,
+        role: str = 'whale',
+        source_address: Optional[str] = None,
+        start_block: int = 0
+    ) -> bool:
+        """
+        Start indexing an address (no-op if already watched).
+
+        Args:
+            address: Address to index
+            role: 'whale' or 'intermediate'
+            source_address: Whale that funded an intermediate
+            start_block: Initial high-water mark (history before it is not indexed)
+
+        Returns:
+            True if the address was newly added
+        """
+        address = address.lower()
+        if address in self.checkpoints:
+            return False
+
+        try:
+            async with self.db_manager.session() as session:
+                session.add(IndexedAddress(
+                    address=address,
+                    role=role,
+                    source_address=source_address.lower() if source_address else None,
+                    high_water_block=start_block
+                ))
+        except Exception as e:
+            self.logger.error(f"Error adding {address} to indexer: {e}")
+            return False
+
+        self.checkpoints[address] = start_block
+        self.roles[address] = role
+        return True
+
+    def get_high_water_mark(self, address: str) -> Optional[int]:
+        """Get the indexed-up-to block of an address (None if not watched)."""
+        return self.checkpoints.get(address.lower())
+
+    async def index_block(self, block_number: int, transactions: List[Dict[str, Any]]) -> int:
+        """
+        Index the transactions of one block.
+
+        Args:
+            block_number: Block number
+            transactions: Decoded transactions of the block
+
+        Returns:
+            Number of newly stored transactions
+        """
+        relevant = []
+        for tx in transactions:
+            sender = tx['from']
+            recipient = tx['to']
+
+            if sender in self.checkpoints or recipient in self.checkpoints:
+                relevant.append(tx)
+
+            # Whale funding an unknown address -> index the intermediate from here on
+            if (
+                self.roles.get(sender) == 'whale'
+                and recipient
+                and recipient not in self.checkpoints
+                and not self.whale_config.classify_transaction_destination(recipient)['is_known']
+            ):
+                await self.watch(recipient, role='intermediate', source_address=sender,
+                                 start_block=block_number - 1)
+
+        stored = await self.store.add_transactions(relevant)
+        if stored is None:
+            # Keep checkpoints behind this block so catch_up() fetches it again
+            return 0
+
+        await self._advance_checkpoints(block_number)
+        return stored
+
+    async def _advance_checkpoints(self, block_number: int) -> None:
+        """Move contiguous checkpoints (high-water == block - 1) to block_number."""
+        contiguous = [
+            address for address, high_water in self.checkpoints.items()
+            if high_water == block_number - 1
+        ]
+        if not contiguous:
+            return
+
+        try:
+            async with self.db_manager.session() as session:
+                await session.execute(
+                    update(IndexedAddress)
+                    .where(IndexedAddress.high_water_block == block_number - 1)
+                    .values(high_water_block=block_number, updated_at=datetime.utcnow())
+                )
+        except Exception as e:
+            self.logger.error(f"Error advancing checkpoints to block {block_number}: {e}")
+            return
+
+        for address in contiguous:
+            self.checkpoints[address] = block_number
+
+    async def backfill(self, address: str, to_block: int) -> int:
+        """
+        Catch an address up from its high-water mark to to_block via Etherscan.
+
+        Args:
+            address: Watched address
+            to_block: Last block to index
+
+        Returns:
+            Number of newly stored transactions
+        """
+        address = address.lower()
+        if address not in self.checkpoints:
+            await self.watch(address)
+
+        if not self.etherscan_api_key:
+            self.logger.warning("Backfill requires an Etherscan API key")
+            return 0
+
+        stored = 0
+        start_block = self.checkpoints[address] + 1
+
+        while start_block <= to_block:
+            page = await self._fetch_txlist(address, start_block, to_block)
+            if page is None:
+                # Keep the checkpoint where it is, retry later
+                return stored
+
+            added = await self.store.add_transactions(page)
+            if added is None:
+                # Keep the checkpoint where it is, retry later
+                return stored
+            stored += added
+
+            if len(page) < self.backfill_page_size:
+                reached = to_block
+            else:
+                # Page full - the last block may be partial, fetch it again
+                reached = page[-1]['blockNumber'] - 1
+                if reached < start_block:
+                    self.logger.error(f"Block {start_block} of {address} exceeds backfill page size")
+                    return stored
+
+            await self._set_checkpoint(address, reached)
+            start_block = reached + 1
+
+        return stored
+
+    async def catch_up(self, to_block: int) -> int:
+        """
+        Backfill every watched address whose checkpoint lags behind to_block
+        (e.g. after downtime), so block-by-block indexing can continue.
+
+        Args:
+            to_block: Block the stream will continue after
+
+        Returns:
+            Number of newly stored transactions
+        """
+        lagging = [address for address, high_water in self.checkpoints.items() if high_water < to_block]
+        if not lagging:
+            return 0
+
+        if not self.etherscan_api_key:
+            self.logger.warning(f"{len(lagging)} addresses lag behind block {to_block} - backfill requires an Etherscan API key")
+            return 0
+
+        stored = 0
+        for address in lagging:
+            stored += await self.backfill(address, to_block)
+        return stored
+
+    async def _set_checkpoint(self, address: str, block_number: int) -> None:
+        """Persist a checkpoint for one address."""
+        try:
+            async with self.db_manager.session() as session:
+                await session.execute(
+                    update(IndexedAddress)
+                    .where(IndexedAddress.address == address)
+                    .values(high_water_block=block_number, updated_at=datetime.utcnow())
+                )
+        except Exception as e:
+            self.logger.error(f"Error saving checkpoint for {address}: {e}")
+            return
+
+        self.checkpoints[address] = block_number
+
+    async def _fetch_txlist(self, address: str, start_block: int, end_block: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch normal transactions of an address from Etherscan (ascending).
+
+        Returns:
+            Detector-format transactions, or None on error
+        """
+        params = {
+            'module': 'account',
+            'action': 'txlist',
+            'address': address,
+            'startblock': start_block,
+            'endblock': end_block,
+            'page': 1,
+            'offset': self.backfill_page_size,
+            'sort': 'asc',
+            'apikey': self.etherscan_api_key
+        }
+
+        try:
+            await self.rate_limiter.acquire('etherscan')
+
+            with self.instrumentation.track_call('etherscan', 'txlist') as call:
+                call.bytes_sent = len(urlencode(params))
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(self.etherscan_url, params=params,
+                                           timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        call.bytes_received = response_size(response)
+                        if response.status != 200:
+                            call.error = True
+                            self.logger.error(f"Etherscan API error: HTTP {response.status}")
+                            return None
+                        data = await response.json()
+                call.error = data.get('status') != '1' and 'No transactions found' not in data.get('message', '')
+
+        except asyncio.TimeoutError:
+            self.logger.error("Etherscan API timeout")
+            return None
+        except Exception as e:
+            self.logger.error(f"Error calling Etherscan API: {e}")
+            return None
+
+        if data.get('status') != '1':
+            # "No transactions found" is an empty page, not an error
+            if 'No transactions found' in data.get('message', ''):
+                return []
+            self.logger.error(f"Etherscan API error: {data.get('message', 'Unknown error')}")
+            return None
+
+        return [self._from_etherscan(item) for item in data.get('result', [])]
+
+    @staticmethod
+    def _from_etherscan(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an Etherscan txlist entry to detector format."""
+        return {
+            'hash': item['hash'],
+            'from': item['from'].lower(),
+            'to': (item.get('to') or '').lower(),
+            'value': int(item.get('value') or 0),
+            'nonce': int(item.get('nonce') or 0),
+            'gasPrice': int(item['gasPrice']) if item.get('gasPrice') else None,
+            'gas': int(item['gas']) if item.get('gas') else None,
+            'maxFeePerGas': None,
+            'maxPriorityFeePerGas': None,
+            'input': item.get('input'),
+            'status': item.get('isError', '0') == '0',
+            'transactionIndex': int(item['transactionIndex']) if item.get('transactionIndex') else None,
+            'blockNumber': int(item['blockNumber']),
+            'timestamp': datetime.fromtimestamp(int(item['timeStamp']))
+        }
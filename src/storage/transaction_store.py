@@ -0,0 +1,292 @@
+"""
+Transaction Store - Local Transaction History
+=============================================
+
+Serves recent-transaction lookups from the local `transactions` table
+instead of remote API calls.
+
+Queries use the composite indexes of the Transaction model:
+- outgoing: idx_from_block (from_address, block_number)
+- incoming: idx_to_block (to_address, block_number)
+
+The outgoing history of hot addresses (whales, intermediates under one-hop
+analysis) is additionally kept in a small newest-first in-memory cache that
+is filled on first read and updated on insert, so repeated
+`limit=20` lookups don't touch the database at all.
+
+Writes are one INSERT ... ON CONFLICT DO NOTHING per batch (see
+models/repository.py), so a block's transactions cost a single statement.
+The same database transaction updates the daily rollups (src/storage/rollups.py);
+on PostgreSQL the monthly partitions the batch needs are created first
+(src/storage/partitions.py).
+
+Transactions are exchanged in the same dict format the detectors use
+(see src/monitors/block_stream.decode_block):
+    hash, from, to, value (wei), nonce, gasPrice, maxFeePerGas,
+    maxPriorityFeePerGas, blockNumber, timestamp (datetime)
+
+Author: Whale Tracker Project
+"""
+
+import logging
+from collections import deque
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Set
+
+from sqlalchemy import select
+
+from models.database import Transaction
+from models.db_connection import AsyncDatabaseManager
+from models.repository import bulk_upsert
+
+if TYPE_CHECKING:
+    from .partitions import PartitionManager
+    from .rollups import DailyRollups
+
+
+class TransactionStore:
+    """
+    Read/write access to locally indexed transactions.
+    """
+
+    def __init__(
+        self,
+        db_manager: AsyncDatabaseManager,
+        cache_size: int = 50,
+        rollups: Optional['DailyRollups'] = None,
+        partitions: Optional['PartitionManager'] = None
+    ):
+        """
+        Initialize Transaction Store.
+
+        Args:
+            db_manager: Async database manager
+            cache_size: Outgoing transactions cached per hot address
+            rollups: Daily rollups updated with every stored batch (optional)
+            partitions: Creates monthly partitions on PostgreSQL (optional)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_manager = db_manager
+        self.cache_size = cache_size
+        self.rollups = rollups
+        self.partitions = partitions
+
+        # address -> newest-first outgoing transactions
+        self._outgoing_cache: Dict[str, Deque[Dict[str, Any]]] = {}
+        # Addresses whose cache holds their complete outgoing history
+        self._complete: Set[str] = set()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def initialize(self) -> None:
+        """Create tables if they don't exist."""
+        await self.db_manager.create_all_tables()
+
+    # ==================== Conversion ====================
+
+    @staticmethod
+    def _to_values(tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a detector transaction dict to Transaction column values."""
+        value_wei = int(tx.get('value') or 0)
+        input_data = tx.get('input')
+
+        return {
+            'tx_hash': tx['hash'],
+            'block_number': tx['blockNumber'],
+            'block_timestamp': tx['timestamp'],
+            'transaction_index': tx.get('transactionIndex'),
+            'from_address': tx['from'].lower(),
+            'to_address': tx['to'].lower() if tx.get('to') else None,
+            'value': Decimal(value_wei) / Decimal(10**18),
+            'value_wei': str(value_wei),
+            'gas_price': tx.get('gasPrice'),
+            'gas_limit': tx.get('gas'),
+            'max_fee_per_gas': tx.get('maxFeePerGas'),
+            'max_priority_fee_per_gas': tx.get('maxPriorityFeePerGas'),
+            'nonce': tx.get('nonce') or 0,
+            'input_data': input_data,
+            'method_id': input_data[:10] if input_data and len(input_data) >= 10 else None,
+            'status': tx.get('status', True),
+            'tx_type': tx.get('type')
+        }
+
+    @classmethod
+    def _to_row(cls, tx: Dict[str, Any]) -> Transaction:
+        """Convert a detector transaction dict to a Transaction row."""
+        return Transaction(**cls._to_values(tx))
+
+    @staticmethod
+    def _to_dict(row: Transaction) -> Dict[str, Any]:
+        """Convert a Transaction row to a detector transaction dict."""
+        return {
+            'hash': row.tx_hash,
+            'from': row.from_address,
+            'to': row.to_address or '',
+            'value': int(row.value_wei),
+            'nonce': row.nonce,
+            'gasPrice': row.gas_price,
+            'maxFeePerGas': row.max_fee_per_gas,
+            'maxPriorityFeePerGas': row.max_priority_fee_per_gas,
+            'blockNumber': row.block_number,
+            'timestamp': row.block_timestamp
+        }
+
+    # ==================== Writes ====================
+
+    async def add_transactions(self, transactions: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Store transactions, skipping ones already stored.
+
+        Args:
+            transactions: Detector-format transaction dicts
+
+        Returns:
+            Number of newly stored transactions (0 if all were already stored),
+            None if the write failed
+        """
+        if not transactions:
+            return 0
+
+        # Deduplicate within the batch, keep first occurrence
+        unique: Dict[str, Dict[str, Any]] = {}
+        for tx in transactions:
+            unique.setdefault(tx['hash'], tx)
+
+        try:
+            if self.partitions:
+                await self.partitions.ensure_partitions(tx['timestamp'] for tx in unique.values())
+
+            async with self.db_manager.session() as session:
+                # One INSERT ... ON CONFLICT DO NOTHING; RETURNING yields the new hashes
+                inserted = set(await bulk_upsert(
+                    session,
+                    Transaction,
+                    [self._to_values(tx) for tx in unique.values()],
+                    update_columns=(),
+                    returning='tx_hash'
+                ))
+                new_txs = [tx for tx_hash, tx in unique.items() if tx_hash in inserted]
+
+                # Same transaction: rollups count each stored row exactly once
+                if self.rollups:
+                    await self.rollups.apply(session, new_txs)
+
+        except Exception as e:
+            self.logger.error(f"Error storing {len(unique)} transactions: {e}")
+            return None
+
+        for tx in new_txs:
+            self._update_cache(tx)
+
+        return len(new_txs)
+
+    def _update_cache(self, tx: Dict[str, Any]) -> None:
+        """Keep the outgoing cache of a hot sender in sync with a new row."""
+        sender = tx['from'].lower()
+        cached = self._outgoing_cache.get(sender)
+        if cached is None:
+            return
+
+        if not cached or tx['blockNumber'] >= cached[0]['blockNumber']:
+            cached.appendleft(self._to_dict(self._to_row(tx)))
+            if len(cached) == cached.maxlen:
+                self._complete.discard(sender)
+        else:
+            # Older than the cached head (backfill) - re-read on next lookup
+            self._outgoing_cache.pop(sender, None)
+            self._complete.discard(sender)
+
+    # ==================== Reads ====================
+
+    async def get_recent_transactions(
+        self,
+        address: str,
+        limit: int = 10,
+        direction: str = 'outgoing',
+        after_block: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get most recent transactions of an address, newest first.
+
+        Args:
+            address: Ethereum address (any casing)
+            limit: Maximum number of transactions
+            direction: 'outgoing', 'incoming', or 'all'
+            after_block: Only transactions in later blocks (None = no lower bound)
+
+        Returns:
+            List of transaction dicts
+        """
+        address = address.lower()
+
+        if after_block is not None:
+            # Newest first: the rows past after_block are a prefix of the unbounded result
+            rows = await self.get_recent_transactions(address, limit, direction)
+            return [tx for tx in rows if tx['blockNumber'] > after_block]
+
+        if direction == 'outgoing':
+            return await self._get_outgoing(address, limit)
+
+        try:
+            async with self.db_manager.session() as session:
+                incoming = await self._query(session, Transaction.to_address, address, limit)
+                if direction == 'incoming':
+                    return incoming
+
+                outgoing = await self._query(session, Transaction.from_address, address, limit)
+
+        except Exception as e:
+            self.logger.error(f"Error reading transactions for {address}: {e}")
+            return []
+
+        merged = {tx['hash']: tx for tx in incoming + outgoing}
+        return sorted(
+            merged.values(),
+            key=lambda tx: (tx['blockNumber'], tx['nonce']),
+            reverse=True
+        )[:limit]
+
+    async def _get_outgoing(self, address: str, limit: int) -> List[Dict[str, Any]]:
+        """Outgoing lookup served from cache when it covers the request."""
+        cached = self._outgoing_cache.get(address)
+        if cached is not None and (limit <= len(cached) or address in self._complete):
+            self.cache_hits += 1
+            return list(cached)[:limit]
+
+        self.cache_misses += 1
+
+        try:
+            async with self.db_manager.session() as session:
+                rows = await self._query(
+                    session, Transaction.from_address, address, max(limit, self.cache_size)
+                )
+        except Exception as e:
+            self.logger.error(f"Error reading transactions for {address}: {e}")
+            return []
+
+        if limit <= self.cache_size:
+            self._outgoing_cache[address] = deque(rows, maxlen=self.cache_size)
+            if len(rows) < self.cache_size:
+                self._complete.add(address)
+
+        return rows[:limit]
+
+    @staticmethod
+    async def _query(session, column, address: str, limit: int) -> List[Dict[str, Any]]:
+        """Indexed (address, block_number) range scan, newest first."""
+        result = await session.execute(
+            select(Transaction)
+            .where(column == address)
+            .order_by(Transaction.block_number.desc(), Transaction.nonce.desc())
+            .limit(limit)
+        )
+        return [TransactionStore._to_dict(row) for row in result.scalars().all()]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        return {
+            'cached_addresses': len(self._outgoing_cache),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
@@ -0,0 +1,49 @@
+"""
+Shared Test Fixtures
+====================
+
+In-memory SQLite database and detector-format transaction builders used by
+the storage, analyzer and watcher tests.
+"""
+
+import pytest_asyncio
+from datetime import datetime, timedelta
+
+from models.db_connection import DatabaseConfig, AsyncDatabaseManager
+
+
+@pytest_asyncio.fixture
+async def db_manager():
+    """Create in-memory SQLite database."""
+    db_manager = AsyncDatabaseManager(DatabaseConfig(db_type='sqlite', sqlite_path=':memory:'))
+    await db_manager.create_all_tables()
+    yield db_manager
+    await db_manager.close()
+
+
+def make_tx(i, sender, recipient, block=None, value=10**18, timestamp=None):
+    """Build a detector-format transaction; hash, nonce and default block / timestamp derive from i."""
+    return {
+        'hash': f"0x{i:064x}",
+        'from': sender,
+        'to': recipient,
+        'value': value,
+        'nonce': i,
+        'gasPrice': 25 * 10**9,
+        'maxFeePerGas': None,
+        'maxPriorityFeePerGas': None,
+        'blockNumber': block if block is not None else 19000000 + i,
+        'timestamp': timestamp or datetime(2024, 1, 1) + timedelta(seconds=12 * i)
+    }
+
+
+class Chain:
+    """Builds detector-format transactions with unique hashes, optionally all stamped at one time."""
+
+    def __init__(self, timestamp=None):
+        self.i = 0
+        self.timestamp = timestamp
+
+    def tx(self, sender, recipient, value=10**18, timestamp=None):
+        self.i += 1
+        return make_tx(self.i, sender, recipient, value=value, timestamp=timestamp or self.timestamp)
@@ -0,0 +1,181 @@
+"""
+Unit Tests for Adaptive Scheduler
+==================================
+
+Tests budget allocation, interval clamps and due ordering with a fake clock.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from src.monitors.adaptive_scheduler import AdaptiveScheduler
+
+
+WHALES = [f"0x{i:040x}" for i in range(1, 11)]
+
+
+class FakeClock:
+    """Settable monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def planned_rate(scheduler):
+    """Planned checks per minute over all whales."""
+    return sum(60.0 / scheduler.get_interval(address) for address in scheduler.addresses)
+
+
+class TestAllocation:
+    """Test how the budget is split."""
+
+    def test_uniform_weights_match_fixed_schedule(self):
+        """Test equal weights give every whale the fixed-schedule interval."""
+        scheduler = AdaptiveScheduler(WHALES, checks_per_minute=len(WHALES) / 15, clock=FakeClock())
+
+        for address in WHALES:
+            assert scheduler.get_interval(address) == pytest.approx(900)
+        assert planned_rate(scheduler) == pytest.approx(len(WHALES) / 15)
+
+    def test_active_and_alerting_whales_checked_more_often(self):
+        """Test activity and alerts shorten intervals without exceeding the budget."""
+        clock = FakeClock()
+        analyzer = Mock()
+        analyzer.get_whale_stats.side_effect = lambda address: (
+            SimpleNamespace(transaction_count=50, ewma_frequency_hours=0.25, avg_frequency_hours=1.0)
+            if address == WHALES[0] else None
+        )
+        scheduler = AdaptiveScheduler(WHALES, checks_per_minute=1.0, analyzer=analyzer, clock=clock)
+        scheduler.due(now=clock.now + 3600)
+
+        scheduler.record_results(
+            [{'whale_address': WHALES[1], 'status': 'alerts_generated', 'alerts': [{}]}]
+            + [{'whale_address': address, 'status': 'checked'} for address in WHALES if address != WHALES[1]]
+        )
+        scheduler.replan()
+
+        quiet = scheduler.get_interval(WHALES[5])
+        assert scheduler.get_interval(WHALES[0]) < quiet
+        assert scheduler.get_interval(WHALES[1]) < quiet
+        assert planned_rate(scheduler) == pytest.approx(1.0)
+
+    def test_volatility_shortens_interval(self):
+        """Test large relative balance moves raise the check rate."""
+        clock = FakeClock()
+        scheduler = AdaptiveScheduler(WHALES[:2], checks_per_minute=0.5, clock=clock)
+        scheduler.due(now=clock.now + 3600)
+
+        scheduler.record_results(
+            [
+                {'whale_address': WHALES[0], 'status': 'checked', 'balance_change': -500.0},
+                {'whale_address': WHALES[1], 'status': 'no_significant_change', 'balance_change': 1.0}
+            ],
+            balances={WHALES[0]: 500.0, WHALES[1]: 10000.0}
+        )
+        scheduler.replan()
+
+        assert scheduler.get_interval(WHALES[0]) < scheduler.get_interval(WHALES[1])
+
+    def test_volatility_relative_to_larger_balance(self):
+        """Test a drop is scaled by the balance before it, a rise by the balance after it."""
+        clock = FakeClock()
+        scheduler = AdaptiveScheduler(WHALES[:2], checks_per_minute=0.5, clock=clock)
+        scheduler.due(now=clock.now + 3600)
+
+        scheduler.record_results(
+            [
+                # 100 -> 10 ETH dump
+                {'whale_address': WHALES[0], 'status': 'checked', 'balance_change': 90.0},
+                # 10 -> 100 ETH deposit
+                {'whale_address': WHALES[1], 'status': 'no_significant_change', 'balance_change': -90.0}
+            ],
+            balances={WHALES[0]: 10.0, WHALES[1]: 100.0}
+        )
+
+        assert scheduler._volatility[WHALES[0]] == pytest.approx(0.9)
+        assert scheduler._volatility[WHALES[1]] == pytest.approx(0.9)
+
+    def test_intervals_clamped(self):
+        """Test min / max interval clamps with the freed budget redistributed."""
+        clock = FakeClock()
+        scheduler = AdaptiveScheduler(
+            WHALES, checks_per_minute=20, min_interval_seconds=60, max_interval_seconds=600, clock=clock
+        )
+        assert all(scheduler.get_interval(address) == pytest.approx(60) for address in WHALES)
+
+        scheduler = AdaptiveScheduler(
+            WHALES, checks_per_minute=0.1, min_interval_seconds=60, max_interval_seconds=600, clock=clock
+        )
+        assert all(scheduler.get_interval(address) == pytest.approx(600) for address in WHALES)
+
+        # One very hot whale hits the floor, the rest share what is left
+        scheduler = AdaptiveScheduler(
+            WHALES, checks_per_minute=3, min_interval_seconds=60, max_interval_seconds=3600,
+            alert_weight=10000, clock=clock
+        )
+        scheduler.due(now=clock.now + 3600)
+        scheduler.record_results([{'whale_address': WHALES[0], 'status': 'checked', 'alerts': [{}]}])
+        scheduler.replan()
+        assert scheduler.get_interval(WHALES[0]) == pytest.approx(60)
+        assert scheduler.get_interval(WHALES[1]) == pytest.approx(60 * 9 / 2)
+
+
+class TestDueQueue:
+    """Test the next-check heap."""
+
+    def test_due_order_and_rescheduling(self):
+        """Test staggered first checks, in-flight tracking and retry after errors."""
+        clock = FakeClock()
+        scheduler = AdaptiveScheduler(WHALES[:4], checks_per_minute=1.0, clock=clock)
+
+        # 4 whales at 240s each, first checks staggered 60s apart
+        assert scheduler.due() == [WHALES[0]]
+        assert scheduler.due(now=clock.now + 130) == [WHALES[1], WHALES[2]]
+        assert scheduler.due(now=clock.now + 130) == []
+        assert scheduler.get_stats()['in_flight'] == 3
+
+        clock.now += 130
+        scheduler.record_results([
+            {'whale_address': WHALES[0], 'status': 'checked'},
+            {'whale_address': WHALES[1], 'status': 'timeout'}
+        ])
+        assert scheduler.next_due_in() == pytest.approx(50)  # WHALES[3] staggered at +180
+
+        clock.now += 60
+        assert scheduler.due() == [WHALES[3], WHALES[1]]  # timeout retried after min_interval
+        clock.now += 180
+        assert scheduler.due() == [WHALES[0]]
+
+    def test_release_reschedules_stranded_whales(self):
+        """Test whales without a result are retried after min_interval, not dropped."""
+        clock = FakeClock()
+        scheduler = AdaptiveScheduler(WHALES[:2], checks_per_minute=1.0, min_interval_seconds=30, clock=clock)
+        due = scheduler.due(now=clock.now + 120)
+        scheduler.record_results([{'whale_address': WHALES[0], 'status': 'checked'}])
+
+        assert scheduler.release(due) == [WHALES[1]]
+        assert scheduler.release(due) == []
+        assert scheduler.get_stats()['in_flight'] == 0
+
+        clock.now += 30
+        assert scheduler.due() == [WHALES[1]]
+
+    def test_replan_pulls_checks_forward(self):
+        """Test a whale that starts alerting is checked sooner, never later."""
+        clock = FakeClock()
+        scheduler = AdaptiveScheduler(WHALES[:2], checks_per_minute=0.2, clock=clock)
+        scheduler.due(now=clock.now + 600)
+        scheduler.record_results([{'whale_address': address, 'status': 'checked'} for address in WHALES[:2]])
+        assert scheduler.next_due_in() == pytest.approx(600)
+
+        scheduler.record_results([{'whale_address': WHALES[0], 'status': 'checked', 'alerts': [{}, {}]}])
+        scheduler.due(now=clock.now)  # nothing due yet
+        scheduler.replan()
+
+        assert scheduler.next_due_in() < 600
+        scheduler.add_whale(WHALES[2])
+        assert scheduler.due() == [WHALES[2]]
@@ -2,6 +2,7 @@
 Unit tests for AddressProfiler (Signal #5)
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock
 from datetime import datetime
@@ -32,10 +33,8 @@ class TestFreshAddressDetection:
     @pytest.mark.asyncio
     async def test_very_fresh_address(self):
         """Test very fresh address (tx count = 1)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 1
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 1
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -48,10 +47,8 @@ class TestFreshAddressDetection:
     @pytest.mark.asyncio
     async def test_fresh_address_low_txcount(self):
         """Test fresh address (tx count = 5)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 5
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 5
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -63,10 +60,8 @@ class TestFreshAddressDetection:
     @pytest.mark.asyncio
     async def test_established_address(self):
         """Test established address (many transactions)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 100
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 100
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -92,10 +87,8 @@ class TestEmptyBeforeDetection:
     @pytest.mark.asyncio
     async def test_was_empty(self):
         """Test address that was completely empty"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_balance.return_value = 0
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_balance_wei.return_value = 0
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -107,10 +100,8 @@ class TestEmptyBeforeDetection:
     @pytest.mark.asyncio
     async def test_was_minimal_balance(self):
         """Test address with minimal balance (< 0.01 ETH)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_balance.return_value = int(0.005 * 10**18)  # 0.005 ETH
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_balance_wei.return_value = int(0.005 * 10**18)  # 0.005 ETH
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -122,10 +113,8 @@ class TestEmptyBeforeDetection:
     @pytest.mark.asyncio
     async def test_had_significant_balance(self):
         """Test address with significant balance"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_balance.return_value = int(1.0 * 10**18)  # 1 ETH
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_balance_wei.return_value = int(1.0 * 10**18)  # 1 ETH
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -147,10 +136,8 @@ class TestEmptyBeforeDetection:
     @pytest.mark.asyncio
     async def test_empty_rpc_error(self):
         """Test handling RPC error (archival node not available)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_balance.side_effect = Exception("Historical data not available")
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_balance_wei.side_effect = Exception("Historical data not available")
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -166,11 +153,9 @@ class TestSingleUseDetection:
     @pytest.mark.asyncio
     async def test_perfect_burner(self):
         """Test perfect burner pattern (2 txs, empty)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 2
-        mock_web3.eth.get_balance.return_value = 0
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 2
+        mock_web3_manager.get_balance_wei.return_value = 0
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -184,11 +169,9 @@ class TestSingleUseDetection:
     @pytest.mark.asyncio
     async def test_likely_burner(self):
         """Test likely burner pattern (3 txs, minimal balance)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 3
-        mock_web3.eth.get_balance.return_value = int(0.05 * 10**18)  # 0.05 ETH
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 3
+        mock_web3_manager.get_balance_wei.return_value = int(0.05 * 10**18)  # 0.05 ETH
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -201,11 +184,9 @@ class TestSingleUseDetection:
     @pytest.mark.asyncio
     async def test_not_burner_many_txs(self):
         """Test not burner (many transactions)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 20
-        mock_web3.eth.get_balance.return_value = int(1.0 * 10**18)
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 20
+        mock_web3_manager.get_balance_wei.return_value = int(1.0 * 10**18)
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -218,11 +199,9 @@ class TestSingleUseDetection:
     @pytest.mark.asyncio
     async def test_not_burner_has_balance(self):
         """Test not burner (2 txs but has balance)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 2
-        mock_web3.eth.get_balance.return_value = int(1.0 * 10**18)  # 1 ETH
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 2
+        mock_web3_manager.get_balance_wei.return_value = int(1.0 * 10**18)  # 1 ETH
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -238,10 +217,8 @@ class TestReusedIntermediateDetection:
     @pytest.mark.asyncio
     async def test_reused_intermediate(self):
         """Test reused intermediate (10+ transactions)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 20  # 10 cycles
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 20  # 10 cycles
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -254,10 +231,8 @@ class TestReusedIntermediateDetection:
     @pytest.mark.asyncio
     async def test_not_reused(self):
         """Test not reused (few transactions)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 5
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 5
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -273,13 +248,11 @@ class TestFullProfileCreation:
     @pytest.mark.asyncio
     async def test_fresh_burner_profile(self):
         """Test fresh burner profile (highest confidence)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
+        mock_web3_manager = AsyncMock()
         # Fresh (low tx count)
-        mock_web3.eth.get_transaction_count.side_effect = [1, 2]  # First for fresh, second for single-use
+        mock_web3_manager.get_transaction_count.side_effect = [1, 2, 2]  # Fresh, single-use, reuse
         # Empty before
-        mock_web3.eth.get_balance.side_effect = [0, 0]  # First for empty check, second for single-use
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager.get_balance_wei.side_effect = [0, 0]  # First for empty check, second for single-use
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -297,13 +270,11 @@ class TestFullProfileCreation:
     @pytest.mark.asyncio
     async def test_burner_profile(self):
         """Test burner profile (single-use but not fresh)"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
+        mock_web3_manager = AsyncMock()
         # Not fresh (many txs from history)
-        mock_web3.eth.get_transaction_count.side_effect = [100, 2]  # Not fresh, but 2 for single-use
+        mock_web3_manager.get_transaction_count.side_effect = [100, 2, 2]  # Not fresh, but 2 for single-use and reuse
         # Wasn't empty before
-        mock_web3.eth.get_balance.side_effect = [int(1.0 * 10**18), 0]  # Had balance, now empty
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager.get_balance_wei.side_effect = [int(1.0 * 10**18), 0]  # Had balance, now empty
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -319,13 +290,11 @@ class TestFullProfileCreation:
     @pytest.mark.asyncio
     async def test_professional_profile(self):
         """Test professional reused intermediate profile"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
+        mock_web3_manager = AsyncMock()
         # Many transactions (reused)
-        mock_web3.eth.get_transaction_count.side_effect = [50, 50, 50]
+        mock_web3_manager.get_transaction_count.side_effect = [50, 50, 50]
         # Has balance
-        mock_web3.eth.get_balance.side_effect = [int(1.0 * 10**18), int(0.5 * 10**18)]
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager.get_balance_wei.side_effect = [int(1.0 * 10**18), int(0.5 * 10**18)]
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -341,13 +310,11 @@ class TestFullProfileCreation:
     @pytest.mark.asyncio
     async def test_normal_profile(self):
         """Test normal address profile"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
+        mock_web3_manager = AsyncMock()
         # Normal transaction count (not enough for reuse, but not fresh)
-        mock_web3.eth.get_transaction_count.side_effect = [8, 8, 8]
+        mock_web3_manager.get_transaction_count.side_effect = [8, 8, 8]
         # Normal balance
-        mock_web3.eth.get_balance.side_effect = [int(1.0 * 10**18), int(1.0 * 10**18)]
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager.get_balance_wei.side_effect = [int(1.0 * 10**18), int(1.0 * 10**18)]
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -362,12 +329,10 @@ class TestFullProfileCreation:
     @pytest.mark.asyncio
     async def test_profile_error_handling(self):
         """Test error handling in profile creation"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
+        mock_web3_manager = AsyncMock()
         # Make ALL calls raise exception
-        mock_web3.eth.get_transaction_count = Mock(side_effect=Exception("RPC error"))
-        mock_web3.eth.get_balance = Mock(side_effect=Exception("RPC error"))
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager.get_transaction_count.side_effect = Exception("RPC error")
+        mock_web3_manager.get_balance_wei.side_effect = Exception("RPC error")
 
         profiler = AddressProfiler(web3_manager=mock_web3_manager)
 
@@ -466,3 +431,143 @@ class TestProfileTypeDetection:
 
         assert profile_type == 'normal'
         assert confidence == 0
+
+
+def make_burner_web3_manager():
+    """Web3Manager mock for a 2-tx, empty address."""
+    mock_web3_manager = AsyncMock()
+    mock_web3_manager.get_transaction_count.return_value = 2
+    mock_web3_manager.get_balance_wei.return_value = 0
+    return mock_web3_manager
+
+
+class TestProfileCache:
+    """Test profile memoization"""
+
+    @pytest.mark.asyncio
+    async def test_same_bucket_served_from_cache(self):
+        """Test repeated profiles within one block bucket hit the cache"""
+        mock_web3_manager = make_burner_web3_manager()
+        profiler = AddressProfiler(web3_manager=mock_web3_manager, block_bucket_size=100)
+
+        first = await profiler.profile_address('0xAddress', 19000010)
+        second = await profiler.profile_address('0xADDRESS', 19000050)
+
+        assert second is first
+        assert mock_web3_manager.get_transaction_count.call_count == 3
+        stats = profiler.get_cache_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_bucket_refetches(self):
+        """Test a whale tx in another block bucket is profiled again"""
+        mock_web3_manager = make_burner_web3_manager()
+        profiler = AddressProfiler(web3_manager=mock_web3_manager, block_bucket_size=100)
+
+        await profiler.profile_address('0xAddress', 19000010)
+        await profiler.profile_address('0xAddress', 19000110)
+
+        assert profiler.get_cache_stats()['misses'] == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test expired profiles are refetched"""
+        profiler = AddressProfiler(web3_manager=make_burner_web3_manager(), cache_ttl_seconds=60)
+
+        await profiler.profile_address('0xAddress', 19000010)
+        key = ('0xaddress', 19000010 // 300)
+        profile, cached_at = profiler._cache[key]
+        profiler._cache[key] = (profile, cached_at - 61)
+        await profiler.profile_address('0xAddress', 19000010)
+
+        assert profiler.get_cache_stats()['misses'] == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test least recently used profile is evicted first"""
+        profiler = AddressProfiler(web3_manager=make_burner_web3_manager(), cache_max_entries=2)
+
+        await profiler.profile_address('0xA', 1000)
+        await profiler.profile_address('0xB', 1000)
+        await profiler.profile_address('0xA', 1000)  # A most recently used
+        await profiler.profile_address('0xC', 1000)
+
+        cached = {address for address, _ in profiler._cache}
+        assert cached == {'0xa', '0xc'}
+        assert profiler.get_cache_stats()['evictions'] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_collapsed(self):
+        """Test concurrent profiles of one address share a single fetch"""
+        mock_web3_manager = make_burner_web3_manager()
+        profiler = AddressProfiler(web3_manager=mock_web3_manager)
+
+        profiles = await asyncio.gather(*[
+            profiler.profile_address('0xAddress', 19000010) for _ in range(5)
+        ])
+
+        assert all(profile is profiles[0] for profile in profiles)
+        assert mock_web3_manager.get_balance_wei.call_count == 2
+        stats = profiler.get_cache_stats()
+        assert stats['misses'] == 1
+        assert stats['coalesced'] == 4
+        assert stats['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_rpc_does_not_block_event_loop(self):
+        """Test slow RPC reads leave the event loop free for other coroutines"""
+        async def slow_call(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return 0
+
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.side_effect = slow_call
+        mock_web3_manager.get_balance_wei.side_effect = slow_call
+        profiler = AddressProfiler(web3_manager=mock_web3_manager)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            await profiler.profile_address('0xAddress', 1000)
+        finally:
+            ticker_task.cancel()
+
+        # 5 calls x 50ms: the ticker keeps running while they are in flight
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_error_profile_not_cached(self):
+        """Test failed profiles are retried"""
+        profiler = AddressProfiler()
+        profiler._build_profile = AsyncMock(return_value=Mock(profile_type='error'))
+
+        await profiler.profile_address('0xAddress', 1000)
+        await profiler.profile_address('0xAddress', 1000)
+
+        assert profiler._build_profile.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_profile_persisted_across_restart(self, db_manager):
+        """Test profile is reloaded from intermediate_addresses"""
+        mock_web3_manager = make_burner_web3_manager()
+        profiler = AddressProfiler(web3_manager=mock_web3_manager, db_manager=db_manager)
+        original = await profiler.profile_address('0xAddress', 19000010)
+
+        restarted = AddressProfiler(web3_manager=mock_web3_manager, db_manager=db_manager)
+        reloaded = await restarted.profile_address('0xAddress', 19000010)
+        refetched = await restarted.profile_address('0xAddress', 19009999)
+
+        assert reloaded.profile_type == original.profile_type == 'fresh_burner'
+        assert reloaded.overall_confidence == original.overall_confidence
+        assert reloaded.details == original.details
+        assert restarted.get_cache_stats()['db_hits'] == 1
+        assert mock_web3_manager.get_balance_wei.call_count == 4
+        assert refetched.profile_type == 'fresh_burner'
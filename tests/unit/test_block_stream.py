@@ -0,0 +1,278 @@
+"""
+Unit Tests for Block Stream Ingester
+=====================================
+
+Tests block decoding, O(1) whale matching and detector routing against a
+recorded block fixture (tests/fixtures/recorded_blocks.json).
+"""
+
+import pytest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, AsyncMock
+from web3 import Web3
+
+from src.monitors.block_stream import BlockStreamIngester, decode_block, load_recorded_blocks
+from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
+from src.analyzers.flow_graph import FlowGraph
+from src.analyzers.split_dump import SplitDumpDetector
+from src.core.whale_config import WhaleConfig
+from src.analyzers.whale_analyzer import WhaleAnalyzer
+from src.notifications.telegram_notifier import TelegramNotifier
+
+
+FIXTURE = Path(__file__).parent.parent / 'fixtures' / 'recorded_blocks.json'
+
+WHALE = '0x5a52e96bacdabb82fd05763e25335261b270efcb'
+INTERMEDIATE = '0x9f8c163cba728e99993abe7495f06c0a3c8ac8b9'
+FIRST_BLOCK = 19000000
+
+
+class FakeChain:
+    """Serves recorded blocks through the Web3Manager block API."""
+
+    def __init__(self, blocks):
+        self.blocks = {int(block['number'], 16): block for block in blocks}
+        self.head = max(self.blocks)
+        self.get_block_calls = 0
+
+    async def get_block_number(self):
+        return self.head
+
+    async def get_block(self, block_number, full_transactions=True):
+        self.get_block_calls += 1
+        return self.blocks.get(block_number)
+
+
+@pytest.fixture
+def recorded_blocks():
+    """Load recorded blocks."""
+    return load_recorded_blocks(FIXTURE)
+
+
+@pytest.fixture
+def mock_settings():
+    """Create mock Settings."""
+    settings = Mock()
+    # Whale configured in checksum form, blocks carry lowercase addresses
+    settings.WHALE_ADDRESSES = [Web3.to_checksum_address(WHALE)]
+    settings.MIN_AMOUNT_USD = 100000.0
+    settings.whale_monitoring.intervals.alert_cooldown_minutes = 0
+    settings.whale_monitoring.intervals.onehop_check_hours = 2
+    return settings
+
+
+@pytest.fixture
+def watcher(recorded_blocks, mock_settings):
+    """Create watcher with real config/analyzer and mocked notifier."""
+    notifier = Mock(spec=TelegramNotifier)
+    notifier.send_whale_direct_transfer_alert = AsyncMock(return_value=True)
+    notifier.send_whale_onehop_alert = AsyncMock(return_value=True)
+
+    return SimpleWhaleWatcher(
+        web3_manager=FakeChain(recorded_blocks),
+        whale_config=WhaleConfig(),
+        analyzer=WhaleAnalyzer(),
+        notifier=notifier,
+        settings=mock_settings
+    )
+
+
+class TestDecodeBlock:
+    """Test raw block decoding."""
+
+    def test_decode_fields(self, recorded_blocks):
+        """Test hex quantities, lowercase addresses and block context."""
+        txs = decode_block(recorded_blocks[0])
+
+        assert len(txs) == 3
+        dump = txs[0]
+        assert dump['from'] == WHALE
+        assert dump['value'] == 100 * 10**18
+        assert dump['nonce'] == 41
+        assert dump['maxPriorityFeePerGas'] == 2 * 10**9
+        assert dump['blockNumber'] == FIRST_BLOCK
+        assert isinstance(dump['timestamp'], datetime)
+
+    def test_decode_contract_creation(self, recorded_blocks):
+        """Test contract creation gets empty 'to'."""
+        txs = decode_block(recorded_blocks[1])
+
+        assert txs[1]['to'] == ''
+
+    def test_decode_hash_only_block(self):
+        """Test blocks without full transactions decode to nothing."""
+        block = {'number': '0x1', 'timestamp': '0x0', 'transactions': ['0xabc']}
+
+        assert decode_block(block) == []
+
+
+class TestBlockStreamIngester:
+    """Test matching and detector routing."""
+
+    def test_watchlist_is_lowercase(self, watcher):
+        """Test whales and exchanges are indexed by lowercase address."""
+        ingester = BlockStreamIngester(watcher)
+
+        assert WHALE in ingester.watched_whales
+        assert '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be' in ingester.exchanges
+
+    @pytest.mark.asyncio
+    async def test_replay_detects_direct_dump_and_one_hop(self, watcher, recorded_blocks):
+        """Test replaying the fixture produces the direct dump and the one-hop alert."""
+        ingester = BlockStreamIngester(watcher)
+
+        results = [await ingester.ingest_block(block) for block in recorded_blocks]
+
+        assert [a['type'] for a in results[0]['alerts']] == ['direct_dump']
+        assert results[0]['alerts'][0]['exchange'] == 'Binance Hot Wallet'
+        assert results[1]['matched'] == 0
+        assert [a['type'] for a in results[2]['alerts']] == ['one_hop_dump']
+        assert results[2]['alerts'][0]['intermediate_address'] == INTERMEDIATE
+
+        watcher.notifier.send_whale_direct_transfer_alert.assert_awaited_once()
+        watcher.notifier.send_whale_onehop_alert.assert_awaited_once()
+        assert INTERMEDIATE not in ingester.pending_intermediates
+
+        stats = ingester.get_stats()
+        assert stats['blocks_processed'] == 3
+        assert stats['transactions_decoded'] == 6
+        assert stats['alerts'] == 2
+
+        # The balance-drop path won't evaluate these whale transfers again
+        assert watcher.last_checked_blocks == {Web3.to_checksum_address(WHALE): FIRST_BLOCK}
+
+    @pytest.mark.asyncio
+    async def test_whale_to_unknown_is_remembered(self, watcher, recorded_blocks):
+        """Test whale -> unknown transfer becomes a pending intermediate."""
+        ingester = BlockStreamIngester(watcher)
+
+        await ingester.ingest_block(recorded_blocks[0])
+
+        whale_address, whale_tx = ingester.pending_intermediates[INTERMEDIATE]
+        assert whale_address == Web3.to_checksum_address(WHALE)
+        assert whale_tx['value'] == 80 * 10**18
+
+    @pytest.mark.asyncio
+    async def test_pending_intermediate_expires(self, watcher, recorded_blocks):
+        """Test intermediate transfers outside the one-hop window are ignored."""
+        ingester = BlockStreamIngester(watcher)
+        await ingester.ingest_block(recorded_blocks[0])
+
+        late_block = dict(recorded_blocks[2])
+        late_block['timestamp'] = hex(int(recorded_blocks[0]['timestamp'], 16) + 3 * 3600)
+        result = await ingester.ingest_block(late_block)
+
+        assert result['alerts'] == []
+        assert ingester.pending_intermediates == {}
+
+    @pytest.mark.asyncio
+    async def test_multi_hop_traced_through_flow_graph(self, watcher):
+        """Test whale -> 2 intermediates -> exchange is alerted once via the flow graph."""
+        watcher.notifier.send_whale_multihop_alert = AsyncMock(return_value=True)
+        ingester = BlockStreamIngester(watcher, flow_graph=FlowGraph())
+        hops = [WHALE, INTERMEDIATE, '0x' + 'b2' * 20, '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be']
+        start = 1704110400
+
+        for i, (sender, recipient) in enumerate(zip(hops, hops[1:])):
+            results = await ingester.ingest_block({
+                'number': hex(FIRST_BLOCK + i),
+                'timestamp': hex(start + i * 600),
+                'transactions': [{
+                    'hash': '0x' + f"{i + 1:02x}" * 32,
+                    'from': sender,
+                    'to': recipient,
+                    'value': hex((100 - i) * 10**18),
+                    'nonce': hex(i)
+                }]
+            })
+            assert results['alerts'] == []
+
+        alerts = await ingester.trace_multi_hop()
+
+        assert [(a['type'], a['hops'], a['amount_eth']) for a in alerts] == [('multi_hop_dump', 2, 98.0)]
+        assert alerts[0]['exchange'] == 'Binance Hot Wallet'
+        watcher.notifier.send_whale_multihop_alert.assert_awaited_once()
+        assert await ingester.trace_multi_hop() == []
+
+    @pytest.mark.asyncio
+    async def test_multi_hop_skipped_in_cooldown_not_alerted_later(self, watcher):
+        """Test a path evaluated during the cooldown doesn't fire as a stale alert afterwards."""
+        watcher.notifier.send_whale_multihop_alert = AsyncMock(return_value=True)
+        ingester = BlockStreamIngester(watcher, flow_graph=FlowGraph())
+        hops = [WHALE, INTERMEDIATE, '0x' + 'b2' * 20, '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be']
+        for i, (sender, recipient) in enumerate(zip(hops, hops[1:])):
+            await ingester.ingest_block({
+                'number': hex(FIRST_BLOCK + i),
+                'timestamp': hex(1704110400 + i * 600),
+                'transactions': [{
+                    'hash': '0x' + f"{i + 1:02x}" * 32,
+                    'from': sender,
+                    'to': recipient,
+                    'value': hex((100 - i) * 10**18),
+                    'nonce': hex(i)
+                }]
+            })
+
+        watcher._can_send_alert = Mock(return_value=False)
+        assert await ingester.trace_multi_hop() == []
+
+        watcher._can_send_alert = Mock(return_value=True)
+        assert await ingester.trace_multi_hop() == []
+        watcher.notifier.send_whale_multihop_alert.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_split_dump_detected_across_intermediates(self, watcher):
+        """Test a whale outflow split over two intermediates is alerted as a split dump."""
+        watcher.notifier.send_whale_split_dump_alert = AsyncMock(return_value=True)
+        ingester = BlockStreamIngester(watcher, split_detector=SplitDumpDetector(share_threshold=0.6))
+        binance = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+        second = '0x' + 'b2' * 20
+        transfers = [(WHALE, INTERMEDIATE, 100), (WHALE, second, 100), (INTERMEDIATE, binance, 90), (second, binance, 90)]
+
+        alerts = []
+        for i, (sender, recipient, eth) in enumerate(transfers):
+            result = await ingester.ingest_block({
+                'number': hex(FIRST_BLOCK + i),
+                'timestamp': hex(1704110400 + i * 60),
+                'transactions': [{
+                    'hash': '0x' + f"{i + 1:02x}" * 32,
+                    'from': sender,
+                    'to': recipient,
+                    'value': hex(eth * 10**18),
+                    'nonce': hex(i)
+                }]
+            })
+            alerts.extend(result['alerts'])
+
+        split = [a for a in alerts if a['type'] == 'split_dump']
+        assert len(split) == 1
+        assert split[0]['amount_eth'] == 180
+        assert split[0]['share'] == 0.9
+        assert set(split[0]['intermediates']) == {INTERMEDIATE, second}
+        watcher.notifier.send_whale_split_dump_alert.assert_awaited_once()
+        assert ingester.get_stats()['split_dump_alerts'] == 1
+
+    @pytest.mark.asyncio
+    async def test_poll_once_fetches_each_block_once(self, watcher):
+        """Test polling processes new blocks once, independent of whale count."""
+        ingester = BlockStreamIngester(watcher, start_block=FIRST_BLOCK)
+
+        first = await ingester.poll_once()
+        second = await ingester.poll_once()
+
+        assert first['blocks'] == 3
+        assert len(first['alerts']) == 2
+        assert first['last_processed_block'] == FIRST_BLOCK + 2
+        assert second['blocks'] == 0
+        assert watcher.web3_manager.get_block_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_poll_once_starts_at_head(self, watcher):
+        """Test first poll without start_block only processes the head block."""
+        ingester = BlockStreamIngester(watcher, confirmations=1)
+
+        result = await ingester.poll_once()
+
+        assert result['blocks'] == 1
+        assert result['last_processed_block'] == FIRST_BLOCK + 1
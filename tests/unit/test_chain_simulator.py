@@ -0,0 +1,188 @@
+"""
+Unit Tests for Chain Simulator
+===============================
+
+Tests seeded block generation, planted dump ground truth, archive-style
+state queries, and the JSON-RPC / Etherscan endpoints as seen by
+Web3Manager, TransactionIndexer, NonceTracker and the block stream.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from src.core.chain_simulator import ChainSimulator, MockChainServer
+from src.core.rate_limiter import AsyncRateLimiter
+from src.core.web3_manager import Web3Manager
+from src.core.whale_config import WhaleConfig
+from src.analyzers.nonce_tracker import NonceTracker
+from src.analyzers.whale_analyzer import WhaleAnalyzer
+from src.monitors.block_stream import BlockStreamIngester
+from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
+from src.notifications.telegram_notifier import TelegramNotifier
+from src.storage.transaction_indexer import TransactionIndexer
+from src.storage.transaction_store import TransactionStore
+
+
+def make_chain(seed=1, **kwargs):
+    params = dict(whale_count=10, exchange_count=3, noise_per_block=10, noise_addresses=200,
+                  direct_dump_rate=0.1, one_hop_rate=0.2, one_hop_delay_blocks=(2, 5))
+    params.update(kwargs)
+    return ChainSimulator(seed=seed, **params)
+
+
+def one_hop(chain):
+    return next(e for e in chain.events if e.kind == 'one_hop_dump' and e.completed)
+
+
+@pytest.fixture
+def chain():
+    chain = make_chain()
+    chain.mine(60)
+    return chain
+
+
+@pytest.fixture
+def server(chain):
+    server = MockChainServer(chain)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def web3_manager(server):
+    return Web3Manager(rpc_url=server.rpc_url, rate_limiter=AsyncRateLimiter(default_rate=1e6, default_burst=10**6))
+
+
+class TestGeneration:
+    """Test blocks, ground truth and state."""
+
+    def test_deterministic(self):
+        """Test same seed -> same chain, other seed -> other chain."""
+        a, b, c = make_chain(seed=3), make_chain(seed=3), make_chain(seed=4)
+        for chain in (a, b, c):
+            chain.generate(20)
+
+        assert a.blocks == b.blocks
+        assert a.events == b.events
+        assert a.blocks != c.blocks
+
+    def test_planted_one_hop(self, chain):
+        """Test a one-hop dump is whale -> fresh address -> exchange with the whale's fee."""
+        event = one_hop(chain)
+        whale_tx = next(tx for tx in chain.get_block(event.started_block)['transactions']
+                        if tx['hash'] == event.whale_tx_hash)
+        exchange_tx = next(tx for tx in chain.get_block(event.completed_block)['transactions']
+                           if tx['hash'] == event.exchange_tx_hash)
+
+        assert (whale_tx['from'], whale_tx['to']) == (event.whale_address, event.intermediate)
+        assert (exchange_tx['from'], exchange_tx['to']) == (event.intermediate, event.exchange_address)
+        assert 2 <= event.completed_block - event.started_block <= 5
+        assert exchange_tx['maxPriorityFeePerGas'] == whale_tx['maxPriorityFeePerGas']
+        assert int(whale_tx['value'], 16) / 10**18 == pytest.approx(event.amount_eth)
+
+        # Archive-style history of the intermediate
+        assert chain.get_balance(event.intermediate, event.started_block - 1) == 0
+        assert chain.get_balance(event.intermediate, event.started_block) == int(whale_tx['value'], 16)
+        assert chain.get_transaction_count(event.intermediate, event.completed_block - 1) == 0
+        assert chain.get_transaction_count(event.intermediate) == 1
+        assert chain.get_balance(event.intermediate) == 10**16
+
+    def test_head_bounds_queries(self):
+        """Test generated but unmined blocks are invisible."""
+        chain = make_chain()
+        chain.generate(30)
+        assert chain.get_block(chain.start_block) is None
+
+        head = chain.mine(10)
+        assert head == chain.start_block + 9
+        assert chain.get_block(head) is not None
+        assert chain.get_block(head + 1) is None
+        assert len(chain.blocks) == 30
+        assert all(int(tx['blockNumber'], 16) <= head
+                   for tx in chain.get_transactions(chain.whales[0]))
+
+
+class TestServer:
+    """Test the endpoints through the real clients."""
+
+    @pytest.mark.asyncio
+    async def test_json_rpc(self, chain, server, web3_manager):
+        """Test Web3Manager connects, follows blocks and batches balances."""
+        assert await web3_manager.initialize() is True
+        assert await web3_manager.get_block_number() == chain.head
+        assert await web3_manager.get_block(chain.head) == chain.get_block(chain.head)
+        assert await web3_manager.get_block(chain.head + 1) is None
+
+        balances = await web3_manager.get_balances_batch(chain.whales)
+        assert balances == {w: chain.get_balance(w) / 10**18 for w in chain.whales}
+        assert server.calls['eth_getBalance'] == len(chain.whales)
+
+        # Sync web3 provider (used by the analyzers) works against the threaded server
+        event = one_hop(chain)
+        address = web3_manager.w3.to_checksum_address(event.intermediate)
+        assert web3_manager.w3.eth.get_transaction_count(address, event.completed_block) == 1
+
+        assert await web3_manager._rpc_call('eth_sendRawTransaction', ['0x00']) is None
+
+    @pytest.mark.asyncio
+    async def test_etherscan(self, chain, server, db_manager):
+        """Test txlist backfill and the proxy nonce call."""
+        store = TransactionStore(db_manager)
+        await store.initialize()
+        indexer = TransactionIndexer(store, etherscan_api_key='key', backfill_page_size=5,
+                                     etherscan_url=server.etherscan_url)
+        whale = one_hop(chain).whale_address
+
+        stored = await indexer.backfill(whale, chain.head)
+
+        expected = chain.get_transactions(whale)
+        assert stored == len(expected) > 0
+        assert indexer.get_high_water_mark(whale) == chain.head
+        recent = await store.get_recent_transactions(whale, limit=100)
+        assert {tx['hash'] for tx in recent} == {tx['hash'] for tx in expected}
+
+        event = one_hop(chain)
+        tracker = NonceTracker(etherscan_api_key='key', etherscan_url=server.etherscan_url)
+        tracker.etherscan_rate_limit = 0
+        assert await tracker._get_nonce_via_etherscan(event.intermediate, event.started_block) == 0
+        assert await tracker._get_nonce_via_etherscan(event.intermediate, event.completed_block) == 1
+
+
+class TestDetection:
+    """Test planted dumps are found by the block stream."""
+
+    @pytest.mark.asyncio
+    async def test_block_stream_detects_planted_dumps(self):
+        """Test every planted dump completed in the stream raises an alert on its exchange tx."""
+        whale_config = WhaleConfig()
+        chain = make_chain(exchange_addresses=whale_config.get_all_exchange_addresses()[:3])
+        server = MockChainServer(chain)
+        server.start()
+
+        settings = Mock()
+        settings.MIN_AMOUNT_USD = 10000.0
+        settings.whale_monitoring.intervals.alert_cooldown_minutes = 0
+        settings.whale_monitoring.intervals.onehop_check_hours = 2
+        notifier = Mock(spec=TelegramNotifier)
+        notifier.send_whale_direct_transfer_alert = AsyncMock(return_value=True)
+        notifier.send_whale_onehop_alert = AsyncMock(return_value=True)
+        watcher = SimpleWhaleWatcher(
+            web3_manager=Web3Manager(rpc_url=server.rpc_url,
+                                     rate_limiter=AsyncRateLimiter(default_rate=1e6, default_burst=10**6)),
+            whale_config=whale_config,
+            analyzer=WhaleAnalyzer(),
+            notifier=notifier,
+            settings=settings
+        )
+        ingester = BlockStreamIngester(watcher, whale_addresses=chain.whales,
+                                       start_block=chain.start_block, max_blocks_per_poll=100)
+
+        chain.mine(40)
+        result = await ingester.poll_once()
+        server.stop()
+
+        assert result['blocks'] == 40
+        planted = {e.exchange_tx_hash for e in chain.events if e.completed}
+        alerted = {a.get('exchange_tx_hash') or a.get('tx_hash') for a in result['alerts']}
+        assert planted and planted <= alerted
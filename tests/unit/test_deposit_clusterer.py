@@ -0,0 +1,133 @@
+"""
+Unit Tests for Deposit Clusterer
+=================================
+
+Tests exchange deposit-address detection on an in-memory SQLite database.
+"""
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, Mock
+
+from src.core.whale_config import WhaleConfig
+from src.storage.transaction_store import TransactionStore
+from src.storage.deposit_clusterer import DepositClusterer
+from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
+from tests.conftest import Chain
+
+
+BINANCE = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+COINBASE = '0x503828976d22510aad0201ac7ec88293211d23da'
+WHALE = '0x5a52e96bacdabb82fd05763e25335261b270efcb'
+DEPOSIT = '0x' + 'd1' * 20
+USER = '0x' + 'a1' * 20
+
+
+@pytest_asyncio.fixture
+async def setup(db_manager):
+    """Store, clusterer and a fresh WhaleConfig on in-memory SQLite."""
+    store = TransactionStore(db_manager)
+    await store.initialize()
+    whale_config = WhaleConfig()
+    clusterer = DepositClusterer(db_manager, whale_config, exclude=[WHALE])
+    return store, clusterer, whale_config, Chain()
+
+
+class TestDepositClusterer:
+    """Test deposit-address detection and publishing."""
+
+    @pytest.mark.asyncio
+    async def test_sweeping_address_published_as_exchange(self, setup):
+        """Test an address sweeping to a hot wallet becomes an exchange address."""
+        store, clusterer, whale_config, chain = setup
+        await store.add_transactions([chain.tx(DEPOSIT, BINANCE), chain.tx(DEPOSIT, BINANCE)])
+
+        assert whale_config.is_exchange(DEPOSIT) is False
+        assert await clusterer.run() == [DEPOSIT]
+
+        assert whale_config.is_exchange('0x' + DEPOSIT[2:].upper()) is True
+        classification = whale_config.classify_transaction_destination(DEPOSIT)
+        assert classification['is_dump_risk'] is True
+        assert 'binance' in classification['tags']
+        assert clusterer.get_exchange(DEPOSIT) == 'binance'
+
+    @pytest.mark.asyncio
+    async def test_clustered_deposit_skips_one_hop_profiling(self, setup):
+        """Test a whale transfer to a learned deposit address needs no one-hop RPC lookups."""
+        store, clusterer, whale_config, chain = setup
+        await store.add_transactions([chain.tx(DEPOSIT, BINANCE), chain.tx(DEPOSIT, BINANCE)])
+        assert await clusterer.run() == [DEPOSIT]
+
+        profiler = Mock()
+        profiler.profile_address = AsyncMock()
+        watcher = SimpleWhaleWatcher(whale_config=whale_config, settings=Mock(), address_profiler=profiler)
+        watcher._get_recent_transactions = AsyncMock(return_value=[])
+        whale_tx = chain.tx(WHALE, DEPOSIT, value=1000 * 10**18)
+
+        assert await watcher._check_advanced_one_hop(WHALE, whale_tx) is None
+        assert whale_config.is_exchange(whale_tx['to'])  # Alerted as a direct dump instead
+        profiler.profile_address.assert_not_awaited()
+        watcher._get_recent_transactions.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_single_sweep_and_mixed_senders_not_published(self, setup):
+        """Test min_sweeps, sweep ratio and the recipient limit."""
+        store, clusterer, whale_config, chain = setup
+        mixed = '0x' + 'b2' * 20
+        await store.add_transactions(
+            [chain.tx(DEPOSIT, BINANCE)]
+            + [chain.tx(mixed, BINANCE), chain.tx(mixed, BINANCE), chain.tx(mixed, USER)]
+            + [chain.tx(USER, '0x' + f"{i:040x}") for i in range(5)]
+        )
+
+        assert await clusterer.run() == []
+        assert clusterer.get_stats()['rejected'] == 1  # USER pays too many parties
+
+    @pytest.mark.asyncio
+    async def test_whales_and_known_addresses_never_published(self, setup):
+        """Test excluded whales and curated addresses are skipped."""
+        store, clusterer, whale_config, chain = setup
+        await store.add_transactions([chain.tx(WHALE, BINANCE), chain.tx(WHALE, BINANCE)])
+
+        assert await clusterer.run() == []
+        assert whale_config.is_exchange(WHALE) is False
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_sender_skipped(self, setup):
+        """Test a sender sweeping to two exchanges is not attributed to either."""
+        store, clusterer, whale_config, chain = setup
+        await store.add_transactions([
+            chain.tx(DEPOSIT, BINANCE), chain.tx(DEPOSIT, BINANCE),
+            chain.tx(DEPOSIT, COINBASE), chain.tx(DEPOSIT, COINBASE)
+        ])
+
+        assert await clusterer.run() == []
+        assert clusterer.get_stats()['ambiguous'] == 1
+
+    @pytest.mark.asyncio
+    async def test_detection_propagates_through_consolidation_wallet(self, setup):
+        """Test deposit -> consolidation -> hot wallet chains are clustered in one run."""
+        store, clusterer, whale_config, chain = setup
+        consolidation = '0x' + 'c3' * 20
+        # Deposit rows come first, before the consolidation wallet is known
+        await store.add_transactions([
+            chain.tx(DEPOSIT, consolidation), chain.tx(DEPOSIT, consolidation),
+            chain.tx(consolidation, BINANCE), chain.tx(consolidation, BINANCE)
+        ])
+
+        assert sorted(await clusterer.run()) == sorted([DEPOSIT, consolidation])
+        assert clusterer.get_exchange(DEPOSIT) == 'binance'
+
+    @pytest.mark.asyncio
+    async def test_incremental_runs(self, setup):
+        """Test later runs only read new rows and keep earlier counts."""
+        store, clusterer, whale_config, chain = setup
+        await store.add_transactions([chain.tx(DEPOSIT, BINANCE)])
+        assert await clusterer.run() == []
+
+        await store.add_transactions([chain.tx(DEPOSIT, BINANCE)])
+        assert await clusterer.run() == [DEPOSIT]
+        assert clusterer.get_stats()['rows_processed'] == 2
+
+        assert await clusterer.run() == []
+        assert clusterer.get_stats()['rows_processed'] == 2
@@ -0,0 +1,152 @@
+"""
+Unit Tests for Flow Graph
+==========================
+
+Tests multi-hop path search (time windows, amount conservation, hop limit),
+CSR compaction with the uncompacted tail, and retention.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from src.analyzers.flow_graph import FlowGraph
+
+
+WHALE = '0x' + 'aa' * 20
+EXCHANGE = '0x' + 'ee' * 20
+T0 = datetime(2024, 1, 1, 12, 0)
+
+
+def addr(i: int) -> str:
+    return f"0x{i:040x}"
+
+
+def tx_hash(i: int) -> str:
+    return f"0x{i:064x}"
+
+
+def add_chain(graph, hops, amounts=None, delays_minutes=10, start=T0, first_hash=1, end=EXCHANGE):
+    """whale -> hops intermediates -> exchange, one transfer every delays_minutes."""
+    path = [WHALE] + [addr(first_hash * 100 + h) for h in range(hops)] + [end]
+    amounts = amounts or [100.0 - h for h in range(hops + 1)]
+    for h, (sender, recipient) in enumerate(zip(path, path[1:])):
+        graph.add_transfer(
+            sender, recipient, amounts[h], start + timedelta(minutes=delays_minutes * h), tx_hash(first_hash * 100 + h)
+        )
+    return path
+
+
+@pytest.fixture
+def graph():
+    """Graph with one exchange and manual compaction."""
+    return FlowGraph(exchanges=[EXCHANGE], compact_threshold=10**6)
+
+
+class TestTrace:
+    """Test path search."""
+
+    def test_finds_multi_hop_path(self, graph):
+        """Test a 3-intermediate chain is reported with hashes, amounts and confidence."""
+        path = add_chain(graph, hops=3)
+
+        paths = graph.trace(WHALE)
+
+        assert len(paths) == 1
+        found = paths[0]
+        assert found.addresses == path
+        assert found.hops == 3
+        assert found.tx_hashes == [tx_hash(100 + h) for h in range(4)]
+        assert found.amount_eth == 97.0
+        assert found.duration_minutes == 30
+        assert found.confidence == pytest.approx(97 * 0.8 ** 2, abs=0.1)
+
+    def test_time_order_and_windows(self, graph):
+        """Test transfers before the previous hop or beyond the hop delay are not followed."""
+        graph.max_hop_delay_seconds = 3600
+        # Second hop happens before the first one
+        graph.add_transfer(WHALE, addr(1), 100, T0, tx_hash(1))
+        graph.add_transfer(addr(1), addr(2), 100, T0 + timedelta(minutes=10), tx_hash(2))
+        graph.add_transfer(addr(2), EXCHANGE, 100, T0 - timedelta(minutes=5), tx_hash(3))
+        # Exchange transfer two hours after the previous hop
+        graph.add_transfer(addr(2), EXCHANGE, 100, T0 + timedelta(hours=2), tx_hash(4))
+
+        assert graph.trace(WHALE) == []
+
+        graph.add_transfer(addr(2), EXCHANGE, 100, T0 + timedelta(minutes=30), tx_hash(5))
+        assert [p.tx_hashes[-1] for p in graph.trace(WHALE)] == [tx_hash(5)]
+
+    def test_amount_conservation(self, graph):
+        """Test dust forwards and transfers mixed with much larger funds are pruned."""
+        add_chain(graph, hops=2, amounts=[100, 10, 10], first_hash=1)   # 10% retained
+        add_chain(graph, hops=2, amounts=[100, 500, 500], first_hash=2)  # 5x the carried amount
+        assert graph.trace(WHALE) == []
+
+        add_chain(graph, hops=2, amounts=[100, 80, 60], first_hash=3)
+        paths = graph.trace(WHALE)
+        assert len(paths) == 1
+        assert paths[0].amount_eth == 60
+
+    def test_hop_limit_and_direct_transfers(self, graph):
+        """Test chains longer than max_hops and direct exchange transfers are not paths."""
+        graph.max_hops = 2
+        add_chain(graph, hops=3, first_hash=1)
+        graph.add_transfer(WHALE, EXCHANGE, 50, T0, tx_hash(9))
+        assert graph.trace(WHALE) == []
+
+        add_chain(graph, hops=2, first_hash=2)
+        assert [p.hops for p in graph.trace(WHALE)] == [2]
+
+    def test_since_and_trace_outflow(self, graph):
+        """Test outflow selection by time and by transaction hash."""
+        add_chain(graph, hops=1, first_hash=1, start=T0)
+        add_chain(graph, hops=2, first_hash=2, start=T0 + timedelta(hours=3))
+
+        assert [p.hops for p in graph.trace(WHALE, since=T0 + timedelta(hours=1))] == [2]
+        assert [p.hops for p in graph.trace_outflow(tx_hash(100))] == [1]
+        assert graph.trace_outflow(tx_hash(999)) == []
+
+
+class TestStorage:
+    """Test compaction and retention."""
+
+    def test_compaction_keeps_results(self, graph):
+        """Test paths spanning compacted edges and the tail are found."""
+        add_chain(graph, hops=2, first_hash=1)
+        before = graph.trace(WHALE)
+        graph.compact()
+        assert graph.get_stats()['tail_edges'] == 0
+        assert graph.trace(WHALE) == before
+
+        # New exchange hop lands in the tail after compaction
+        graph.add_transfer(addr(101), '0x' + 'ef' * 20, 99, T0 + timedelta(minutes=15), tx_hash(7))
+        graph.add_exchanges(['0x' + 'ef' * 20])
+        assert len(graph.trace(WHALE)) == 2
+
+    def test_automatic_compaction_and_retention(self):
+        """Test the tail is merged automatically and expired edges / addresses are dropped."""
+        graph = FlowGraph(exchanges=[EXCHANGE], retention_hours=1, compact_threshold=4)
+        add_chain(graph, hops=1, first_hash=1, start=T0)
+        add_chain(graph, hops=1, first_hash=2, start=T0 + timedelta(hours=3))
+
+        stats = graph.get_stats()
+        assert stats['compactions'] == 1
+        assert stats['edges'] == 2
+        assert stats['edges_expired'] == 2
+        assert stats['nodes'] == 3  # whale, second intermediate, exchange
+        assert graph.is_exchange(EXCHANGE)
+        assert [p.tx_hashes[0] for p in graph.trace(WHALE)] == [tx_hash(200)]
+        assert graph.latest_timestamp == T0 + timedelta(hours=3, minutes=10)
+
+    def test_add_transactions(self, graph):
+        """Test decoded block transactions become edges (value transfers only)."""
+        added = graph.add_transactions([
+            {'hash': tx_hash(1), 'from': WHALE, 'to': addr(1), 'value': 10**20, 'timestamp': T0},
+            {'hash': tx_hash(2), 'from': addr(1), 'to': '', 'value': 10**18, 'timestamp': T0},
+            {'hash': tx_hash(3), 'from': addr(1), 'to': addr(2), 'value': 0, 'timestamp': T0},
+            {'hash': tx_hash(4), 'from': addr(1), 'to': EXCHANGE, 'value': 99 * 10**18,
+             'timestamp': T0 + timedelta(minutes=1)}
+        ])
+
+        assert added == 2
+        assert graph.out_degree(addr(1)) == 1
+        assert graph.trace(WHALE)[0].amounts_eth == [100.0, 99.0]
@@ -2,8 +2,10 @@
 Unit tests for GasCorrelator (Signal #2)
 """
 
+import random
+
 import pytest
-from src.analyzers.gas_correlator import GasCorrelator, GasCorrelationResult
+from src.analyzers.gas_correlator import GasCorrelator, GasCorrelationResult, GasPairScore
 
 
 class TestGasCorrelatorInitialization:
@@ -318,3 +320,89 @@ class TestEdgeCases:
         assert result.match is False
         assert result.correlation_type == 'error'
         assert 'Error' in result.details
+
+
+def random_tx(rng):
+    """Random legacy / EIP-1559 / gasless transaction with colliding values."""
+    kind = rng.choice(['legacy', 'eip1559', 'eip1559', 'missing'])
+    gas = rng.choice([30, 30.05, 31, 50]) * 10**9
+    priority = rng.choice([1, 2]) * 10**9
+    if kind == 'legacy':
+        return {'gasPrice': int(gas)}
+    if kind == 'eip1559':
+        return {'gasPrice': None, 'maxFeePerGas': hex(int(gas)), 'maxPriorityFeePerGas': priority}
+    return {'gasPrice': None}
+
+
+class TestScoreMatrix:
+    """Test vectorized batch scoring"""
+
+    def test_matches_per_pair_path(self):
+        """Test every pair scores the same as check_gas_correlation"""
+        correlator = GasCorrelator()
+        rng = random.Random(42)
+        whale_txs = [random_tx(rng) for _ in range(15)]
+        intermediate_txs = [random_tx(rng) for _ in range(20)]
+
+        pairs = correlator.score_matrix(whale_txs, intermediate_txs, top_k=15 * 20)
+        scored = {(p.whale_index, p.intermediate_index): p for p in pairs}
+
+        for i, whale_tx in enumerate(whale_txs):
+            for j, intermediate_tx in enumerate(intermediate_txs):
+                expected = correlator.check_gas_correlation(whale_tx, intermediate_tx)
+                if expected.confidence == 0:
+                    assert (i, j) not in scored
+                else:
+                    assert scored[(i, j)].confidence == expected.confidence
+                    assert scored[(i, j)].correlation_type == expected.correlation_type
+
+    def test_top_k_order(self):
+        """Test best pairs first, ties broken by smaller difference"""
+        correlator = GasCorrelator()
+        whale_txs = [{'gasPrice': 50 * 10**9}, {'gasPrice': 40 * 10**9}]
+        intermediate_txs = [
+            {'gasPrice': 40 * 10**9 + 5 * 10**7},  # close to whale 1
+            {'gasPrice': 50 * 10**9},              # exact with whale 0
+            {'gasPrice': 40 * 10**9 + 1 * 10**7},  # closer to whale 1
+        ]
+
+        pairs = correlator.score_matrix(whale_txs, intermediate_txs, top_k=2)
+
+        assert [(p.whale_index, p.intermediate_index) for p in pairs] == [(0, 1), (1, 2)]
+        assert pairs[0] == GasPairScore(0, 1, 95, 'exact', 0.0)
+        assert pairs[1].correlation_type == 'close'
+
+    def test_no_correlation(self):
+        """Test uncorrelated transactions produce no pairs"""
+        correlator = GasCorrelator()
+
+        pairs = correlator.score_matrix([{'gasPrice': 50 * 10**9}], [{'gasPrice': 20 * 10**9}])
+
+        assert pairs == []
+
+    def test_empty_inputs(self):
+        """Test empty transaction lists"""
+        correlator = GasCorrelator()
+
+        assert correlator.score_matrix([], [{'gasPrice': 1}]) == []
+        assert correlator.score_matrix([{'gasPrice': 1}], []) == []
+
+    def test_invalid_data(self):
+        """Test invalid gas field returns no pairs instead of raising"""
+        correlator = GasCorrelator()
+
+        assert correlator.score_matrix([{'gasPrice': 'invalid'}], [{'gasPrice': 1}]) == []
+
+    def test_invalid_field_masks_only_its_pairs(self):
+        """Test one unparsable or out-of-range gas field doesn't drop the rest of the batch"""
+        correlator = GasCorrelator()
+        whale_txs = [{'gasPrice': 'invalid'}, {'gasPrice': 50 * 10**9}, {'gasPrice': 2**70}]
+        intermediate_txs = [
+            {'gasPrice': 50 * 10**9},
+            {'maxFeePerGas': [1]},
+            {'gasPrice': 60 * 10**9, 'maxPriorityFeePerGas': '0xzz'},
+        ]
+
+        pairs = correlator.score_matrix(whale_txs, intermediate_txs)
+
+        assert pairs == [GasPairScore(1, 0, 95, 'exact', 0.0)]
@@ -0,0 +1,189 @@
+"""
+Unit tests for Instrumentation
+===============================
+
+Tests latency histograms, call tracking, nested spans and the Prometheus /
+JSON exporters.
+"""
+
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from src.core.instrumentation import Histogram, Instrumentation, MetricsExporter, traced
+
+
+class TestHistogram:
+    """Test bucket counting and quantile estimates."""
+
+    def test_observe_buckets(self):
+        """Test samples land in the first bucket whose bound is >= the sample."""
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for seconds in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(seconds)
+
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.cumulative() == [('0.1', 2), ('1', 3), ('+Inf', 4)]
+        assert histogram.total == pytest.approx(3.65)
+        assert histogram.max == 3.0
+
+    def test_quantile(self):
+        """Test quantiles interpolate inside the bucket and never exceed the max."""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for _ in range(50):
+            histogram.observe(0.05)
+        for _ in range(50):
+            histogram.observe(0.4)
+
+        assert histogram.quantile(0.5) == pytest.approx(0.1)
+        assert 0.1 < histogram.quantile(0.95) <= 0.4
+        assert Histogram().quantile(0.5) == 0.0
+
+
+class TestCalls:
+    """Test per-call cost tracking."""
+
+    def test_track_call_records_bytes_and_errors(self):
+        """Test sizes and API errors set by the caller are recorded."""
+        instrumentation = Instrumentation()
+
+        with instrumentation.track_call('rpc', 'eth_blockNumber') as call:
+            call.bytes_sent = 60
+            call.bytes_received = 40
+        with instrumentation.track_call('rpc', 'eth_blockNumber') as call:
+            call.error = True
+
+        stats = instrumentation.get_stats('rpc')['eth_blockNumber']
+        assert stats['calls'] == 2
+        assert stats['errors'] == 1
+        assert stats['bytes_sent'] == 60
+        assert stats['bytes_received'] == 40
+
+    def test_track_call_exception(self):
+        """Test an exception counts as an error and propagates."""
+        instrumentation = Instrumentation()
+
+        with pytest.raises(ValueError):
+            with instrumentation.track_call('etherscan', 'txlist'):
+                raise ValueError("boom")
+
+        assert instrumentation.get_stats('etherscan')['txlist']['errors'] == 1
+        assert instrumentation.get_stats('telegram') == {}
+
+
+class TestSpans:
+    """Test nested pipeline spans."""
+
+    @pytest.mark.asyncio
+    async def test_spans_nest_across_tasks(self):
+        """Test child spans, also in tasks started inside a span, get the parent path."""
+        instrumentation = Instrumentation()
+
+        async def signal(name):
+            with instrumentation.span(f'signal.{name}'):
+                await asyncio.sleep(0)
+
+        with instrumentation.span('check_whale'):
+            with instrumentation.span('one_hop'):
+                await asyncio.gather(
+                    asyncio.create_task(signal('nonce')),
+                    asyncio.create_task(signal('profile'))
+                )
+        with instrumentation.span('check_whale'):
+            pass
+
+        spans = instrumentation.get_stats()['spans']
+        assert set(spans) == {
+            'check_whale',
+            'check_whale/one_hop',
+            'check_whale/one_hop/signal.nonce',
+            'check_whale/one_hop/signal.profile'
+        }
+        assert spans['check_whale']['count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_traced_decorator(self):
+        """Test @traced records into self.instrumentation and counts errors."""
+
+        class Component:
+            def __init__(self):
+                self.instrumentation = Instrumentation()
+
+            @traced('work')
+            async def work(self, fail=False):
+                if fail:
+                    raise RuntimeError("failed")
+                return 42
+
+        component = Component()
+
+        assert await component.work() == 42
+        with pytest.raises(RuntimeError):
+            await component.work(fail=True)
+
+        spans = component.instrumentation.get_stats()['spans']
+        assert spans['work']['count'] == 2
+        assert spans['work']['errors'] == 1
+
+
+class TestExport:
+    """Test Prometheus text and JSON export."""
+
+    def _instrumentation(self):
+        instrumentation = Instrumentation(buckets=(0.1, 1.0))
+        instrumentation.record_call('rpc', 'eth_getBalance', 0.05, bytes_sent=100, bytes_received=80)
+        instrumentation.record_call('rpc', 'eth_getBalance', 2.0, error=True)
+        instrumentation.record_call('etherscan', 'txlist', 0.5)
+        with instrumentation.span('check_whale'):
+            pass
+        return instrumentation
+
+    def test_render_prometheus(self):
+        """Test histogram buckets, counters and labels in exposition format."""
+        text = self._instrumentation().render_prometheus()
+
+        assert '# TYPE whale_tracker_call_duration_seconds histogram' in text
+        assert 'whale_tracker_call_duration_seconds_bucket{service="rpc",method="eth_getBalance",le="0.1"} 1' in text
+        assert 'whale_tracker_call_duration_seconds_bucket{service="rpc",method="eth_getBalance",le="+Inf"} 2' in text
+        assert 'whale_tracker_call_duration_seconds_count{service="etherscan",method="txlist"} 1' in text
+        assert 'whale_tracker_call_errors_total{service="rpc",method="eth_getBalance"} 1' in text
+        assert 'whale_tracker_call_bytes_sent_total{service="rpc",method="eth_getBalance"} 100' in text
+        assert 'whale_tracker_span_duration_seconds_count{span="check_whale"} 1' in text
+
+    def test_label_escaping(self):
+        """Test quotes and backslashes in label values are escaped."""
+        instrumentation = Instrumentation()
+        instrumentation.record_call('rpc', 'odd"name\\', 0.01)
+
+        assert 'method="odd\\"name\\\\"' in instrumentation.render_prometheus()
+
+    def test_write_json(self, tmp_path):
+        """Test the JSON dump contains calls and spans."""
+        path = tmp_path / 'metrics' / 'metrics.json'
+
+        self._instrumentation().write_json(str(path))
+
+        snapshot = json.loads(path.read_text())
+        assert snapshot['calls']['rpc']['eth_getBalance']['calls'] == 2
+        assert snapshot['spans']['check_whale']['count'] == 1
+        assert 'timestamp' in snapshot
+
+    @pytest.mark.asyncio
+    async def test_metrics_exporter(self):
+        """Test /metrics and /metrics.json are served over HTTP."""
+        exporter = MetricsExporter(self._instrumentation(), port=0)
+        url = await exporter.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f'{url}/metrics') as response:
+                    text = await response.text()
+                async with session.get(f'{url}/metrics.json') as response:
+                    data = await response.json()
+        finally:
+            await exporter.stop()
+
+        assert 'whale_tracker_call_duration_seconds_count{service="rpc",method="eth_getBalance"} 2' in text
+        assert data['calls']['etherscan']['txlist']['calls'] == 1
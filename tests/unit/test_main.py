@@ -9,7 +9,8 @@ import pytest
 import asyncio
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from main import WhaleTrackerOrchestrator, setup_logging
-from config.settings import Settings
+from config.settings import BlockchainConfig, Settings
+from src.monitors.adaptive_scheduler import AdaptiveScheduler
 
 
 @pytest.fixture
@@ -30,6 +31,33 @@ def mock_settings():
     settings.whale_monitoring = Mock()
     settings.whale_monitoring.thresholds = Mock()
     settings.whale_monitoring.thresholds.anomaly_multiplier = 1.3
+    settings.whale_monitoring.block_stream_enabled = False
+    settings.whale_monitoring.persist_state = False
+    settings.whale_monitoring.address_label_files = []
+    settings.whale_monitoring.deposit_clustering_enabled = False
+    settings.whale_monitoring.adaptive_scheduling = False
+
+    # Mock notifications
+    settings.notifications = Mock()
+    settings.notifications.telegram.per_chat_interval_seconds = 1.0
+    settings.notifications.telegram.global_rate_per_second = 25.0
+    settings.notifications.telegram.max_retries = 5
+    settings.notifications.telegram.max_queue_size = 1000
+    settings.notifications.telegram.timeout = 30
+
+    # Mock phases (local transaction history disabled)
+    settings.phases = Mock()
+    settings.phases.phase2_price_impact.historical_data_storage = False
+
+    # Mock performance settings
+    settings.performance = Mock()
+    settings.performance.max_concurrent_requests = 10
+    settings.performance.whale_check_timeout_seconds = 60
+    settings.performance.cache_ttl_seconds = 300
+    settings.performance.onehop_signal_timeout_seconds = 10
+    settings.performance.metrics_port = 0
+    settings.performance.metrics_dump_seconds = 0
+    settings.blockchain = BlockchainConfig()
 
     return settings
 
@@ -219,6 +247,64 @@ class TestScheduler:
         assert call_args.kwargs['id'] == 'whale_monitoring'
         assert call_args.kwargs['max_instances'] == 1
 
+    @patch('main.AsyncIOScheduler')
+    def test_setup_scheduler_adaptive(self, mock_scheduler_class, mock_settings):
+        """Test adaptive scheduling replaces the fixed monitoring job."""
+        mock_settings.whale_monitoring.intervals.adaptive_tick_seconds = 15
+        orchestrator = WhaleTrackerOrchestrator(settings=mock_settings)
+        orchestrator.check_scheduler = AdaptiveScheduler(mock_settings.WHALE_ADDRESSES, checks_per_minute=2)
+
+        mock_scheduler = Mock()
+        mock_scheduler_class.return_value = mock_scheduler
+
+        orchestrator.setup_scheduler()
+
+        mock_scheduler.add_job.assert_called_once()
+        assert mock_scheduler.add_job.call_args.kwargs['id'] == 'adaptive_checks'
+
+    @pytest.mark.asyncio
+    async def test_run_adaptive_checks(self, mock_settings):
+        """Test only due whales are checked and then rescheduled."""
+        orchestrator = WhaleTrackerOrchestrator(settings=mock_settings)
+        now = [0.0]
+        orchestrator.check_scheduler = AdaptiveScheduler(
+            mock_settings.WHALE_ADDRESSES, checks_per_minute=2, clock=lambda: now[0]
+        )
+
+        mock_watcher = Mock()
+        mock_watcher.last_balances = {}
+        mock_watcher.monitor_all_whales = AsyncMock(return_value={
+            'status': 'completed',
+            'total_alerts': 0,
+            'results': [{'whale_address': '0xwhale1', 'status': 'checked', 'balance_change': 0.0}]
+        })
+        orchestrator.watcher = mock_watcher
+
+        await orchestrator.run_adaptive_checks()
+
+        mock_watcher.monitor_all_whales.assert_called_once_with(['0xwhale1'])
+        assert orchestrator.check_scheduler.get_stats()['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_adaptive_checks_failure_reschedules(self, mock_settings):
+        """Test whales of a failed adaptive tick are retried instead of dropped."""
+        orchestrator = WhaleTrackerOrchestrator(settings=mock_settings)
+        now = [0.0]
+        orchestrator.check_scheduler = AdaptiveScheduler(
+            mock_settings.WHALE_ADDRESSES, checks_per_minute=2, min_interval_seconds=30, clock=lambda: now[0]
+        )
+
+        mock_watcher = Mock()
+        mock_watcher.last_balances = {}
+        mock_watcher.monitor_all_whales = AsyncMock(side_effect=RuntimeError("RPC down"))
+        orchestrator.watcher = mock_watcher
+
+        await orchestrator.run_adaptive_checks()
+
+        assert orchestrator.check_scheduler.get_stats()['in_flight'] == 0
+        now[0] += 30
+        assert '0xwhale1' in orchestrator.check_scheduler.due()
+
     @patch('main.AsyncIOScheduler')
     def test_setup_scheduler_error(self, mock_scheduler_class, mock_settings):
         """Test scheduler setup error handling."""
@@ -340,3 +426,53 @@ class TestIntegration:
         assert orchestrator.analyzer is not None
         assert orchestrator.notifier is not None
         assert orchestrator.watcher is not None
+
+
+class TestStorageSetup:
+    """Test the async storage setup and its hand-off to the block stream."""
+
+    @pytest.mark.asyncio
+    async def test_block_stream_resumes_after_catch_up(self, mock_settings, db_manager):
+        """Test the stream continues at catch_up's head + 1 and checkpoints keep advancing."""
+        from src.core.whale_config import WhaleConfig
+        from src.monitors.block_stream import BlockStreamIngester
+        from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
+        from src.storage.transaction_indexer import TransactionIndexer
+        from src.storage.transaction_store import TransactionStore
+
+        whale = '0x' + 'ab' * 20
+        mock_settings.WHALE_ADDRESSES = [whale]
+
+        class Chain:
+            head = 100
+
+            async def get_block_number(self):
+                return self.head
+
+            async def get_block(self, number, full_transactions=True):
+                return {'number': hex(number), 'timestamp': '0x0', 'transactions': []}
+
+        chain = Chain()
+        orchestrator = WhaleTrackerOrchestrator(settings=mock_settings)
+        orchestrator.web3_manager = chain
+        orchestrator.transaction_store = TransactionStore(db_manager)
+        # No Etherscan key: catch_up has nothing to backfill
+        orchestrator.transaction_indexer = TransactionIndexer(orchestrator.transaction_store)
+        orchestrator.partition_manager = AsyncMock()
+        orchestrator.signal_metrics = AsyncMock()
+        orchestrator.watcher = SimpleWhaleWatcher(
+            web3_manager=chain, whale_config=WhaleConfig(), analyzer=Mock(),
+            notifier=Mock(), settings=mock_settings
+        )
+        orchestrator.block_stream = BlockStreamIngester(
+            watcher=orchestrator.watcher, indexer=orchestrator.transaction_indexer
+        )
+
+        await orchestrator.setup_storage()
+
+        # The chain moved on before the first poll
+        chain.head = 104
+        result = await orchestrator.block_stream.poll_once()
+
+        assert result['blocks'] == 4
+        assert orchestrator.transaction_indexer.get_high_water_mark(whale) == 104
@@ -7,7 +7,7 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
 import aiohttp
 
-from src.analyzers.nonce_tracker import NonceTracker, NonceCorrelationResult
+from src.analyzers.nonce_tracker import NonceTracker, NonceCorrelationResult, NonceTimeline
 
 
 class TestNonceTrackerInitialization:
@@ -291,17 +291,15 @@ class TestRPCNonceRetrieval:
         """Test successful nonce retrieval via RPC"""
         test_address = '0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045'  # Valid Ethereum address
 
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.return_value = 5
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.return_value = 5
 
         tracker = NonceTracker(web3_manager=mock_web3_manager)
 
         nonce = await tracker._get_nonce_via_rpc(test_address, 18000000)
 
         assert nonce == 5
-        mock_web3.eth.get_transaction_count.assert_called_once()
+        mock_web3_manager.get_transaction_count.assert_awaited_once_with(test_address, block=18000000)
 
     @pytest.mark.asyncio
     async def test_rpc_no_web3_manager(self):
@@ -315,10 +313,8 @@ class TestRPCNonceRetrieval:
     @pytest.mark.asyncio
     async def test_rpc_error(self):
         """Test RPC error handling"""
-        mock_web3_manager = Mock()
-        mock_web3 = Mock()
-        mock_web3.eth.get_transaction_count.side_effect = Exception("RPC error")
-        mock_web3_manager.w3 = mock_web3
+        mock_web3_manager = AsyncMock()
+        mock_web3_manager.get_transaction_count.side_effect = Exception("RPC error")
 
         tracker = NonceTracker(web3_manager=mock_web3_manager)
 
@@ -384,6 +380,107 @@ class TestNonceFallback:
         assert nonce is None
 
 
+class TestNonceTimeline:
+    """Test nonce checkpoint timeline"""
+
+    def test_exact_checkpoint(self):
+        """Test lookup at a known block"""
+        timeline = NonceTimeline()
+        timeline.add(100, 3)
+
+        assert timeline.lookup(100) == 3
+        assert timeline.lookup(101) is None
+
+    def test_equal_neighbors_determine_nonce(self):
+        """Test block between checkpoints with equal nonce"""
+        timeline = NonceTimeline()
+        timeline.add(100, 3)
+        timeline.add(200, 3)
+        timeline.add(300, 5)
+
+        assert timeline.lookup(150) == 3
+        assert timeline.lookup(250) is None
+
+    def test_zero_before_first_checkpoint(self):
+        """Test blocks before a zero-nonce checkpoint"""
+        timeline = NonceTimeline()
+        timeline.add(100, 0)
+
+        assert timeline.lookup(50) == 0
+
+    def test_observe_transaction(self):
+        """Test sent transaction extends neighboring checkpoints"""
+        timeline = NonceTimeline()
+        timeline.add(100, 0)
+        timeline.observe_transaction(nonce=0, block_number=150)
+
+        # Nonce 0 until the block before the tx
+        assert timeline.lookup(149) == 0
+        assert timeline.lookup(120) == 0
+        assert timeline.lookup(150) is None
+
+    def test_checkpoint_limit(self):
+        """Test oldest checkpoints are dropped"""
+        timeline = NonceTimeline(max_checkpoints=3)
+        for block in range(5):
+            timeline.add(block, block)
+
+        assert timeline.blocks == [2, 3, 4]
+
+
+class TestNonceCache:
+    """Test cached nonce lookups"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_check_no_remote_call(self):
+        """Test second check against same intermediate is served from cache"""
+        tracker = NonceTracker()
+        tracker._fetch_nonce_at_block = AsyncMock(return_value=5)
+
+        whale_tx = {'blockNumber': 18000000, 'to': '0xIntermediate'}
+        intermediate_tx = {'nonce': 6, 'from': '0xIntermediate', 'blockNumber': 18000010}
+
+        first = await tracker.check_nonce_sequence(whale_tx, intermediate_tx)
+        second = await tracker.check_nonce_sequence(whale_tx, intermediate_tx)
+
+        assert first.nonce_gap == second.nonce_gap == 1
+        tracker._fetch_nonce_at_block.assert_awaited_once()
+        assert tracker.get_cache_stats()['hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_other_block_inferred_from_exchange_tx(self):
+        """Test later whale tx before the exchange tx needs no remote call"""
+        tracker = NonceTracker()
+        tracker._fetch_nonce_at_block = AsyncMock(return_value=4)
+
+        intermediate_tx = {'nonce': 4, 'from': '0xIntermediate', 'blockNumber': 18000100}
+        await tracker.check_nonce_sequence({'blockNumber': 18000000, 'to': '0xIntermediate'}, intermediate_tx)
+        result = await tracker.check_nonce_sequence({'blockNumber': 18000050, 'to': '0xINTERMEDIATE'}, intermediate_tx)
+
+        assert result.intermediate_nonce_at_whale_block == 4
+        tracker._fetch_nonce_at_block.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_not_cached(self):
+        """Test failed lookups are retried"""
+        tracker = NonceTracker()
+        tracker._fetch_nonce_at_block = AsyncMock(return_value=None)
+
+        assert await tracker._get_nonce_at_block('0xAddress', 100) is None
+        assert await tracker._get_nonce_at_block('0xAddress', 100) is None
+        assert tracker._fetch_nonce_at_block.await_count == 2
+
+    def test_address_lru_eviction(self):
+        """Test least recently used timelines are evicted"""
+        tracker = NonceTracker(max_cached_addresses=2)
+        tracker.record_nonce('0xA', 100, 1)
+        tracker.record_nonce('0xB', 100, 1)
+        tracker.record_nonce('0xA', 200, 1)
+        tracker.record_nonce('0xC', 100, 1)
+
+        assert list(tracker._timelines) == ['0xa', '0xc']
+
+
 class TestConfidenceCalculation:
     """Test confidence score calculation"""
 
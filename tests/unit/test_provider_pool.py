@@ -0,0 +1,277 @@
+"""
+Unit tests for ProviderPool
+===========================
+
+Tests latency-based routing, failover, eviction / re-admission, probing,
+per-provider quotas and hedged requests.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.provider_pool import ProviderPool, ProviderUnavailable, endpoint_name
+from src.core.rate_limiter import AsyncRateLimiter
+
+
+FAST = 'https://fast.example/v3/key'
+SLOW = 'https://slow.example/v3/key'
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProviders:
+    """send() for ProviderPool.request: per-URL delay and failure."""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.calls = []
+
+    async def send(self, endpoint):
+        self.calls.append(endpoint.url)
+        await asyncio.sleep(self.delays.get(endpoint.url, 0))
+        if endpoint.url in self.failing:
+            raise ConnectionError(f"{endpoint.name} down")
+        return endpoint.url
+
+
+class TestRouting:
+    """Test endpoint selection."""
+
+    def test_endpoint_name_hides_api_key(self):
+        """Test names are host (and port) only."""
+        assert endpoint_name('https://mainnet.infura.io/v3/secret') == 'mainnet.infura.io'
+        assert endpoint_name('http://127.0.0.1:8545/') == '127.0.0.1:8545'
+
+    def test_duplicates_and_names(self):
+        """Test duplicate URLs are dropped and same-host endpoints get unique names."""
+        pool = ProviderPool([FAST, FAST, 'https://fast.example/v3/other'])
+
+        assert pool.urls == [FAST, 'https://fast.example/v3/other']
+        assert list(pool.get_stats()['endpoints']) == ['fast.example', 'fast.example#2']
+
+    def test_requires_endpoint(self):
+        """Test an empty pool is rejected."""
+        with pytest.raises(ValueError):
+            ProviderPool([])
+
+    def test_configuration_order_until_measured(self):
+        """Test unmeasured endpoints keep preference order."""
+        pool = ProviderPool([SLOW, FAST])
+
+        assert pool.select().url == SLOW
+
+    def test_routes_to_lowest_latency(self):
+        """Test the endpoint with the lower moving latency wins."""
+        pool = ProviderPool([SLOW, FAST])
+        slow, fast = pool.endpoints
+
+        pool.record_success(slow, 0.8)
+        pool.record_success(fast, 0.05)
+
+        assert pool.select().url == FAST
+        assert [e.url for e in pool.ranked()] == [FAST, SLOW]
+
+    def test_errors_inflate_score(self):
+        """Test a fast but failing endpoint loses to a slower reliable one."""
+        pool = ProviderPool([FAST, SLOW])
+        fast, slow = pool.endpoints
+        pool.record_success(fast, 0.05)
+        pool.record_success(slow, 0.08)
+
+        pool.record_failure(fast, ConnectionError())
+
+        assert pool.select().url == SLOW
+
+    def test_latency_is_smoothed(self):
+        """Test one slow answer moves the EWMA only part of the way."""
+        pool = ProviderPool([FAST], smoothing=0.5)
+        endpoint = pool.endpoints[0]
+
+        pool.record_success(endpoint, 0.1)
+        pool.record_success(endpoint, 0.5)
+
+        assert endpoint.latency == pytest.approx(0.3)
+
+    def test_idle_endpoint_probed(self):
+        """Test an endpoint idle past the probe interval gets the next request."""
+        clock = FakeClock()
+        pool = ProviderPool([FAST, SLOW], probe_interval_seconds=60, clock=clock)
+        fast, slow = pool.endpoints
+        pool.record_success(fast, 0.05)
+        pool.record_success(slow, 0.8)
+
+        fast.last_used = slow.last_used = clock.now
+        assert pool.select().url == FAST
+
+        clock.now += 61
+        fast.last_used = clock.now
+        assert pool.select().url == SLOW
+
+
+class TestEviction:
+    """Test eviction and re-admission."""
+
+    def _pool(self, clock, **kwargs):
+        return ProviderPool(
+            [FAST, SLOW], max_consecutive_failures=2, max_error_rate=1.0,
+            eviction_seconds=30, max_eviction_seconds=100, clock=clock, **kwargs
+        )
+
+    def test_evicted_after_consecutive_failures(self):
+        """Test an endpoint leaves rotation and is re-admitted on probation."""
+        clock = FakeClock()
+        pool = self._pool(clock)
+        fast = pool.endpoints[0]
+
+        pool.record_failure(fast, ConnectionError())
+        assert not fast.is_evicted(clock.now)
+        pool.record_failure(fast, ConnectionError())
+
+        assert fast.is_evicted(clock.now)
+        assert pool.select().url == SLOW
+        assert pool.get_stats()['endpoints']['fast.example']['state'] == 'evicted'
+
+        clock.now += 31
+        assert not fast.is_evicted(clock.now)
+        assert fast.probation
+
+        pool.record_success(fast, 0.05)
+        assert not fast.probation
+        assert pool.get_stats()['endpoints']['fast.example']['state'] == 'healthy'
+
+    def test_probation_failure_backs_off(self):
+        """Test a failure on probation evicts again for twice as long, capped."""
+        clock = FakeClock()
+        pool = self._pool(clock)
+        fast = pool.endpoints[0]
+
+        periods = []
+        pool.record_failure(fast, ConnectionError())
+        pool.record_failure(fast, ConnectionError())
+        for _ in range(3):
+            periods.append(fast.evicted_until - clock.now)
+            clock.now = fast.evicted_until
+            pool.record_failure(fast, ConnectionError())
+        periods.append(fast.evicted_until - clock.now)
+
+        assert periods == [30, 60, 100, 100]
+        assert fast.stats['evictions'] == 4
+
+    def test_evicted_endpoint_is_last_resort(self):
+        """Test requests still go out when every endpoint is evicted."""
+        clock = FakeClock()
+        pool = self._pool(clock)
+        for endpoint in pool.endpoints:
+            pool._evict(endpoint, ConnectionError())
+        pool.endpoints[1].evicted_until -= 10
+
+        assert [e.url for e in pool.ranked()] == [SLOW, FAST]
+
+
+class TestRequests:
+    """Test request routing with failover and hedging."""
+
+    @pytest.mark.asyncio
+    async def test_failover(self):
+        """Test a failed request is retried on the next endpoint."""
+        providers = FakeProviders(failing={SLOW})
+        pool = ProviderPool([SLOW, FAST])
+
+        assert await pool.request(providers.send) == FAST
+        assert providers.calls == [SLOW, FAST]
+        assert pool.stats['failovers'] == 1
+        assert pool.endpoints[0].stats['failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_endpoints_fail(self):
+        """Test ProviderUnavailable chains the last error."""
+        providers = FakeProviders(failing={SLOW, FAST})
+        pool = ProviderPool([SLOW, FAST])
+
+        with pytest.raises(ProviderUnavailable) as exc_info:
+            await pool.request(providers.send)
+
+        assert isinstance(exc_info.value.__cause__, ConnectionError)
+        assert pool.stats['unavailable'] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_attempts(self):
+        """Test max_attempts limits failover."""
+        providers = FakeProviders(failing={SLOW})
+        pool = ProviderPool([SLOW, FAST])
+
+        with pytest.raises(ProviderUnavailable):
+            await pool.request(providers.send, max_attempts=1)
+        assert providers.calls == [SLOW]
+
+    @pytest.mark.asyncio
+    async def test_hedge_takes_first_answer(self):
+        """Test a slow primary is hedged and the faster secondary answers."""
+        providers = FakeProviders(delays={SLOW: 1.0, FAST: 0.0})
+        pool = ProviderPool([SLOW, FAST], hedge_after_seconds=0.02)
+
+        started = asyncio.get_running_loop().time()
+        assert await pool.request(providers.send, hedge=True) == FAST
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert elapsed < 0.5
+        assert providers.calls == [SLOW, FAST]
+        assert pool.stats['hedged'] == 1
+        assert pool.endpoints[1].stats['hedges_won'] == 1
+        # The cancelled primary is not counted as a failure
+        assert pool.endpoints[0].stats['failures'] == 0
+        assert pool.endpoints[0].in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_when_primary_fast(self):
+        """Test a primary answering within the hedge delay is the only request."""
+        providers = FakeProviders()
+        pool = ProviderPool([SLOW, FAST], hedge_after_seconds=0.5)
+
+        assert await pool.request(providers.send, hedge=True) == SLOW
+        assert providers.calls == [SLOW]
+        assert pool.stats['hedged'] == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_survives_failed_primary(self):
+        """Test a hedged request succeeds when the primary fails after the hedge went out."""
+        providers = FakeProviders(delays={SLOW: 0.05, FAST: 0.1}, failing={SLOW})
+        pool = ProviderPool([SLOW, FAST], hedge_after_seconds=0.01)
+
+        assert await pool.request(providers.send, hedge=True) == FAST
+        assert providers.calls == [SLOW, FAST]
+
+
+class TestQuotas:
+    """Test per-provider quotas."""
+
+    def test_quota_matched_by_name_fragment(self):
+        """Test quotas apply only to endpoints whose name contains the key."""
+        limiter = AsyncRateLimiter()
+        pool = ProviderPool([FAST, SLOW], quotas={'slow': 5}, rate_limiter=limiter)
+
+        assert pool._quota_keys == {SLOW: 'provider:slow.example'}
+        assert limiter.available('provider:slow.example') == pytest.approx(5, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_quota_routes_elsewhere(self):
+        """Test a faster endpoint without free tokens is passed over."""
+        providers = FakeProviders()
+        pool = ProviderPool([FAST, SLOW], quotas={'fast': 0.01}, rate_limiter=AsyncRateLimiter())
+        fast, slow = pool.endpoints
+        pool.record_success(fast, 0.01)
+        pool.record_success(slow, 0.5)
+
+        assert await pool.request(providers.send) == FAST
+        assert await pool.request(providers.send) == SLOW
+        assert providers.calls == [FAST, SLOW]
@@ -0,0 +1,118 @@
+"""
+Unit tests for AsyncRateLimiter
+================================
+
+Tests token bucket budgets, burst capacity, fair queuing and wait-time metrics.
+"""
+
+import pytest
+import asyncio
+import time
+
+from src.core.rate_limiter import AsyncRateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    """Test token bucket arithmetic."""
+
+    def test_burst_is_free(self):
+        """Test that the first `burst` reservations need no wait."""
+        bucket = TokenBucket(rate=10, burst=3)
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_reservations_queue_up(self):
+        """Test that reservations beyond burst are spaced by 1/rate."""
+        bucket = TokenBucket(rate=10, burst=1)
+
+        bucket.reserve()
+        second = bucket.reserve()
+        third = bucket.reserve()
+
+        assert second == pytest.approx(0.1, abs=0.01)
+        assert third == pytest.approx(0.2, abs=0.01)
+
+    def test_invalid_budget(self):
+        """Test that non-positive rate or burst is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, burst=1)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestAsyncRateLimiter:
+    """Test AsyncRateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_rate_is_enforced(self):
+        """Test that sustained calls are limited to the configured rate."""
+        limiter = AsyncRateLimiter()
+        limiter.configure('rpc', rate=50, burst=1)
+
+        start = time.monotonic()
+        for _ in range(6):
+            await limiter.acquire('rpc')
+        elapsed = time.monotonic() - start
+
+        # 5 waits of 20ms each
+        assert elapsed >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_endpoints_have_separate_budgets(self):
+        """Test that one endpoint's queue does not delay another endpoint."""
+        limiter = AsyncRateLimiter(default_rate=1, default_burst=1)
+
+        await limiter.acquire('etherscan:ethereum')
+        waited = await limiter.acquire('etherscan:base')
+
+        assert waited == 0.0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_served_in_order(self):
+        """Test fair FIFO queuing for concurrent callers."""
+        limiter = AsyncRateLimiter(default_rate=100, default_burst=1)
+        order = []
+
+        async def caller(i):
+            await limiter.acquire('rpc')
+            order.append(i)
+
+        await asyncio.gather(*(caller(i) for i in range(8)))
+
+        assert order == list(range(8))
+
+    @pytest.mark.asyncio
+    async def test_wait_time_metrics(self):
+        """Test acquired/throttled counters and wait times."""
+        limiter = AsyncRateLimiter(default_rate=20, default_burst=2)
+
+        await asyncio.gather(*(limiter.acquire('rpc') for _ in range(4)))
+        stats = limiter.get_stats('rpc')
+
+        assert stats['acquired'] == 4
+        assert stats['throttled'] == 2
+        assert stats['waiting'] == 0
+        assert stats['max_wait_ms'] == pytest.approx(100, abs=10)
+        assert stats['avg_wait_ms'] > 0
+        assert 'rpc' in limiter.get_stats()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_token(self):
+        """Test that a cancelled caller gives its reservation back."""
+        limiter = AsyncRateLimiter(default_rate=1, default_burst=1)
+        await limiter.acquire('rpc')
+
+        waiter = asyncio.create_task(limiter.acquire('rpc'))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.get_stats('rpc')['waiting'] == 0
+        assert limiter._buckets['rpc'].tokens > -1
+
+    def test_stats_for_unknown_endpoint(self):
+        """Test metrics for an endpoint that was never used."""
+        limiter = AsyncRateLimiter()
+
+        assert limiter.get_stats('unknown')['acquired'] == 0
@@ -0,0 +1,172 @@
+"""
+Unit Tests for Bulk Write Repository
+=====================================
+
+Tests bulk upserts and buffered writers on SQLite.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from sqlalchemy import func, select
+
+from models.database import IntermediateAddress, SignalMetrics, Transaction
+from models.db_connection import DatabaseConfig, AsyncDatabaseManager
+from models.repository import BulkWriter
+
+
+def profile_row(address, profile_type='burner', confidence=80):
+    """intermediate_addresses column values."""
+    return {'address': address, 'profile_type': profile_type, 'overall_confidence': confidence}
+
+
+def tx_row(i):
+    """transactions column values."""
+    return {
+        'tx_hash': f"0x{i:064x}",
+        'block_number': 19000000 + i,
+        'block_timestamp': datetime(2024, 1, 1),
+        'from_address': '0x' + 'a' * 40,
+        'to_address': '0x' + 'b' * 40,
+        'value': 1,
+        'value_wei': str(10**18),
+        'nonce': i
+    }
+
+
+async def fetch_profiles(db_manager):
+    """address -> IntermediateAddress row."""
+    async with db_manager.session() as session:
+        result = await session.execute(select(IntermediateAddress))
+        return {row.address: row for row in result.scalars().all()}
+
+
+class TestBulkUpsert:
+    """Test one-statement upserts."""
+
+    @pytest.mark.asyncio
+    async def test_insert_then_update(self, db_manager):
+        """Test conflicting rows update supplied columns and keep created_at."""
+        await db_manager.repository.upsert(IntermediateAddress, [profile_row('0x1'), profile_row('0x2')])
+        created_at = (await fetch_profiles(db_manager))['0x1'].created_at
+
+        await db_manager.repository.upsert(IntermediateAddress, [profile_row('0x1', 'fresh_burner', 95)])
+        rows = await fetch_profiles(db_manager)
+
+        assert len(rows) == 2
+        assert rows['0x1'].profile_type == 'fresh_burner'
+        assert rows['0x1'].overall_confidence == 95
+        assert rows['0x1'].created_at == created_at
+        assert rows['0x1'].updated_at >= created_at
+        assert rows['0x2'].profile_type == 'burner'
+
+    @pytest.mark.asyncio
+    async def test_do_nothing_returns_new_keys(self, db_manager):
+        """Test update_columns=() skips existing rows and RETURNING lists inserted ones."""
+        repository = db_manager.repository
+        assert await repository.upsert(Transaction, [tx_row(1), tx_row(2)], update_columns=(), returning='tx_hash')
+
+        inserted = await repository.upsert(
+            Transaction, [tx_row(i) for i in range(1, 5)], update_columns=(), returning='tx_hash'
+        )
+
+        assert sorted(inserted) == [tx_row(3)['tx_hash'], tx_row(4)['tx_hash']]
+
+    @pytest.mark.asyncio
+    async def test_rows_without_key_are_plain_inserts(self, db_manager):
+        """Test autoincrement tables take rows without primary key."""
+        rows = [{'signal_name': 'gas', 'date': datetime(2024, 1, d)} for d in range(1, 4)]
+
+        await db_manager.repository.upsert(SignalMetrics, rows)
+
+        async with db_manager.session() as session:
+            assert await session.scalar(select(func.count()).select_from(SignalMetrics)) == 3
+
+
+class TestBulkWriter:
+    """Test buffering, flush triggers and backpressure."""
+
+    @pytest.mark.asyncio
+    async def test_flush_on_batch_size(self, db_manager):
+        """Test a full batch is written without waiting for the timer."""
+        writer = db_manager.repository.writer(IntermediateAddress, batch_size=3, flush_interval_seconds=60)
+
+        await writer.add_many([profile_row(f"0x{i}") for i in range(3)])
+        await writer._flush_task
+
+        assert len(await fetch_profiles(db_manager)) == 3
+        assert writer.get_stats()['flushes'] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_on_interval(self, db_manager):
+        """Test a partial batch is written after flush_interval_seconds."""
+        writer = db_manager.repository.writer(IntermediateAddress, batch_size=100, flush_interval_seconds=0.05)
+
+        await writer.add(profile_row('0x1'))
+        assert len(await fetch_profiles(db_manager)) == 0
+
+        await asyncio.sleep(0.2)
+        assert len(await fetch_profiles(db_manager)) == 1
+
+    @pytest.mark.asyncio
+    async def test_rows_coalesced_by_key(self, db_manager):
+        """Test repeated updates of one key cost one row and merge columns."""
+        writer = db_manager.repository.writer(IntermediateAddress, flush_interval_seconds=60)
+
+        await writer.add(profile_row('0x1', 'burner', 70))
+        await writer.add({'address': '0x1', 'overall_confidence': 90})
+        assert writer.get_pending('0x1')['overall_confidence'] == 90
+
+        assert await writer.flush() == 1
+        row = (await fetch_profiles(db_manager))['0x1']
+        assert (row.profile_type, row.overall_confidence) == ('burner', 90)
+        assert writer.get_stats()['rows_coalesced'] == 1
+
+    @pytest.mark.asyncio
+    async def test_backpressure_waits_for_flush(self, db_manager):
+        """Test add() writes synchronously once max_pending rows are buffered."""
+        writer = BulkWriter(db_manager, IntermediateAddress, batch_size=5, max_pending=5,
+                            flush_interval_seconds=60)
+
+        await writer.add_many([profile_row(f"0x{i}") for i in range(5)])
+
+        assert len(writer) == 0
+        assert writer.get_stats()['backpressure_waits'] == 1
+        assert len(await fetch_profiles(db_manager)) == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeued_and_bounded(self, db_manager):
+        """Test rows survive a failed flush and the buffer never exceeds max_pending."""
+        writer = BulkWriter(db_manager, IntermediateAddress, batch_size=3, max_pending=3,
+                            flush_interval_seconds=60)
+        writer.db_manager = Mock()
+        writer.db_manager.session = Mock(side_effect=Exception("database is locked"))
+
+        await writer.add_many([profile_row(f"0x{i}") for i in range(4)])
+
+        stats = writer.get_stats()
+        assert stats['pending'] <= 3
+        assert stats['rows_dropped'] == 1
+        assert stats['flush_errors'] >= 1
+
+        writer.db_manager = db_manager
+        assert await writer.flush() == 3
+        assert sorted(await fetch_profiles(db_manager)) == ['0x1', '0x2', '0x3']
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_rows(self, tmp_path):
+        """Test AsyncDatabaseManager.close() writes buffered rows (shutdown hook)."""
+        config = DatabaseConfig(db_type='sqlite', sqlite_path=str(tmp_path / 'whales.db'))
+        db_manager = AsyncDatabaseManager(config)
+        await db_manager.create_all_tables()
+        await db_manager.repository.writer(IntermediateAddress, flush_interval_seconds=60).add(profile_row('0x1'))
+
+        await db_manager.close()
+
+        reopened = AsyncDatabaseManager(config)
+        try:
+            assert list(await fetch_profiles(reopened)) == ['0x1']
+        finally:
+            await reopened.close()
@@ -0,0 +1,174 @@
+"""
+Unit Tests for Daily Rollups and Retention
+===========================================
+
+Tests rollup maintenance through TransactionStore, rebuild, partition helpers
+and the retention job on an in-memory SQLite database.
+"""
+
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from models.database import OneHopDetection, Transaction, WhaleAlert, WhaleDailyRollup
+from src.core.whale_config import WhaleConfig
+from src.storage.partitions import PartitionManager, month_start, next_month, partition_name
+from src.storage.rollups import DailyRollups
+from src.storage.transaction_store import TransactionStore
+from tests.conftest import Chain
+
+
+BINANCE = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+WHALE = '0x5a52e96bacdabb82fd05763e25335261b270efcb'
+USER = '0x' + 'a1' * 20
+
+
+@pytest_asyncio.fixture
+async def setup(db_manager):
+    """Store with rollups and partitions on in-memory SQLite."""
+    rollups = DailyRollups(db_manager, WhaleConfig(), whale_addresses=[WHALE], rebuild_page_size=2)
+    partitions = PartitionManager(db_manager, retention_days=30, rollup_retention_days=365, delete_batch_size=2)
+    store = TransactionStore(db_manager, rollups=rollups, partitions=partitions)
+    await store.initialize()
+    return db_manager, store, rollups, partitions, Chain(timestamp=datetime.utcnow())
+
+
+class TestDailyRollups:
+    """Test incremental rollups."""
+
+    @pytest.mark.asyncio
+    async def test_whale_and_exchange_counters(self, setup):
+        """Test outflows, inflows and exchange deposits are summed per day."""
+        _, store, rollups, _, chain = setup
+        await store.add_transactions([
+            chain.tx(WHALE, BINANCE, value=100 * 10**18),
+            chain.tx(WHALE, USER, value=5 * 10**18),
+            chain.tx(USER, WHALE, value=2 * 10**18),
+            chain.tx(USER, BINANCE, value=1 * 10**18)
+        ])
+
+        days = await rollups.get_whale_days(WHALE)
+        assert len(days) == 1
+        assert days[0]['tx_out_count'] == 2
+        assert days[0]['eth_out'] == Decimal(105)
+        assert days[0]['tx_in_count'] == 1
+        assert days[0]['eth_in'] == Decimal(2)
+        assert days[0]['exchange_tx_count'] == 1
+        assert days[0]['exchange_eth'] == Decimal(100)
+
+        exchanges = await rollups.get_exchange_days('Binance')
+        assert len(exchanges) == 1
+        assert exchanges[0]['exchange'] == 'binance'
+        assert exchanges[0]['inflow_tx_count'] == 2
+        assert exchanges[0]['inflow_eth'] == Decimal(101)
+        assert exchanges[0]['whale_inflow_tx_count'] == 1
+        assert exchanges[0]['whale_inflow_eth'] == Decimal(100)
+
+    @pytest.mark.asyncio
+    async def test_duplicates_not_counted_twice(self, setup):
+        """Test re-stored transactions do not increment the rollups again."""
+        _, store, rollups, _, chain = setup
+        txs = [chain.tx(WHALE, BINANCE, value=10 * 10**18)]
+        await store.add_transactions(txs)
+        await store.add_transactions(txs + [chain.tx(WHALE, BINANCE, value=1 * 10**18)])
+
+        days = await rollups.get_whale_days(WHALE)
+        assert days[0]['tx_out_count'] == 2
+        assert days[0]['eth_out'] == Decimal(11)
+        assert rollups.get_stats()['transactions_applied'] == 2
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental(self, setup):
+        """Test rebuild() recomputes the same rows across several pages and days."""
+        db_manager, store, rollups, _, chain = setup
+        today = datetime.utcnow().replace(hour=12)
+        await store.add_transactions([
+            chain.tx(WHALE, BINANCE, value=3 * 10**18, timestamp=today - timedelta(days=1)),
+            chain.tx(WHALE, BINANCE, value=4 * 10**18, timestamp=today - timedelta(days=1)),
+            chain.tx(WHALE, USER, value=1 * 10**18, timestamp=today),
+            chain.tx(USER, WHALE, value=2 * 10**18, timestamp=today),
+            chain.tx(WHALE, BINANCE, value=5 * 10**18, timestamp=today)
+        ])
+        incremental = await rollups.get_whale_days(WHALE, days=7)
+
+        assert await rollups.rebuild(today.date() - timedelta(days=7)) == 5
+        assert await rollups.get_whale_days(WHALE, days=7) == incremental
+        assert [day['tx_out_count'] for day in incremental] == [2, 2]
+
+        async with db_manager.session() as session:
+            count = (await session.execute(select(func.count()).select_from(WhaleDailyRollup))).scalar()
+        assert count == 2
+
+
+class TestPartitions:
+    """Test partition helpers and retention."""
+
+    def test_month_helpers(self):
+        """Test month boundaries and partition names."""
+        assert month_start(datetime(2024, 3, 17, 8, 30)) == datetime(2024, 3, 1)
+        assert next_month(datetime(2024, 12, 1)) == datetime(2025, 1, 1)
+        assert partition_name('transactions', datetime(2024, 1, 1)) == 'transactions_y2024m01'
+
+    @pytest.mark.asyncio
+    async def test_sqlite_not_partitioned(self, setup):
+        """Test partition management is a no-op on SQLite."""
+        _, _, _, partitions, _ = setup
+        assert partitions.partitioned is False
+        assert await partitions.ensure_upcoming() == 0
+        assert await partitions.list_partitions() == []
+
+    @pytest.mark.asyncio
+    async def test_retention_deletes_expired_rows(self, setup):
+        """Test expired transactions, detections, alerts and rollups are removed in batches."""
+        db_manager, store, rollups, partitions, chain = setup
+        now = datetime.utcnow()
+        old = now - timedelta(days=40)
+        ancient = now - timedelta(days=400)
+
+        await store.add_transactions(
+            [chain.tx(WHALE, BINANCE, timestamp=old) for _ in range(5)]
+            + [chain.tx(WHALE, BINANCE, timestamp=ancient)]
+            + [chain.tx(WHALE, BINANCE, timestamp=now)]
+        )
+
+        async with db_manager.session() as session:
+            for timestamp in (old, now):
+                detection = OneHopDetection(
+                    whale_address=WHALE,
+                    whale_tx_hash='0x' + '0' * 64,
+                    intermediate_address=USER,
+                    whale_tx_block=1,
+                    whale_tx_timestamp=timestamp,
+                    whale_amount_wei='1',
+                    whale_amount_eth=Decimal(1),
+                    total_confidence=80
+                )
+                session.add(detection)
+                await session.flush()
+                session.add(WhaleAlert(
+                    detection_id=detection.id,
+                    alert_type='one_hop',
+                    confidence=80,
+                    title='t',
+                    message='m',
+                    delivery_method='telegram'
+                ))
+
+        stats = await partitions.apply_retention(now)
+        assert stats['transactions_deleted'] == 6
+        assert stats['detections_deleted'] == 1
+        assert stats['alerts_deleted'] == 1
+        # Only the 400-day-old whale and exchange rows
+        assert stats['rollups_deleted'] == 2
+
+        async with db_manager.session() as session:
+            remaining = (await session.execute(select(func.count()).select_from(Transaction))).scalar()
+            detections = (await session.execute(select(func.count()).select_from(OneHopDetection))).scalar()
+            alerts = (await session.execute(select(func.count()).select_from(WhaleAlert))).scalar()
+        assert (remaining, detections, alerts) == (1, 1, 1)
+
+        # Rollups outlive raw history
+        assert len(await rollups.get_whale_days(WHALE, days=60)) == 2
@@ -0,0 +1,180 @@
+"""
+Unit Tests for Signal Metrics Aggregator
+=========================================
+
+Tests incremental confusion counts, relabeling, persistence and rebuild on an
+in-memory SQLite database.
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from models.database import OneHopDetection, SignalMetrics
+from src.storage.signal_metrics import SignalCounts, SignalMetricsAggregator
+
+
+WHALE = '0x5a52e96bacdabb82fd05763e25335261b270efcb'
+INTERMEDIATE = '0x' + 'b2' * 20
+
+
+@pytest_asyncio.fixture
+async def setup(db_manager):
+    """Aggregator on in-memory SQLite with a detection factory."""
+    aggregator = SignalMetricsAggregator(db_manager, positive_threshold=50)
+    await aggregator.initialize()
+
+    async def detect(gas=None, nonce=None, total=70, signal_details=None):
+        async with db_manager.session() as session:
+            detection = OneHopDetection(
+                whale_address=WHALE,
+                whale_tx_hash='0x' + '0' * 64,
+                intermediate_address=INTERMEDIATE,
+                whale_tx_block=1,
+                whale_tx_timestamp=datetime(2024, 1, 1, 15, 30),
+                whale_amount_wei='1',
+                whale_amount_eth=Decimal(1),
+                gas_correlation_score=gas,
+                nonce_correlation_score=nonce,
+                total_confidence=total,
+                signal_details=signal_details
+            )
+            session.add(detection)
+            await session.flush()
+            return detection.id
+
+    return db_manager, aggregator, detect
+
+
+class TestSignalCounts:
+    """Test the in-memory counters."""
+
+    def test_add_and_remove(self):
+        """Test confusion cells, histogram buckets and exact removal."""
+        counts = SignalCounts()
+        counts.add(90, True, 'confirmed')
+        counts.add(80, True, 'false_positive')
+        counts.add(20, False, 'confirmed')
+        counts.add(100, True, 'confirmed')
+
+        assert (counts.true_positives, counts.false_positives, counts.false_negatives) == (2, 1, 1)
+        assert counts.precision == pytest.approx(2 / 3)
+        assert counts.recall == pytest.approx(2 / 3)
+        assert counts.histogram['confirmed'][9] == 2
+        assert counts.histogram['confirmed'][2] == 1
+
+        counts.add(100, True, 'confirmed', sign=-1)
+        counts.add(20, False, 'confirmed', sign=-1)
+        assert counts.recall == 1.0
+        assert counts.to_dict()['avg_confidence_overall'] == 85
+
+
+class TestSignalMetricsAggregator:
+    """Test outcome recording."""
+
+    @pytest.mark.asyncio
+    async def test_outcomes_update_metrics(self, setup):
+        """Test confirmed / false positive labels move the per-signal counts."""
+        db_manager, aggregator, detect = setup
+        first = await detect(gas=90, nonce=95)
+        second = await detect(gas=85, nonce=10)
+        third = await detect(gas=20, signal_details={'profile': {'confidence': 70}})
+
+        assert await aggregator.record_outcome(first, 'confirmed')
+        assert await aggregator.record_outcome(second, 'false_positive')
+        assert await aggregator.record_outcome(third, 'confirmed')
+
+        gas = aggregator.get_metrics('gas')
+        assert (gas['true_positives'], gas['false_positives'], gas['false_negatives']) == (1, 1, 1)
+        assert gas['precision'] == 0.5
+        assert gas['recall'] == 0.5
+
+        nonce = aggregator.get_metrics('nonce')
+        assert (nonce['true_positives'], nonce['true_negatives']) == (1, 1)
+        assert nonce['precision'] == 1.0
+
+        assert aggregator.get_metrics('address')['true_positives'] == 1
+        assert aggregator.get_metrics('composite')['total_checks'] == 3
+
+        async with db_manager.session() as session:
+            detection = await session.get(OneHopDetection, second)
+            assert detection.status == 'false_positive'
+            row = (await session.execute(
+                select(SignalMetrics).where(SignalMetrics.signal_name == 'gas')
+            )).scalar_one()
+        assert row.date == datetime(2024, 1, 1)
+        assert row.precision == Decimal('0.5')
+        assert row.confidence_histogram['confirmed'][9] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_outcomes(self, setup):
+        """Test concurrent labels of one signal-day (and of one detection) all count exactly once."""
+        db_manager, aggregator, detect = setup
+        ids = [await detect(gas=90) for _ in range(5)]
+
+        results = await asyncio.gather(
+            *(aggregator.record_outcome(detection_id, 'confirmed') for detection_id in ids),
+            aggregator.record_outcome(ids[0], 'confirmed')
+        )
+
+        assert all(results)
+        assert aggregator.get_metrics('gas')['true_positives'] == 5
+        async with db_manager.session() as session:
+            row = (await session.execute(
+                select(SignalMetrics).where(SignalMetrics.signal_name == 'gas')
+            )).scalar_one()
+        assert row.true_positives == 5
+
+        # Persisted rows and in-memory totals agree
+        await aggregator.initialize()
+        assert aggregator.get_metrics('gas')['true_positives'] == 5
+
+    @pytest.mark.asyncio
+    async def test_relabel_and_reload(self, setup):
+        """Test relabeling removes the old contribution and totals survive a reload."""
+        db_manager, aggregator, detect = setup
+        detection_id = await detect(gas=90)
+
+        await aggregator.record_outcome(detection_id, 'confirmed')
+        await aggregator.record_outcome(detection_id, 'confirmed')
+        await aggregator.record_outcome(detection_id, 'false_positive')
+
+        gas = aggregator.get_metrics('gas')
+        assert (gas['total_checks'], gas['true_positives'], gas['false_positives']) == (1, 0, 1)
+
+        restarted = SignalMetricsAggregator(db_manager)
+        await restarted.initialize()
+        assert restarted.get_metrics('gas') == gas
+
+        await restarted.record_outcome(detection_id, 'pending')
+        assert restarted.get_metrics('gas')['total_checks'] == 0
+
+    @pytest.mark.asyncio
+    async def test_rebuild_and_unknown_inputs(self, setup):
+        """Test rebuild() matches incremental state; bad ids and statuses are rejected."""
+        db_manager, aggregator, detect = setup
+        for gas, status in ((90, 'confirmed'), (60, 'false_positive'), (10, 'confirmed')):
+            await aggregator.record_outcome(await detect(gas=gas), status)
+        incremental = aggregator.get_all_metrics()
+
+        assert await aggregator.rebuild() == 3
+        assert aggregator.get_all_metrics() == incremental
+
+        assert await aggregator.record_outcome(999, 'confirmed') is False
+        assert await aggregator.record_outcome(1, 'maybe') is False
+
+    @pytest.mark.asyncio
+    async def test_suggest_weights(self, setup):
+        """Test weights follow precision once enough labels exist."""
+        _, aggregator, detect = setup
+        for status in ('confirmed', 'confirmed', 'false_positive', 'false_positive'):
+            await aggregator.record_outcome(await detect(gas=90, nonce=90 if status == 'confirmed' else 10), status)
+
+        weights = aggregator.suggest_weights(min_checks=4, signals=['gas', 'nonce', 'time'])
+        assert weights['nonce'] > weights['gas']
+        assert weights['time'] == 1.0
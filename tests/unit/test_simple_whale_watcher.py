@@ -6,6 +6,8 @@ Tests for MVP whale monitoring engine.
 """
 
 import pytest
+import asyncio
+import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock, AsyncMock, MagicMock
 from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
@@ -13,6 +15,10 @@ from src.core.web3_manager import Web3Manager
 from src.core.whale_config import WhaleConfig, WhaleMetadata, WhaleCategory
 from src.analyzers.whale_analyzer import WhaleAnalyzer, AnomalyResult
 from src.notifications.telegram_notifier import TelegramNotifier
+from src.core.instrumentation import Instrumentation
+from src.analyzers.nonce_tracker import NonceTracker
+from src.analyzers.address_profiler import AddressProfiler
+from tests.conftest import make_tx
 
 
 @pytest.fixture
@@ -40,6 +46,14 @@ def mock_whale_config():
     )
     config.get_metadata = Mock(return_value=exchange_metadata)
 
+    # One-hop intermediates are unknown addresses
+    config.classify_transaction_destination = Mock(return_value={
+        'is_known': False,
+        'category': WhaleCategory.UNKNOWN,
+        'name': 'Unknown Address',
+        'is_dump_risk': False
+    })
+
     return config
 
 
@@ -334,6 +348,215 @@ class TestSimpleOneHopDetection:
         assert result is None
 
 
+class TestAdvancedOneHop:
+    """Test concurrent signal evaluation in advanced one-hop detection."""
+
+    INTERMEDIATE = '0x9f8c163cba728e99993abe7495f06c0a3c8ac8b9'
+
+    def make_analyzers(self, watcher, nonce=95, profile=95, gas=0, nonce_delay=0.0, profile_delay=0.0):
+        """Attach mocked analyzers with given confidences and latencies."""
+        calls = {'nonce_done': False, 'profile_done': False}
+
+        async def check_nonce_sequence(whale_tx, int_tx):
+            await asyncio.sleep(nonce_delay)
+            calls['nonce_done'] = True
+            return Mock(match=nonce > 0, confidence=nonce, nonce_gap=1,
+                        signal_strength='VERY_STRONG', details='')
+
+        async def profile_address(address, block, timestamp):
+            await asyncio.sleep(profile_delay)
+            calls['profile_done'] = True
+            return Mock(profile_type='burner', overall_confidence=profile, is_fresh=True,
+                        is_single_use=True, is_reused=False, details='')
+
+        watcher.nonce_tracker = Mock()
+        watcher.nonce_tracker.check_nonce_sequence = check_nonce_sequence
+        watcher.address_profiler = Mock()
+        watcher.address_profiler.profile_address = profile_address
+        watcher.gas_correlator = Mock()
+        watcher.gas_correlator.check_gas_correlation = Mock(return_value=Mock(
+            match=gas > 0, confidence=gas, correlation_type='exact', details=''
+        ))
+        watcher.whale_config.is_exchange = Mock(return_value=True)
+        return calls
+
+    def make_txs(self, delay_minutes):
+        """Whale -> intermediate and intermediate -> exchange transactions."""
+        whale_time = datetime.now() - timedelta(hours=1)
+        whale_tx = {
+            'to': self.INTERMEDIATE,
+            'value': 100 * 10**18,
+            'hash': '0xwhaletx',
+            'blockNumber': 19000000,
+            'timestamp': whale_time
+        }
+        int_tx = {
+            'to': '0xexchange',
+            'hash': '0xinttx',
+            'timestamp': whale_time + timedelta(minutes=delay_minutes)
+        }
+        return whale_tx, int_tx
+
+    @pytest.mark.asyncio
+    async def test_signals_run_concurrently(self, watcher):
+        """Test nonce and profile latencies overlap instead of adding up."""
+        self.make_analyzers(watcher, nonce_delay=0.2, profile_delay=0.2)
+        whale_tx, int_tx = self.make_txs(delay_minutes=10)
+
+        start = time.perf_counter()
+        alert = await watcher._check_advanced_one_hop('0xwhale1', whale_tx, intermediate_txs=[int_tx])
+        elapsed = time.perf_counter() - start
+
+        assert alert is not None
+        assert alert['confidence'] == 80  # (50 + 95 + 95) / 3
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_signal_spans_nest_under_one_hop(self, watcher):
+        """Test signal evaluation is recorded under the one-hop span."""
+        watcher.instrumentation = Instrumentation()
+        self.make_analyzers(watcher)
+        whale_tx, int_tx = self.make_txs(delay_minutes=10)
+
+        await watcher._check_advanced_one_hop('0xwhale1', whale_tx, intermediate_txs=[int_tx])
+
+        spans = watcher.instrumentation.get_stats()['spans']
+        assert {'one_hop', 'one_hop/signal.gas', 'one_hop/signal.nonce', 'one_hop/signal.profile'} <= set(spans)
+
+    @pytest.mark.asyncio
+    async def test_early_reject_cancels_slow_signal(self, watcher):
+        """Test candidate is dropped once threshold is unreachable."""
+        calls = self.make_analyzers(watcher, nonce=0, profile=95, profile_delay=5.0)
+        whale_tx, int_tx = self.make_txs(delay_minutes=90)  # time signal 10%
+
+        alert = await asyncio.wait_for(
+            watcher._check_advanced_one_hop('0xwhale1', whale_tx, intermediate_txs=[int_tx]),
+            timeout=1.0
+        )
+
+        assert alert is None
+        assert calls['profile_done'] is False
+
+    @pytest.mark.asyncio
+    async def test_early_accept_skips_slow_signal(self, watcher):
+        """Test alert is sent once threshold can't be missed anymore."""
+        calls = self.make_analyzers(watcher, gas=95, nonce=95, profile_delay=5.0)
+        whale_tx, int_tx = self.make_txs(delay_minutes=10)
+
+        alert = await asyncio.wait_for(
+            watcher._check_advanced_one_hop('0xwhale1', whale_tx, intermediate_txs=[int_tx]),
+            timeout=1.0
+        )
+
+        assert alert is not None
+        assert alert['signals']['profile']['confidence'] == 0
+        assert calls['profile_done'] is False
+        watcher.notifier.send_whale_onehop_alert.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_labeled_deposit_skips_one_hop(self, watcher, tmp_path):
+        """Test addresses from a loaded label file are classified by the watcher's own config."""
+        path = tmp_path / 'labels.csv'
+        path.write_text(f'address,name,tags\n{self.INTERMEDIATE},Binance Deposit,binance|deposit\n')
+        watcher.whale_config = WhaleConfig()
+        watcher.whale_config.load_labels(str(path))
+        self.make_analyzers(watcher)
+        watcher.address_profiler.profile_address = AsyncMock()
+        watcher._get_recent_transactions = AsyncMock(return_value=[])
+        whale_tx, _ = self.make_txs(delay_minutes=10)
+
+        assert await watcher._check_advanced_one_hop('0xwhale1', whale_tx) is None
+        assert await watcher._check_simple_one_hop('0xwhale1', whale_tx) is None
+
+        watcher.address_profiler.profile_address.assert_not_awaited()
+        watcher._get_recent_transactions.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_small_amount_skips_signals(self, watcher):
+        """Test no signal is evaluated below the alert amount."""
+        calls = self.make_analyzers(watcher)
+        whale_tx, int_tx = self.make_txs(delay_minutes=10)
+        whale_tx['value'] = 10**18  # $3,500
+
+        alert = await watcher._check_advanced_one_hop('0xwhale1', whale_tx, intermediate_txs=[int_tx])
+
+        assert alert is None
+        assert calls['nonce_done'] is False
+
+    def attach_slow_analyzers(self, watcher, nonce_delay, profile_delay):
+        """Real NonceTracker / AddressProfiler over Web3Manager mocks with slow RPC reads; returns call intervals."""
+        intervals = {'nonce': [], 'profile': []}
+
+        def slow_web3_manager(signal, delay, value):
+            async def call(*args, **kwargs):
+                started = time.perf_counter()
+                await asyncio.sleep(delay)
+                intervals[signal].append((started, time.perf_counter()))
+                return value
+
+            manager = AsyncMock()
+            manager.get_transaction_count.side_effect = call
+            manager.get_balance_wei.side_effect = call
+            return manager
+
+        watcher.nonce_tracker = NonceTracker(web3_manager=slow_web3_manager('nonce', nonce_delay, 5))
+        watcher.address_profiler = AddressProfiler(web3_manager=slow_web3_manager('profile', profile_delay, 1))
+        watcher.gas_correlator = None
+        watcher.whale_config.is_exchange = Mock(return_value=True)
+        return intervals
+
+    @pytest.mark.asyncio
+    async def test_slow_rpc_signals_overlap(self, watcher):
+        """Test RPC-backed nonce and profile signals run in parallel, not one after the other."""
+        intervals = self.attach_slow_analyzers(watcher, nonce_delay=0.4, profile_delay=0.4)
+        whale_tx, int_tx = self.make_txs(delay_minutes=10)
+        int_tx['nonce'] = 6
+
+        start = time.perf_counter()
+        alert = await watcher._check_advanced_one_hop('0xwhale1', whale_tx, intermediate_txs=[int_tx])
+        elapsed = time.perf_counter() - start
+
+        assert alert is not None
+        (nonce_start, nonce_end), = intervals['nonce']
+        profile_start, profile_end = intervals['profile'][0]
+        assert profile_start < nonce_end and nonce_start < profile_end
+        assert elapsed < 0.7  # one after the other: >= 0.8s
+
+    @pytest.mark.asyncio
+    async def test_slow_rpc_signals_time_out(self, watcher):
+        """Test the per-signal budget cuts off RPC reads that are still running."""
+        watcher.signal_timeout_seconds = 0.1
+        self.attach_slow_analyzers(watcher, nonce_delay=0.5, profile_delay=0.5)
+        whale_tx, int_tx = self.make_txs(delay_minutes=10)
+        int_tx['nonce'] = 6
+
+        start = time.perf_counter()
+        alert = await watcher._check_advanced_one_hop('0xwhale1', whale_tx, intermediate_txs=[int_tx])
+        elapsed = time.perf_counter() - start
+
+        assert alert is None  # Time signal alone stays below the threshold
+        assert elapsed < 0.4
+
+    @pytest.mark.asyncio
+    async def test_signal_timeout(self, watcher):
+        """Test a slow signal counts as no signal."""
+        watcher.signal_timeout_seconds = 0.05
+
+        result = await watcher._run_signal('nonce', asyncio.sleep(1.0))
+
+        assert result['confidence'] == 0
+        assert result['details'] == 'Timed out'
+
+    def test_confidence_bounds(self):
+        """Test bounds over pending signals that may or may not fire."""
+        bounds = SimpleWhaleWatcher._confidence_bounds
+
+        assert bounds([50, 0], [(40, 95), (70, 95)]) == (45, 80)
+        assert bounds([10, 0], [(70, 95)]) == (10, 52)
+        assert bounds([50, 95, 95], [(70, 95)]) == (77, 83)
+        assert bounds([], []) == (0, 0)
+
+
 class TestAlertCooldown:
     """Test alert cooldown management."""
 
@@ -389,6 +612,202 @@ class TestMonitorAllWhales:
         assert 'timestamp' in result
 
 
+class TestConcurrentSweep:
+    """Test concurrent monitor_all_whales sweep."""
+
+    @pytest.fixture
+    def concurrent_watcher(self, mock_web3_manager, mock_whale_config, mock_analyzer, mock_notifier, mock_settings):
+        """Create watcher with concurrent sweep enabled."""
+        return SimpleWhaleWatcher(
+            web3_manager=mock_web3_manager,
+            whale_config=mock_whale_config,
+            analyzer=mock_analyzer,
+            notifier=mock_notifier,
+            settings=mock_settings,
+            max_concurrent_checks=3,
+            check_timeout_seconds=0.2,
+            cycle_deadline_seconds=1.0
+        )
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, concurrent_watcher, mock_web3_manager, mock_settings):
+        """Test results come back in WHALE_ADDRESSES order even if checks finish out of order."""
+        mock_settings.WHALE_ADDRESSES = ['0xslow', '0xmedium', '0xfast']
+        delays = {'0xslow': 0.05, '0xmedium': 0.02, '0xfast': 0.0}
+
+        async def get_balance(address):
+            await asyncio.sleep(delays[address])
+            return 1000.0
+
+        mock_web3_manager.get_balance.side_effect = get_balance
+
+        result = await concurrent_watcher.monitor_all_whales()
+
+        assert result['status'] == 'completed'
+        assert [r['whale_address'] for r in result['results']] == ['0xslow', '0xmedium', '0xfast']
+        assert all(r['latency_ms'] is not None for r in result['results'])
+        assert result['max_latency_ms'] >= result['avg_latency_ms'] > 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_respected(self, concurrent_watcher, mock_web3_manager, mock_settings):
+        """Test no more than max_concurrent_checks whales are checked at once."""
+        mock_settings.WHALE_ADDRESSES = [f'0xwhale{i}' for i in range(10)]
+        in_flight = 0
+        peak = 0
+
+        async def get_balance(address):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 1000.0
+
+        mock_web3_manager.get_balance.side_effect = get_balance
+
+        result = await concurrent_watcher.monitor_all_whales()
+
+        assert result['whales_checked'] == 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_restores_balance(self, concurrent_watcher, mock_web3_manager, mock_settings):
+        """Test a timed-out check does not lose the previous balance."""
+        mock_settings.WHALE_ADDRESSES = ['0xwhale1']
+        concurrent_watcher.last_balances['0xwhale1'] = 1000.0
+
+        async def get_balance(address):
+            return 500.0
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+            return []
+
+        mock_web3_manager.get_balance.side_effect = get_balance
+        concurrent_watcher._get_recent_transactions = hang
+
+        result = await concurrent_watcher.monitor_all_whales()
+
+        assert result['timeouts'] == 1
+        assert result['results'][0]['status'] == 'timeout'
+        assert concurrent_watcher.last_balances['0xwhale1'] == 1000.0
+
+    @pytest.mark.asyncio
+    async def test_cycle_deadline_cancels_pending(self, concurrent_watcher, mock_web3_manager, mock_settings):
+        """Test whales unfinished at the cycle deadline are reported, not awaited."""
+        mock_settings.WHALE_ADDRESSES = ['0xwhale1', '0xwhale2']
+        concurrent_watcher.check_timeout_seconds = None
+        concurrent_watcher.cycle_deadline_seconds = 0.05
+
+        async def get_balance(address):
+            if address == '0xwhale2':
+                await asyncio.sleep(10)
+            return 1000.0
+
+        mock_web3_manager.get_balance.side_effect = get_balance
+
+        result = await concurrent_watcher.monitor_all_whales()
+
+        assert result['status'] == 'deadline_exceeded'
+        assert result['deadline_exceeded'] == 1
+        assert result['results'][0]['status'] == 'initialized'
+        assert result['results'][1]['status'] == 'deadline_exceeded'
+        assert '0xwhale2' not in concurrent_watcher.last_balances
+
+    @pytest.mark.asyncio
+    async def test_duplicate_whale_checks_serialized(self, concurrent_watcher, mock_web3_manager, mock_settings):
+        """Test the same whale listed twice is never checked concurrently."""
+        mock_settings.WHALE_ADDRESSES = ['0xwhale1', '0xwhale1']
+        in_flight = 0
+        peak = 0
+
+        async def get_balance(address):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 1000.0
+
+        mock_web3_manager.get_balance.side_effect = get_balance
+
+        result = await concurrent_watcher.monitor_all_whales()
+
+        assert peak == 1
+        assert [r['status'] for r in result['results']] == ['initialized', 'no_significant_change']
+
+
+class TestBalancePrefetch:
+    """Test batched balance prefetch in the sweep."""
+
+    @pytest.mark.asyncio
+    async def test_check_whale_uses_prefetched_balance(self, watcher, mock_web3_manager):
+        """Test check_whale skips the RPC call when a balance is supplied."""
+        result = await watcher.check_whale("0xwhale1", balance=42.0)
+
+        assert result['status'] == 'initialized'
+        assert result['balance'] == 42.0
+        assert not mock_web3_manager.get_balance.called
+
+    @pytest.mark.asyncio
+    async def test_monitor_all_whales_prefetches_balances(
+        self, mock_web3_manager, mock_whale_config, mock_analyzer, mock_notifier, mock_settings
+    ):
+        """Test sweep fetches every balance in one batch call."""
+        mock_settings.WHALE_ADDRESSES = ['0xwhale1', '0xwhale2']
+        mock_web3_manager.get_balances_batch = AsyncMock(
+            return_value={'0xwhale1': 10.0, '0xwhale2': None}
+        )
+        watcher = SimpleWhaleWatcher(
+            web3_manager=mock_web3_manager,
+            whale_config=mock_whale_config,
+            analyzer=mock_analyzer,
+            notifier=mock_notifier,
+            settings=mock_settings,
+            prefetch_balances=True
+        )
+
+        result = await watcher.monitor_all_whales()
+
+        mock_web3_manager.get_balances_batch.assert_awaited_once_with(['0xwhale1', '0xwhale2'])
+        assert result['results'][0]['balance'] == 10.0
+        # Failed batch entry falls back to the single-address call
+        mock_web3_manager.get_balance.assert_awaited_once_with('0xwhale2')
+
+    @pytest.mark.asyncio
+    async def test_slow_prefetch_counts_against_cycle_deadline(
+        self, mock_web3_manager, mock_whale_config, mock_analyzer, mock_notifier, mock_settings
+    ):
+        """Test a hanging batch prefetch is cut at the cycle deadline and the checks get no extra time."""
+        mock_settings.WHALE_ADDRESSES = ['0xwhale1', '0xwhale2']
+
+        async def get_balances_batch(addresses):
+            await asyncio.sleep(10)
+
+        async def get_balance(address):
+            await asyncio.sleep(10)
+
+        mock_web3_manager.get_balances_batch = AsyncMock(side_effect=get_balances_batch)
+        mock_web3_manager.get_balance.side_effect = get_balance
+        watcher = SimpleWhaleWatcher(
+            web3_manager=mock_web3_manager,
+            whale_config=mock_whale_config,
+            analyzer=mock_analyzer,
+            notifier=mock_notifier,
+            settings=mock_settings,
+            prefetch_balances=True,
+            cycle_deadline_seconds=0.2
+        )
+
+        started = time.perf_counter()
+        result = await watcher.monitor_all_whales()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.35
+        assert result['status'] == 'deadline_exceeded'
+        assert result['deadline_exceeded'] == 2
+
+
 class TestIntegration:
     """Integration tests with real (non-mocked) components."""
 
@@ -402,3 +821,55 @@ class TestIntegration:
         assert watcher.analyzer is not None
         assert watcher.notifier is not None
         assert watcher.settings is not None
+
+
+class TestCheckedBlocks:
+    """Test stored transfers are evaluated once across balance drops."""
+
+    WHALE = '0x5a52e96bacdabb82fd05763e25335261b270efcb'
+    EXCHANGE = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+
+    @pytest.mark.asyncio
+    async def test_later_drop_skips_evaluated_transfers(
+        self, mock_web3_manager, mock_whale_config, mock_analyzer, mock_notifier, mock_settings, db_manager
+    ):
+        """Test a second drop after the cooldown doesn't re-alert on the same stored dump."""
+        from src.storage.transaction_store import TransactionStore
+
+        store = TransactionStore(db_manager)
+        await store.initialize()
+        mock_settings.whale_monitoring.intervals.alert_cooldown_minutes = 0
+        mock_whale_config.is_exchange = Mock(return_value=True)
+        watcher = SimpleWhaleWatcher(
+            web3_manager=mock_web3_manager,
+            whale_config=mock_whale_config,
+            analyzer=mock_analyzer,
+            notifier=mock_notifier,
+            settings=mock_settings,
+            transaction_store=store
+        )
+        await watcher.check_whale(self.WHALE, balance=1000.0)
+        await store.add_transactions([make_tx(1, self.WHALE, self.EXCHANGE, block=100, value=100 * 10**18)])
+
+        first = await watcher.check_whale(self.WHALE, balance=900.0)
+        second = await watcher.check_whale(self.WHALE, balance=800.0)
+
+        assert len(first['alerts']) == 1
+        assert second['status'] == 'checked'
+        assert watcher.last_checked_blocks[self.WHALE] == 100
+
+        # A new dump in a later block is still found
+        await store.add_transactions([make_tx(2, self.WHALE, self.EXCHANGE, block=101, value=100 * 10**18)])
+        third = await watcher.check_whale(self.WHALE, balance=700.0)
+
+        assert [a['tx_hash'] for a in third['alerts']] == [f"0x{2:064x}"]
+        assert mock_notifier.send_whale_direct_transfer_alert.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_mark_checked_keeps_highest_block(self, watcher):
+        """Test the per-whale block only moves forward."""
+        watcher.mark_checked('0xwhale1', 120)
+        watcher.mark_checked('0xwhale1', 110)
+        watcher.mark_checked('0xwhale1', None)
+
+        assert watcher.last_checked_blocks == {'0xwhale1': 120}
@@ -0,0 +1,153 @@
+"""
+Unit Tests for Split Dump Detector
+===================================
+
+Tests exchange-inflow aggregation per whale outflow, the share threshold,
+taint propagation limits, and bounded / expiring state.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from src.analyzers.split_dump import SplitDumpDetector
+
+
+WHALE = '0x' + 'aa' * 20
+EXCHANGES = {'0x' + 'e1' * 20, '0x' + 'e2' * 20}
+EX1, EX2 = sorted(EXCHANGES)
+WHALES = {WHALE: WHALE}
+T0 = datetime(2024, 1, 1, 12, 0)
+
+
+def addr(i: int) -> str:
+    return f"0x{i:040x}"
+
+
+def tx(sender, recipient, eth, minutes, i=0):
+    return {
+        'hash': f"0x{i:064x}",
+        'from': sender,
+        'to': recipient,
+        'value': int(eth * 10**18),
+        'timestamp': T0 + timedelta(minutes=minutes)
+    }
+
+
+@pytest.fixture
+def detector():
+    return SplitDumpDetector(share_threshold=0.6, min_intermediates=2, group_window_minutes=30)
+
+
+def feed(detector, transactions):
+    flagged = []
+    for t in transactions:
+        flagged.extend(detector.observe_block([t], WHALES, EXCHANGES))
+    return flagged
+
+
+class TestAggregation:
+    """Test running sums and the threshold."""
+
+    def test_split_outflow_flagged_at_share(self, detector):
+        """Test 4 x 250 ETH split, flagged once 600 ETH reached two exchanges."""
+        transactions = [tx(WHALE, addr(i), 250, i, i) for i in range(4)]
+        transactions += [
+            tx(addr(0), EX1, 249, 20, 10),
+            tx(addr(1), EX2, 249, 25, 11),
+        ]
+        assert feed(detector, transactions) == []
+
+        flagged = feed(detector, [tx(addr(2), EX1, 200, 30, 12)])
+
+        assert len(flagged) == 1
+        episode = flagged[0]
+        assert episode.amount_eth == 1000
+        assert episode.exchange_amount_eth == pytest.approx(698)
+        assert set(episode.exchanges) == EXCHANGES
+        assert len(episode.intermediates) == 3
+        assert episode.outflow_hashes[0] == f"0x{0:064x}"
+
+        # Flagged once; later inflows keep the sum running
+        assert feed(detector, [tx(addr(3), EX2, 250, 35, 13)]) == []
+        assert episode.exchange_amount_eth == pytest.approx(948)
+
+    def test_single_path_and_unrelated_funds(self, detector):
+        """Test one delivering address is not a split; inflows beyond the traced amount don't count."""
+        feed(detector, [tx(WHALE, addr(1), 100, 0, 1), tx(WHALE, addr(2), 100, 1, 2)])
+        # addr(1) forwards far more than it received from the whale
+        assert feed(detector, [tx(addr(1), EX1, 5000, 10, 3)]) == []
+
+        episode = next(iter(detector.episodes.values()))
+        assert episode.exchange_amount_eth == 100
+        assert episode.share == 0.5
+
+        flagged = feed(detector, [tx(addr(2), EX2, 50, 12, 4)])
+        assert [e.share for e in flagged] == [0.75]
+
+    def test_second_level_split_and_dust(self, detector):
+        """Test taint follows forwards up to max_depth and ignores dust."""
+        feed(detector, [
+            tx(WHALE, addr(1), 1000, 0, 1),
+            tx(addr(1), addr(9), 0.5, 4, 4),  # dust: not followed
+            tx(addr(1), addr(2), 500, 5, 2),
+            tx(addr(1), addr(3), 500, 6, 3),
+            tx(addr(2), addr(4), 500, 7, 5),  # third hop below the whale: not followed
+        ])
+        assert addr(9) not in detector.tainted
+        assert addr(4) not in detector.tainted
+        assert addr(1) not in detector.tainted  # everything it received was forwarded
+
+        assert feed(detector, [tx(addr(3), EX1, 500, 10, 6)]) == []
+        flagged = feed(detector, [tx(addr(2), EX2, 300, 11, 7)])
+        assert [e.exchange_amount_eth for e in flagged] == [800]
+        assert set(flagged[0].intermediates) == {addr(2), addr(3)}
+
+
+class TestBoundedState:
+    """Test expiry and caps."""
+
+    def test_window_expiry(self, detector):
+        """Test episodes and taint older than the window are dropped."""
+        feed(detector, [tx(WHALE, addr(1), 100, 0, 1), tx(WHALE, addr(2), 100, 1, 2)])
+        assert len(detector.tainted) == 2
+
+        feed(detector, [tx(addr(8), addr(9), 1, 7 * 60, 3)])
+
+        assert detector.episodes == {}
+        assert detector.tainted == {}
+        assert detector.get_stats()['episodes_expired'] == 1
+
+    def test_caps(self):
+        """Test episode, address and per-address source caps under high volume."""
+        detector = SplitDumpDetector(
+            group_window_minutes=0, max_episodes=10, max_tainted=50, max_sources_per_address=2
+        )
+        for i in range(1000):
+            detector.observe(tx(WHALE, addr(i % 200), 10, i * 0.001, i), whale_address=WHALE)
+
+        stats = detector.get_stats()
+        assert stats['episodes'] == 10
+        assert stats['tainted_addresses'] == 50
+        assert all(len(sources) <= 2 for sources, _ in detector.tainted.values())
+
+    def test_episode_collections_capped(self):
+        """Test a many-way split keeps counts and sums but bounded hashes and addresses."""
+        detector = SplitDumpDetector(
+            group_window_minutes=60, min_intermediates=2, hash_sample_size=3, max_addresses_per_episode=4
+        )
+        n = 50
+        feed(detector, [tx(WHALE, addr(i), 10, i * 0.1, i) for i in range(n)])
+        feed(detector, [tx(addr(i), EX1, 10, 10 + i * 0.1, 1000 + i) for i in range(n)])
+
+        episode = next(iter(detector.episodes.values()))
+        assert episode.amount_eth == 10 * n
+        assert episode.exchange_amount_eth == pytest.approx(10 * n)
+        assert episode.outflow_hashes.count == n
+        assert list(episode.outflow_hashes) == [f"0x{i:064x}" for i in (0, 1, 2, n - 3, n - 2, n - 1)]
+        assert episode.outflow_hashes.omitted == n - 6
+        assert len(episode.recipients) == 6
+        assert episode.exchange_tx_hashes.count == n
+        assert len(episode.exchange_tx_hashes) == 6
+        assert len(episode.intermediates) == 4
+        assert sum(episode.intermediates.values()) + episode.other_intermediates_eth == pytest.approx(10 * n)
+        assert episode.to_dict()['exchange_tx_count'] == n
@@ -0,0 +1,150 @@
+"""
+Unit Tests for State Store
+===========================
+
+Tests persisted watcher state on an in-memory SQLite database.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+from src.storage.state_store import StateStore
+from src.monitors.simple_whale_watcher import SimpleWhaleWatcher
+from src.notifications.telegram_notifier import AlertManager
+
+
+class TestStateStore:
+    """Test write-behind persistence."""
+
+    @pytest.mark.asyncio
+    async def test_values_survive_restart(self, db_manager):
+        """Test flushed values are loaded by a new store."""
+        store = StateStore(db_manager)
+        balances = await store.load('last_balances')
+        alerts = await store.load('last_alerts')
+        alert_time = datetime(2024, 1, 1, 12, 30)
+
+        balances['0xwhale1'] = 1234.5
+        alerts['0xwhale1'] = alert_time
+        await store.flush()
+
+        restarted = StateStore(db_manager)
+        assert dict(await restarted.load('last_balances')) == {'0xwhale1': 1234.5}
+        assert (await restarted.load('last_alerts'))['0xwhale1'] == alert_time
+
+    @pytest.mark.asyncio
+    async def test_writes_are_deferred_and_coalesced(self, db_manager):
+        """Test nothing is written before flush and repeated updates cost one row."""
+        store = StateStore(db_manager)
+        balances = await store.load('last_balances')
+
+        for i in range(10):
+            balances['0xwhale1'] = float(i)
+
+        assert len(await StateStore(db_manager).load('last_balances')) == 0
+        assert store.get_stats()['pending'] == 1
+
+        assert await store.flush() == 1
+        assert (await StateStore(db_manager).load('last_balances'))['0xwhale1'] == 9.0
+        assert store.get_stats()['rows_written'] == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_persisted(self, db_manager):
+        """Test deleted keys are removed from the database."""
+        store = StateStore(db_manager)
+        balances = await store.load('last_balances')
+        balances['0xwhale1'] = 1.0
+        balances['0xwhale2'] = 2.0
+        await store.flush()
+
+        balances.pop('0xwhale1')
+        await store.close()
+
+        assert dict(await StateStore(db_manager).load('last_balances')) == {'0xwhale2': 2.0}
+
+    @pytest.mark.asyncio
+    async def test_early_flush_when_pending_limit_reached(self, db_manager):
+        """Test too many dirty keys trigger a flush without waiting for the schedule."""
+        store = StateStore(db_manager, max_pending=3)
+        balances = await store.load('last_balances')
+
+        for i in range(3):
+            balances[f'0xwhale{i}'] = float(i)
+        await store._flush_task
+
+        assert store.get_stats()['pending'] == 0
+        assert len(await StateStore(db_manager).load('last_balances')) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_retried(self, db_manager):
+        """Test keys stay dirty when the database write fails."""
+        store = StateStore(db_manager)
+        balances = await store.load('last_balances')
+        balances['0xwhale1'] = 1.0
+
+        store.db_manager = Mock()
+        store.db_manager.session = Mock(side_effect=Exception("database is locked"))
+        assert await store.flush() == 0
+        assert store.get_stats()['pending'] == 1
+
+        store.db_manager = db_manager
+        assert await store.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_unsupported_value_rejected_on_flush(self, db_manager):
+        """Test a non-JSON value is reported and doesn't block other keys."""
+        store = StateStore(db_manager)
+        state = await store.load('misc')
+        state['bad'] = object()
+        state['good'] = 1
+
+        assert await store.flush() == 1
+        assert store.get_stats()['flush_errors'] == 1
+        assert store.get_stats()['pending'] == 0
+        assert dict(await StateStore(db_manager).load('misc')) == {'good': 1}
+
+
+class TestWatcherResume:
+    """Test watcher resumes from persisted state."""
+
+    @pytest.mark.asyncio
+    async def test_restart_skips_initialize_cycle(self, db_manager):
+        """Test known whale is checked for movement right after restart."""
+        store = StateStore(db_manager)
+        (await store.load('last_balances'))['0xwhale1'] = 1000.0
+        (await store.load('last_alerts'))['0xwhale1'] = datetime.now() - timedelta(minutes=10)
+        await store.flush()
+
+        restarted = StateStore(db_manager)
+        settings = Mock()
+        settings.whale_monitoring.intervals.alert_cooldown_minutes = 60
+        web3_manager = Mock()
+        web3_manager.get_balance = AsyncMock(return_value=1000.0)
+        watcher = SimpleWhaleWatcher(
+            web3_manager=web3_manager,
+            whale_config=Mock(),
+            analyzer=Mock(),
+            notifier=Mock(),
+            settings=settings
+        )
+        watcher.last_balances = await restarted.load('last_balances')
+        watcher.last_alerts = await restarted.load('last_alerts')
+
+        result = await watcher.check_whale('0xwhale1')
+
+        assert result['status'] != 'initialized'
+        assert watcher._can_send_alert('0xwhale1') is False
+
+    @pytest.mark.asyncio
+    async def test_alert_manager_dedup_survives_restart(self, db_manager):
+        """Test AlertManager dedup keys persist through a persistent mapping."""
+        store = StateStore(db_manager)
+        manager = AlertManager(Mock(), last_alerts=await store.load('alert_manager'))
+        manager._mark_alert_sent('pool_il_5.00')
+        await store.flush()
+
+        restarted = StateStore(db_manager)
+        manager = AlertManager(Mock(), last_alerts=await restarted.load('alert_manager'))
+
+        assert manager._was_alert_sent_recently('pool_il_5.00') is True
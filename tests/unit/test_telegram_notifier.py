@@ -11,9 +11,15 @@ from pathlib import Path
 import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from datetime import datetime, timedelta
+
+from src.notifications.alert_dispatch import AlertPriority, LatencyTracker, onehop_priority
+from src.notifications.stub_bot_api import StubBotAPI
 from src.notifications.telegram_notifier import TelegramNotifier, AlertManager, MessageFormatter
 
 
@@ -149,6 +155,201 @@ class TestWhaleAlerts:
         assert "5.0x" in call_args  # multiplier
 
 
+class FakeResponse:
+    """aiohttp response stand-in."""
+
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status = status
+
+    async def json(self, content_type=None):
+        return self.data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Records POSTs; replies with queued responses (exceptions are raised)."""
+
+    def __init__(self, responses=None):
+        self.responses = list(responses or [])
+        self.posts = []
+        self.closed = False
+
+    def post(self, url, data=None, **kwargs):
+        self.posts.append(data)
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return FakeResponse(response)
+        return FakeResponse({'ok': True})
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def queued_notifier(monkeypatch):
+    """Notifier with a fake pooled session and fast pacing."""
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "123456789")
+    notifier = TelegramNotifier(per_chat_interval_seconds=0.05, backoff_base_seconds=0.001, max_retries=3)
+    notifier._session = FakeSession()
+    return notifier
+
+
+class TestMessageQueue:
+    """Test pooled session, queue worker, digests and retries."""
+
+    @pytest.mark.asyncio
+    async def test_messages_reuse_session(self, queued_notifier):
+        """Test queued messages go out in order over one session."""
+        session = queued_notifier._session
+        assert await queued_notifier.send_message("first") is True
+        assert await queued_notifier.send_message("second") is True
+        await queued_notifier.flush()
+
+        assert [post['text'] for post in session.posts] == ["first", "second"]
+        assert queued_notifier._session is session
+        assert queued_notifier.get_stats()['sent'] == 2
+
+    @pytest.mark.asyncio
+    async def test_burst_coalesced_into_digest(self, queued_notifier):
+        """Test alerts queued while the chat is throttled become one digest."""
+        session = queued_notifier._session
+        await queued_notifier.send_message("alert 0", digest=True)
+        await asyncio.sleep(0.01)
+        for i in range(1, 5):
+            await queued_notifier.send_message(f"alert {i}", digest=True)
+        await queued_notifier.flush()
+
+        assert len(session.posts) == 2
+        assert session.posts[0]['text'] == "alert 0"
+        assert "4 alerts" in session.posts[1]['text']
+        assert "alert 4" in session.posts[1]['text']
+        stats = queued_notifier.get_stats()
+        assert (stats['digests'], stats['coalesced']) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff(self, queued_notifier):
+        """Test 429, 5xx and network errors are retried."""
+        session = queued_notifier._session
+        session.responses = [
+            {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 0}},
+            aiohttp.ClientConnectionError("reset"),
+            {'ok': False, 'error_code': 502},
+        ]
+        await queued_notifier.send_message("hello")
+        await queued_notifier.flush()
+
+        assert len(session.posts) == 4
+        stats = queued_notifier.get_stats()
+        assert (stats['sent'], stats['retried'], stats['failed']) == (1, 3, 0)
+
+    @pytest.mark.asyncio
+    async def test_bad_request_not_retried(self, queued_notifier):
+        """Test client errors fail without retries."""
+        session = queued_notifier._session
+        session.responses = [{'ok': False, 'error_code': 400, 'description': "can't parse entities"}]
+        await queued_notifier.send_message("*broken")
+        await queued_notifier.flush()
+
+        assert len(session.posts) == 1
+        assert queued_notifier.get_stats()['failed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_close_drains(self, queued_notifier):
+        """Test a full queue drops new messages and close() delivers the rest."""
+        queued_notifier.max_queue_size = 2
+        session = queued_notifier._session
+        results = [await queued_notifier.send_message(f"m{i}") for i in range(3)]
+
+        assert results == [True, True, False]
+        await queued_notifier.close()
+        assert [post['text'] for post in session.posts] == ["m0", "m1"]
+        assert session.closed is True
+        assert queued_notifier.get_stats()['dropped'] == 1
+
+
+class TestAlertDispatch:
+    """Test priority lanes, latency tracking and the stub Bot API."""
+
+    def test_latency_percentiles(self):
+        """Test nearest-rank percentiles per lane and overall."""
+        tracker = LatencyTracker(window=100)
+        for i in range(1, 101):
+            tracker.record('queue', 'critical', float(i))
+        tracker.record('queue', 'low', 500.0)
+
+        critical = tracker.summary('queue', 'critical')
+        assert (critical['p50'], critical['p95'], critical['p99']) == (50.0, 95.0, 99.0)
+        assert tracker.summary('queue')['max'] == 500.0
+        # Window keeps the most recent samples only
+        assert tracker.summary('queue', 'critical')['count'] == 100
+        tracker.record('queue', 'critical', 1000.0)
+        assert tracker.summary('queue', 'critical')['count'] == 100
+        assert set(tracker.get_stats()['queue']) == {'all', 'critical', 'low'}
+
+    def test_onehop_priority(self):
+        """Test one-hop lanes by confidence."""
+        assert onehop_priority(90) == AlertPriority.HIGH
+        assert onehop_priority(65) == AlertPriority.NORMAL
+        assert onehop_priority(None) == AlertPriority.NORMAL
+
+    @pytest.mark.asyncio
+    async def test_urgent_lane_overtakes_queued_messages(self, queued_notifier):
+        """Test queued messages leave by lane, then by arrival."""
+        session = queued_notifier._session
+        await queued_notifier.send_message("first")
+        await asyncio.sleep(0.01)
+
+        await queued_notifier.send_message("low", priority=AlertPriority.LOW)
+        await queued_notifier.send_message("normal 1")
+        await queued_notifier.send_message("critical", priority=AlertPriority.CRITICAL)
+        await queued_notifier.send_message("normal 2")
+        await queued_notifier.flush()
+
+        assert [post['text'] for post in session.posts] == ["first", "critical", "normal 1", "normal 2", "low"]
+
+    @pytest.mark.asyncio
+    async def test_end_to_end_with_stub_api(self, monkeypatch):
+        """Test delivery through a local Bot API stub, with a 429 and latency metrics."""
+        monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test_token")
+        monkeypatch.setenv("TELEGRAM_CHAT_ID", "123456789")
+        stub = StubBotAPI(latency_seconds=0.01)
+        api_url = await stub.start()
+        notifier = TelegramNotifier(api_base_url=api_url, per_chat_interval_seconds=0.01)
+
+        try:
+            assert await notifier.test_connection() is True
+            stub.fail_next(429, retry_after=0)
+
+            await notifier.send_whale_direct_transfer_alert(
+                "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0",
+                {'value_usd': 500000, 'hash': '0xabc', 'timestamp': datetime.now() - timedelta(seconds=12)},
+                {'name': 'Binance'}
+            )
+            await notifier.flush()
+        finally:
+            await notifier.close()
+            await stub.stop()
+
+        assert len(stub.messages) == 1
+        assert stub.messages[0]['chat_id'] == '123456789'
+        assert "Binance" in stub.messages[0]['text']
+        assert stub.requests == 2
+
+        latency = notifier.get_stats()['latency']
+        assert latency['detection_to_delivery']['critical']['count'] == 1
+        assert 12 <= latency['detection_to_delivery']['critical']['p50'] < 20
+        assert latency['queue']['critical']['p99'] < 5
+
+
 class TestMessageFormatter:
     """Test message formatting utilities."""
 
@@ -0,0 +1,175 @@
+"""
+Unit Tests for Transaction Indexer
+===================================
+
+Tests block indexing, checkpoints and Etherscan backfill on in-memory SQLite.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.storage.transaction_store import TransactionStore
+from src.storage.transaction_indexer import TransactionIndexer
+from tests.conftest import make_tx
+
+
+WHALE = '0x5a52e96bacdabb82fd05763e25335261b270efcb'
+BINANCE = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+INTERMEDIATE = '0x9f8c163cba728e99993abe7495f06c0a3c8ac8b9'
+OTHER = '0x' + 'cd' * 20
+
+
+@pytest.fixture
+def indexer(db_manager):
+    """Create indexer with Etherscan enabled."""
+    return TransactionIndexer(TransactionStore(db_manager), etherscan_api_key='test_key',
+                              backfill_page_size=2)
+
+
+class TestIndexBlock:
+    """Test block-by-block indexing."""
+
+    @pytest.mark.asyncio
+    async def test_stores_only_watched_transactions(self, indexer):
+        """Test only transactions touching watched addresses are stored."""
+        await indexer.watch(WHALE, start_block=99)
+
+        stored = await indexer.index_block(100, [
+            make_tx(1, WHALE, BINANCE, 100),
+            make_tx(2, OTHER, BINANCE, 100)
+        ])
+
+        assert stored == 1
+        assert len(await indexer.store.get_recent_transactions(WHALE)) == 1
+
+    @pytest.mark.asyncio
+    async def test_whale_recipient_becomes_intermediate(self, indexer):
+        """Test unknown recipient of a whale is indexed, exchanges are not."""
+        await indexer.watch(WHALE, start_block=99)
+
+        await indexer.index_block(100, [
+            make_tx(1, WHALE, INTERMEDIATE, 100),
+            make_tx(2, WHALE, BINANCE, 100)
+        ])
+        await indexer.index_block(101, [make_tx(3, INTERMEDIATE, BINANCE, 101)])
+
+        assert indexer.roles[INTERMEDIATE] == 'intermediate'
+        assert BINANCE not in indexer.roles
+        assert indexer.get_high_water_mark(INTERMEDIATE) == 101
+        assert len(await indexer.store.get_recent_transactions(INTERMEDIATE)) == 1
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_advances_only_when_contiguous(self, indexer):
+        """Test a lagging address keeps its checkpoint."""
+        await indexer.watch(WHALE, start_block=99)
+        await indexer.watch(OTHER, start_block=50)
+
+        await indexer.index_block(100, [])
+
+        assert indexer.get_high_water_mark(WHALE) == 100
+        assert indexer.get_high_water_mark(OTHER) == 50
+
+    @pytest.mark.asyncio
+    async def test_store_failure_keeps_checkpoint(self, indexer):
+        """Test a failed write leaves the block to be fetched again."""
+        await indexer.watch(WHALE, start_block=99)
+        indexer.store.add_transactions = AsyncMock(return_value=None)
+
+        stored = await indexer.index_block(100, [make_tx(1, WHALE, BINANCE, 100)])
+
+        assert stored == 0
+        assert indexer.get_high_water_mark(WHALE) == 99
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_persist(self, indexer, db_manager):
+        """Test checkpoints survive a restart."""
+        await indexer.watch(WHALE, start_block=99)
+        await indexer.index_block(100, [])
+
+        restarted = TransactionIndexer(TransactionStore(db_manager))
+        count = await restarted.load_checkpoints()
+
+        assert count == 1
+        assert restarted.get_high_water_mark(WHALE.upper().replace('0X', '0x')) == 100
+        assert restarted.roles[WHALE] == 'whale'
+
+
+class TestBackfill:
+    """Test Etherscan backfill."""
+
+    @pytest.mark.asyncio
+    async def test_backfill_paginates_and_checkpoints(self, indexer):
+        """Test full pages re-fetch their last block and the checkpoint ends at to_block."""
+        await indexer.watch(WHALE, start_block=10)
+        pages = [
+            [make_tx(1, WHALE, OTHER, 11), make_tx(2, WHALE, OTHER, 12)],
+            [make_tx(2, WHALE, OTHER, 12), make_tx(3, WHALE, OTHER, 13)],
+            [make_tx(4, WHALE, OTHER, 15)]
+        ]
+        indexer._fetch_txlist = AsyncMock(side_effect=pages)
+
+        stored = await indexer.backfill(WHALE, to_block=20)
+
+        assert stored == 4
+        assert indexer.get_high_water_mark(WHALE) == 20
+        assert [call.args[1] for call in indexer._fetch_txlist.call_args_list] == [11, 12, 13]
+
+    @pytest.mark.asyncio
+    async def test_backfill_block_larger_than_page(self, indexer):
+        """Test a block that doesn't fit in one page stops the backfill."""
+        await indexer.watch(WHALE, start_block=10)
+        indexer._fetch_txlist = AsyncMock(return_value=[
+            make_tx(1, WHALE, OTHER, 11), make_tx(2, WHALE, OTHER, 11)
+        ])
+
+        await indexer.backfill(WHALE, to_block=20)
+
+        assert indexer.get_high_water_mark(WHALE) == 10
+        assert indexer._fetch_txlist.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_error_keeps_checkpoint(self, indexer):
+        """Test API failure leaves checkpoint unchanged."""
+        await indexer.watch(WHALE, start_block=10)
+        indexer._fetch_txlist = AsyncMock(return_value=None)
+
+        assert await indexer.backfill(WHALE, to_block=20) == 0
+        assert indexer.get_high_water_mark(WHALE) == 10
+
+    @pytest.mark.asyncio
+    async def test_backfill_store_failure_keeps_checkpoint(self, indexer):
+        """Test a failed write stops the backfill at the last stored page."""
+        await indexer.watch(WHALE, start_block=10)
+        indexer._fetch_txlist = AsyncMock(side_effect=[
+            [make_tx(1, WHALE, OTHER, 11), make_tx(2, WHALE, OTHER, 12)],
+            [make_tx(2, WHALE, OTHER, 12), make_tx(3, WHALE, OTHER, 13)]
+        ])
+        indexer.store.add_transactions = AsyncMock(side_effect=[2, None])
+
+        assert await indexer.backfill(WHALE, to_block=20) == 2
+        assert indexer.get_high_water_mark(WHALE) == 11
+        assert indexer._fetch_txlist.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_catch_up_without_api_key(self, db_manager):
+        """Test catch_up is a no-op without Etherscan key."""
+        indexer = TransactionIndexer(TransactionStore(db_manager))
+        await indexer.watch(WHALE, start_block=10)
+        indexer._fetch_txlist = AsyncMock()
+
+        assert await indexer.catch_up(20) == 0
+        indexer._fetch_txlist.assert_not_called()
+
+    def test_from_etherscan(self):
+        """Test Etherscan txlist entry conversion."""
+        tx = TransactionIndexer._from_etherscan({
+            'hash': '0xabc', 'from': WHALE.upper().replace('0X', '0x'), 'to': BINANCE,
+            'value': '1000', 'nonce': '7', 'gasPrice': '20', 'gas': '21000',
+            'isError': '0', 'blockNumber': '123', 'timeStamp': '1700000000'
+        })
+
+        assert tx['from'] == WHALE
+        assert tx['value'] == 1000
+        assert tx['nonce'] == 7
+        assert tx['blockNumber'] == 123
+        assert tx['status'] is True
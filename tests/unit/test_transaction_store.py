@@ -0,0 +1,130 @@
+"""
+Unit Tests for Transaction Store
+=================================
+
+Tests local transaction history on an in-memory SQLite database.
+"""
+
+import pytest
+import pytest_asyncio
+
+from src.storage.transaction_store import TransactionStore
+from tests.conftest import make_tx
+
+
+WHALE = '0x5a52e96bacdabb82fd05763e25335261b270efcb'
+EXCHANGE = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+
+
+@pytest_asyncio.fixture
+async def store(db_manager):
+    """Create store on in-memory SQLite."""
+    store = TransactionStore(db_manager, cache_size=5)
+    await store.initialize()
+    return store
+
+
+class TestTransactionStore:
+    """Test TransactionStore reads and writes."""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip(self, store):
+        """Test stored transactions come back in detector format."""
+        tx = make_tx(1, WHALE, EXCHANGE)
+        await store.add_transactions([tx])
+
+        result = await store.get_recent_transactions(WHALE, limit=10)
+
+        assert result == [tx]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_skipped(self, store):
+        """Test the same hash is stored once."""
+        assert await store.add_transactions([make_tx(1, WHALE, EXCHANGE), make_tx(1, WHALE, EXCHANGE)]) == 1
+        assert await store.add_transactions([make_tx(1, WHALE, EXCHANGE), make_tx(2, WHALE, EXCHANGE)]) == 1
+        assert await store.add_transactions([make_tx(1, WHALE, EXCHANGE)]) == 0
+
+    @pytest.mark.asyncio
+    async def test_write_failure_returns_none(self, store):
+        """Test a failed write is distinct from "nothing new"."""
+        broken = make_tx(3, WHALE, EXCHANGE)
+        broken['timestamp'] = 'not a timestamp'
+
+        assert await store.add_transactions([broken]) is None
+
+    @pytest.mark.asyncio
+    async def test_newest_first_and_limit(self, store):
+        """Test ordering by block descending and limit."""
+        await store.add_transactions([make_tx(i, WHALE, EXCHANGE) for i in range(1, 8)])
+
+        result = await store.get_recent_transactions(WHALE, limit=3)
+
+        assert [tx['nonce'] for tx in result] == [7, 6, 5]
+
+    @pytest.mark.asyncio
+    async def test_after_block(self, store):
+        """Test only transactions in later blocks are returned."""
+        await store.add_transactions([make_tx(i, WHALE, EXCHANGE) for i in range(1, 8)])
+
+        result = await store.get_recent_transactions(WHALE, limit=3, after_block=19000005)
+
+        assert [tx['nonce'] for tx in result] == [7, 6]
+
+    @pytest.mark.asyncio
+    async def test_address_casing_ignored(self, store):
+        """Test lookups with checksum addresses."""
+        await store.add_transactions([make_tx(1, WHALE, EXCHANGE)])
+
+        result = await store.get_recent_transactions(WHALE.upper().replace('0X', '0x'), limit=5)
+
+        assert len(result) == 1
+
+    @pytest.mark.asyncio
+    async def test_directions(self, store):
+        """Test outgoing / incoming / all."""
+        other = '0x' + 'ab' * 20
+        await store.add_transactions([
+            make_tx(1, WHALE, other),
+            make_tx(2, other, WHALE)
+        ])
+
+        outgoing = await store.get_recent_transactions(WHALE, direction='outgoing')
+        incoming = await store.get_recent_transactions(WHALE, direction='incoming')
+        both = await store.get_recent_transactions(WHALE, direction='all')
+
+        assert [tx['nonce'] for tx in outgoing] == [1]
+        assert [tx['nonce'] for tx in incoming] == [2]
+        assert [tx['nonce'] for tx in both] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_cache_serves_repeated_lookups(self, store):
+        """Test second lookup is a cache hit and new inserts are visible."""
+        await store.add_transactions([make_tx(1, WHALE, EXCHANGE), make_tx(2, WHALE, EXCHANGE)])
+
+        await store.get_recent_transactions(WHALE, limit=2)
+        await store.get_recent_transactions(WHALE, limit=2)
+        assert store.get_stats()['cache_hits'] == 1
+        assert store.get_stats()['cache_misses'] == 1
+
+        await store.add_transactions([make_tx(3, WHALE, EXCHANGE)])
+        result = await store.get_recent_transactions(WHALE, limit=5)
+
+        assert [tx['nonce'] for tx in result] == [3, 2, 1]
+        assert store.get_stats()['cache_hits'] == 2
+
+    @pytest.mark.asyncio
+    async def test_backfilled_older_tx_invalidates_cache(self, store):
+        """Test inserting history older than the cached head re-reads from DB."""
+        await store.add_transactions([make_tx(5, WHALE, EXCHANGE)])
+        await store.get_recent_transactions(WHALE, limit=5)
+
+        await store.add_transactions([make_tx(1, WHALE, EXCHANGE)])
+        result = await store.get_recent_transactions(WHALE, limit=5)
+
+        assert [tx['nonce'] for tx in result] == [5, 1]
+        assert store.get_stats()['cache_misses'] == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_address_empty(self, store):
+        """Test lookup for an address without history."""
+        assert await store.get_recent_transactions('0x' + '00' * 20) == []
@@ -14,6 +14,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.core.web3_manager import Web3Manager
+from src.core.instrumentation import Instrumentation
 
 
 class TestWeb3ManagerInit:
@@ -91,6 +92,21 @@ class TestWeb3ManagerRPC:
         # Should use Ankr public endpoint
         assert 'ankr.com' in rpc_url.lower()
 
+    def test_get_rpc_urls_pool(self, monkeypatch):
+        """Test every keyed provider joins the pool, Ankr always last."""
+        monkeypatch.setenv("INFURA_API_KEY", "test_infura_key")
+        monkeypatch.setenv("ALCHEMY_API_KEY", "")
+        monkeypatch.delenv("RPC_URL", raising=False)
+        monkeypatch.delenv("RPC_URLS", raising=False)
+
+        manager = Web3Manager()
+        urls = manager.networks['ethereum_mainnet']['rpc_urls']
+
+        assert len(urls) == 2
+        assert 'infura' in urls[0]
+        assert 'ankr.com' in urls[1]
+        assert manager._get_provider_pool().urls == urls
+
 
 class TestWeb3ManagerMockMode:
     """Test mock mode functionality."""
@@ -145,10 +161,216 @@ class TestWeb3ManagerMockMode:
         assert health['status'] == 'healthy'
 
 
+class MockRPCServer:
+    """Minimal local JSON-RPC server answering account reads (single and batch) and block calls."""
+
+    def __init__(self, balances_wei, blocks=None, reject_code=None, nonces=None, code=None):
+        self.balances_wei = {k.lower(): v for k, v in balances_wei.items()}
+        self.blocks = blocks or {}
+        self.nonces = {k.lower(): v for k, v in (nonces or {}).items()}
+        self.code = {k.lower(): v for k, v in (code or {}).items()}
+        self.reject_code = reject_code
+        self.http_requests = 0
+        self.runner = None
+        self.url = None
+
+    def _answer(self, call):
+        if self.reject_code is not None:
+            return {'jsonrpc': '2.0', 'id': call['id'], 'error': {'code': self.reject_code, 'message': 'rate limited'}}
+        if call['method'] == 'eth_blockNumber':
+            return {'jsonrpc': '2.0', 'id': call['id'], 'result': hex(max(self.blocks, default=0))}
+        if call['method'] == 'eth_getBlockByNumber':
+            return {'jsonrpc': '2.0', 'id': call['id'], 'result': self.blocks.get(int(call['params'][0], 16))}
+
+        address = call['params'][0].lower()
+        if call['method'] == 'eth_getTransactionCount':
+            return {'jsonrpc': '2.0', 'id': call['id'], 'result': hex(self.nonces.get(address, 0))}
+        if call['method'] == 'eth_getCode':
+            return {'jsonrpc': '2.0', 'id': call['id'], 'result': self.code.get(address, '0x')}
+        if address not in self.balances_wei:
+            return {'jsonrpc': '2.0', 'id': call['id'], 'error': {'code': -32000, 'message': 'unknown'}}
+        return {'jsonrpc': '2.0', 'id': call['id'], 'result': hex(self.balances_wei[address])}
+
+    async def handle(self, request):
+        from aiohttp import web
+        self.http_requests += 1
+        body = await request.json()
+        if isinstance(body, list):
+            return web.json_response([self._answer(call) for call in body])
+        return web.json_response(self._answer(body))
+
+    async def __aenter__(self):
+        from aiohttp import web
+        app = web.Application()
+        app.router.add_post('/', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}/'
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+class TestWeb3ManagerBatchBalances:
+    """Test batched JSON-RPC balance fetching."""
+
+    @pytest.mark.asyncio
+    async def test_get_balances_batch_mock(self):
+        """Test get_balances_batch in mock mode."""
+        manager = Web3Manager(mock_mode=True)
+
+        balances = await manager.get_balances_batch(["0xabc", "0xdef"])
+
+        assert set(balances.keys()) == {"0xabc", "0xdef"}
+
+    @pytest.mark.asyncio
+    async def test_get_balances_batch_packs_requests(self):
+        """Test 250 balances are fetched in 3 HTTP requests with batch_size=100."""
+        addresses = [f"0x{i:040x}" for i in range(1, 251)]
+        balances_wei = {addr: i * 10**18 for i, addr in enumerate(addresses, start=1)}
+
+        async with MockRPCServer(balances_wei) as server:
+            manager = Web3Manager()
+            manager.networks[manager.network]['rpc_url'] = server.url
+
+            balances = await manager.get_balances_batch(addresses, batch_size=100)
+
+        assert server.http_requests == 3
+        assert balances[addresses[0]] == 1.0
+        assert balances[addresses[-1]] == 250.0
+        assert manager.call_counts['get_balances_batch'] == 3
+
+    @pytest.mark.asyncio
+    async def test_get_balances_batch_partial_errors(self):
+        """Test failed calls and invalid addresses map to None without failing the batch."""
+        known = "0x" + "1" * 40
+        unknown = "0x" + "2" * 40
+
+        async with MockRPCServer({known: 5 * 10**18}) as server:
+            manager = Web3Manager()
+            manager.networks[manager.network]['rpc_url'] = server.url
+
+            balances = await manager.get_balances_batch([known, unknown, "not_an_address"], block=123)
+
+        assert balances[known] == 5.0
+        assert balances[unknown] is None
+        assert balances["not_an_address"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_balances_batch_connection_error(self):
+        """Test unreachable RPC returns None for every address."""
+        manager = Web3Manager()
+        manager.networks[manager.network]['rpc_url'] = 'http://127.0.0.1:1/'
+
+        address = "0x" + "1" * 40
+        balances = await manager.get_balances_batch([address])
+
+        assert balances == {address: None}
+
+
+class TestWeb3ManagerBlocks:
+    """Test async block fetching used by the block stream."""
+
+    @pytest.mark.asyncio
+    async def test_get_block_number_and_block(self):
+        """Test eth_blockNumber / eth_getBlockByNumber over JSON-RPC."""
+        block = {'number': hex(100), 'timestamp': hex(1700000000), 'transactions': []}
+
+        async with MockRPCServer({}, blocks={100: block}) as server:
+            manager = Web3Manager()
+            manager.networks[manager.network]['rpc_url'] = server.url
+
+            head = await manager.get_block_number()
+            fetched = await manager.get_block(100)
+            missing = await manager.get_block(101)
+
+        assert head == 100
+        assert fetched == block
+        assert missing is None
+        assert manager.call_counts['eth_getBlockByNumber'] == 2
+
+    @pytest.mark.asyncio
+    async def test_rpc_calls_instrumented(self):
+        """Test latency, bytes and errors are recorded per RPC method."""
+        instrumentation = Instrumentation()
+
+        async with MockRPCServer({}, blocks={100: {'number': hex(100)}}) as server:
+            manager = Web3Manager(instrumentation=instrumentation)
+            manager.networks[manager.network]['rpc_url'] = server.url
+            await manager.get_block_number()
+            await manager.get_balances_batch(["0x" + "1" * 40])
+
+        manager.networks[manager.network]['rpc_url'] = 'http://127.0.0.1:1/'
+        await manager.get_block_number()
+
+        stats = instrumentation.get_stats('rpc')
+        assert stats['eth_blockNumber']['calls'] == 2
+        assert stats['eth_blockNumber']['errors'] == 1
+        assert stats['eth_blockNumber']['bytes_sent'] > 0
+        assert stats['eth_blockNumber']['bytes_received'] > 0
+        assert stats['eth_getBalance[batch]']['calls'] == 1
+
+    @pytest.mark.asyncio
+    async def test_provider_failover(self):
+        """Test requests fail over from a dead or rate-limiting provider to a healthy one."""
+        async with MockRPCServer({}, reject_code=-32005) as limited, \
+                MockRPCServer({}, blocks={100: {'number': hex(100)}}) as server:
+            manager = Web3Manager(rpc_urls=['http://127.0.0.1:1/', limited.url, server.url])
+
+            assert await manager.get_block_number() == 100
+
+            stats = manager._get_provider_pool().get_stats()
+            assert stats['failovers'] == 2
+            assert limited.http_requests == 1
+            assert server.http_requests == 1
+            assert sum(e['failures'] for e in stats['endpoints'].values()) == 2
+
+            # The healthy provider is now the fastest known one
+            assert await manager.get_block_number() == 100
+            assert server.http_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_account_reads_fail_over(self):
+        """Test balance, nonce and code reads go through the provider pool, not the single web3.py URL."""
+        wallet = "0x" + "1" * 40
+        contract = "0x" + "2" * 40
+
+        async with MockRPCServer(
+            {wallet: 3 * 10**18}, blocks={100: {'number': hex(100)}},
+            nonces={wallet: 7}, code={contract: '0x6080'}
+        ) as server:
+            manager = Web3Manager(rpc_urls=['http://127.0.0.1:1/', server.url])
+
+            assert await manager.get_eth_balance(wallet) == 3.0
+            assert await manager.get_transaction_count(wallet, block=99) == 7
+            assert await manager.is_contract(contract) is True
+            assert await manager.is_contract(wallet) is False
+
+            health = await manager.health_check()
+
+        assert manager._get_provider_pool().get_stats()['failovers'] >= 1
+        assert server.http_requests == 5
+        assert health['status'] == 'healthy'
+        assert health['latest_block'] == 100
+
+    @pytest.mark.asyncio
+    async def test_get_block_number_connection_error(self):
+        """Test unreachable RPC returns None."""
+        manager = Web3Manager()
+        manager.networks[manager.network]['rpc_url'] = 'http://127.0.0.1:1/'
+
+        assert await manager.get_block_number() is None
+
+
 class TestWeb3ManagerRateLimiting:
     """Test rate limiting functionality."""
 
-    def test_rate_limit_tracking(self):
+    @pytest.mark.asyncio
+    async def test_rate_limit_tracking(self):
         """Test that rate limiting tracks calls."""
         manager = Web3Manager()
 
@@ -156,22 +378,48 @@ class TestWeb3ManagerRateLimiting:
         assert len(manager.call_counts) == 0
 
         # Simulate calls
-        manager._rate_limit('test_operation')
-        manager._rate_limit('test_operation')
+        await manager._rate_limit('test_operation')
+        await manager._rate_limit('test_operation')
 
         assert manager.call_counts['test_operation'] == 2
 
-    def test_rate_limit_different_operations(self):
+    @pytest.mark.asyncio
+    async def test_rate_limit_different_operations(self):
         """Test rate limiting for different operations."""
         manager = Web3Manager()
 
-        manager._rate_limit('operation_a')
-        manager._rate_limit('operation_b')
-        manager._rate_limit('operation_a')
+        await manager._rate_limit('operation_a')
+        await manager._rate_limit('operation_b')
+        await manager._rate_limit('operation_a')
 
         assert manager.call_counts['operation_a'] == 2
         assert manager.call_counts['operation_b'] == 1
 
+    @pytest.mark.asyncio
+    async def test_rate_limit_does_not_block_event_loop(self):
+        """Test that throttled calls yield to other tasks instead of sleeping the thread."""
+        from src.core.rate_limiter import AsyncRateLimiter
+
+        manager = Web3Manager(rate_limiter=AsyncRateLimiter(default_rate=20, default_burst=1))
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(asyncio.get_running_loop().time())
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        for _ in range(3):
+            await manager._rate_limit('is_contract')
+        done_at = asyncio.get_running_loop().time()
+        await ticker_task
+
+        # The ticker kept running while _rate_limit waited (~100ms total)
+        assert sum(1 for tick in ticks if tick < done_at) >= 3
+        stats = manager.rate_limiter.get_stats(manager.network)
+        assert stats['acquired'] == 3
+        assert stats['throttled'] == 2
+
 
 class TestWeb3ManagerValidation:
     """Test address validation."""
@@ -14,6 +14,7 @@ from src.analyzers.whale_analyzer import (
     AnomalyResult,
     get_analyzer
 )
+from src.analyzers.whale_history import WhaleHistory
 
 
 class TestWhaleAnalyzerInitialization:
@@ -138,6 +139,170 @@ class TestWhaleStats:
         assert abs(stats.avg_frequency_hours - 1.0) < 0.01
 
 
+class TestIncrementalStats:
+    """Test incremental statistics against full recomputation."""
+
+    def test_matches_numpy_over_sliding_window(self):
+        """Test mean/median/std/min/max/rolling mean after many evictions."""
+        rng = np.random.default_rng(42)
+        analyzer = WhaleAnalyzer(rolling_window_size=7)
+        whale_address = "0x123"
+        base_time = datetime(2024, 1, 1)
+
+        for i in range(500):
+            amount = float(rng.lognormal(12, 1.5))
+            analyzer.add_transaction(whale_address, amount, base_time + timedelta(minutes=int(rng.integers(0, 100000))))
+
+            window = list(analyzer.transaction_history[whale_address])
+            timestamps = list(analyzer.timestamp_history[whale_address])
+            stats = analyzer.get_whale_stats(whale_address)
+
+            assert stats.transaction_count == len(window)
+            assert stats.avg_amount_usd == pytest.approx(np.mean(window), rel=1e-9)
+            assert stats.median_amount_usd == np.median(window)
+            assert stats.std_dev_usd == pytest.approx(np.std(window), rel=1e-6, abs=1e-6)
+            assert stats.max_amount_usd == max(window)
+            assert stats.min_amount_usd == min(window)
+            rolling_mean = analyzer.history.summary([analyzer.history.row_of(whale_address)])['rolling_mean'][0]
+            assert rolling_mean == pytest.approx(np.mean(window[-7:]), rel=1e-9)
+            if len(timestamps) > 1:
+                diffs = [(timestamps[j] - timestamps[j - 1]).total_seconds() / 3600 for j in range(1, len(timestamps))]
+                assert stats.avg_frequency_hours == pytest.approx(np.mean(diffs))
+
+    def test_ewma_frequency(self):
+        """Test EWMA of hours between transactions."""
+        history = WhaleHistory(max_length=10, rolling_window=5, ewma_alpha=0.5)
+        base_time = datetime(2024, 1, 1)
+
+        for hours in [0, 2, 6]:
+            history.add("0x123", 100.0, base_time + timedelta(hours=hours))
+
+        summary = history.summary([history.row_of("0x123")])
+
+        # intervals 2h, 4h -> 2 + 0.5 * (4 - 2) = 3
+        assert summary['ewma_interval_hours'][0] == 3.0
+        assert summary['avg_interval_hours'][0] == 3.0
+
+    def test_ewma_in_stats(self):
+        """Test EWMA frequency reaches TransactionStats."""
+        analyzer = WhaleAnalyzer()
+        base_time = datetime(2024, 1, 1)
+        for i in range(3):
+            analyzer.add_transaction("0x123", 100000.0, base_time + timedelta(hours=i))
+
+        stats = analyzer.get_whale_stats("0x123")
+
+        assert stats.ewma_frequency_hours == 1.0
+        assert stats.to_dict()['ewma_frequency_hours'] == 1.0
+
+    def test_clear_history_resets_stats(self):
+        """Test cleared whale starts from empty statistics."""
+        analyzer = WhaleAnalyzer()
+        analyzer.add_transaction("0x123", 100000.0)
+        analyzer.clear_history("0x123")
+        analyzer.add_transaction("0x123", 50000.0)
+
+        stats = analyzer.get_whale_stats("0x123")
+
+        assert stats.transaction_count == 1
+        assert stats.avg_amount_usd == 50000.0
+
+
+class TestColumnarHistory:
+    """Test the columnar multi-whale store."""
+
+    def test_rows_grow_and_are_reused(self):
+        """Test capacity grows past preallocation and cleared rows are reused."""
+        analyzer = WhaleAnalyzer(expected_whales=2)
+        for i in range(5):
+            analyzer.add_transaction(f"0x{i}", 1000.0 * (i + 1))
+
+        assert analyzer.history.capacity >= 5
+        assert analyzer.get_whale_stats("0x4").avg_amount_usd == 5000.0
+
+        row = analyzer.history.row_of("0x1")
+        analyzer.clear_history("0x1")
+        analyzer.add_transaction("0xnew", 7.0)
+
+        assert analyzer.history.row_of("0xnew") == row
+        assert analyzer.get_whale_stats("0xnew").transaction_count == 1
+        assert list(analyzer.transaction_history["0xnew"]) == [7.0]
+
+    def test_sorted_order_maintained_incrementally(self):
+        """Test median / min / max from the maintained order match a full sort through evictions and reuse."""
+        rng = np.random.default_rng(7)
+        history = WhaleHistory(max_length=8, rolling_window=4, initial_capacity=2)
+        base_time = datetime(2024, 1, 1)
+        for step in range(300):
+            address = f"0x{int(rng.integers(0, 3))}"
+            # Few distinct values, so ties are common
+            history.add(address, float(rng.integers(0, 5)) * 1000.0, base_time + timedelta(minutes=step))
+            if step % 97 == 96:
+                history.remove(address)
+                continue
+
+            amounts = history.get_amounts(address)
+            row = history.row_of(address)
+            single = history.row_summary(row)
+            batch = history.summary([row])
+            assert list(history.amounts[row, history.order[row, :len(amounts)]]) == sorted(amounts)
+            for key, expected in (('median', np.median(amounts)), ('min', amounts.min()), ('max', amounts.max())):
+                assert single[key] == expected
+                assert batch[key][0] == expected
+
+    def test_detect_anomalies_matches_single(self):
+        """Test batch detection equals per-whale detection."""
+        rng = np.random.default_rng(1)
+        analyzer = WhaleAnalyzer(min_history_required=5)
+        for i in range(50):
+            for _ in range(int(rng.integers(1, 40))):
+                analyzer.add_transaction(f"0x{i}", float(rng.uniform(1e4, 1e6)))
+
+        current = {f"0x{i}": float(rng.uniform(1e4, 2e6)) for i in range(55)}
+        batch = analyzer.detect_anomalies(current)
+
+        assert list(batch) == list(current)
+        for address, amount in current.items():
+            single = analyzer.detect_anomaly(address, amount)
+            assert batch[address] == single
+
+    def test_export_stats_matches_single(self):
+        """Test vectorized export equals get_whale_stats per whale."""
+        analyzer = WhaleAnalyzer()
+        base_time = datetime(2024, 1, 1)
+        for i in range(20):
+            for j in range(i + 1):
+                analyzer.add_transaction(f"0x{i}", float(j * 1000 + i), base_time + timedelta(hours=j * i))
+
+        exported = analyzer.export_stats()
+
+        for address in analyzer.get_all_whale_addresses():
+            assert exported[address] == analyzer.get_whale_stats(address).to_dict()
+
+    def test_memory_at_least_5x_below_deques(self):
+        """Test footprint against one deque of floats + one of datetimes per whale."""
+        import sys
+        from collections import deque
+
+        whales, length = 2000, 30
+        base_time = datetime(2024, 1, 1)
+        analyzer = WhaleAnalyzer(expected_whales=whales)
+
+        deque_bytes = 0
+        for i in range(whales):
+            amounts = deque((float(i * length + j) for j in range(length)), maxlen=length)
+            timestamps = deque((base_time + timedelta(seconds=i * length + j) for j in range(length)), maxlen=length)
+            deque_bytes += sys.getsizeof(amounts) + sys.getsizeof(timestamps)
+            deque_bytes += sum(sys.getsizeof(x) for x in amounts) + sum(sys.getsizeof(x) for x in timestamps)
+            for j in range(length):
+                analyzer.add_transaction(f"0x{i}", amounts[j], timestamps[j])
+
+        usage = analyzer.get_memory_usage()
+
+        assert usage['whales'] == whales
+        assert deque_bytes / usage['total_bytes'] >= 5
+
+
 class TestAnomalyDetection:
     """Test anomaly detection logic."""
 
@@ -10,6 +10,9 @@ from src.core.whale_config import (
     WhaleConfig,
     WhaleCategory,
     WhaleMetadata,
+    AddressIndex,
+    CATEGORY_BITS,
+    address_key,
     get_whale_config,
     is_exchange_address,
     classify_address,
@@ -128,6 +131,15 @@ class TestWhaleConfig:
         # Random address
         assert config.is_exchange('0x1234567890123456789012345678901234567890') == False
 
+    def test_lookup_is_case_insensitive(self):
+        """Test lowercase addresses (as returned by RPC) match checksum keys."""
+        config = WhaleConfig()
+
+        binance_lower = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+        assert config.is_exchange(binance_lower) == True
+        assert config.get_metadata(binance_lower).name == 'Binance Hot Wallet'
+        assert config.classify_transaction_destination(binance_lower)['is_dump_risk'] == True
+
     def test_is_defi_protocol(self):
         """Test DeFi protocol detection."""
         config = WhaleConfig()
@@ -287,6 +299,100 @@ class TestWhaleConfig:
         assert result['exchanges'][binance_address]['name'] == 'Binance Hot Wallet'
 
 
+class TestAddressIndex:
+    """Test normalized address index and bulk loading."""
+
+    DEPOSIT = '0xAbCdEf0123456789aBcDeF0123456789AbCdEf01'
+
+    def test_address_key(self):
+        """Test casing-independent 20-byte keys and invalid input."""
+        assert address_key(self.DEPOSIT) == address_key(self.DEPOSIT.lower()) == address_key(self.DEPOSIT[2:])
+        assert len(address_key(self.DEPOSIT)) == 20
+        assert address_key('0x1234') is None
+        assert address_key('0x' + 'zz' * 20) is None
+        assert address_key('') is None
+
+    def test_category_bitmask_merges(self):
+        """Test an address can carry several categories."""
+        index = AddressIndex()
+        index.add(self.DEPOSIT, WhaleCategory.EXCHANGE, 'Deposit', ['binance'])
+        index.add(self.DEPOSIT.upper().replace('0X', '0x'), WhaleCategory.BRIDGE, tags=['deposit'])
+
+        mask = index.get_mask(self.DEPOSIT.lower())
+
+        assert mask == CATEGORY_BITS[WhaleCategory.EXCHANGE] | CATEGORY_BITS[WhaleCategory.BRIDGE]
+        assert index.has_category(self.DEPOSIT, WhaleCategory.BRIDGE)
+        assert index.get_metadata(self.DEPOSIT).tags == ['binance', 'deposit']
+        assert len(index) == 1
+
+    def test_prefilter(self):
+        """Test prefilter accepts indexed and rejects most unknown addresses."""
+        import random
+
+        rng = random.Random(3)
+        known = ['0x' + rng.randbytes(20).hex() for _ in range(1000)]
+        unknown = ['0x' + rng.randbytes(20).hex().upper() for _ in range(2000)]
+        index = AddressIndex()
+        for address in known:
+            index.add(address, WhaleCategory.EXCHANGE)
+
+        assert all(index.might_contain(address.upper().replace('0X', '0x')) for address in known)
+        assert not index.might_contain('not an address')
+
+        rejected = sum(1 for address in unknown if not index.might_contain(address))
+        assert rejected / len(unknown) > 0.95
+
+    def test_load_csv(self, tmp_path):
+        """Test bulk CSV load with categories, tags and invalid rows."""
+        path = tmp_path / 'labels.csv'
+        path.write_text(
+            'address,name,category,tags\n'
+            f'{self.DEPOSIT},Binance Deposit,,binance|deposit\n'
+            '0x1111111111111111111111111111111111111111,Some Bridge,bridge,\n'
+            'not-an-address,Broken,,\n'
+        )
+        config = WhaleConfig()
+
+        loaded = config.load_labels(str(path))
+
+        assert loaded == 2
+        assert config.is_exchange(self.DEPOSIT.lower())
+        assert config.is_bridge('0x1111111111111111111111111111111111111111')
+        assert config.get_name(self.DEPOSIT) == 'Binance Deposit'
+        assert self.DEPOSIT.lower() in config.get_addresses_by_tag('deposit')
+        assert self.DEPOSIT.lower() in config.get_all_exchange_addresses()
+        assert config.classify_transaction_destination(self.DEPOSIT)['is_dump_risk'] is True
+
+        # Curated entries keep their checksum address and metadata
+        assert '0x3f5CE5FBFe3E9af3971dD833D26bA9b5C936f0bE' in config.get_addresses_by_tag('binance')
+
+    def test_load_missing_file(self, tmp_path):
+        """Test unreadable file loads nothing."""
+        assert AddressIndex().load_file(str(tmp_path / 'missing.csv')) == 0
+
+    def test_load_parquet_without_engine(self, tmp_path, monkeypatch):
+        """Test Parquet load fails soft when no Parquet engine is installed."""
+        pd = pytest.importorskip('pandas')
+
+        def no_engine(*args, **kwargs):
+            raise ImportError("Unable to find a usable engine")
+
+        monkeypatch.setattr(pd, 'read_parquet', no_engine)
+
+        assert AddressIndex().load_file(str(tmp_path / 'labels.parquet')) == 0
+
+    def test_classify_many(self):
+        """Test batch classification returns known addresses only."""
+        config = WhaleConfig()
+        binance = '0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be'
+
+        expected = {binance: CATEGORY_BITS[WhaleCategory.EXCHANGE]}
+
+        assert config.index.classify_many([binance, '0x' + '12' * 20, None]) == expected
+        # Malformed entry falls back to one-by-one lookups
+        assert config.index.classify_many([binance, 'not-an-address']) == expected
+
+
 class TestSingletonAndConvenience:
     """Test singleton pattern and convenience functions."""
 